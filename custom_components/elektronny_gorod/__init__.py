@@ -4,14 +4,21 @@ from __future__ import annotations
 import json
 from typing import Any
 
+import voluptuous as vol
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.helpers.device_registry import DeviceEntry
-from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+)
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
 
 from .api import ElektronnyGorodAPI
 from .const import (
@@ -30,6 +37,7 @@ from .const import (
     DEFAULT_GO2RTC_RTSP_HOST,
     STREAM_MANAGER_DATA,
     SIGNAL_DOORBELL,
+    SIGNAL_STREAM_MANAGER,
     SIP_DATA as _SIP_DATA,
 )
 from .coordinator import ElektronnyGorodUpdateCoordinator
@@ -38,8 +46,11 @@ from .fcm import DoorbellFcmListener
 from .go2rtc import Go2RtcClient, go2rtc_auth_headers
 from .history import HistoryManager
 from .history_ws import async_register_history_ws_command
+from .refresh_schedule import PLACE_KINDS
 from .sip.call_controller import DoorbellCallController, Go2RtcConfig
+from .snapshot_store import SnapshotStore
 from .stream_manager import CameraStreamManager
+from .transport import async_acquire_operator_transport
 from .uplink_ws import async_register_uplink_card, async_register_uplink_ws_command
 from .user_agent import UserAgent
 
@@ -47,6 +58,16 @@ from .user_agent import UserAgent
 # key, чтобы не ломать `hass.data[DOMAIN][entry_id] = coordinator` (event/camera/lock).
 SERVICE_ANSWER = "answer"
 SERVICE_HANGUP = "hangup"
+# Targeted refresh одного place (coordinator.async_refresh_place).
+SERVICE_REFRESH_PLACE = "refresh_place"
+ATTR_PLACE_ID = "place_id"
+ATTR_KINDS = "kinds"
+REFRESH_PLACE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_PLACE_ID): cv.string,
+        vol.Optional(ATTR_KINDS): vol.All(cv.ensure_list, [vol.In(PLACE_KINDS)]),
+    }
+)
 
 PLATFORMS: list[Platform] = [
     Platform.BINARY_SENSOR,
@@ -61,40 +82,22 @@ PLATFORMS: list[Platform] = [
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Elektronny Gorod from a config entry."""
     hass.data.setdefault(DOMAIN, {})
+    # Выделенный connection pool operator-а (transport.py): shared между
+    # entries, закрывается unload-ом последнего (в т.ч. при неудачном setup).
+    entry.async_on_unload(async_acquire_operator_transport(hass))
 
     coordinator = ElektronnyGorodUpdateCoordinator(hass, entry=entry)
-    await coordinator.async_config_entry_first_refresh()
+    # Быстрый старт (snapshot_store.py): entity строятся из сохранённого
+    # снимка, живой refresh — в фоне после setup-а платформ. Без снимка —
+    # блокирующий first refresh, как раньше.
+    restored = await coordinator.async_restore_snapshot()
+    if not restored:
+        await coordinator.async_config_entry_first_refresh()
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
     stream_manager: CameraStreamManager | None = None
-    use_go2rtc = entry.options.get(
-        CONF_USE_GO2RTC,
-        entry.data.get(CONF_USE_GO2RTC, False),
-    )
-    go2rtc_base_url = entry.options.get(
-        CONF_GO2RTC_BASE_URL,
-        entry.data.get(CONF_GO2RTC_BASE_URL),
-    )
-    go2rtc_rtsp_host = entry.options.get(
-        CONF_GO2RTC_RTSP_HOST,
-        entry.data.get(CONF_GO2RTC_RTSP_HOST),
-    )
-    if use_go2rtc and go2rtc_base_url and go2rtc_rtsp_host:
-        go2rtc_username = entry.options.get(
-            CONF_GO2RTC_USERNAME,
-            entry.data.get(CONF_GO2RTC_USERNAME),
-        )
-        go2rtc_password = entry.options.get(
-            CONF_GO2RTC_PASSWORD,
-            entry.data.get(CONF_GO2RTC_PASSWORD),
-        )
-        client = Go2RtcClient(
-            base_url=go2rtc_base_url,
-            rtsp_host=go2rtc_rtsp_host,
-            session=async_get_clientsession(hass),
-            username=go2rtc_username,
-            password=go2rtc_password,
-        )
+    client = _build_go2rtc_client(hass, entry)
+    if client is not None:
         stream_manager = CameraStreamManager(
             hass=hass,
             entry=entry,
@@ -114,10 +117,16 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # HA-core гарантированно вызовет эти cleanup-функции на unload entry,
     # независимо от успешности platform unload. См. audit A-16.
     entry.async_on_unload(coordinator.async_unsubscribe)
-    entry.async_on_unload(entry.add_update_listener(async_update_options))
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    if restored:
+        entry.async_create_background_task(
+            hass,
+            coordinator.async_refresh_restored(),
+            name=f"{DOMAIN}_restored_refresh",
+        )
+
     # Durable REST history is intentionally separate from the five-minute main
     # coordinator. Event entities are already attached before the first silent
     # baseline/poll, and the config-entry lifecycle owns both task and timer.
@@ -137,6 +146,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass, fcm_listener.async_start(), name=f"{DOMAIN}_fcm_listener"
     )
     entry.async_on_unload(fcm_listener.async_stop)
+    # Пуш звонка — активность в place: его DND/screens/домофоны опрашиваются
+    # снова часто (адаптивные сроки, `refresh_schedule.py`).
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, SIGNAL_DOORBELL, coordinator.handle_doorbell_signal)
+    )
 
     # Two-way audio: контроллер приёма вызова (REGISTER-on-ring). Трекает
     # активный FCM-вызов (SIGNAL_DOORBELL) и драйвит SipManager по сервису
@@ -151,6 +165,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     )
     hass.data.setdefault(_SIP_DATA, {})[entry.entry_id] = sip_controller
     _async_register_sip_services(hass)
+    _async_register_refresh_service(hass)
     async_register_history_ws_command(hass)
     # Phase C (ADR-0013): WS-команда uplink-микрофона (браузер → HA-WS → SIP)
     # + раздача Lovelace-карты микрофона статикой.
@@ -160,6 +175,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # One-time migration: legacy state (disabled_by на entities/devices от
     # старых версий integration) → None. Применяется один раз per entry.
     migration_changed = _migrate_legacy_disabled_state(hass, entry)
+    # Options-listener подписываем ПОСЛЕ записи migration-флага: HA вызывает
+    # update listeners на любое изменение entry (и data тоже), и флаг иначе
+    # запускал бы лишний reload посреди первого setup (A-64).
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
 
     # Visibility sync: hidden в /settings/screens → entity.hidden_by=INTEGRATION.
     # `hidden_by` (НЕ disabled_by) — state machine продолжает работать
@@ -183,6 +202,39 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+def _build_go2rtc_client(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> Go2RtcClient | None:
+    """Транспорт go2rtc для CameraStreamManager из entry. None если выключен."""
+    use_go2rtc = entry.options.get(
+        CONF_USE_GO2RTC,
+        entry.data.get(CONF_USE_GO2RTC, False),
+    )
+    go2rtc_base_url = entry.options.get(
+        CONF_GO2RTC_BASE_URL,
+        entry.data.get(CONF_GO2RTC_BASE_URL),
+    )
+    go2rtc_rtsp_host = entry.options.get(
+        CONF_GO2RTC_RTSP_HOST,
+        entry.data.get(CONF_GO2RTC_RTSP_HOST),
+    )
+    if not (use_go2rtc and go2rtc_base_url and go2rtc_rtsp_host):
+        return None
+    return Go2RtcClient(
+        base_url=go2rtc_base_url,
+        rtsp_host=go2rtc_rtsp_host,
+        session=async_get_clientsession(hass),
+        username=entry.options.get(
+            CONF_GO2RTC_USERNAME,
+            entry.data.get(CONF_GO2RTC_USERNAME),
+        ),
+        password=entry.options.get(
+            CONF_GO2RTC_PASSWORD,
+            entry.data.get(CONF_GO2RTC_PASSWORD),
+        ),
+    )
+
+
 def _build_go2rtc_config(entry: ConfigEntry) -> Go2RtcConfig | None:
     """go2rtc-конфиг для аудио-моста (downlink) из entry. None если go2rtc выключен."""
     use = entry.options.get(CONF_USE_GO2RTC, entry.data.get(CONF_USE_GO2RTC))
@@ -238,8 +290,37 @@ def _async_register_sip_services(hass: HomeAssistant) -> None:
     hass.services.async_register(DOMAIN, SERVICE_HANGUP, _hangup)
 
 
+def _async_register_refresh_service(hass: HomeAssistant) -> None:
+    """Зарегистрировать сервис `refresh_place` (один раз на интеграцию).
+
+    Place ищется по всем entry интеграции (place_id уникален у оператора).
+    Без `kinds` — все виды данных place-а.
+    """
+    if hass.services.has_service(DOMAIN, SERVICE_REFRESH_PLACE):
+        return
+
+    async def _refresh_place(call: ServiceCall) -> None:
+        place_id = call.data[ATTR_PLACE_ID]
+        coordinators = [
+            coordinator
+            for coordinator in list(hass.data.get(DOMAIN, {}).values())
+            if coordinator.has_place(place_id)
+        ]
+        if not coordinators:
+            raise HomeAssistantError(f"Unknown place_id: {place_id}")
+        for coordinator in coordinators:
+            await coordinator.async_refresh_place(place_id, call.data.get(ATTR_KINDS))
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_REFRESH_PLACE, _refresh_place, schema=REFRESH_PLACE_SCHEMA
+    )
+
+
 _MIGRATION_FLAG_KEY = "visibility_migration_v2"
 _CAMERA_HISTORY_UNIQUE_ID_PREFIX = f"{DOMAIN}_event_history_camera_"
+# Opt-in diagnostic-сенсоры метрик operator API (metrics.py) — тоже выключены
+# по умолчанию намеренно, а не legacy-состоянием.
+_OPT_IN_UNIQUE_ID_SUFFIXES = ("_api_latency_p95", "_api_errors")
 
 
 def _migrate_legacy_disabled_state(
@@ -286,7 +367,9 @@ def _migrate_legacy_disabled_state(
     for entity in er.async_entries_for_config_entry(ent_reg, entry.entry_id):
         # Motion history is intentionally opt-in. Its disabled marker is not
         # legacy visibility state and must survive this one-time migration.
-        if entity.unique_id.startswith(_CAMERA_HISTORY_UNIQUE_ID_PREFIX):
+        if entity.unique_id.startswith(
+            _CAMERA_HISTORY_UNIQUE_ID_PREFIX
+        ) or entity.unique_id.endswith(_OPT_IN_UNIQUE_ID_SUFFIXES):
             continue
         if entity.disabled_by in (
             er.RegistryEntryDisabler.INTEGRATION,
@@ -486,16 +569,84 @@ async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
 
 
 async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Update options for entry that was configured via user interface."""
-    stream_manager = hass.data.get(STREAM_MANAGER_DATA, {}).get(entry.entry_id)
-    if (
-        stream_manager is not None
-        and await stream_manager.async_apply_entry_options()
-    ):
+    """Update options for entry that was configured via user interface.
+
+    Все опции применяются на лету (`_async_apply_go2rtc_options`): reload
+    entry рвёт FCM-сокет (re-checkin), удерживаемый SIP-вызов, go2rtc
+    preload-ы и таймеры истории — он остаётся только запасным путём, если
+    hot-apply упал.
+    """
+    coordinator = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    try:
+        applied = await _async_apply_go2rtc_options(hass, entry, coordinator)
+    except Exception as err:  # noqa: BLE001 - reload остаётся fallback-ом
+        LOGGER.warning(
+            "Не удалось применить опции без reload (%s); перезагружаем entry",
+            type(err).__name__,
+        )
+        applied = False
+    if applied:
+        # Опции применены без reload — entity перечитывают state целиком.
+        if coordinator is not None:
+            coordinator.async_update_all_listeners()
         return
     await hass.config_entries.async_reload(entry.entry_id)
 
 
+async def _async_apply_go2rtc_options(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: Any
+) -> bool:
+    """Привести go2rtc-часть к опциям entry без reload. False — нужен reload.
+
+    - та же конфигурация транспорта → только policy (keep_warm*);
+    - сменился адрес / RTSP-host / учётка → `async_swap_client`: owned
+      стримы переезжают на новый go2rtc, менеджер и его подписчики те же;
+    - go2rtc включили → новый менеджер; выключили → менеджер остановлен
+      (owned preload-ы сняты).
+
+    После смены транспорта SIP-контроллер получает новый `Go2RtcConfig`, а
+    camera/sensor платформы — `SIGNAL_STREAM_MANAGER` (перепривязка entity,
+    добавление отсутствующих). Запись FCM-креденшелов в data ничего не меняет.
+    """
+    managers = hass.data.setdefault(STREAM_MANAGER_DATA, {})
+    manager: CameraStreamManager | None = managers.get(entry.entry_id)
+    if manager is not None and await manager.async_apply_entry_options():
+        return True
+    client = _build_go2rtc_client(hass, entry)
+    created = False
+    if manager is not None and client is not None:
+        await manager.async_swap_client(client)
+        if not await manager.async_apply_entry_options():
+            return False
+    elif manager is not None:
+        managers.pop(entry.entry_id, None)
+        await manager.async_stop()
+        manager = None
+    elif client is not None:
+        if coordinator is None:
+            return False
+        manager = CameraStreamManager(
+            hass=hass,
+            entry=entry,
+            coordinator=coordinator,
+            client=client,
+        )
+        managers[entry.entry_id] = manager
+        created = True
+    else:
+        return True
+
+    sip_controller = hass.data.get(_SIP_DATA, {}).get(entry.entry_id)
+    if sip_controller is not None:
+        sip_controller.set_go2rtc(_build_go2rtc_config(entry))
+    async_dispatcher_send(
+        hass, SIGNAL_STREAM_MANAGER.format(entry.entry_id), manager
+    )
+    if created:
+        await manager.async_start()
+    return True
+
+
 async def async_remove_config_entry_device(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -536,6 +687,10 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id, None)
         hass.data.get(STREAM_MANAGER_DATA, {}).pop(entry.entry_id, None)
+        if not hass.data[DOMAIN] and hass.services.has_service(
+            DOMAIN, SERVICE_REFRESH_PLACE
+        ):
+            hass.services.async_remove(DOMAIN, SERVICE_REFRESH_PLACE)
 
     return unload_ok
 
@@ -560,3 +715,6 @@ async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
         await api.unregister_push_device()
     except Exception:  # noqa: BLE001
         LOGGER.debug("Push-токен не отвязан при удалении entry (best-effort)")
+
+    # Сохранённый снимок (адреса, камеры) не переживает удаление entry.
+    await SnapshotStore(hass, entry.entry_id).async_remove()
@@ -2,16 +2,20 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Awaitable, Callable
+import hashlib
 import json
 import uuid
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, TypeVar
 from urllib.parse import urlencode
 
 from aiohttp import ClientResponse
 
 from homeassistant.core import HomeAssistant
 
+from .const import SNAPSHOT_MAX_BYTES
 from .http import HTTP
 from .user_agent import UserAgent
 
@@ -21,6 +25,8 @@ _DEVICE_INSTALLATIONS = (
 )
 _SUBSCRIBER_NOTIFICATIONS = "/rest/v1/subscriberNotifications"
 
+_T = TypeVar("_T")
+
 
 @dataclass(frozen=True, slots=True)
 class HistoryEvent:
@@ -81,6 +87,68 @@ class ElektronnyGorodAPI:
             operator,
         )
         self._phone: str | None = None
+        # Single-flight: одинаковые конкурентные чтения (stream URL из
+        # stream manager + camera entity + call camera, snapshot, history)
+        # делят один HTTP round-trip. Per-entity futures (A-68) дедуплицируют
+        # только внутри одной entity.
+        self.coalesce_requests = True
+        self.coalesced = 0
+        self._inflight: dict[tuple[str, str, str | None], asyncio.Task[Any]] = {}
+
+    async def _single_flight(
+        self,
+        method: str,
+        endpoint: str,
+        body: str | None,
+        fetch: Callable[[], Awaitable[_T]],
+        *,
+        coalesce: bool | None = None,
+    ) -> _T:
+        """Выполнить `fetch`, разделив результат с идентичными in-flight вызовами.
+
+        Ключ — `(method, endpoint, sha256(body))`. По умолчанию склеиваются
+        только GET; POST — лишь с явным `coalesce=True` (идемпотентный поиск).
+        Действия (open_lock, mint SIP, DND, auth, push) сюда не ходят вовсе;
+        GET одноразового stream URL — с `coalesce=False` (ADR-0014).
+        Результат (и исключение) получают все ожидающие — он должен быть
+        immutable либо не мутироваться вызывающими.
+        """
+        if coalesce is None:
+            coalesce = method == "GET"
+        if not (coalesce and self.coalesce_requests):
+            return await fetch()
+        key = (
+            method,
+            endpoint,
+            hashlib.sha256(body.encode()).hexdigest() if body is not None else None,
+        )
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget_inflight(key, done))
+        else:
+            self.coalesced += 1
+        # shield: отмена одного ожидающего не отменяет общий запрос.
+        return await asyncio.shield(task)
+
+    def _forget_inflight(
+        self, key: tuple[str, str, str | None], task: asyncio.Task[Any]
+    ) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Ошибку уже получили ожидающие; без этого — "never retrieved".
+            task.exception()
+
+    async def _get_json(self, endpoint: str, place_id: str | None) -> Any:
+        """Coalesced conditional GET (`HTTP.get_json`)."""
+        return await self._single_flight(
+            "GET",
+            endpoint,
+            None,
+            lambda: self.http.get_json(endpoint, place_id=place_id),
+        )
 
     def _ensure_phone(self) -> str:
         """Return phone if it is known, otherwise raise a setup error."""
@@ -218,23 +286,22 @@ class ElektronnyGorodAPI:
         """Query the balance/finance info for a place."""
         api_url = f"/api/mh-payment/mobile/v1/finance?placeId={place_id}"
 
-        response = await self.http.get(api_url)
-        if not isinstance(response, ClientResponse):
-            raise TypeError(f"Unexpected response type: {type(response)!r}")
+        async def fetch() -> dict[str, Any]:
+            response = await self.http.get(api_url, place_id=place_id)
+            if not isinstance(response, ClientResponse):
+                raise TypeError(f"Unexpected response type: {type(response)!r}")
+
+            finance = await response.json()
+            return finance.get("data") if finance else {}
 
-        finance = await response.json()
-        return finance.get("data") if finance else {}
+        return await self._single_flight("GET", api_url, None, fetch)
 
     async def query_places(self, place_id: str = "") -> list[dict[str, Any]]:
         """Query the list of places for the subscriber."""
         suffix = f"?placeId={place_id}" if place_id else ""
         api_url = f"/rest/v3/subscriber-places{suffix}"
 
-        response = await self.http.get(api_url)
-        if not isinstance(response, ClientResponse):
-            raise TypeError(f"Unexpected response type: {type(response)!r}")
-
-        places = await response.json()
+        places = await self._get_json(api_url, place_id or None)
         data = places.get("data") if places else []
         return data
 
@@ -246,10 +313,18 @@ class ElektronnyGorodAPI:
     ) -> HistoryPage:
         """Query one page of sanitized durable events for the given places."""
         api_url = f"/rest/v1/events/search?page={page}&sort=occurredAt%2CDESC"
-        response = await self.http.post(
+        body = json.dumps({"placeIds": place_ids})
+        # POST, но это поиск (read-only) — склеиваем явно.
+        return await self._single_flight(
+            "POST",
             api_url,
-            json.dumps({"placeIds": place_ids}),
+            body,
+            lambda: self._fetch_events_page(api_url, body),
+            coalesce=True,
         )
+
+    async def _fetch_events_page(self, api_url: str, body: str) -> HistoryPage:
+        response = await self.http.post(api_url, body)
         if not isinstance(response, ClientResponse):
             raise TypeError(f"Unexpected response type: {type(response)!r}")
 
@@ -287,9 +362,18 @@ class ElektronnyGorodAPI:
                 "orderByTime": "DESC",
             }
         )
-        response = await self.http.get(
-            f"/rest/v2/forpost/cameras/{camera_id}/events?{query}"
+        api_url = f"/rest/v2/forpost/cameras/{camera_id}/events?{query}"
+        return await self._single_flight(
+            "GET",
+            api_url,
+            None,
+            lambda: self._fetch_camera_events(api_url, camera_id),
         )
+
+    async def _fetch_camera_events(
+        self, api_url: str, camera_id: str
+    ) -> tuple[CameraHistoryEvent, ...]:
+        response = await self.http.get(api_url)
         if not isinstance(response, ClientResponse):
             raise TypeError(f"Unexpected response type: {type(response)!r}")
 
@@ -312,11 +396,7 @@ class ElektronnyGorodAPI:
         """Query the list of access controls for a place."""
         api_url = f"/rest/v1/places/{place_id}/accesscontrols"
 
-        response = await self.http.get(api_url)
-        if not isinstance(response, ClientResponse):
-            raise TypeError(f"Unexpected response type: {type(response)!r}")
-
-        access_controls = await response.json()
+        access_controls = await self._get_json(api_url, place_id)
         data = access_controls.get("data") if access_controls else []
         return data
 
@@ -335,34 +415,40 @@ class ElektronnyGorodAPI:
         except Exception:
             return []
 
-    async def query_cameras(self, place_id: str) -> list[dict[str, Any]]:
-        """Query the list of cameras for the current access token."""
+    async def query_cameras(
+        self, place_id: str, *, strict: bool = False
+    ) -> list[dict[str, Any]]:
+        """Query the list of cameras for the current access token.
+
+        `strict=True` (здесь и в public cameras / screens / DND) пробрасывает
+        ошибку вместо пустого ответа: coordinator-у надо отличать сбой от
+        «пусто», иначе пустой список закэшируется на весь интервал вида
+        (`refresh_schedule.py`).
+        """
         api_url = f"/rest/v1/places/{place_id}/cameras"
 
         try:
-            response = await self.http.get(api_url)
-            if not isinstance(response, ClientResponse):
-                raise TypeError(f"Unexpected response type: {type(response)!r}")
-
-            cameras = await response.json()
+            cameras = await self._get_json(api_url, place_id)
             data = cameras.get("data") if cameras else []
             return data
         except Exception:
+            if strict:
+                raise
             return []
 
-    async def query_public_cameras(self, place_id: str) -> list[dict[str, Any]]:
+    async def query_public_cameras(
+        self, place_id: str, *, strict: bool = False
+    ) -> list[dict[str, Any]]:
         """Query the list of public cameras for a place."""
         api_url = f"/rest/v2/places/{place_id}/public/cameras"
 
         try:
-            response = await self.http.get(api_url)
-            if not isinstance(response, ClientResponse):
-                raise TypeError(f"Unexpected response type: {type(response)!r}")
-
-            cameras = await response.json()
+            cameras = await self._get_json(api_url, place_id)
             data = cameras.get("data") if cameras else []
             return data
         except Exception:
+            if strict:
+                raise
             return []
 
     async def query_sections(self, place_id: str) -> list[dict[str, Any]]:
@@ -370,7 +456,7 @@ class ElektronnyGorodAPI:
         api_url = f"/rest/v1/places/{place_id}/screen-sections"
 
         try:
-            response = await self.http.get(api_url)
+            response = await self.http.get(api_url, place_id=place_id)
             if not isinstance(response, ClientResponse):
                 raise TypeError(f"Unexpected response type: {type(response)!r}")
 
@@ -380,7 +466,9 @@ class ElektronnyGorodAPI:
         except Exception:
             return []
 
-    async def query_screens_settings(self, place_id: str) -> dict[str, Any]:
+    async def query_screens_settings(
+        self, place_id: str, *, strict: bool = False
+    ) -> dict[str, Any]:
         """Пользовательские настройки видимости из приложения оператора.
 
         Возвращает dict вида:
@@ -405,15 +493,16 @@ class ElektronnyGorodAPI:
             f"/api/mh-customer/mobile/v1/customers/places/{place_id}/settings/screens"
         )
         try:
-            response = await self.http.get(api_url)
-            if not isinstance(response, ClientResponse):
-                raise TypeError(f"Unexpected response type: {type(response)!r}")
-            data = await response.json()
+            data = await self._get_json(api_url, place_id)
             return data or {}
         except Exception:
+            if strict:
+                raise
             return {}
 
-    async def query_dnd_settings(self, place_id: str) -> list[dict[str, Any]]:
+    async def query_dnd_settings(
+        self, place_id: str, *, strict: bool = False
+    ) -> list[dict[str, Any]]:
         """Get Do Not Disturb settings for a place.
 
         Response shape (см. api-reference §settings/do_not_disturb):
@@ -429,12 +518,11 @@ class ElektronnyGorodAPI:
             f"/api/mh-customer/mobile/v1/customers/places/{place_id}/settings/do_not_disturb"
         )
         try:
-            response = await self.http.get(api_url)
-            if not isinstance(response, ClientResponse):
-                raise TypeError(f"Unexpected response type: {type(response)!r}")
-            data = await response.json()
+            data = await self._get_json(api_url, place_id)
             return (data or {}).get("do_not_disturb") or []
         except Exception:
+            if strict:
+                raise
             return []
 
     async def post_dnd_settings(
@@ -454,26 +542,39 @@ class ElektronnyGorodAPI:
             f"/api/mh-customer/mobile/v1/customers/places/{place_id}/settings/do_not_disturb"
         )
         try:
-            response = await self.http.post(api_url, json.dumps(items))
+            response = await self.http.post(
+                api_url, json.dumps(items), place_id=place_id
+            )
             return isinstance(response, ClientResponse) and response.ok
         except Exception:
             return False
 
-    async def query_camera_stream(self, camera_id: str) -> str | None:
-        """Query the stream URL for the given camera."""
+    async def query_camera_stream(
+        self, camera_id: str, *, priority: int | None = None
+    ) -> str | None:
+        """Query the stream URL for the given camera.
+
+        `priority` — класс в token bucket (rate_limit.py); None — interactive
+        по endpoint-у. Фоновые refresh-и stream manager-а передают background.
+        """
         api_url = (
             f"/rest/v1/forpost/cameras/{camera_id}/video"
             "?LightStream=0&Format=H264"
         )
 
-        try:
-            response = await self.http.get(api_url)
+        async def fetch() -> str | None:
+            response = await self.http.get(api_url, priority=priority)
             if not isinstance(response, ClientResponse):
                 raise TypeError(f"Unexpected response type: {type(response)!r}")
 
             camera_stream = await response.json()
             return camera_stream["data"]["URL"] if camera_stream else None
 
+        try:
+            # Forpost URL одноразовый (ADR-0014): каждый вызов — своя сессия.
+            return await self._single_flight(
+                "GET", api_url, None, fetch, coalesce=False
+            )
         except Exception:
             return None
 
@@ -483,18 +584,27 @@ class ElektronnyGorodAPI:
         width: int | None,
         height: int | None,
     ) -> bytes:
-        """Query the camera snapshot bytes for the given camera."""
+        """Query the camera snapshot bytes for the given camera.
+
+        Тело читается чанками под `SNAPSHOT_MAX_BYTES` и склеивается один раз;
+        конкурентные зрители одной камеры делят один `bytes` (single-flight).
+        """
         api_url = f"/rest/v1/forpost/cameras/{camera_id}/snapshots?width={width}&height={height}"
 
-        result = await self.http.get(api_url, binary=True)
+        async def fetch() -> bytes:
+            result = await self.http.get(
+                api_url, binary=True, max_bytes=SNAPSHOT_MAX_BYTES
+            )
+
+            if isinstance(result, bytes):
+                return result
 
-        if isinstance(result, (bytes, bytearray)):
-            return bytes(result)
+            if isinstance(result, ClientResponse):
+                return await result.read()
 
-        if isinstance(result, ClientResponse):
-            return await result.read()
+            raise TypeError(f"Unexpected response type: {type(result)!r}")
 
-        raise TypeError(f"Unexpected response type: {type(result)!r}")
+        return await self._single_flight("GET", api_url, None, fetch)
 
     async def open_lock(self, place_id: str, access_control_id: str, entrance_id: str | None) -> None:
         """Send a request to open a lock."""
@@ -504,7 +614,7 @@ class ElektronnyGorodAPI:
             api_url = f"/rest/v1/places/{place_id}/accesscontrols/{access_control_id}/entrances/{entrance_id}/actions"
 
         payload = {"name": "accessControlOpen"}
-        await self.http.post(api_url, json.dumps(payload))
+        await self.http.post(api_url, json.dumps(payload), place_id=place_id)
 
     async def mint_sip_device(
         self, place_id: str, access_control_id: str
@@ -521,7 +631,7 @@ class ElektronnyGorodAPI:
             f"/rest/v1/places/{place_id}/accesscontrols/{access_control_id}/sipdevices"
         )
         body = json.dumps({"installationId": self.http.user_agent.uuid})
-        response = await self.http.post(api_url, body)
+        response = await self.http.post(api_url, body, place_id=place_id)
         if not isinstance(response, ClientResponse):
             raise TypeError(f"Unexpected response type: {type(response)!r}")
         payload = await response.json()
@@ -21,6 +21,7 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, LOGGER
 from .coordinator import ElektronnyGorodUpdateCoordinator
+from .snapshot_index import RECORD_BALANCES, data_index
 
 
 async def async_setup_entry(
@@ -30,11 +31,26 @@ async def async_setup_entry(
 ) -> None:
     """Set up Elektronny Gorod Binary Sensors."""
     coordinator: ElektronnyGorodUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    # Новый place добавляется по diff-у coordinator-а, без reload entry.
+    known: set[str] = set()
 
-    balances = (coordinator.data or {}).get("balances") or []
-    async_add_entities(
-        ElektronnyGorodBlockedBinarySensor(coordinator, balance_info["place_id"])
-        for balance_info in balances
+    @callback
+    def _async_add_new_places() -> None:
+        new = {
+            place_id: balance_info
+            for place_id, balance_info in data_index(coordinator.data).balances.items()
+            if place_id not in known
+        }
+        if not new:
+            return
+        known.update(new)
+        async_add_entities(
+            ElektronnyGorodBlockedBinarySensor(coordinator, balance_info["place_id"])
+            for balance_info in new.values()
+        )
+
+    entry.async_on_unload(
+        coordinator.async_track_records((RECORD_BALANCES,), _async_add_new_places)
     )
 
 
@@ -63,11 +79,7 @@ class ElektronnyGorodBlockedBinarySensor(
 
     @property
     def _balance_info(self) -> dict[str, Any] | None:
-        balances = (self.coordinator.data or {}).get("balances") or []
-        for entry in balances:
-            if entry.get("place_id") == self._place_id:
-                return entry
-        return None
+        return data_index(self.coordinator.data).balances.get(str(self._place_id))
 
     @property
     def available(self) -> bool:
@@ -90,4 +102,5 @@ class ElektronnyGorodBlockedBinarySensor(
 
     @callback
     def _handle_coordinator_update(self) -> None:
-        self.async_write_ha_state()
+        if self.coordinator.record_changed(RECORD_BALANCES, str(self._place_id)):
+            self.async_write_ha_state()
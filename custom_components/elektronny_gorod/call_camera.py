@@ -70,6 +70,21 @@ class ElektronnyGorodCallCamera(Camera):
             identifiers={(DOMAIN, f"{entry_id}_intercom_call")}, name="Вызов домофона"
         )
 
+    @callback
+    def update_go2rtc(
+        self, base_url: str | None, headers: dict, rtsp_host: str | None
+    ) -> None:
+        """Новый go2rtc из опций (hot-apply); base_url None — go2rtc выключен.
+
+        Собранный стрим текущего звонка живёт на старом go2rtc — кэш
+        сбрасывается, следующее открытие соберёт стрим на новом."""
+        self._base_url = base_url
+        self._headers = headers
+        self._rtsp_host = rtsp_host
+        self._call_stream_cache = None
+        if self.hass is not None:
+            self.async_write_ha_state()
+
     async def async_added_to_hass(self) -> None:
         """Слушать смену фазы вызова, чтобы обновлять `available`/снапшот в UI.
 
@@ -137,6 +152,8 @@ class ElektronnyGorodCallCamera(Camera):
         HA Stream worker бесконечно ретраит мёртвый `rtsp://…/eg_intercom_call`
         (404, спам в логе), а снапшот-запросы валятся. Пока `active_call_media`
         None — entity `unavailable`, карточка показывает чистый плейсхолдер."""
+        if not self._base_url:
+            return False  # go2rtc выключен в опциях (hot-apply)
         controller = self._controller_getter()
         return controller is not None and controller.active_call_media() is not None
 
@@ -11,15 +11,18 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
-from datetime import datetime, timedelta
+from datetime import timedelta
 from typing import TYPE_CHECKING, Any
 
+from aiohttp import ClientError, web
+
 from homeassistant.components.camera import Camera, CameraEntityFeature
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONTENT_TYPE_MULTIPART
 from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
@@ -33,11 +36,15 @@ from .const import (
     CONF_USE_GO2RTC,
     DOMAIN,
     LOGGER,
+    SIGNAL_STREAM_MANAGER,
     STREAM_MANAGER_DATA,
 )
 from .call_camera import ElektronnyGorodCallCamera
 from .coordinator import ElektronnyGorodUpdateCoordinator
 from .go2rtc import go2rtc_auth_headers
+from .go2rtc_monitor import HEALTH_POLL_INTERVAL, Go2RtcHealthMonitor, StreamHealth
+from .session_ttl import SessionTtlModel
+from .snapshot_index import RECORD_CAMERAS, data_index
 from .stream_manager import CameraStreamManager
 
 if TYPE_CHECKING:
@@ -48,12 +55,6 @@ if TYPE_CHECKING:
 # без cooldown re-fetch забивал бы operator API. См. ADR-0009.
 STREAM_RECOVERY_COOLDOWN = 30.0
 
-# A-71 v2 / ADR-0009: интервал poll'а go2rtc producer-health для
-# go2rtc/WebRTC-only пути (камеры без legacy HA Stream worker — напр. лифты).
-# Живой forpost-поток шлёт ~150 КБ/с; `bytes_recv`, замороженный за интервал
-# при наличии consumers → producer мёртв (operator session EOF) → recovery.
-GO2RTC_HEALTH_POLL_INTERVAL = timedelta(seconds=30)
-
 # A-71 v3 / ADR-0009: PROACTIVE keep-alive refresh интервал.
 # Production DIAG (2026-05-28 17h): v1/v2 reactive механизмы не покрывают
 # реальный кейс — WebRTC consumer отваливается БЫСТРЕЕ poll-интервала, а
@@ -67,7 +68,12 @@ GO2RTC_HEALTH_POLL_INTERVAL = timedelta(seconds=30)
 # Эмпирически TTL operator-сессии deterministic = 30:00. Margin 90с = 180x
 # recovery latency (<1с) + 100x client jitter (~800мс) — race-window закрыт.
 # Если v3 пропустит (network blip) — v1/v2 поймают.
+# Это значение по умолчанию: keep-alive идёт по выученному интервалу
+# менеджера (`session_ttl.py`), который начинается с тех же 28:30.
 GO2RTC_PROACTIVE_REFRESH_INTERVAL = timedelta(minutes=28, seconds=30)
+# Proactive-проверке consumers хватает снимка общего health-monitor-а
+# (`go2rtc_monitor.py`) не старше одного его интервала — без своего GET.
+GO2RTC_PROACTIVE_SNAPSHOT_MAX_AGE = HEALTH_POLL_INTERVAL.total_seconds()
 
 
 def _get_go2rtc_cfg(
@@ -92,54 +98,100 @@ async def async_setup_entry(
 ) -> None:
     """Set up Elektronny Gorod Camera based on a config entry."""
     coordinator: ElektronnyGorodUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
-    cameras = (coordinator.data or {}).get("cameras") or []
-    stream_manager: CameraStreamManager | None = hass.data.get(
-        STREAM_MANAGER_DATA, {}
-    ).get(entry.entry_id)
-
-    use_go2rtc, base_url, rtsp_host, go2rtc_username, go2rtc_password = _get_go2rtc_cfg(entry)
-
-    async_add_entities(
-        ElektronnyGorodCamera(
-            coordinator,
-            camera_info,
-            stream_manager=stream_manager,
-        )
-        for camera_info in cameras
+    entry_id = entry.entry_id
+
+    def _stream_manager() -> CameraStreamManager | None:
+        # Менеджер меняется hot-apply-ем опций (__init__) — читаем текущий.
+        return hass.data.get(STREAM_MANAGER_DATA, {}).get(entry_id)
+
+    # Камеры, появившиеся после setup-а (новый entrance / public-камера),
+    # добавляются по diff-у coordinator-а — без reload entry.
+    cameras: dict[str, ElektronnyGorodCamera] = {}
+
+    @callback
+    def _async_add_new_cameras() -> None:
+        new = {
+            camera_id: ElektronnyGorodCamera(
+                coordinator,
+                camera_info,
+                stream_manager=_stream_manager(),
+            )
+            for camera_id, camera_info in data_index(coordinator.data).cameras.items()
+            if camera_id not in cameras
+        }
+        if not new:
+            return
+        cameras.update(new)
+        async_add_entities(new.values())
+
+    entry.async_on_unload(
+        coordinator.async_track_records((RECORD_CAMERAS,), _async_add_new_cameras)
     )
 
     # Two-way audio: камера-сущность экрана вызова (рефреш-на-открытии, ADR-0012 C).
     # Контроллер создаётся в __init__ ПОСЛЕ forward_entry_setups — резолвим лениво
     # через _controller_getter, чтобы не зависеть от timing setup. Регистрируется
     # всегда при наличии go2rtc-конфига, без проверки controller is not None.
-    if use_go2rtc and base_url and rtsp_host:
-        def _doorbell_lookup(camera_id: str):
-            """Найти camera-сущность домофона по unique_id в платформе camera."""
-            comp = hass.data.get("camera")
-            if comp is None:
-                return None
-            uid = f"{DOMAIN}_camera_{camera_id}"
-            for ent in comp.entities:
-                if getattr(ent, "unique_id", None) == uid:
-                    return ent
+    def _doorbell_lookup(camera_id: str):
+        """Найти camera-сущность домофона по unique_id в платформе camera."""
+        comp = hass.data.get("camera")
+        if comp is None:
             return None
+        uid = f"{DOMAIN}_camera_{camera_id}"
+        for ent in comp.entities:
+            if getattr(ent, "unique_id", None) == uid:
+                return ent
+        return None
 
-        entry_id = entry.entry_id
+    def _controller_getter():
+        # Контроллер создаётся в __init__ ПОСЛЕ forward_entry_setups — резолвим лениво.
+        return hass.data.get(f"{DOMAIN}_sip", {}).get(entry_id)
 
-        def _controller_getter():
-            # Контроллер создаётся в __init__ ПОСЛЕ forward_entry_setups — резолвим лениво.
-            return hass.data.get(f"{DOMAIN}_sip", {}).get(entry_id)
+    call_camera: ElektronnyGorodCallCamera | None = None
 
-        async_add_entities([
-            ElektronnyGorodCallCamera(
-                controller_getter=_controller_getter,
-                go2rtc_base_url=base_url,
-                go2rtc_headers=go2rtc_auth_headers(go2rtc_username, go2rtc_password),
-                rtsp_host=rtsp_host,
-                doorbell_lookup=_doorbell_lookup,
-                entry_id=entry_id,
+    @callback
+    def _async_sync_call_camera() -> None:
+        nonlocal call_camera
+        use_go2rtc, base_url, rtsp_host, go2rtc_username, go2rtc_password = (
+            _get_go2rtc_cfg(entry)
+        )
+        enabled = bool(use_go2rtc and base_url and rtsp_host)
+        headers = go2rtc_auth_headers(go2rtc_username, go2rtc_password)
+        if call_camera is not None:
+            call_camera.update_go2rtc(
+                base_url if enabled else None, headers, rtsp_host
             )
-        ])
+            return
+        if not enabled:
+            return
+        call_camera = ElektronnyGorodCallCamera(
+            controller_getter=_controller_getter,
+            go2rtc_base_url=base_url,
+            go2rtc_headers=headers,
+            rtsp_host=rtsp_host,
+            doorbell_lookup=_doorbell_lookup,
+            entry_id=entry_id,
+        )
+        async_add_entities([call_camera])
+
+    _async_sync_call_camera()
+
+    @callback
+    def _async_stream_manager_changed(
+        stream_manager: CameraStreamManager | None,
+    ) -> None:
+        """Hot-apply go2rtc-опций: перепривязать камеры, синхронизировать вызов."""
+        for camera in cameras.values():
+            camera.async_set_stream_manager(stream_manager)
+        _async_sync_call_camera()
+
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_STREAM_MANAGER.format(entry_id),
+            _async_stream_manager_changed,
+        )
+    )
 
 
 class ElektronnyGorodCamera(
@@ -198,13 +250,21 @@ class ElektronnyGorodCamera(
         self._inflight_stream_future: asyncio.Future[str | None] | None = None
         # A-71: monotonic-метка последней авто-recovery (throttle, см. ADR-0009).
         self._last_recovery_monotonic: float = 0.0
-        # A-71 v2: go2rtc producer-health poll (go2rtc/WebRTC-only путь, лифты).
-        # baseline `bytes_recv` с прошлого опроса + unsub таймера.
-        self._go2rtc_last_bytes_recv: int | None = None
-        self._unsub_health_poll: CALLBACK_TYPE | None = None
-        # A-71 v3: proactive keep-alive refresh для активных consumers.
+        # A-71 v2: go2rtc producer-health (go2rtc/WebRTC-only путь, лифты) —
+        # подписка на общий monitor go2rtc-инстанса (`go2rtc_monitor.py`).
+        # После recovery producer стартует заново: следующий frozen-снимок
+        # пропускаем (re-baseline, как раньше сброс `bytes_recv`).
+        self._health_monitor: Go2RtcHealthMonitor | None = None
+        self._unsub_health: CALLBACK_TYPE | None = None
+        self._go2rtc_rebaseline = False
+        # A-71 v3: proactive keep-alive refresh для активных consumers —
+        # срок в общем deadline-планировщике менеджера (один таймер на entry).
         self._unsub_proactive_refresh: CALLBACK_TYPE | None = None
+        self._keepalive_manager: CameraStreamManager | None = None
         self._image: bytes | None = None
+        # MJPEG: один snapshot на `frame_interval` на камеру, общий для всех
+        # зрителей (момент последнего кадра в `_image`).
+        self._frame_monotonic: float | None = None
         self._attr_unique_id = f"{DOMAIN}_camera_{self._id}"
         if is_intercom:
             device_uid = f"entrance_{place_id}_{ac_id}_{entrance_id or 'main'}"
@@ -241,18 +301,22 @@ class ElektronnyGorodCamera(
 
     @property
     def _coordinator_camera_info(self) -> dict[str, Any] | None:
-        """Найти текущую запись camera в coordinator.data."""
-        cameras = (self.coordinator.data or {}).get("cameras") or []
-        for cam in cameras:
-            if str(cam.get("id") or "") == self._id:
-                return cam
-        return None
+        """Текущая запись camera из индекса coordinator.data (O(1))."""
+        return data_index(self.coordinator.data).cameras.get(self._id)
 
     @property
     def available(self) -> bool:
         """Доступна, если camera найдена в последнем refresh coordinator."""
         return super().available and self._coordinator_camera_info is not None
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """`stale_since`, пока запись камеры — из last-known-good кэша."""
+        info = self._coordinator_camera_info
+        if not info or not info.get("stale_since"):
+            return None
+        return {"stale_since": info["stale_since"]}
+
     # ------------------------------------------------------------------ #
     # go2rtc                                                             #
     # ------------------------------------------------------------------ #
@@ -336,6 +400,82 @@ class ElektronnyGorodCamera(
             self._image = image
         return self._image
 
+    async def handle_async_mjpeg_stream(
+        self, request: web.Request
+    ) -> web.StreamResponse | None:
+        """MJPEG из snapshot-ов с общим на всех зрителей кадром.
+
+        Штатный `async_get_still_stream` на каждого зрителя дёргает snapshot
+        и держит свою копию кадра. Здесь кадр — `_async_shared_frame`: тот же
+        single-flight `get_camera_snapshot`, что у still image, не чаще раза в
+        `frame_interval` на камеру, сколько бы зрителей ни было, и один буфер
+        на всех. Первый кадр уходит дважды (Chrome
+        показывает кадр n-1). Ошибка оператора / guard `SNAPSHOT_MAX_BYTES` /
+        отключение клиента — штатный конец потока (браузер переподключится).
+        """
+        if self._is_hidden() or not self.available:
+            return None
+        first = await self._async_shared_frame()
+        if not first:
+            return None
+        response = web.StreamResponse()
+        response.content_type = CONTENT_TYPE_MULTIPART.format("--frameboundary")
+        await response.prepare(request)
+        header = (
+            f"--frameboundary\r\nContent-Type: {self.content_type}\r\n"
+        ).encode()
+        try:
+            for _ in range(2):
+                await self._write_mjpeg_part(response, header, first)
+            while True:
+                await asyncio.sleep(self.frame_interval)
+                if self._is_hidden() or not self.available:
+                    break
+                frame = await self._async_shared_frame()
+                if not frame:
+                    break
+                await self._write_mjpeg_part(response, header, frame)
+        except ConnectionResetError:
+            LOGGER.debug("MJPEG client of camera %s disconnected", self._id)
+        return response
+
+    @staticmethod
+    async def _write_mjpeg_part(
+        response: web.StreamResponse, header: bytes, frame: bytes
+    ) -> None:
+        await response.write(
+            header + f"Content-Length: {len(frame)}\r\n\r\n".encode()
+        )
+        await response.write(frame)
+        await response.write(b"\r\n")
+
+    async def _async_shared_frame(self) -> bytes | None:
+        """Кадр не старше `frame_interval`.
+
+        Конкурентные зрители склеиваются в один GET single-flight-ом API
+        (`query_camera_snapshot`) и получают один и тот же `bytes`.
+        """
+        if (
+            self._image
+            and self._frame_monotonic is not None
+            and time.monotonic() - self._frame_monotonic < self.frame_interval
+        ):
+            return self._image
+        try:
+            frame = await self.coordinator.get_camera_snapshot(self._id, None, None)
+        except (ClientError, asyncio.TimeoutError) as err:
+            LOGGER.debug(
+                "MJPEG frame for camera %s failed: %s",
+                self._id,
+                type(err).__name__,
+            )
+            return None
+        if not frame:
+            return None
+        self._image = frame
+        self._frame_monotonic = time.monotonic()
+        return frame
+
     async def stream_source(self) -> str | None:
         """Return the source of the stream.
 
@@ -421,8 +561,13 @@ class ElektronnyGorodCamera(
 
     @callback
     def _handle_coordinator_update(self) -> None:
-        """Coordinator refresh — actuality берётся из property `available`."""
-        self.async_write_ha_state()
+        """Coordinator refresh — actuality берётся из property `available`.
+
+        State пишем, только если запись этой камеры изменилась (или полный
+        diff) — остальные камеры на тике не трогаются.
+        """
+        if self.coordinator.record_changed(RECORD_CAMERAS, self._id):
+            self.async_write_ha_state()
 
     # ------------------------------------------------------------------ #
     # Stream auto-recovery (A-71 / ADR-0009)                             #
@@ -547,98 +692,158 @@ class ElektronnyGorodCamera(
     # ------------------------------------------------------------------ #
 
     async def async_added_to_hass(self) -> None:
-        """Подписка на coordinator + (для go2rtc) запуск producer-health poll.
+        """Подписка на coordinator + (для go2rtc) на producer-health monitor.
 
         Event-driven recovery (`_on_stream_state_change`) ловит только camera с
         активным legacy HA Stream worker (домофоны). go2rtc/WebRTC-only camera
-        (напр. лифты) такого сигнала не дают — для них poll'им go2rtc producer.
+        (напр. лифты) такого сигнала не дают — для них смотрим go2rtc producer
+        через общий снимок `/api/streams` (`go2rtc_monitor.py`).
         """
         await super().async_added_to_hass()
-        if (
-            self._stream_manager is not None
-            and self._unsub_health_poll is None  # idempotent: не плодим таймеры
-        ):
-            self._unsub_health_poll = async_track_time_interval(
-                self.hass,
-                self._async_poll_go2rtc_health,
-                GO2RTC_HEALTH_POLL_INTERVAL,
-            )
+        self._sync_go2rtc_timers()
+
+    def _sync_go2rtc_timers(self) -> None:
+        """Health-подписка / proactive-refresh — только при go2rtc-менеджере."""
+        if self._stream_manager is None:
+            self._cancel_go2rtc_timers()
+            return
+        monitor = self._stream_manager.health_monitor
+        if monitor is not self._health_monitor:
+            # Новый go2rtc-инстанс (hot-apply транспорта) — переподписка.
+            self._unsubscribe_health()
+            self._health_monitor = monitor
+            if monitor is not None:
+                self._unsub_health = monitor.async_subscribe(
+                    self._go2rtc_stream_name, self._handle_stream_health
+                )
         # A-71 v3: proactive keep-alive refresh для streams с активными viewers.
-        if (
-            self._stream_manager is not None
-            and self._unsub_proactive_refresh is None
-        ):
-            self._unsub_proactive_refresh = async_track_time_interval(
-                self.hass,
-                self._async_proactive_refresh,
-                GO2RTC_PROACTIVE_REFRESH_INTERVAL,
+        if self._keepalive_manager is not self._stream_manager:
+            self._cancel_proactive_refresh()
+            self._keepalive_manager = self._stream_manager
+            self._unsub_proactive_refresh = (
+                self._stream_manager.async_track_keepalive(
+                    self._id,
+                    self._async_proactive_refresh,
+                )
             )
 
-    async def async_will_remove_from_hass(self) -> None:
-        """Снять health-poll и proactive-refresh таймеры при удалении entity."""
-        if self._unsub_health_poll is not None:
-            self._unsub_health_poll()
-            self._unsub_health_poll = None
+    def _unsubscribe_health(self) -> None:
+        if self._unsub_health is not None:
+            self._unsub_health()
+            self._unsub_health = None
+        self._health_monitor = None
+        self._go2rtc_rebaseline = False
+
+    def _cancel_proactive_refresh(self) -> None:
         if self._unsub_proactive_refresh is not None:
             self._unsub_proactive_refresh()
             self._unsub_proactive_refresh = None
+        self._keepalive_manager = None
+
+    def _cancel_go2rtc_timers(self) -> None:
+        self._unsubscribe_health()
+        self._cancel_proactive_refresh()
+
+    @callback
+    def async_set_stream_manager(
+        self, stream_manager: CameraStreamManager | None
+    ) -> None:
+        """Перепривязка к менеджеру go2rtc после hot-apply опций (без reload).
+
+        Смена транспорта / включение / выключение go2rtc меняет URL источника:
+        активный HA Stream worker переводится на новый `stream_source()`,
+        иначе он ретраил бы RTSP старого go2rtc.
+        """
+        self._stream_manager = stream_manager
+        self._use_go2rtc = stream_manager is not None
+        if self.hass is None:
+            return
+        self._sync_go2rtc_timers()
+        if self.stream is not None:
+            self.hass.async_create_task(
+                self._async_repoint_stream(),
+                name=f"{DOMAIN}_camera_{self._id}_repoint",
+            )
+
+    async def _async_repoint_stream(self) -> None:
+        try:
+            url = await self.stream_source()
+            if url and self.stream is not None:
+                self.stream.update_source(url)
+        except Exception as err:  # noqa: BLE001 - sanitize operator URL
+            LOGGER.error(
+                "Camera %s (%s): repoint after go2rtc change failed (%s)",
+                self._name,
+                self._id,
+                type(err).__name__,
+            )
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Снять health-poll и proactive-refresh таймеры при удалении entity."""
+        self._cancel_go2rtc_timers()
         await super().async_will_remove_from_hass()
 
     async def _fetch_go2rtc_stream_info(
         self,
+        *,
+        max_age: float | None = None,
     ) -> tuple[list[dict[str, Any]], Any] | None:
-        """GET go2rtc `/api/streams?src=<name>` → `(producers, consumers)`.
+        """go2rtc stream `eg_<id>` → `(producers, consumers)`.
 
-        Возвращает None при сетевой ошибке / не-200 / не-JSON (graceful).
+        `max_age` — допускается снимок общего health-monitor-а не старше
+        `max_age` секунд (без отдельного запроса); без него / без свежего
+        снимка — GET `/api/streams?src=<name>`. None при сетевой ошибке /
+        не-200 / не-JSON (graceful).
         """
         if self._stream_manager is None:
             return None
-        info = await self._stream_manager.async_get_stream_info(self._id)
+        info = None
+        if max_age is not None:
+            info = self._stream_manager.cached_stream_info(self._id, max_age)
+        if info is None:
+            info = await self._stream_manager.async_get_stream_info(self._id)
         if info is None:
             return None
         return list(info.producers), [{} for _ in range(info.consumer_count)]
 
-    async def _async_poll_go2rtc_health(self, now: datetime | None = None) -> None:
+    @callback
+    def _handle_stream_health(self, health: StreamHealth | None) -> None:
         """Детект stall по go2rtc producer `bytes_recv` (A-71 v2).
 
         Живой forpost-producer непрерывно принимает байты. Если `bytes_recv` не
-        изменился с прошлого опроса **при наличии consumers** — producer мёртв
-        (operator session EOF), но go2rtc держит stale-producer → запускаем тот
-        же throttled recovery, что и event-driven путь. Покрывает камеры без
-        legacy HA Stream worker (go2rtc/WebRTC-only, напр. лифты).
+        изменился между снимками monitor-а **при наличии consumers** — producer
+        мёртв (operator session EOF), но go2rtc держит stale-producer →
+        запускаем тот же throttled recovery, что и event-driven путь. Покрывает
+        камеры без legacy HA Stream worker (go2rtc/WebRTC-only, напр. лифты).
         """
-        if not self.available:
+        if not self.available or health is None or not health.frozen:
+            self._go2rtc_rebaseline = False
             return
-        info = await self._fetch_go2rtc_stream_info()
-        if info is None:
+        if self._go2rtc_rebaseline:
+            # Первый снимок после recovery — новый baseline, не вердикт.
+            self._go2rtc_rebaseline = False
             return
-        producers, consumers = info
-        n_consumers = len(consumers) if isinstance(consumers, list) else 0
-        if n_consumers == 0 or not producers:
-            # Никто не смотрит → producer может быть idle легитимно; baseline сброс.
-            self._go2rtc_last_bytes_recv = None
-            return
-        cur = producers[0].get("bytes_recv")
-        if not isinstance(cur, int):
-            return
-        prev = self._go2rtc_last_bytes_recv
-        self._go2rtc_last_bytes_recv = cur
-        if prev is not None and cur == prev:
-            LOGGER.debug(
-                "Camera %s (%s): go2rtc producer frozen "
-                "(bytes_recv=%d, %d consumer(s)) — triggering recovery",
-                self._name, self._id, cur, n_consumers,
-            )
-            self._maybe_schedule_stream_recovery()
-            # Ре-baseline: после re-mint producer стартует заново.
-            self._go2rtc_last_bytes_recv = None
+        LOGGER.debug(
+            "Camera %s (%s): go2rtc producer frozen "
+            "(bytes_recv=%s, %d consumer(s)) — triggering recovery",
+            self._name, self._id, health.bytes_recv, health.consumer_count,
+        )
+        self._maybe_schedule_stream_recovery()
+        self._go2rtc_rebaseline = True
 
-    async def _async_proactive_refresh(
-        self, now: datetime | None = None
-    ) -> None:
+    def _proactive_refresh_interval(self) -> float:
+        """Выученный интервал refresh-а менеджера (28:30 без менеджера)."""
+        model = getattr(self._stream_manager, "session_ttl", None)
+        if isinstance(model, SessionTtlModel):
+            return model.refresh_interval()
+        return GO2RTC_PROACTIVE_REFRESH_INTERVAL.total_seconds()
+
+    async def _async_proactive_refresh(self) -> None:
         """Proactive keep-alive refresh для активных streams (A-71 v3).
 
-        Запускается каждые `GO2RTC_PROACTIVE_REFRESH_INTERVAL` (28:30).
+        Запускается с выученным интервалом refresh-а менеджера (по умолчанию
+        `GO2RTC_PROACTIVE_REFRESH_INTERVAL`, 28:30) из общего
+        deadline-планировщика менеджера (`async_track_keepalive`).
         Архитектурное решение: НЕ ждать пока stream упадёт. Рефрешим до того
         как backend закроет session, **только** для streams с активными
         consumers (someone watching).
@@ -659,7 +864,9 @@ class ElektronnyGorodCamera(
             # Manager preload is not an external viewer. The manager owns the
             # staggered 28:30 cadence for background-eligible cameras.
             return
-        info = await self._fetch_go2rtc_stream_info()
+        info = await self._fetch_go2rtc_stream_info(
+            max_age=GO2RTC_PROACTIVE_SNAPSHOT_MAX_AGE
+        )
         if info is None:
             return
         producers, consumers = info
@@ -672,8 +879,8 @@ class ElektronnyGorodCamera(
         now_mono = time.monotonic()
         elapsed = now_mono - self._last_recovery_monotonic
         # Минимальный возраст последнего refresh = половина интервала.
-        # Если v1/v2 пере-minted поток <12.5 мин назад — он ещё свежий, skip.
-        min_age = GO2RTC_PROACTIVE_REFRESH_INTERVAL.total_seconds() / 2
+        # Если v1/v2 пере-minted поток <14 мин назад — он ещё свежий, skip.
+        min_age = self._proactive_refresh_interval() / 2
         if elapsed < min_age:
             LOGGER.debug(
                 "Camera %s (%s): proactive skip — recent refresh %.0fs ago (< %.0fs)",
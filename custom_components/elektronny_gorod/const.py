@@ -46,6 +46,10 @@ GO2RTC_RTSP_PORT = 8554
 # Per-config-entry CameraStreamManager registry. Kept separate from
 # hass.data[DOMAIN][entry_id], whose public shape remains the coordinator.
 STREAM_MANAGER_DATA: Final = f"{DOMAIN}_stream_managers"
+# Per-entry сигнал «менеджер/транспорт go2rtc сменился без reload» (__init__
+# hot-apply опций → camera/sensor платформы). Payload — текущий
+# CameraStreamManager или None (go2rtc выключен). `.format(entry_id)`.
+SIGNAL_STREAM_MANAGER: Final = f"{DOMAIN}_stream_manager_{{}}"
 
 CONF_OPERATOR_ID: Final = "operator_id"
 CONF_ACCOUNT_ID: Final = "account_id"
@@ -54,6 +58,9 @@ CONF_USER_AGENT: Final = "user_agent"
 
 DEFAULT_SNAPSHOT_WIDTH: Final = 300
 DEFAULT_SNAPSHOT_HEIGHT: Final = 300
+# Guard на тело snapshot-а: JPEG камеры — десятки-сотни КБ; больше — ошибка
+# оператора / не картинка, дочитывать в память (× число зрителей) не стоит.
+SNAPSHOT_MAX_BYTES: Final = 4 * 1024 * 1024
 
 # Suggested area names — даём пользователю осмысленную дефолтную группировку.
 # suggested_area работает только при создании device; existing devices можно
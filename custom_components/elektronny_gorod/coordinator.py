@@ -15,24 +15,62 @@ Slice 3b (будущий PR):
 - Entities наследуют `CoordinatorEntity`, читают `self.coordinator.data` напрямую.
 - Старые shim-методы удалить.
 
-⚠️ Concurrency: `self._api.http.user_agent.place_id` — shared state, которое
-читается в момент построения HTTP-headers (см. `mirror-app-behavior` memory:
-UA — load-bearing fingerprint). Поэтому ВЕСЬ refresh идёт **последовательно**
-по places. Race-free; параллелизация — отдельная задача, требующая
-рефакторинга `HTTP` (передавать `place_id` per-request, не через state).
+Concurrency: UA — load-bearing fingerprint (см. `mirror-app-behavior`
+memory), и его `place_id` раньше читался из shared `user_agent.place_id`,
+из-за чего refresh шёл строго последовательно (~6 HTTP × N places). Теперь
+`place_id` передаётся per-request (`HTTP.get(..., place_id=...)`), UA-строка
+та же, shared state не мутируется — places и их per-place запросы идут
+параллельно под общим лимитом `_REFRESH_CONCURRENCY` in-flight запросов.
+
+Расписания: `UPDATE_INTERVAL` — только гранулярность тика. Каждый вид данных
+place-а (баланс, screens, access controls, камеры, DND) и список places
+живут в кэше coordinator-а и перезапрашиваются по своему сроку
+(`refresh_schedule.py`); тик склеивает из кэша тот же `coordinator.data`.
+Сроки адаптивные: неизменные ответы отодвигают срок slice-а (backoff до
+`MAX_INTERVALS`), активность в place (DND, открытие двери, FCM-пуш —
+`note_place_activity`) возвращает его к `FAST_INTERVAL`.
+`async_refresh_place(place_id, kinds)` перезапрашивает только выбранные виды
+одного place (DND после записи, сервис `refresh_place`) и вливает результат в
+`data` без обхода остальных places.
+
+Last-known-good: сбой fetch-а вида данных place-а не выбрасывает прошлый
+удачный результат, пока ему не больше `MAX_STALENESS[kind]` — entity не
+мигают unavailable на разовых сбоях оператора. Записи, собранные из такого
+результата, несут `stale_since` (время последнего удачного fetch-а), сводка —
+в `data["stale"]`; повтор fetch-а — на следующем тике, как раньше.
+
+Change-aware уведомления: перед вызовом listener-ов coordinator сравнивает
+индекс снимка с последним разосланным (`diff_indexes`) и кладёт результат в
+`last_diff`. Entity пишут state, только если `record_changed(kind, key)` —
+их запись изменилась — или diff полный (первое уведомление, смена
+`last_update_success`, `async_update_all_listeners`). Тот же diff платформы
+используют для добавления entity новых ключей (`async_track_records`).
+
+Записи `cameras` / `locks` / `balances` — frozen slotted `records.py`
+(только поля, которые читают entity, с read-only Mapping-интерфейсом);
+`places` хранятся без неиспользуемого payload-а (`slim_place`).
+
+Быстрый старт: последний удачный снимок хранится в `.storage`
+(`snapshot_store.py`); `async_restore_snapshot` поднимает его в `data` без
+сети, первый живой refresh идёт в фоне. Сэкономленное время — в
+`startup_stats` (diagnostics).
 """
 from __future__ import annotations
 
-from collections.abc import Callable, Iterator
-from datetime import timedelta
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from dataclasses import replace
+from datetime import datetime, timedelta
 import json
-from typing import Any
+import time
+from typing import Any, TypeVar
 
 from homeassistant.components import persistent_notification
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .api import ElektronnyGorodAPI
 from .const import (
@@ -45,10 +83,62 @@ from .const import (
     LOGGER,
 )
 from .helpers import dedupe_by_id
+from .records import BalanceRecord, CameraRecord, LockRecord, slim_place
+from .refresh_schedule import (
+    ACCOUNT_SCOPE,
+    KIND_ACCESS_CONTROLS,
+    KIND_BALANCE,
+    KIND_CAMERAS,
+    KIND_DND,
+    KIND_PLACES,
+    KIND_PUBLIC_CAMERAS,
+    KIND_SCREENS,
+    ACTIVITY_KINDS,
+    MAX_STALENESS,
+    PLACE_KINDS,
+    RefreshSchedule,
+    balance_refresh_interval,
+)
+from .snapshot_index import (
+    FULL_DIFF,
+    INDEX_KEY,
+    SnapshotDiff,
+    SnapshotIndex,
+    data_index,
+    diff_indexes,
+)
+from .snapshot_store import SNAPSHOT_MAX_AGE, SnapshotStore
+from .session_ttl import SessionTtlModel
+from .stream_url_cache import StreamUrlCache
 from .user_agent import UserAgent
 
+# Тик coordinator-а; сроки видов данных — `REFRESH_INTERVALS`.
 UPDATE_INTERVAL = timedelta(minutes=5)
 
+# Максимум одновременных operator-запросов за один refresh. Places и их
+# balance/screens/access-controls/cameras/DND идут параллельно, но не более
+# этого числа in-flight — не устраиваем burst на аккаунтах с десятками places.
+_REFRESH_CONCURRENCY = 6
+
+_T = TypeVar("_T")
+
+# Собранные данные одного place: `(balance, cameras, locks, dnd_items)`.
+PlaceResult = tuple[
+    BalanceRecord | None,
+    list[CameraRecord],
+    list[LockRecord],
+    list[dict[str, Any]],
+]
+_EMPTY_PLACE_RESULT: PlaceResult = (None, [], [], [])
+
+# Из каких видов данных собрана запись — её `stale_since` берётся по ним.
+_LOCK_KINDS = (KIND_ACCESS_CONTROLS, KIND_SCREENS)
+_CAMERA_KINDS = {
+    "intercom": (KIND_ACCESS_CONTROLS, KIND_SCREENS),
+    "place": (KIND_CAMERAS,),
+    "public": (KIND_PUBLIC_CAMERAS, KIND_SCREENS),
+}
+
 
 class ElektronnyGorodUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     """Coordinator: периодически опрашивает API, кэширует в self.data."""
@@ -75,6 +165,47 @@ class ElektronnyGorodUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             self._notification_dismiss_listener,
         )
 
+        self._request_slots = asyncio.Semaphore(_REFRESH_CONCURRENCY)
+
+        # Кэш видов данных: places аккаунта + `{place_id: {kind: value}}`.
+        self.refresh_schedule = RefreshSchedule()
+        self._places: list[dict[str, Any]] | None = None
+        self._place_slices: dict[str, dict[str, Any]] = {}
+        self._place_results: dict[str, PlaceResult] = {}
+        # Last-known-good: `(place_id, kind)` → время последнего удачного
+        # fetch-а вида, который сейчас отдаётся из кэша после сбоя.
+        self._stale_since: dict[tuple[str, str], datetime] = {}
+
+        # Targeted refresh: in-flight задачи по `(place_id, kind)` — дедуп
+        # одновременных запросов одного slice-а.
+        self._targeted: dict[tuple[str, str], asyncio.Task[bool]] = {}
+        self.targeted_stats = {"refreshes": 0, "deduplicated": 0}
+
+        # Operator stream URL-ы go2rtc-источников stream manager-а
+        # (`stream_url_cache.py`); direct-путь камер URL-ы не переиспользует
+        # (одноразовые, ADR-0014). Срок их сессии — выученная
+        # модель (`session_ttl.py`), общая с stream manager-ом.
+        self.session_ttl = SessionTtlModel()
+        self.stream_urls = StreamUrlCache(ttl_model=self.session_ttl)
+
+        # Последний разосланный снимок — база для diff-а следующего уведомления.
+        self.last_diff: SnapshotDiff = FULL_DIFF
+        self._notified_index: SnapshotIndex | None = None
+        self._notified_success: bool | None = None
+        self._force_full_update = False
+        self.notify_stats = {"notifies": 0, "full": 0, "changed_records": 0}
+
+        # Persisted снимок: пишем только данные живого refresh-а (не restored).
+        self._snapshot_store = SnapshotStore(hass, entry.entry_id)
+        self._live_data = False
+        self.startup_stats: dict[str, Any] = {
+            "source": "live",
+            "snapshot_age": None,
+            "stale": False,
+            "first_refresh": None,
+            "time_saved": 0.0,
+        }
+
         super().__init__(
             hass,
             LOGGER,
@@ -92,6 +223,112 @@ class ElektronnyGorodUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         """Read-only доступ к API-обёртке (для FCM push-registration в fcm.py)."""
         return self._api
 
+    # ------------------------------------------------------------------ #
+    # Change-aware уведомления entity                                    #
+    # ------------------------------------------------------------------ #
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Посчитать diff снимка и разослать listener-ам."""
+        index = data_index(self.data)
+        if (
+            self._force_full_update
+            or self._notified_index is None
+            or self.last_update_success != self._notified_success
+        ):
+            self.last_diff = FULL_DIFF
+        else:
+            self.last_diff = diff_indexes(self._notified_index, index)
+        self._force_full_update = False
+        self._notified_index = index
+        self._notified_success = self.last_update_success
+
+        self.notify_stats["notifies"] += 1
+        if self.last_diff.full:
+            self.notify_stats["full"] += 1
+        self.notify_stats["changed_records"] += len(self.last_diff.changed)
+        if (
+            self._live_data
+            and self.last_update_success
+            and (self.last_diff.full or self.last_diff.changed)
+        ):
+            self._snapshot_store.async_delay_save(lambda: self.data or {})
+        super().async_update_listeners()
+
+    @callback
+    def async_update_all_listeners(self) -> None:
+        """Полный refresh entity: разбудить всех, независимо от diff-а."""
+        self._force_full_update = True
+        self.async_update_listeners()
+
+    def record_changed(self, kind: str | None, key: Any = None) -> bool:
+        """Нужно ли entity записи `(kind, key)` писать state в этом уведомлении.
+
+        `kind=None` — entity без своей записи (availability только от
+        coordinator-а): пишет лишь на полном уведомлении.
+        """
+        if kind is None:
+            return self.last_diff.full
+        return self.last_diff.affects(kind, key)
+
+    @callback
+    def async_track_records(
+        self, kinds: tuple[str, ...], add_new: Callable[[], None]
+    ) -> CALLBACK_TYPE:
+        """Вызвать `add_new` сейчас и на каждом уведомлении, менявшем `kinds`.
+
+        Платформы добавляют entity для появившихся ключей без reload entry
+        (go2rtc-стримы, SIP, FCM не пересоздаются). Исчезнувший ключ entity не
+        удаляет: её запись пропала из индекса — она unavailable и оживёт, если
+        ключ вернётся (частичный сбой fetch-а не плодит remove/add).
+        """
+
+        @callback
+        def _listener() -> None:
+            if self.last_diff.touches(kinds):
+                add_new()
+
+        add_new()
+        return self.async_add_listener(_listener)
+
+    # ------------------------------------------------------------------ #
+    # Persisted снимок (быстрый старт)                                   #
+    # ------------------------------------------------------------------ #
+
+    async def async_restore_snapshot(self) -> bool:
+        """Поднять сохранённый снимок в `data` без сети.
+
+        True — setup строит entity из снимка и не ждёт оператора; живой
+        refresh — `async_refresh_restored` в фоне. Снимок старше
+        `SNAPSHOT_MAX_AGE` помечает coordinator неуспешным: entity создаются,
+        но unavailable до первого живого refresh-а.
+        """
+        restored = await self._snapshot_store.async_load()
+        if restored is None:
+            return False
+        data, saved_at = restored
+        age = max(0.0, (dt_util.utcnow() - saved_at).total_seconds())
+        stale = age > SNAPSHOT_MAX_AGE
+
+        self.data = self._indexed(data)
+        self.last_update_success = not stale
+        # Shared UA place_id — как его оставил бы refresh (см. `_async_build_snapshot`).
+        for _, place_id in self._iter_place_ids(data["places"]):
+            self._api.http.user_agent.place_id = place_id
+            break
+        self.startup_stats.update(
+            source="restored", snapshot_age=round(age), stale=stale
+        )
+        LOGGER.info(
+            "Restored coordinator snapshot (age %ds%s), refreshing in background",
+            age, ", stale" if stale else "",
+        )
+        return True
+
+    async def async_refresh_restored(self) -> None:
+        """Первый живой refresh после старта из снимка (фоновая задача setup-а)."""
+        await self.async_refresh()
+
     # ------------------------------------------------------------------ #
     # Public service methods (вызываются entity-слоем)                   #
     # ------------------------------------------------------------------ #
@@ -104,35 +341,153 @@ class ElektronnyGorodUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         """Update DND settings for a place.
 
         Caller (switch entity) формирует полный payload (3 items с обновлёнными
-        `status`).
+        `status`). `place_id` уходит в UA per-request — без мутации shared
+        `user_agent.place_id`, поэтому гонки с параллельным refresh нет.
 
-        ⚠️ Inter-task race с `_async_update_data` теоретически возможен (оба
-        мутируют shared `user_agent.place_id`), но **не affecting корректность**:
-        backend идентифицирует место по `place_id` в URL `.../places/{id}/...`,
-        UA-поле — лишь metadata о клиенте. Worst case — UA содержит чужой
-        place_id в момент DND POST; backend всё равно обрабатывает запрос
-        корректно по URL. Полноценный `asyncio.Lock` — overengineering для
-        этой semantics.
+        Успешная запись инвалидирует DND этого place — refresh после неё
+        (`async_refresh_place(place_id, (KIND_DND,))`) перечитывает только DND,
+        не дожидаясь его срока.
 
         Returns True если backend принял.
         """
-        self._api.http.user_agent.place_id = place_id
-        return await self._api.post_dnd_settings(place_id, items)
+        accepted = await self._api.post_dnd_settings(place_id, items)
+        if accepted:
+            self.note_place_activity(place_id, (KIND_DND,))
+            self.refresh_schedule.invalidate(KIND_DND, str(place_id))
+        return accepted
+
+    @callback
+    def note_place_activity(
+        self, place_id: str, kinds: tuple[str, ...] = ACTIVITY_KINDS
+    ) -> None:
+        """Действие пользователя / пуш в place: `kinds` — снова с быстрым сроком."""
+        if self.has_place(place_id):
+            self.refresh_schedule.snap_back(str(place_id), kinds)
+
+    @callback
+    def handle_doorbell_signal(self, payload: dict[str, Any]) -> None:
+        """SIGNAL_DOORBELL: FCM-пуш звонка — активность в его place."""
+        if place_id := payload.get("place_id"):
+            self.note_place_activity(str(place_id))
+
+    def has_place(self, place_id: str) -> bool:
+        """Есть ли place в последнем списке places аккаунта.
+
+        До первого живого refresh-а (старт из сохранённого снимка) `_places`
+        ещё пуст — place ищется и в опубликованном `data`.
+        """
+        return (
+            self._place_ref(place_id) is not None
+            or str(place_id) in data_index(self.data).places
+        )
+
+    async def async_refresh_place(
+        self,
+        place_id: str,
+        kinds: Iterable[str] | None = None,
+    ) -> bool:
+        """Перезапросить виды `kinds` (по умолчанию все) одного place.
+
+        Остальные виды и places берутся из кэша; результат вливается в `data`
+        (`async_set_updated_data` — listener-ы получают обычный diff).
+        Одновременные запросы того же `(place_id, kind)` ждут одну задачу.
+        До первого живого refresh-а влить не во что — делаем полный refresh.
+
+        Returns True, если все запрошенные виды получены.
+        """
+        wanted = tuple(dict.fromkeys(PLACE_KINDS if kinds is None else kinds))
+        if unknown := set(wanted) - set(PLACE_KINDS):
+            raise ValueError(f"Unknown place data kinds: {sorted(unknown)}")
+        if not self._live_data or self._places is None:
+            # Запрошенные виды place-а — в полный refresh, даже если не due.
+            for kind in wanted:
+                self.refresh_schedule.invalidate(kind, str(place_id))
+            await self.async_refresh()
+            return self.last_update_success
+        place_ref = self._place_ref(place_id)
+        if place_ref is None:
+            return False
+
+        scope = str(place_id)
+        tasks: set[asyncio.Task[bool]] = set()
+        pending: list[str] = []
+        for kind in wanted:
+            if (task := self._targeted.get((scope, kind))) is not None:
+                self.targeted_stats["deduplicated"] += 1
+                tasks.add(task)
+            else:
+                pending.append(kind)
+        if pending:
+            self.targeted_stats["refreshes"] += 1
+            for kind in pending:
+                self.refresh_schedule.invalidate(kind, scope)
+            task = self.hass.async_create_task(
+                self._async_refresh_place_slices(place_ref, tuple(pending)),
+                f"{DOMAIN}_refresh_place_{scope}",
+                eager_start=False,
+            )
+            for kind in pending:
+                self._targeted[(scope, kind)] = task
+            task.add_done_callback(
+                lambda done, keys=[(scope, kind) for kind in pending]: [
+                    self._targeted.pop(key)
+                    for key in keys
+                    if self._targeted.get(key) is done
+                ]
+            )
+            tasks.add(task)
+        # shield: отмена одного caller-а не отменяет общую задачу.
+        results = await asyncio.gather(*(asyncio.shield(task) for task in tasks))
+        return all(results)
+
+    def _place_ref(self, place_id: str) -> str | None:
+        """Исходный id place-а (как в API) по строковому."""
+        for _, ref in self._iter_place_ids(self._places or []):
+            if str(ref) == str(place_id):
+                return ref
+        return None
+
+    async def _async_refresh_place_slices(
+        self, place_id: str, kinds: tuple[str, ...]
+    ) -> bool:
+        """Общая задача targeted refresh-а: fetch place-а и merge в `data`."""
+        await self._fetch_place(place_id)
+        self.async_set_updated_data(self._assemble_snapshot(self._places or []))
+        scope = str(place_id)
+        cache = self._place_slices.get(scope, {})
+        return all(
+            kind in cache and (scope, kind) not in self._stale_since for kind in kinds
+        )
 
     # ------------------------------------------------------------------ #
     # Periodic refresh (`_async_update_data`)                            #
     # ------------------------------------------------------------------ #
 
     async def _async_update_data(self) -> dict[str, Any]:
+        """Тик coordinator-а; первый удачный замеряется для `startup_stats`."""
+        started = time.monotonic()
+        data = await self._async_build_snapshot()
+        self._live_data = True
+        if self.startup_stats["first_refresh"] is None:
+            elapsed = round(time.monotonic() - started, 3)
+            self.startup_stats["first_refresh"] = elapsed
+            # Restored-старт не ждал этот refresh — он и есть выигрыш.
+            if self.startup_stats["source"] == "restored":
+                self.startup_stats["time_saved"] = elapsed
+        return data
+
+    async def _async_build_snapshot(self) -> dict[str, Any]:
         """Обновить весь снапшот данных за один тик.
 
         Возвращает dict:
             {
-                "places":   list[dict],            # subscriber places
-                "balances": list[dict],            # per-place balance info
-                "cameras":  list[dict],            # уникальные камеры (по id)
-                "locks":    list[dict],            # по entrance (или AC, если нет entrances)
+                "places":   list[dict],            # subscriber places (`slim_place`)
+                "balances": list[BalanceRecord],   # per-place balance info
+                "cameras":  list[CameraRecord],    # уникальные камеры (по id)
+                "locks":    list[LockRecord],      # по entrance (или AC, если нет entrances)
                 "dnd":      dict[str, list[dict]], # do_not_disturb per place_id
+                "stale":    dict[str, dict[str, str]], # place_id → {kind: stale_since}
+                "index":    SnapshotIndex,         # O(1) lookup-и entity
             }
 
         Стратегия ошибок:
@@ -140,79 +495,58 @@ class ElektronnyGorodUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
           не построить).
         - Per-place sub-задачи (balance/cameras/locks) ловятся индивидуально;
           partial data допустима. Логируется warning-ом, не tracebackом, чтобы
-          не спамить лог при стабильном per-place failure.
+          не спамить лог при стабильном per-place failure. Прошлый удачный
+          результат вида держится до `MAX_STALENESS` (см. `_slice`).
 
-        ⚠️ Race-safety: serial по places (см. module docstring).
+        Places обходятся параллельно (см. module docstring); результаты
+        склеиваются в порядке `places`, поэтому приоритет dedupe_by_id и
+        порядок entities — те же, что при serial refresh. Запрашиваются только
+        виды данных с истёкшим сроком, остальное берётся из кэша.
         """
-        try:
-            places = await self._api.query_places()
-        except Exception as ex:  # noqa: BLE001
-            LOGGER.exception("Failed to load subscriber places")
-            raise UpdateFailed(f"places: {ex}") from ex
+        places = await self._async_places()
 
         if not places:
             LOGGER.warning("No subscriber places returned by API")
-            return {"places": [], "balances": [], "cameras": [], "locks": [], "dnd": {}}
-
-        balances: list[dict[str, Any]] = []
-        cameras: list[dict[str, Any]] = []
-        locks: list[dict[str, Any]] = []
-        dnd: dict[str, list[dict[str, Any]]] = {}
-
-        for _, place_id in self._iter_place_ids(places):
-            # Установка `place_id` в shared UA — критично сделать ДО любого
-            # запроса для этого place. Поскольку refresh serial — race нет.
-            self._api.http.user_agent.place_id = place_id
+            return self._indexed(
+                {
+                    "places": [],
+                    "balances": [],
+                    "cameras": [],
+                    "locks": [],
+                    "dnd": {},
+                    "stale": {},
+                }
+            )
 
-            try:
-                balance = await self._fetch_balance(place_id)
-            except Exception as ex:  # noqa: BLE001
-                LOGGER.warning("Balance fetch failed for place_id=%s: %s", place_id, ex)
-            else:
-                if balance:
-                    balances.append(balance)
-
-            # Pre-fetch shared per-place data (A-61): screens + access_controls
-            # нужны и для cameras (для hidden), и для locks. Раньше каждый
-            # collector делал свой fetch — двойной HTTP. Теперь один раз per
-            # place, передаём в collectors как параметры.
-            try:
-                screens = await self._api.query_screens_settings(place_id)
-            except Exception as ex:  # noqa: BLE001
-                LOGGER.warning("Screens fetch failed for place_id=%s: %s", place_id, ex)
-                screens = {}
-            try:
-                access_controls = await self._api.query_access_controls(place_id)
-            except Exception as ex:  # noqa: BLE001
-                LOGGER.warning(
-                    "Access controls fetch failed for place_id=%s: %s", place_id, ex
-                )
-                access_controls = []
+        place_ids = [place_id for _, place_id in self._iter_place_ids(places)]
+        # Запросы без явного place-контекста (stream/snapshot/history) берут
+        # shared UA place_id — держим там основное место аккаунта, как раньше
+        # его оставлял serial refresh. Одно присваивание, не per-request.
+        if place_ids:
+            self._api.http.user_agent.place_id = place_ids[0]
 
-            hidden_cam_ids = self._extract_hidden_ids(screens, "PUBLIC_CAMERAS")
-            hidden_entrance_ids = self._extract_hidden_ids(screens, "ACCESS_CONTROLS")
+        await asyncio.gather(*(self._fetch_place(place_id) for place_id in place_ids))
+        return self._assemble_snapshot(places)
 
-            try:
-                cameras.extend(await self._collect_cameras_for_place(
-                    place_id, access_controls, hidden_cam_ids, hidden_entrance_ids
-                ))
-            except Exception as ex:  # noqa: BLE001
-                LOGGER.warning("Cameras fetch failed for place_id=%s: %s", place_id, ex)
-
-            try:
-                locks.extend(self._collect_locks_for_place(
-                    place_id, access_controls, hidden_entrance_ids
-                ))
-            except Exception as ex:  # noqa: BLE001
-                LOGGER.warning("Locks fetch failed for place_id=%s: %s", place_id, ex)
-
-            try:
-                dnd_items = await self._api.query_dnd_settings(place_id)
-            except Exception as ex:  # noqa: BLE001
-                LOGGER.warning("DND fetch failed for place_id=%s: %s", place_id, ex)
-            else:
-                if dnd_items:
-                    dnd[str(place_id)] = dnd_items
+    def _assemble_snapshot(self, places: list[dict[str, Any]]) -> dict[str, Any]:
+        """Склеить снимок из собранных per-place результатов в порядке `places`."""
+        balances: list[BalanceRecord] = []
+        cameras: list[CameraRecord] = []
+        locks: list[LockRecord] = []
+        dnd: dict[str, list[dict[str, Any]]] = {}
+        stale: dict[str, dict[str, str]] = {}
+        for (scope, kind), since in self._stale_since.items():
+            stale.setdefault(scope, {})[kind] = since.isoformat()
+        for _, place_id in self._iter_place_ids(places):
+            balance, place_cameras, place_locks, dnd_items = self._place_results.get(
+                str(place_id), _EMPTY_PLACE_RESULT
+            )
+            if balance:
+                balances.append(balance)
+            cameras.extend(place_cameras)
+            locks.extend(place_locks)
+            if dnd_items:
+                dnd[str(place_id)] = dnd_items
 
         cameras = dedupe_by_id(cameras) if cameras else []
 
@@ -221,13 +555,216 @@ class ElektronnyGorodUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             len(places), len(balances), len(cameras), len(locks), len(dnd),
         )
 
-        return {
+        return self._indexed({
             "places": places,
             "balances": balances,
             "cameras": cameras,
             "locks": locks,
             "dnd": dnd,
-        }
+            "stale": stale,
+        })
+
+    @staticmethod
+    def _indexed(data: dict[str, Any]) -> dict[str, Any]:
+        """Приложить к снимку `SnapshotIndex` (один раз за тик, см. snapshot_index)."""
+        data[INDEX_KEY] = SnapshotIndex.build(data)
+        return data
+
+    async def _async_places(self) -> list[dict[str, Any]]:
+        """Список places аккаунта — из кэша, пока не вышел его срок."""
+        if self._places is not None and not self.refresh_schedule.is_due(KIND_PLACES):
+            return self._places
+        try:
+            places = await self._api.query_places()
+        except Exception as ex:  # noqa: BLE001
+            self.refresh_schedule.mark_failed(KIND_PLACES)
+            LOGGER.exception("Failed to load subscriber places")
+            raise UpdateFailed(f"places: {ex}") from ex
+
+        # Из ответа нужны только id / name / адрес — остальной payload не держим.
+        slim_places = [slim_place(place) for place in places or []]
+        self.refresh_schedule.mark_fetched(
+            KIND_PLACES, ACCOUNT_SCOPE, changed=slim_places != self._places
+        )
+        self._places = slim_places
+        # Исчезнувшие places не держим ни в кэше, ни в расписании.
+        scopes = {str(place_id) for _, place_id in self._iter_place_ids(self._places)}
+        for scope in set(self._place_slices) - scopes:
+            del self._place_slices[scope]
+        for scope in set(self._place_results) - scopes:
+            del self._place_results[scope]
+        for key in [key for key in self._stale_since if key[0] not in scopes]:
+            del self._stale_since[key]
+        self.refresh_schedule.retain_scopes(scopes)
+        return self._places
+
+    async def _limited(self, awaitable: Awaitable[_T]) -> _T:
+        """Выполнить operator-запрос под общим лимитом `_REFRESH_CONCURRENCY`."""
+        async with self._request_slots:
+            return await awaitable
+
+    async def _slice(
+        self,
+        place_id: str,
+        kind: str,
+        fetch: Callable[[], Awaitable[_T]],
+        default: _T,
+        label: str,
+    ) -> _T:
+        """Вид данных `kind` одного place: кэш или fetch, если срок вышел.
+
+        Удачный fetch сравнивается с кэшем: тот же ответ отодвигает следующий
+        срок slice-а (backoff в `RefreshSchedule.mark_fetched`).
+        Сбой логируется warning-ом, срок сбрасывается — повтор на следующем
+        тике. Прошлый удачный результат не старше `MAX_STALENESS[kind]`
+        остаётся в кэше и отдаётся дальше (last-known-good, помечен в
+        `_stale_since`); старше или не было — place получает `default`
+        (partial data, как раньше).
+        """
+        scope = str(place_id)
+        cache = self._place_slices.setdefault(scope, {})
+        if kind in cache and not self.refresh_schedule.is_due(kind, scope):
+            return cache[kind]
+        try:
+            value = await self._limited(fetch())
+        except Exception as ex:  # noqa: BLE001
+            age = self.refresh_schedule.age(kind, scope)
+            if kind in cache and age is not None and age <= MAX_STALENESS[kind]:
+                LOGGER.warning(
+                    "%s fetch failed for place_id=%s, keeping data from %ds ago: %s",
+                    label, place_id, age, ex,
+                )
+                self.refresh_schedule.mark_failed(kind, scope, retained=True)
+                self._stale_since.setdefault(
+                    (scope, kind), dt_util.utcnow() - timedelta(seconds=age)
+                )
+                return cache[kind]
+            LOGGER.warning("%s fetch failed for place_id=%s: %s", label, place_id, ex)
+            cache.pop(kind, None)
+            self._stale_since.pop((scope, kind), None)
+            self.refresh_schedule.mark_failed(kind, scope)
+            return default
+
+        changed = kind not in cache or cache[kind] != value
+        cache[kind] = value
+        self._stale_since.pop((scope, kind), None)
+        interval = (
+            balance_refresh_interval(value, dt_util.now())  # type: ignore[arg-type]
+            if kind == KIND_BALANCE
+            else None
+        )
+        self.refresh_schedule.mark_fetched(kind, scope, interval, changed=changed)
+        return value
+
+    async def _fetch_place(self, place_id: str) -> PlaceResult:
+        """Все данные одного place: `(balance, cameras, locks, dnd_items)`.
+
+        Виды данных с истёкшим сроком запрашиваются параллельно, остальные
+        берутся из кэша. cameras/locks строятся из общего результата screens +
+        access_controls (A-61: один fetch per place для обоих collectors).
+        Каждый вид ловится отдельно — сбой одного не обнуляет остальные.
+        Результат запоминается для склейки снимка (`_assemble_snapshot`).
+        """
+        api = self._api
+        (
+            balance,
+            screens,
+            access_controls,
+            dnd_items,
+            place_cameras,
+            public_cameras,
+        ) = await asyncio.gather(
+            self._slice(
+                place_id, KIND_BALANCE,
+                lambda: self._fetch_balance(place_id), None, "Balance",
+            ),
+            self._slice(
+                place_id, KIND_SCREENS,
+                lambda: api.query_screens_settings(place_id, strict=True), {}, "Screens",
+            ),
+            self._slice(
+                place_id, KIND_ACCESS_CONTROLS,
+                lambda: api.query_access_controls(place_id), [], "Access controls",
+            ),
+            self._slice(
+                place_id, KIND_DND,
+                lambda: api.query_dnd_settings(place_id, strict=True), [], "DND",
+            ),
+            self._slice(
+                place_id, KIND_CAMERAS,
+                lambda: api.query_cameras(place_id, strict=True), [], "Cameras",
+            ),
+            self._slice(
+                place_id, KIND_PUBLIC_CAMERAS,
+                lambda: api.query_public_cameras(place_id, strict=True), [],
+                "Public cameras",
+            ),
+        )
+
+        hidden_cam_ids = self._extract_hidden_ids(screens, "PUBLIC_CAMERAS")
+        hidden_entrance_ids = self._extract_hidden_ids(screens, "ACCESS_CONTROLS")
+
+        cameras: list[CameraRecord] = []
+        try:
+            cameras = self._collect_cameras_for_place(
+                place_id,
+                access_controls,
+                place_cameras,
+                public_cameras,
+                hidden_cam_ids,
+                hidden_entrance_ids,
+            )
+        except Exception as ex:  # noqa: BLE001
+            LOGGER.warning("Cameras build failed for place_id=%s: %s", place_id, ex)
+
+        locks: list[LockRecord] = []
+        try:
+            locks = self._collect_locks_for_place(
+                place_id, access_controls, hidden_entrance_ids
+            )
+        except Exception as ex:  # noqa: BLE001
+            LOGGER.warning("Locks fetch failed for place_id=%s: %s", place_id, ex)
+
+        if any(key[0] == str(place_id) for key in self._stale_since):
+            balance, cameras, locks = self._mark_stale(
+                str(place_id), balance, cameras, locks
+            )
+
+        result: PlaceResult = (balance, cameras, locks, dnd_items)
+        self._place_results[str(place_id)] = result
+        return result
+
+    def _mark_stale(
+        self,
+        scope: str,
+        balance: BalanceRecord | None,
+        cameras: list[CameraRecord],
+        locks: list[LockRecord],
+    ) -> tuple[BalanceRecord | None, list[CameraRecord], list[LockRecord]]:
+        """Копии записей place-а с `stale_since` там, где источник устарел.
+
+        Записи frozen — `replace`, кэш не меняется. DND-items — payload API,
+        их staleness — в `data["stale"]`.
+        """
+
+        def since(kinds: Iterable[str]) -> str | None:
+            stamps = [
+                stamp for kind in kinds
+                if (stamp := self._stale_since.get((scope, kind))) is not None
+            ]
+            return min(stamps).isoformat() if stamps else None
+
+        if balance is not None and (stamp := since((KIND_BALANCE,))):
+            balance = replace(balance, stale_since=stamp)
+        cameras = [
+            replace(camera, stale_since=stamp)
+            if (stamp := since(_CAMERA_KINDS.get(camera.source, ())))
+            else camera
+            for camera in cameras
+        ]
+        if stamp := since(_LOCK_KINDS):
+            locks = [replace(lock, stale_since=stamp) for lock in locks]
+        return balance, cameras, locks
 
     @staticmethod
     def _iter_place_ids(
@@ -242,34 +779,33 @@ class ElektronnyGorodUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             yield subscriber_place, place_id
 
     # ------------------------------------------------------------------ #
-    # Per-place collectors (вызываются сериально из `_async_update_data`)#
+    # Per-place collectors (вызываются из `_fetch_place`)                 #
     # ------------------------------------------------------------------ #
 
-    async def _fetch_balance(self, place_id: str) -> dict[str, Any] | None:
-        """Балансовая запись для одного place."""
+    async def _fetch_balance(self, place_id: str) -> BalanceRecord | None:
+        """Балансовая запись для одного place (слот лимита держит `_slice`)."""
         finance = await self._api.query_balance(place_id)
         if not finance:
             return None
-        return {
-            "place_id": place_id,
-            "balance": finance.get("balance"),
-            "block_type": finance.get("blockType"),
-            "blocked": finance.get("blocked"),
-            "payment_date": finance.get("targetDate"),
-            "payment_sum": finance.get("amountSum"),
-            "payment_link": finance.get("paymentLink"),
-            "days_to_block": finance.get("daysToBlock"),
-            "days_to_warning": finance.get("daysToWarning"),
-            "company": finance.get("company"),
-        }
+        return BalanceRecord(
+            place_id=place_id,
+            balance=finance.get("balance"),
+            blocked=finance.get("blocked"),
+            payment_date=finance.get("targetDate"),
+            payment_sum=finance.get("amountSum"),
+            payment_link=finance.get("paymentLink"),
+            days_to_block=finance.get("daysToBlock"),
+        )
 
-    async def _collect_cameras_for_place(
+    def _collect_cameras_for_place(
         self,
         place_id: str,
         access_controls: list[dict[str, Any]],
+        place_cameras: list[dict[str, Any]],
+        public_cameras: list[dict[str, Any]],
         hidden_cam_ids: set[str],
         hidden_entrance_ids: set[str],
-    ) -> list[dict[str, Any]]:
+    ) -> list[CameraRecord]:
         """Камеры одного place — три источника (access_controls + public + cameras).
 
         Args:
@@ -277,6 +813,8 @@ class ElektronnyGorodUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             access_controls: pre-fetched access controls (общий результат с
                 _collect_locks_for_place; раньше каждый делал свой запрос —
                 A-61).
+            place_cameras / public_cameras: pre-fetched списки (у каждого
+                свой срок refresh-а, см. `refresh_schedule.py`).
             hidden_cam_ids: pre-extracted из `/settings/screens` PUBLIC_CAMERAS
                 раздел (общий с locks для ACCESS_CONTROLS hidden — A-61).
             hidden_entrance_ids: pre-extracted из ACCESS_CONTROLS раздел.
@@ -303,7 +841,7 @@ class ElektronnyGorodUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         `hidden`: entity получит `_attr_entity_registry_enabled_default = False`
         (uses user app preference как дефолт для новых установок).
         """
-        cameras: list[dict[str, Any]] = []
+        cameras: list[CameraRecord] = []
 
         # 1. Access controls (домофоны).
         # hidden для intercom-камеры берётся из ACCESS_CONTROLS.hidden — если
@@ -319,53 +857,50 @@ class ElektronnyGorodUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                     if not eid:
                         continue
                     entrance_id = entrance.get("id")
-                    cameras.append({
-                        "id": eid,
-                        "name": entrance.get("name"),
-                        "place_id": place_id,
-                        "access_control_id": ac_id,
-                        "entrance_id": entrance_id,
-                        "source": "intercom",
-                        "hidden": str(entrance_id) in hidden_entrance_ids,
-                    })
+                    cameras.append(CameraRecord(
+                        id=eid,
+                        name=entrance.get("name"),
+                        source="intercom",
+                        hidden=str(entrance_id) in hidden_entrance_ids,
+                        place_id=place_id,
+                        access_control_id=ac_id,
+                        entrance_id=entrance_id,
+                    ))
             else:
                 # AC без entrances — сам по себе door. Используем ac.externalCameraId.
                 cid = ac.get("externalCameraId")
                 if cid:
-                    cameras.append({
-                        "id": cid,
-                        "name": ac.get("name"),
-                        "place_id": place_id,
-                        "access_control_id": ac_id,
-                        "entrance_id": None,
-                        "source": "intercom",
-                        "hidden": False,  # AC без entrance не отображается в screens
-                    })
+                    cameras.append(CameraRecord(
+                        id=cid,
+                        name=ac.get("name"),
+                        source="intercom",
+                        hidden=False,  # AC без entrance не отображается в screens
+                        place_id=place_id,
+                        access_control_id=ac_id,
+                    ))
 
         # 2. Place-cameras (личные подписочные камеры).
         # Идут ВТОРЫМИ чтобы dedupe_by_id отдал приоритет intercom > place > public.
-        place_cameras = await self._api.query_cameras(place_id)
         for cam in place_cameras:
             cid = cam.get("externalCameraId") or cam.get("id")
-            cameras.append({
-                "id": cid,
-                "name": cam.get("name"),
-                "source": "place",
-                "hidden": False,  # личные камеры всегда видимы по дефолту
-            })
+            cameras.append(CameraRecord(
+                id=cid,
+                name=cam.get("name"),
+                source="place",
+                hidden=False,  # личные камеры всегда видимы по дефолту
+            ))
 
         # 3. Public cameras (общедомовые + городские, API не разделяет).
         # Видимость берётся из /settings/screens — user в приложении сам решает
         # какие camera ему интересны, какие скрыть.
-        public_cameras = await self._api.query_public_cameras(place_id)
         for cam in public_cameras:
             cid = cam.get("externalCameraId") or cam.get("id")
-            cameras.append({
-                "id": cid,
-                "name": cam.get("name"),
-                "source": "public",
-                "hidden": str(cid) in hidden_cam_ids,
-            })
+            cameras.append(CameraRecord(
+                id=cid,
+                name=cam.get("name"),
+                source="public",
+                hidden=str(cid) in hidden_cam_ids,
+            ))
 
         return cameras
 
@@ -391,7 +926,7 @@ class ElektronnyGorodUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         place_id: str,
         access_controls: list[dict[str, Any]],
         hidden_entrance_ids: set[str],
-    ) -> list[dict[str, Any]]:
+    ) -> list[LockRecord]:
         """Locks одного place (один per entrance, либо per AC если без entrances).
 
         Args:
@@ -403,37 +938,33 @@ class ElektronnyGorodUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                 ACCESS_CONTROLS раздел.
 
         `name` — entrance.name (для UI entity, чтобы различать "Подъезд 1" /
-        "Калитка 2"). `ac_name` — имя access_control (физического домофона),
-        используется как `device_info.name` — общее для всех entrances + camera
-        этого домофона. `hidden` — из ACCESS_CONTROLS.hidden в `/settings/screens`
-        (user в приложении скрыл entrance) → entity получит enabled_default=False.
+        "Калитка 2"; он же `device_info.name` entrance-device-а). `hidden` — из
+        ACCESS_CONTROLS.hidden в `/settings/screens` (user в приложении скрыл
+        entrance) → entity получит enabled_default=False.
         """
-        locks: list[dict[str, Any]] = []
+        locks: list[LockRecord] = []
         for ac in access_controls:
-            ac_name = ac.get("name")
             entrances = ac.get("entrances") or []
             if entrances:
                 for entrance in entrances:
                     eid = entrance.get("id")
-                    locks.append({
-                        "place_id": place_id,
-                        "access_control_id": ac.get("id"),
-                        "entrance_id": eid,
-                        "name": entrance.get("name"),
-                        "ac_name": ac_name,
-                        "openable": entrance.get("allowOpen"),
-                        "hidden": str(eid) in hidden_entrance_ids,
-                    })
+                    locks.append(LockRecord(
+                        place_id=place_id,
+                        access_control_id=ac.get("id"),
+                        entrance_id=eid,
+                        name=entrance.get("name"),
+                        openable=entrance.get("allowOpen"),
+                        hidden=str(eid) in hidden_entrance_ids,
+                    ))
             else:
-                locks.append({
-                    "place_id": place_id,
-                    "access_control_id": ac.get("id"),
-                    "entrance_id": None,
-                    "name": ac_name,
-                    "ac_name": ac_name,
-                    "openable": ac.get("allowOpen"),
-                    "hidden": False,
-                })
+                locks.append(LockRecord(
+                    place_id=place_id,
+                    access_control_id=ac.get("id"),
+                    entrance_id=None,
+                    name=ac.get("name"),
+                    openable=ac.get("allowOpen"),
+                    hidden=False,
+                ))
         return locks
 
     # ------------------------------------------------------------------ #
@@ -453,6 +984,43 @@ class ElektronnyGorodUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         LOGGER.debug("Fetching camera %s stream URL", camera_id)
         return await self._api.query_camera_stream(camera_id)
 
+    async def get_shared_camera_stream(
+        self,
+        camera_id: str,
+        *,
+        min_remaining: float | None = None,
+        priority: int | None = None,
+    ) -> str | None:
+        """Camera stream URL for the go2rtc source (общий кэш stream manager-а).
+
+        Только для stream manager-а: URL потребляет один go2rtc producer, и
+        повторный PATCH тем же URL, пока producer жив, сессию не открывает
+        заново. Direct-путь камеры (HA stream worker напрямую) URL одноразовый
+        (ADR-0014) — он берёт `get_camera_stream`, мимо кэша.
+
+        `min_remaining` — годится закэшированный URL, если его сессии осталось
+        не меньше стольких секунд; None — всегда свежий URL. Свежий URL
+        заменяет кэш камеры. `priority` — класс запроса в token bucket
+        (`rate_limit.py`).
+        """
+        camera_id = str(camera_id)
+        if min_remaining is not None:
+            cached = self.stream_urls.get(camera_id, min_remaining)
+            if cached is not None:
+                LOGGER.debug("Reusing camera %s stream URL", camera_id)
+                return cached
+        LOGGER.debug("Fetching camera %s stream URL", camera_id)
+        url = await self._api.query_camera_stream(camera_id, priority=priority)
+        if url:
+            self.stream_urls.put(camera_id, url)
+        return url
+
+    def invalidate_camera_stream(
+        self, camera_id: str, *, producer_died: bool = False
+    ) -> None:
+        """Забыть stream URL камеры (сессия мертва или не нужна)."""
+        self.stream_urls.invalidate(str(camera_id), producer_died=producer_died)
+
     async def get_camera_snapshot(
         self,
         camera_id: str,
@@ -477,3 +1045,4 @@ class ElektronnyGorodUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             place_id, access_control_id, entrance_id,
         )
         await self._api.open_lock(place_id, access_control_id, entrance_id)
+        self.note_place_activity(place_id)
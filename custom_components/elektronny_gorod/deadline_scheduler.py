@@ -0,0 +1,213 @@
+"""Heap-ordered deadline scheduler behind a single armed HA timer.
+
+`CameraStreamManager` used to hold one `async_call_later` handle per camera
+for background refreshes, and every go2rtc camera entity ran its own 28:30
+keep-alive interval on top. Independent timers drift into bursts, and a
+policy change cancelled and rebuilt all of them. The scheduler keeps every
+deadline of one manager in a binary heap and arms exactly one timer for the
+earliest one:
+
+- `schedule(key, deadline)` — O(log n) push; an earlier deadline re-arms the
+  timer, a later one leaves it alone;
+- `cancel(key)` — O(1) lazy removal; stale heap entries are skipped on pop
+  and compacted once they outnumber the live ones;
+- every key due within `DISPATCH_WINDOW_SECONDS` of the earliest deadline is
+  handed to the dispatch coroutine as one batch.
+
+Deadlines are monotonic seconds (`clock` is patched in tests).
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+import time
+from collections.abc import Awaitable, Callable, Hashable, Iterator
+from datetime import datetime
+from typing import Any, Generic, TypeVar
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+from homeassistant.helpers.event import async_call_later
+
+from .const import LOGGER
+
+# Below the manager's 0.5 s policy-enable stagger: batching coalesces
+# wakeups of cameras that are due together, not the deliberate ramp.
+DISPATCH_WINDOW_SECONDS = 0.25
+
+K = TypeVar("K", bound=Hashable)
+
+
+def _monotonic() -> float:
+    """Patchable monotonic clock boundary for deterministic tests."""
+    return time.monotonic()
+
+
+class _Entry:
+    """One heap slot; `live` is cleared instead of removing it from the heap."""
+
+    __slots__ = ("deadline", "seq", "key", "live")
+
+    def __init__(self, deadline: float, seq: int, key: Any) -> None:
+        self.deadline = deadline
+        self.seq = seq
+        self.key = key
+        self.live = True
+
+    def __lt__(self, other: _Entry) -> bool:
+        return (self.deadline, self.seq) < (other.deadline, other.seq)
+
+
+class DeadlineScheduler(Generic[K]):
+    """Per-key deadlines with one armed timer and batch dispatch."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        dispatch: Callable[[list[K]], Awaitable[None]],
+        *,
+        clock: Callable[[], float] = _monotonic,
+        window: float = DISPATCH_WINDOW_SECONDS,
+    ) -> None:
+        self.hass = hass
+        self._dispatch = dispatch
+        self._clock = clock
+        self.window = window
+        self._heap: list[_Entry] = []
+        self._entries: dict[K, _Entry] = {}
+        self._seq = itertools.count()
+        self._stale = 0
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._armed_deadline: float | None = None
+        self.dispatches = 0
+        self.dispatched = 0
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(tuple(self._entries))
+
+    def schedule(self, key: K, deadline: float) -> None:
+        """Set (or move) the deadline of `key`."""
+        self._discard(key)
+        entry = _Entry(deadline, next(self._seq), key)
+        self._entries[key] = entry
+        heapq.heappush(self._heap, entry)
+        self._arm()
+
+    def cancel(self, key: K) -> bool:
+        """Forget `key`; True if it was scheduled."""
+        if not self._discard(key):
+            return False
+        if not self._entries:
+            self._disarm()
+        return True
+
+    def clear(self) -> None:
+        """Forget every deadline and disarm the timer."""
+        self._entries.clear()
+        self._heap.clear()
+        self._stale = 0
+        self._disarm()
+
+    def next_due(self, key: K) -> float | None:
+        """Monotonic deadline of `key` (None if not scheduled)."""
+        entry = self._entries.get(key)
+        return entry.deadline if entry is not None else None
+
+    def due_times(self) -> dict[K, float]:
+        """Every scheduled key with its monotonic deadline."""
+        return {key: entry.deadline for key, entry in self._entries.items()}
+
+    @property
+    def armed(self) -> bool:
+        return self._unsub_timer is not None
+
+    def stats(self) -> dict[str, Any]:
+        """Counters for diagnostics."""
+        head = self._head()
+        return {
+            "scheduled": len(self._entries),
+            "armed": self.armed,
+            "next_in_s": (
+                round(max(head.deadline - self._clock(), 0.0), 1)
+                if head is not None
+                else None
+            ),
+            "dispatches": self.dispatches,
+            "dispatched": self.dispatched,
+        }
+
+    def _discard(self, key: K) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        entry.live = False
+        self._stale += 1
+        if self._stale > len(self._entries):
+            self._heap = [item for item in self._heap if item.live]
+            heapq.heapify(self._heap)
+            self._stale = 0
+        return True
+
+    def _head(self) -> _Entry | None:
+        while self._heap and not self._heap[0].live:
+            heapq.heappop(self._heap)
+            self._stale -= 1
+        return self._heap[0] if self._heap else None
+
+    def _arm(self) -> None:
+        head = self._head()
+        if head is None:
+            self._disarm()
+            return
+        if (
+            self._armed_deadline is not None
+            and self._armed_deadline <= head.deadline
+        ):
+            # An earlier (possibly cancelled) wakeup is already armed; it
+            # re-arms for the real head when it fires.
+            return
+        self._disarm()
+        self._armed_deadline = head.deadline
+        self._unsub_timer = async_call_later(
+            self.hass,
+            max(head.deadline - self._clock(), 0.0),
+            self._async_fire,
+        )
+
+    def _disarm(self) -> None:
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self._armed_deadline = None
+
+    def _pop_due(self) -> list[K]:
+        cutoff = self._clock() + self.window
+        due: list[K] = []
+        while (head := self._head()) is not None and head.deadline <= cutoff:
+            heapq.heappop(self._heap)
+            del self._entries[head.key]
+            due.append(head.key)
+        return due
+
+    async def _async_fire(self, _now: datetime) -> None:
+        self._unsub_timer = None
+        self._armed_deadline = None
+        due = self._pop_due()
+        # Re-arm before dispatching: a slow batch must not delay the next one.
+        self._arm()
+        if not due:
+            return
+        self.dispatches += 1
+        self.dispatched += len(due)
+        try:
+            await self._dispatch(due)
+        except Exception as err:  # noqa: BLE001 - HA timer boundary
+            LOGGER.error(
+                "Deadline scheduler dispatch failed (%s)",
+                type(err).__name__,
+            )
@@ -21,7 +21,9 @@ from .const import (
     CONF_PHONE,
     CONF_SUBSCRIBER_ID,
     DOMAIN,
+    STREAM_MANAGER_DATA,
 )
+from .session_ttl import SessionTtlModel
 
 # Источник правды по секретам — SENSITIVE_KEYS из _logging.py (ADR-0004).
 # Дополняем PII-идентификаторами, которые не секреты, но не должны утекать в
@@ -56,5 +58,58 @@ async def async_get_config_entry_diagnostics(
             "balances": len(data.get("balances") or {}),
             "dnd": bool(data.get("dnd")),
         }
+        # Виды данных place-ов, отданные из last-known-good кэша.
+        stale = data.get("stale")
+        if isinstance(stale, dict):
+            diagnostics["coordinator"]["stale"] = sum(
+                len(kinds) for kinds in stale.values()
+            )
+        # Change-aware уведомления: сколько записей реально будили entity.
+        notify_stats = getattr(coordinator, "notify_stats", None)
+        if isinstance(notify_stats, dict):
+            diagnostics["coordinator"]["notify"] = dict(notify_stats)
+        # Targeted refresh place-ов: запуски и присоединившиеся дубли.
+        targeted_stats = getattr(coordinator, "targeted_stats", None)
+        if isinstance(targeted_stats, dict):
+            diagnostics["coordinator"]["targeted_refresh"] = dict(targeted_stats)
+
+    # Кэш operator stream URL-ов: попадания, инвалидации, смерти producer-ов.
+    stream_urls = getattr(coordinator, "stream_urls", None)
+    if stream_urls is not None and hasattr(stream_urls, "stats"):
+        diagnostics["stream_urls"] = stream_urls.stats()
+    # Выученный TTL operator-сессии: наблюдения, интервал refresh-а, alerts.
+    session_ttl = getattr(coordinator, "session_ttl", None)
+    if isinstance(session_ttl, SessionTtlModel):
+        diagnostics["session_ttl"] = session_ttl.stats()
+
+    # Быстрый старт из сохранённого снимка: источник, возраст, выигрыш (с).
+    startup_stats = getattr(coordinator, "startup_stats", None)
+    if isinstance(startup_stats, dict):
+        diagnostics["startup"] = dict(startup_stats)
+
+    # Расписания видов данных: интервалы, следующий срок, fetched/skipped/retained.
+    schedule = getattr(coordinator, "refresh_schedule", None)
+    if schedule is not None and hasattr(schedule, "stats"):
+        diagnostics["refresh_schedule"] = schedule.stats()
+
+    # go2rtc stream manager: общий планировщик сроков — следующий refresh /
+    # keep-alive каждой камеры (секунды), число срабатываний таймера; очередь
+    # допуска refresh-ей (in-flight, глубина, допущено по приоритетам).
+    stream_manager = hass.data.get(STREAM_MANAGER_DATA, {}).get(entry.entry_id)
+    if stream_manager is not None and hasattr(stream_manager, "scheduler_stats"):
+        diagnostics["stream_manager"] = stream_manager.scheduler_stats()
+        if hasattr(stream_manager, "admission_stats"):
+            diagnostics["stream_manager"]["admission"] = (
+                stream_manager.admission_stats()
+            )
+
+    # Транспортные счётчики (conditional-кэш и т.п.) — только числа, без URL.
+    api = getattr(coordinator, "api", None)
+    http = getattr(api, "http", None)
+    if http is not None and hasattr(http, "diagnostics"):
+        diagnostics["http"] = http.diagnostics()
+        coalesced = getattr(api, "coalesced", None)
+        if isinstance(coalesced, int):
+            diagnostics["http"]["coalesced"] = coalesced
 
     return diagnostics
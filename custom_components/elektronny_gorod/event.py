@@ -43,6 +43,12 @@ from .history import (
     history_signal,
     place_display_name,
 )
+from .snapshot_index import (
+    RECORD_ACCESS_CONTROLS,
+    RECORD_CAMERAS,
+    RECORD_PLACES,
+    data_index,
+)
 
 EVENT_RING = "ring"
 EVENT_ENDED = "ended"
@@ -125,75 +131,120 @@ async def async_setup_entry(
 ) -> None:
     """Set up Elektronny Gorod doorbell call events based on a config entry."""
     coordinator: ElektronnyGorodUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
-    locks = (coordinator.data or {}).get("locks") or []
-
-    # Дедуп по (place_id, access_control_id) — одна event-сущность на домофон
-    # (FCM-payload несёт AccessControlId, не entrance). При multi-entrance AC
-    # берём lock с min entrance_id → стабильный intercom-device между рестартами.
-    by_ac: dict[tuple[str, str], dict] = {}
-    for lk in locks:
-        key = (lk.get("place_id"), lk.get("access_control_id"))
-        if None in key:
-            continue
-        cur = by_ac.get(key)
-        if cur is None or str(lk.get("entrance_id") or "") < str(
-            cur.get("entrance_id") or ""
-        ):
-            by_ac[key] = lk
 
-    entities: list[EventEntity] = []
     entry_history_signal = history_signal(entry.entry_id)
     account_id = str(entry.data.get(CONF_ACCOUNT_ID) or "")
     subscriber_id = str(entry.data.get(CONF_SUBSCRIBER_ID) or "")
     if account_id and subscriber_id:
-        place_ids = sorted({place_id for place_id, _ in by_ac})
         _migrate_single_place_account_history_entity(
             hass,
             account_id,
             subscriber_id,
-            place_ids,
+            sorted({place_id for place_id, _ in data_index(coordinator.data).access_controls}),
+        )
+
+    # Одна event-сущность на домофон (FCM-payload несёт AccessControlId, не
+    # entrance): `SnapshotIndex.access_controls` берёт lock с min entrance_id →
+    # стабильный intercom-device между рестартами. Домофоны, места и камеры,
+    # появившиеся после setup-а, добавляются по diff-у coordinator-а.
+    place_entities: dict[str, ElektronnyGorodPlaceHistoryEvent] = {}
+    known_access_controls: set[tuple[str, str]] = set()
+    known_cameras: set[str] = set()
+
+    @callback
+    def _async_add_new_events() -> None:
+        index = data_index(coordinator.data)
+        new_by_ac = {
+            ac_key: lock_info
+            for ac_key, lock_info in index.access_controls.items()
+            if ac_key not in known_access_controls
+        }
+        known_access_controls.update(new_by_ac)
+
+        entities: list[EventEntity] = []
+        if account_id and subscriber_id:
+            for place_id in sorted({place_id for place_id, _ in new_by_ac}):
+                place_locks = [
+                    lock
+                    for (source_place_id, _), lock in new_by_ac.items()
+                    if source_place_id == place_id
+                ]
+                if place_id in place_entities:
+                    place_entities[place_id].add_sources(place_locks)
+                    continue
+                place_entities[place_id] = ElektronnyGorodPlaceHistoryEvent(
+                    coordinator,
+                    account_id,
+                    subscriber_id,
+                    place_id,
+                    entry_history_signal,
+                    place_locks,
+                )
+                entities.append(place_entities[place_id])
+        entities.extend(
+            ElektronnyGorodDoorbellEvent(coordinator, lock_info)
+            for lock_info in new_by_ac.values()
         )
         entities.extend(
-            ElektronnyGorodPlaceHistoryEvent(
+            ElektronnyGorodAccessHistoryEvent(
                 coordinator,
-                account_id,
-                subscriber_id,
-                place_id,
+                lock_info,
                 entry_history_signal,
-                [
-                    lock
-                    for (source_place_id, _), lock in by_ac.items()
-                    if source_place_id == place_id
-                ],
             )
-            for place_id in place_ids
-        )
-    entities.extend(
-        ElektronnyGorodDoorbellEvent(coordinator, lock_info)
-        for lock_info in by_ac.values()
-    )
-    entities.extend(
-        ElektronnyGorodAccessHistoryEvent(
-            coordinator,
-            lock_info,
-            entry_history_signal,
+            for lock_info in new_by_ac.values()
         )
-        for lock_info in by_ac.values()
-    )
-    entities.extend(
-        ElektronnyGorodCameraHistoryEvent(
-            coordinator,
-            camera_info,
-            entry_history_signal,
+        for camera_id, camera_info in index.cameras.items():
+            if camera_id in known_cameras or camera_info.get("source") not in (
+                "intercom",
+                "public",
+            ):
+                continue
+            known_cameras.add(camera_id)
+            entities.append(
+                ElektronnyGorodCameraHistoryEvent(
+                    coordinator,
+                    camera_info,
+                    entry_history_signal,
+                )
+            )
+        if entities:
+            async_add_entities(entities)
+
+    entry.async_on_unload(
+        coordinator.async_track_records(
+            (RECORD_ACCESS_CONTROLS, RECORD_CAMERAS), _async_add_new_events
         )
-        for camera_info in (coordinator.data or {}).get("cameras") or []
-        if camera_info.get("source") in ("intercom", "public")
     )
-    async_add_entities(entities)
+
+
+class _SnapshotRecordUpdates:
+    """Event-entity, привязанная к записи снимка `(_record_kind, _record_key)`.
+
+    State событий приходит из push/history, от тика coordinator-а зависит
+    только availability: coordinator доступен и запись (домофон, место,
+    камера) ещё есть в снимке. Пишем state лишь когда эта запись изменилась
+    или уведомление полное, а не каждый тик.
+    """
+
+    coordinator: ElektronnyGorodUpdateCoordinator
+    _record_kind: str
+    _record_key: Any
+
+    @property
+    def available(self) -> bool:
+        records = getattr(data_index(self.coordinator.data), self._record_kind)
+        return super().available and self._record_key in records  # type: ignore[misc]
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        if self.coordinator.record_changed(self._record_kind, self._record_key):
+            self.async_write_ha_state()  # type: ignore[attr-defined]
 
 
 class ElektronnyGorodPlaceHistoryEvent(
-    CoordinatorEntity[ElektronnyGorodUpdateCoordinator], EventEntity
+    _SnapshotRecordUpdates,
+    CoordinatorEntity[ElektronnyGorodUpdateCoordinator],
+    EventEntity,
 ):
     """Aggregate accepted/missed-call history for one configured place."""
 
@@ -212,13 +263,10 @@ class ElektronnyGorodPlaceHistoryEvent(
     ) -> None:
         super().__init__(coordinator)
         self._place_id = place_id
+        self._record_kind, self._record_key = RECORD_PLACES, str(place_id)
         self._history_signal = history_dispatch_signal
-        self._sources = {
-            (str(lock["place_id"]), str(lock["access_control_id"])): str(
-                lock.get("name") or lock["access_control_id"]
-            )
-            for lock in locks
-        }
+        self._sources: dict[tuple[str, str], str] = {}
+        self.add_sources(locks)
         self._attr_unique_id = _place_history_unique_id(
             account_id,
             subscriber_id,
@@ -243,6 +291,18 @@ class ElektronnyGorodPlaceHistoryEvent(
             )
         )
 
+    @callback
+    def add_sources(self, locks: list[dict[str, Any]]) -> None:
+        """Accept history for access controls that appeared after setup."""
+        self._sources.update(
+            {
+                (str(lock["place_id"]), str(lock["access_control_id"])): str(
+                    lock.get("name") or lock["access_control_id"]
+                )
+                for lock in locks
+            }
+        )
+
     @callback
     def _handle_history(self, payload: dict[str, Any]) -> None:
         """Route one verified account event and retain safe source metadata."""
@@ -276,7 +336,9 @@ class ElektronnyGorodPlaceHistoryEvent(
 
 
 class ElektronnyGorodAccessHistoryEvent(
-    CoordinatorEntity[ElektronnyGorodUpdateCoordinator], EventEntity
+    _SnapshotRecordUpdates,
+    CoordinatorEntity[ElektronnyGorodUpdateCoordinator],
+    EventEntity,
 ):
     """Durable accepted/missed-call history for one access control."""
 
@@ -295,6 +357,8 @@ class ElektronnyGorodAccessHistoryEvent(
         access_control_id = str(lock_info["access_control_id"])
         self._place_id = place_id
         self._access_control_id = access_control_id
+        self._record_kind = RECORD_ACCESS_CONTROLS
+        self._record_key = (place_id, access_control_id)
         self._history_signal = history_dispatch_signal
         entrance_id = lock_info.get("entrance_id")
         self._attr_unique_id = (
@@ -344,7 +408,9 @@ class ElektronnyGorodAccessHistoryEvent(
 
 
 class ElektronnyGorodCameraHistoryEvent(
-    CoordinatorEntity[ElektronnyGorodUpdateCoordinator], EventEntity
+    _SnapshotRecordUpdates,
+    CoordinatorEntity[ElektronnyGorodUpdateCoordinator],
+    EventEntity,
 ):
     """Durable verified motion history for one forpost camera."""
 
@@ -363,6 +429,7 @@ class ElektronnyGorodCameraHistoryEvent(
         super().__init__(coordinator)
         camera_id = str(camera_info["id"])
         self._camera_id = camera_id
+        self._record_kind, self._record_key = RECORD_CAMERAS, camera_id
         self._history_signal = history_dispatch_signal
         self._attr_unique_id = camera_history_unique_id(camera_id)
 
@@ -428,7 +495,9 @@ class ElektronnyGorodCameraHistoryEvent(
 
 
 class ElektronnyGorodDoorbellEvent(
-    CoordinatorEntity[ElektronnyGorodUpdateCoordinator], EventEntity
+    _SnapshotRecordUpdates,
+    CoordinatorEntity[ElektronnyGorodUpdateCoordinator],
+    EventEntity,
 ):
     """`event`-сущность вызова домофона (EventDeviceClass.DOORBELL)."""
 
@@ -447,6 +516,8 @@ class ElektronnyGorodDoorbellEvent(
         self._access_control_id: str = lock_info["access_control_id"]
         self._entrance_id = lock_info.get("entrance_id")
         self._name: str = lock_info["name"]
+        self._record_kind = RECORD_ACCESS_CONTROLS
+        self._record_key = (str(self._place_id), str(self._access_control_id))
         self._auto_end_cancel: CALLBACK_TYPE | None = None
         self._ring_attributes: dict[str, Any] = {}
 
@@ -521,12 +592,10 @@ class ElektronnyGorodDoorbellEvent(
         Место истины — `apartment` в subscriber-places (coordinator.data["places"]),
         а не gate-кодированный `Apartment`/`Sender` из FCM-пуша.
         """
-        for sp in (self.coordinator.data or {}).get("places") or []:
-            place = sp.get("place") or {}
-            if str(place.get("id")) == str(self._place_id):
-                address = place.get("address")
-                if isinstance(address, dict):
-                    return address.get("apartment")
+        place = data_index(self.coordinator.data).place(self._place_id)
+        address = place.get("address")
+        if isinstance(address, dict):
+            return address.get("apartment")
         return None
 
     @callback
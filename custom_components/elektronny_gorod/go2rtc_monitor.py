@@ -0,0 +1,293 @@
+"""Shared go2rtc producer-health monitor (one per go2rtc instance).
+
+Previously every go2rtc camera entity ran its own 30 s timer with one
+`GET /api/streams?src=eg_<id>` (A-71 v2), and `CameraStreamManager` listed
+all streams once more for reconcile: with 100+ cameras that is 200+ go2rtc
+requests per minute. The monitor takes one `/api/streams` snapshot per
+interval, computes per-stream `bytes_recv` deltas, producer liveness and
+consumer counts in one pass, and fans the result out:
+
+- `async_subscribe(stream_name, listener)` — per-stream `StreamHealth`
+  (None when the stream is absent from the snapshot);
+- `async_subscribe_snapshot(listener)` — the whole sanitized snapshot
+  (stream manager state between reconciles).
+
+Monitors are keyed by go2rtc instance (base URL + credentials) and
+ref-counted like the operator transport: entries pointing at the same go2rtc
+share one poll. The timer runs only while somebody is subscribed.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import DOMAIN, LOGGER
+from .go2rtc import Go2RtcClient, Go2RtcStreamInfo
+
+GO2RTC_MONITOR_DATA = f"{DOMAIN}_go2rtc_monitors"
+
+# A-71 v2: живой forpost-поток шлёт ~150 КБ/с; `bytes_recv`, замороженный за
+# интервал при наличии consumers → producer мёртв (operator session EOF).
+HEALTH_POLL_INTERVAL = timedelta(seconds=30)
+
+StreamHealthListener = Callable[["StreamHealth | None"], None]
+SnapshotListener = Callable[[dict[str, Go2RtcStreamInfo]], None]
+
+
+def _monotonic() -> float:
+    """Patchable monotonic clock boundary for deterministic tests."""
+    return time.monotonic()
+
+
+@dataclass(frozen=True, slots=True)
+class StreamHealth:
+    """One stream's producer health computed from two consecutive snapshots."""
+
+    name: str
+    info: Go2RtcStreamInfo
+    bytes_recv: int | None
+    # None — no baseline yet (first sighting, or nobody was watching).
+    bytes_delta: int | None
+
+    @property
+    def consumer_count(self) -> int:
+        return self.info.consumer_count
+
+    @property
+    def producer_active(self) -> bool:
+        return self.info.producer_active
+
+    @property
+    def frozen(self) -> bool:
+        """Watched producer received nothing since the previous snapshot."""
+        return self.consumer_count > 0 and self.bytes_delta == 0
+
+
+def _first_bytes_recv(info: Go2RtcStreamInfo) -> int | None:
+    if not info.producers:
+        return None
+    value = info.producers[0].get("bytes_recv")
+    return value if isinstance(value, int) else None
+
+
+class Go2RtcHealthMonitor:
+    """Single `/api/streams` poller fanning health out to subscribers."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: Go2RtcClient,
+        *,
+        interval: timedelta = HEALTH_POLL_INTERVAL,
+    ) -> None:
+        self.hass = hass
+        self.client = client
+        self.interval = interval
+        # Сколько владельцев (stream manager-ов) держат monitor.
+        self.users = 0
+        self.polls = 0
+        self.failures = 0
+        self._stream_listeners: dict[str, set[StreamHealthListener]] = {}
+        self._snapshot_listeners: set[SnapshotListener] = set()
+        self._baseline: dict[str, int] = {}
+        self._health: dict[str, StreamHealth] = {}
+        self._snapshot: dict[str, Go2RtcStreamInfo] | None = None
+        self._snapshot_monotonic: float | None = None
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._poll_lock = asyncio.Lock()
+        self._closed = False
+
+    @callback
+    def async_subscribe(
+        self, stream_name: str, listener: StreamHealthListener
+    ) -> CALLBACK_TYPE:
+        """Receive `StreamHealth` (or None) for one stream after every poll."""
+        self._stream_listeners.setdefault(stream_name, set()).add(listener)
+        self._ensure_timer()
+
+        @callback
+        def _unsubscribe() -> None:
+            listeners = self._stream_listeners.get(stream_name)
+            if listeners is not None:
+                listeners.discard(listener)
+                if not listeners:
+                    del self._stream_listeners[stream_name]
+            self._maybe_stop_timer()
+
+        return _unsubscribe
+
+    @callback
+    def async_subscribe_snapshot(self, listener: SnapshotListener) -> CALLBACK_TYPE:
+        """Receive every sanitized `/api/streams` snapshot."""
+        self._snapshot_listeners.add(listener)
+        self._ensure_timer()
+
+        @callback
+        def _unsubscribe() -> None:
+            self._snapshot_listeners.discard(listener)
+            self._maybe_stop_timer()
+
+        return _unsubscribe
+
+    def latest(self, stream_name: str) -> StreamHealth | None:
+        """Last computed health of one stream (None if absent/never polled)."""
+        return self._health.get(stream_name)
+
+    def snapshot(self, max_age: float) -> dict[str, Go2RtcStreamInfo] | None:
+        """Last snapshot if it is at most `max_age` seconds old."""
+        if self._snapshot is None or self._snapshot_monotonic is None:
+            return None
+        if _monotonic() - self._snapshot_monotonic > max_age:
+            return None
+        return dict(self._snapshot)
+
+    async def async_poll(self) -> bool:
+        """Take one snapshot and notify subscribers. False on go2rtc failure."""
+        async with self._poll_lock:
+            try:
+                streams = await self.client.async_list_streams()
+            except asyncio.CancelledError:
+                raise
+            except Exception:  # noqa: BLE001 - transport details stay private
+                self.failures += 1
+                # Дыра в наблюдениях: дельта через неё заморозку не докажет.
+                self._baseline.clear()
+                return False
+            if self._closed:
+                return False
+            self.polls += 1
+            self._snapshot = streams
+            self._snapshot_monotonic = _monotonic()
+            self._health = self._compute_health(streams)
+        self._fan_out(streams)
+        return True
+
+    def _compute_health(
+        self, streams: dict[str, Go2RtcStreamInfo]
+    ) -> dict[str, StreamHealth]:
+        """One pass: deltas against the previous snapshot, new baselines."""
+        health: dict[str, StreamHealth] = {}
+        baseline: dict[str, int] = {}
+        for name, info in streams.items():
+            current = _first_bytes_recv(info)
+            previous = self._baseline.get(name)
+            delta = (
+                current - previous
+                if current is not None and previous is not None
+                else None
+            )
+            health[name] = StreamHealth(
+                name=name, info=info, bytes_recv=current, bytes_delta=delta
+            )
+            # Baseline только для просматриваемых producer-ов: без consumers
+            # producer может быть idle легитимно (A-71 v2).
+            if current is not None and info.consumer_count > 0:
+                baseline[name] = current
+        self._baseline = baseline
+        return health
+
+    def _fan_out(self, streams: dict[str, Go2RtcStreamInfo]) -> None:
+        for listener in tuple(self._snapshot_listeners):
+            self._call(listener, streams)
+        for name, listeners in tuple(self._stream_listeners.items()):
+            health = self._health.get(name)
+            for listener in tuple(listeners):
+                self._call(listener, health)
+
+    @staticmethod
+    def _call(listener: Callable[[Any], None], value: Any) -> None:
+        """Notify one subscriber without letting it break the fan-out."""
+        try:
+            listener(value)
+        except Exception as err:  # noqa: BLE001 - HA callback boundary
+            LOGGER.error(
+                "go2rtc health monitor listener failed (%s)",
+                type(err).__name__,
+            )
+
+    def _ensure_timer(self) -> None:
+        if self._unsub_timer is None and not self._closed:
+            self._unsub_timer = async_track_time_interval(
+                self.hass,
+                self._async_poll_interval,
+                self.interval,
+                name=f"{DOMAIN}_go2rtc_health_monitor",
+            )
+
+    def _maybe_stop_timer(self) -> None:
+        if self._stream_listeners or self._snapshot_listeners:
+            return
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self._baseline.clear()
+
+    async def _async_poll_interval(self, _now: datetime) -> None:
+        await self.async_poll()
+
+    @callback
+    def async_close(self) -> None:
+        """Stop polling and drop subscribers (last owner released)."""
+        self._closed = True
+        self._stream_listeners.clear()
+        self._snapshot_listeners.clear()
+        self._maybe_stop_timer()
+
+    def stats(self) -> dict[str, Any]:
+        """Counters for diagnostics (no URLs, no stream sources)."""
+        return {
+            "polls": self.polls,
+            "failures": self.failures,
+            "streams": len(self._health),
+            "subscribed_streams": len(self._stream_listeners),
+            "interval_s": self.interval.total_seconds(),
+        }
+
+
+def _instance_key(client: Go2RtcClient) -> tuple[Any, ...]:
+    # Один go2rtc с разными учётками — разные monitor-ы: ответ `/api/streams`
+    # зависит от авторизации, кэшировать его между учётками нельзя.
+    return (
+        client.base_url,
+        getattr(client, "_username", None) or None,
+        getattr(client, "_password", None) or None,
+    )
+
+
+@callback
+def async_acquire_health_monitor(
+    hass: HomeAssistant, client: Go2RtcClient
+) -> Go2RtcHealthMonitor:
+    """Shared monitor for the go2rtc instance behind `client` (ref-counted)."""
+    monitors: dict[tuple[Any, ...], Go2RtcHealthMonitor] = hass.data.setdefault(
+        GO2RTC_MONITOR_DATA, {}
+    )
+    key = _instance_key(client)
+    monitor = monitors.get(key)
+    if monitor is None:
+        monitor = Go2RtcHealthMonitor(hass, client)
+        monitors[key] = monitor
+    monitor.users += 1
+    return monitor
+
+
+@callback
+def async_release_health_monitor(
+    hass: HomeAssistant, monitor: Go2RtcHealthMonitor
+) -> None:
+    """Drop one reference; the last one stops polling and forgets the monitor."""
+    monitor.users -= 1
+    if monitor.users > 0:
+        return
+    monitor.async_close()
+    monitors = hass.data.get(GO2RTC_MONITOR_DATA, {})
+    key = _instance_key(monitor.client)
+    if monitors.get(key) is monitor:
+        del monitors[key]
@@ -14,6 +14,7 @@ from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.storage import Store
 
 from .const import DOMAIN, LOGGER
+from .snapshot_index import data_index
 
 
 _GENERAL_EVENT_TYPES = {
@@ -57,21 +58,17 @@ def place_display_name(
     place_id: str,
 ) -> str:
     """Return the same stable place label used by HA place devices."""
-    for subscriber_place in (data or {}).get("places") or []:
-        place = subscriber_place.get("place") or {}
-        if str(place.get("id") or "") != place_id:
-            continue
-        address = place.get("address")
-        if isinstance(address, dict):
-            visible = address.get("visibleAddress")
-            if isinstance(visible, str) and visible:
-                return visible
-        if isinstance(address, str) and address:
-            return address
-        name = place.get("name")
-        if isinstance(name, str) and name:
-            return name
-        break
+    place = data_index(data).place(place_id)
+    address = place.get("address")
+    if isinstance(address, dict):
+        visible = address.get("visibleAddress")
+        if isinstance(visible, str) and visible:
+            return visible
+    if isinstance(address, str) and address:
+        return address
+    name = place.get("name")
+    if isinstance(name, str) and name:
+        return name
     return f"Place {place_id}"
 
 
@@ -1,25 +1,50 @@
 """HTTP interface."""
 
-from aiohttp import ClientError, ClientResponse, ClientTimeout
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+import hashlib
+import time
+from typing import Any
+
+from aiohttp import ClientConnectionError, ClientError, ClientResponse, ClientTimeout
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util.json import json_loads
 
 from ._logging import redact, is_auth_path, redact_path
 from .const import (
     BASE_API_URL,
+    DOMAIN,
     LOGGER,
 )
+from .http_policy import (
+    RETRY_AFTER_STATUSES,
+    RETRY_STATUSES,
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    parse_retry_after,
+    policy_for,
+)
+from .metrics import EndpointMetrics
+from .rate_limit import TokenBucket, account_rate_limiter, priority_for
+from .transport import get_operator_transport
 from .user_agent import UserAgent
 
 # A-21: явные таймауты на operator API. Без них shared HA-сессия использует
 # дефолт aiohttp (total≈5 мин), а refresh coordinator-а сериальный (~6 HTTP на
 # place) — один зависший запрос надолго тормозит tick / первый setup.
 # REST — короткий кап; binary (snapshot JPEG) — щедрее по total; connect-кап
-# даёт быстрый fail на недоступный хост. Retry/backoff сознательно вне scope
-# этого слайса (POST/login/open_lock не идемпотентны) — см. audit A-21.
+# даёт быстрый fail на недоступный хост. Retry/backoff + circuit breaker — в
+# `http_policy.py`: только идемпотентные GET; POST/login/open_lock по-прежнему
+# ровно одна попытка (не идемпотентны) — см. audit A-21.
 _REST_TIMEOUT = ClientTimeout(total=30, connect=10)
 _BINARY_TIMEOUT = ClientTimeout(total=60, connect=10)
+# Binary-тело читаем чанками такого размера (guard `max_bytes` проверяется
+# на каждом, а не после полной буферизации).
+_BINARY_CHUNK_SIZE = 64 * 1024
 
 # Endpoints that the stock 9.9.0 client calls before authentication. Keep this
 # narrow: `/rest/v2/.../public/cameras` contains `public` but still requires a
@@ -29,6 +54,109 @@ _PREAUTH_PATH_PREFIXES = (
     "/api/mh-customer-device/mobile/public/",
 )
 
+# Per-host circuit breakers в hass.data: общий для всех entries, которые ходят
+# к одному operator host (падение backend-а — свойство хоста, не аккаунта).
+_CIRCUIT_BREAKERS_DATA = f"{DOMAIN}_circuit_breakers"
+
+
+class ResponseTooLargeError(ClientError):
+    """Binary-ответ больше разрешённого `max_bytes` (тело не дочитывается)."""
+
+
+def _check_content_length(
+    response: ClientResponse, max_bytes: int, endpoint: str
+) -> None:
+    """Отказать до чтения тела, если Content-Length уже больше лимита."""
+    content_length = response.headers.get("Content-Length")
+    if (
+        content_length is not None
+        and content_length.isdigit()
+        and int(content_length) > max_bytes
+    ):
+        response.close()
+        raise ResponseTooLargeError(
+            f"{redact_path(endpoint)}: Content-Length {content_length} > {max_bytes}"
+        )
+
+
+async def _async_sleep(seconds: float) -> None:
+    """Patchable backoff-sleep boundary for deterministic retry tests."""
+    await asyncio.sleep(seconds)
+
+
+def _circuit_breaker(hass: HomeAssistant, host: str) -> CircuitBreaker:
+    """Shared per-host breaker (создаётся лениво)."""
+    breakers: dict[str, CircuitBreaker] = hass.data.setdefault(
+        _CIRCUIT_BREAKERS_DATA, {}
+    )
+    if host not in breakers:
+        breakers[host] = CircuitBreaker()
+    return breakers[host]
+
+
+# Верхняя граница записей conditional-кэша на аккаунт. Кэшируются только
+# медленно меняющиеся per-place GET (screens/access-controls/cameras/DND/
+# places) — это ~6 ключей × places; кап защищает от неограниченного роста.
+_RESPONSE_CACHE_MAX_ENTRIES = 512
+
+
+@dataclass(slots=True)
+class _CacheEntry:
+    """Валидаторы и последнее распарсенное тело одного endpoint-а."""
+
+    etag: str | None
+    last_modified: str | None
+    digest: str
+    body: Any
+
+
+class ResponseCache:
+    """Conditional-request кэш (ETag / Last-Modified / content-hash).
+
+    Ключ — `(account_id, endpoint)`. Кэш НЕ отдаёт данные без обращения к
+    оператору: каждый запрос ревалидируется (`If-None-Match` /
+    `If-Modified-Since`), на 304 возвращается сохранённое тело. Если оператор
+    валидаторов не шлёт, совпадение sha256 тела пропускает JSON-парсинг и
+    возвращает тот же объект (identity-stable) — downstream может сравнивать
+    через `is`. Кэшированные тела — shared: вызывающие не должны их мутировать.
+    """
+
+    def __init__(self, max_entries: int = _RESPONSE_CACHE_MAX_ENTRIES) -> None:
+        self._entries: OrderedDict[tuple[str, str], _CacheEntry] = OrderedDict()
+        self._max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.unchanged = 0
+
+    def get(self, key: tuple[str, str]) -> _CacheEntry | None:
+        """Запись по ключу (LRU-touch)."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: tuple[str, str], entry: _CacheEntry) -> None:
+        """Сохранить запись, вытеснив самую старую при переполнении."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Сбросить все записи (счётчики сохраняются)."""
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Счётчики для diagnostics (без ключей/тел — там place_id/PII)."""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "unchanged": self.unchanged,
+        }
+
 
 def _log_request(url: str, method: str, headers: dict, body_size: int) -> None:
     """Log outgoing request. Headers redacted; body NEVER logged.
@@ -92,22 +220,63 @@ class HTTP:
             self._headers["operator"] = operator
         self.access_token: str | None = access_token
         self._refresh_token: str | None = refresh_token
+        self.response_cache = ResponseCache()
+        self.circuit_breaker = _circuit_breaker(hass, BASE_API_URL)
+        self.retries = 0
+        # Per-endpoint latency / ошибки / байты (metrics.py) — diagnostics и
+        # diagnostic-сенсоры, без debug-логов.
+        self.metrics = EndpointMetrics()
+
+    @property
+    def rate_limiter(self) -> TokenBucket:
+        """Token bucket аккаунта (account_id известен только после login)."""
+        return account_rate_limiter(self._hass, str(self.user_agent.account_id))
 
     async def __request(
-        self, endpoint: str, method: str, data: object | None, binary: bool
+        self,
+        endpoint: str,
+        method: str,
+        data: object | None,
+        binary: bool,
+        place_id: str | None = None,
+        extra_headers: dict[str, str] | None = None,
+        priority: int | None = None,
+        max_bytes: int | None = None,
     ) -> ClientResponse | bytes:
         """Make a HTTP request through shared HA aiohttp session.
 
         См. ADR-0008. Не создаём свою ClientSession — это нарушение HA convention
         (audit A-05, security S-05).
+
+        `place_id` — per-request контекст для UA-строки. None → shared
+        `user_agent.place_id` (запросы вне конкретного места: stream, snapshot,
+        history). Явный place_id не мутирует UA, поэтому coordinator может
+        параллелить places без гонки за shared state.
+
+        `priority` — класс в account-wide token bucket (rate_limit.py);
+        None → по `(method, endpoint)`.
+
+        `max_bytes` — лимит binary-тела: чтение чанками, превышение →
+        `ResponseTooLargeError`.
         """
-        session = async_get_clientsession(self._hass)
+        # Выделенный pool operator-а (transport.py), пока entry загружен;
+        # иначе (config flow, async_remove_entry) — shared HA-сессия.
+        transport = get_operator_transport(self._hass)
+        session = (
+            transport.session
+            if transport is not None
+            else async_get_clientsession(self._hass)
+        )
         url = f"{self._base_url}{endpoint}"
 
         # Per-request headers (не накапливаем в self._headers, чтобы Authorization
         # из прошлых запросов не утекал в pre-auth endpoints).
         headers: dict[str, str] = dict(self._headers)
-        headers["user-agent"] = str(self.user_agent)
+        headers["user-agent"] = (
+            str(self.user_agent)
+            if place_id is None
+            else self.user_agent.for_place(place_id)
+        )
         # content-type для тела (POST всегда; DELETE с телом — мирроринг
         # subscriberNotifications-отписки, см. api.unregister_push_device).
         if method == "POST" or (method == "DELETE" and data is not None):
@@ -120,6 +289,8 @@ class HTTP:
         )
         if self.access_token is not None and not is_preauth:
             headers["authorization"] = f"Bearer {self.access_token}"
+        if extra_headers:
+            headers.update(extra_headers)
         # data может быть str/bytes/None. Размер считаем безопасно.
         if data is None:
             body_size = 0
@@ -129,16 +300,24 @@ class HTTP:
             body_size = len(str(data).encode("utf-8"))
         _log_request(url, method, headers, body_size)
         timeout = _BINARY_TIMEOUT if binary else _REST_TIMEOUT
-        if method == "GET":
-            response = await session.get(url, headers=headers, timeout=timeout)
-        elif method == "POST":
-            response = await session.post(url, data=data, headers=headers, timeout=timeout)
-        elif method == "DELETE":
-            response = await session.delete(url, data=data, headers=headers, timeout=timeout)
+        policy = policy_for(method, endpoint, binary)
+        if priority is None:
+            priority = priority_for(method, endpoint, binary)
+        response = await self._send_with_policy(
+            session, policy, priority, endpoint, method, url, data, headers, timeout
+        )
 
         if binary:
-            return await response.read()
+            if max_bytes is None:
+                body = await response.read()
+            else:
+                body = await self._read_limited(response, max_bytes, endpoint)
+            self.metrics.record_bytes(endpoint, len(body))
+            return body
 
+        content_length = response.headers.get("Content-Length")
+        if content_length is not None and content_length.isdigit():
+            self.metrics.record_bytes(endpoint, int(content_length))
         await _log_response(response)
         if response.ok:
             return response
@@ -146,18 +325,264 @@ class HTTP:
             LOGGER.error("API request failed: %s [%s]", redact_path(endpoint), response.status)
             raise ClientError(response)
 
-    async def get(self, endpoint: str, binary: bool = False) -> ClientResponse | bytes:
+    @staticmethod
+    async def _read_limited(
+        response: ClientResponse, max_bytes: int, endpoint: str
+    ) -> bytes:
+        """Тело чанками с guard-ом; одна склейка в конце (без `read()` + копии)."""
+        _check_content_length(response, max_bytes, endpoint)
+        chunks: list[bytes] = []
+        size = 0
+        async for chunk in response.content.iter_chunked(_BINARY_CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_bytes:
+                response.close()
+                raise ResponseTooLargeError(
+                    f"{redact_path(endpoint)}: body > {max_bytes} bytes"
+                )
+            chunks.append(chunk)
+        return chunks[0] if len(chunks) == 1 else b"".join(chunks)
+
+    async def _send_with_policy(
+        self,
+        session: Any,
+        policy: RetryPolicy,
+        priority: int,
+        endpoint: str,
+        method: str,
+        url: str,
+        data: object | None,
+        headers: dict[str, str],
+        timeout: ClientTimeout,
+    ) -> ClientResponse:
+        """Отправить запрос с retry/backoff и circuit breaker по политике.
+
+        Неидемпотентные запросы (POST/DELETE/auth) — одна попытка и не
+        блокируются открытым circuit (действие пользователя всегда получает
+        реальную попытку), но их исход обновляет состояние breaker-а.
+        Повторяются 429/5xx и connection errors; общий total-timeout не
+        повторяется — иначе tick ждал бы 3×30 с. Каждая попытка берёт токен
+        из bucket-а аккаунта (retry тоже нагружает оператора).
+        """
+        breaker = self.circuit_breaker
+        limiter = self.rate_limiter
+        attempt = 0
+        while True:
+            attempt += 1
+            if policy.idempotent and not breaker.allow():
+                raise CircuitOpenError(
+                    f"operator circuit open: {method} {redact_path(endpoint)}"
+                )
+            await limiter.acquire(priority)
+            started = time.monotonic()
+            try:
+                response = await self._send(
+                    session, method, url, data, headers, timeout
+                )
+            except ClientConnectionError as err:
+                self._record_attempt(endpoint, started, type(err).__name__)
+                breaker.record_failure()
+                if attempt >= policy.max_attempts:
+                    raise
+                delay = policy.backoff(attempt)
+                reason: object = type(err).__name__
+            except asyncio.TimeoutError:
+                self._record_attempt(endpoint, started, "TimeoutError")
+                breaker.record_failure()
+                raise
+            else:
+                self._record_attempt(
+                    endpoint,
+                    started,
+                    str(response.status) if response.status >= 400 else None,
+                )
+                if response.status >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                if (
+                    response.status not in RETRY_STATUSES
+                    or attempt >= policy.max_attempts
+                ):
+                    return response
+                delay = policy.backoff(attempt)
+                if response.status in RETRY_AFTER_STATUSES:
+                    retry_after = parse_retry_after(
+                        response.headers.get("Retry-After")
+                    )
+                    if retry_after is not None:
+                        if retry_after > policy.max_retry_after:
+                            return response
+                        delay = retry_after
+                reason = response.status
+                response.release()
+
+            self.retries += 1
+            LOGGER.debug(
+                "Retrying %s %s in %.2fs (attempt %d/%d): %s",
+                method,
+                redact_path(endpoint),
+                delay,
+                attempt + 1,
+                policy.max_attempts,
+                reason,
+            )
+            await _async_sleep(delay)
+
+    def _record_attempt(self, endpoint: str, started: float, error: str | None) -> None:
+        self.metrics.record(endpoint, (time.monotonic() - started) * 1000, error)
+
+    @staticmethod
+    async def _send(
+        session: Any,
+        method: str,
+        url: str,
+        data: object | None,
+        headers: dict[str, str],
+        timeout: ClientTimeout,
+    ) -> ClientResponse:
+        """Одна попытка запроса через aiohttp-сессию."""
+        if method == "GET":
+            return await session.get(url, headers=headers, timeout=timeout)
+        if method == "POST":
+            return await session.post(url, data=data, headers=headers, timeout=timeout)
+        if method == "DELETE":
+            return await session.delete(url, data=data, headers=headers, timeout=timeout)
+        raise ValueError(f"Unsupported method: {method}")
+
+    async def get(
+        self,
+        endpoint: str,
+        binary: bool = False,
+        *,
+        place_id: str | None = None,
+        priority: int | None = None,
+        max_bytes: int | None = None,
+    ) -> ClientResponse | bytes:
         """Handle GET requests."""
-        return await self.__request(endpoint, method="GET", data=None, binary=binary)
+        return await self.__request(
+            endpoint,
+            method="GET",
+            data=None,
+            binary=binary,
+            place_id=place_id,
+            priority=priority,
+            max_bytes=max_bytes,
+        )
+
+    async def get_json(
+        self,
+        endpoint: str,
+        *,
+        place_id: str | None = None,
+    ) -> Any:
+        """Conditional GET с разбором JSON через `response_cache`.
+
+        Шлёт сохранённые валидаторы; 304 → кэшированное тело без парсинга.
+        200 с тем же sha256 тела → тоже кэшированный объект (оператор не всегда
+        отдаёт ETag/Last-Modified). Ошибки — как у `get` (ClientError на
+        не-2xx/3xx), кэш при этом не трогается.
+        """
+        key = (str(self.user_agent.account_id), endpoint)
+        cached = self.response_cache.get(key)
+        conditional: dict[str, str] = {}
+        if cached is not None:
+            if cached.etag:
+                conditional["if-none-match"] = cached.etag
+            if cached.last_modified:
+                conditional["if-modified-since"] = cached.last_modified
+
+        response = await self.__request(
+            endpoint,
+            method="GET",
+            data=None,
+            binary=False,
+            place_id=place_id,
+            extra_headers=conditional,
+        )
+        if not isinstance(response, ClientResponse):
+            raise TypeError(f"Unexpected response type: {type(response)!r}")
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status == 304 and cached is not None:
+            self.response_cache.hits += 1
+            self.response_cache.not_modified += 1
+            # 304 может обновить валидаторы (RFC 9111 §4.3.4).
+            cached.etag = etag or cached.etag
+            cached.last_modified = last_modified or cached.last_modified
+            return cached.body
+
+        raw = await response.read()
+        if response.headers.get("Content-Length") is None:
+            self.metrics.record_bytes(endpoint, len(raw))
+        digest = hashlib.sha256(raw).hexdigest()
+        if cached is not None and cached.digest == digest:
+            self.response_cache.hits += 1
+            self.response_cache.unchanged += 1
+            cached.etag = etag
+            cached.last_modified = last_modified
+            return cached.body
+
+        self.response_cache.misses += 1
+        body = json_loads(raw) if raw else None
+        self.response_cache.put(
+            key,
+            _CacheEntry(
+                etag=etag,
+                last_modified=last_modified,
+                digest=digest,
+                body=body,
+            ),
+        )
+        return body
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Счётчики транспортного слоя для diagnostics (без URL/токенов)."""
+        return {
+            "response_cache": self.response_cache.stats(),
+            "retries": self.retries,
+            "circuit_breaker": self.circuit_breaker.stats(),
+            "rate_limiter": self.rate_limiter.stats(),
+            "endpoints": self.metrics.stats(),
+            "transport": transport.stats()
+            if (transport := get_operator_transport(self._hass)) is not None
+            else None,
+        }
 
     async def post(
-        self, endpoint: str, data: object, binary: bool = False
+        self,
+        endpoint: str,
+        data: object,
+        binary: bool = False,
+        *,
+        place_id: str | None = None,
+        priority: int | None = None,
     ) -> ClientResponse | bytes:
         """Handle POST requests."""
-        return await self.__request(endpoint, method="POST", data=data, binary=binary)
+        return await self.__request(
+            endpoint,
+            method="POST",
+            data=data,
+            binary=binary,
+            place_id=place_id,
+            priority=priority,
+        )
 
     async def delete(
-        self, endpoint: str, data: object | None = None
+        self,
+        endpoint: str,
+        data: object | None = None,
+        *,
+        place_id: str | None = None,
+        priority: int | None = None,
     ) -> ClientResponse | bytes:
         """Handle DELETE requests (опц. тело — мирроринг отписки)."""
-        return await self.__request(endpoint, method="DELETE", data=data, binary=False)
+        return await self.__request(
+            endpoint,
+            method="DELETE",
+            data=data,
+            binary=False,
+            place_id=place_id,
+            priority=priority,
+        )
@@ -0,0 +1,191 @@
+"""Retry / backoff / circuit-breaker policy для operator API.
+
+Продолжение A-21 (явные таймауты в `http.py`): один транзиентный 5xx или
+connect-timeout раньше превращался в пропавший баланс, пустой список камер
+(`query_cameras` глушит ошибки → `[]`) или `UpdateFailed`.
+
+- Политика выбирается по `(method, endpoint class)`. Ретраятся **только**
+  идемпотентные GET (REST и binary snapshot). POST / DELETE / `/auth/*`
+  (login, password, SMS) / open_lock — ровно одна попытка: повтор может
+  дважды открыть дверь или сжечь SMS-лимит.
+- Backoff — экспонента с full jitter; на 429/503 уважаем `Retry-After`
+  (секунды или HTTP-date), если он в пределах бюджета политики.
+- Circuit breaker — per host (shared между entries одного оператора): после
+  серии подряд идущих сбоев идемпотентные GET сразу получают
+  `CircuitOpenError`, а не ждут 30-секундный таймаут на каждом тике.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import random
+import time
+from typing import Any
+
+from aiohttp import ClientError
+
+# Статусы, на которых повтор идемпотентного GET имеет смысл.
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Статусы, для которых оператор может прислать `Retry-After`.
+RETRY_AFTER_STATUSES = frozenset({429, 503})
+
+ENDPOINT_CLASS_AUTH = "auth"
+ENDPOINT_CLASS_BINARY = "binary"
+ENDPOINT_CLASS_REST = "rest"
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+# Подряд идущих сбоев хоста (5xx / connection error / timeout) до открытия.
+CIRCUIT_FAILURE_THRESHOLD = 5
+# Сколько держим circuit открытым до пробного запроса (half-open).
+CIRCUIT_RESET_TIMEOUT_SECONDS = 60.0
+
+
+def _monotonic() -> float:
+    """Patchable monotonic clock boundary for deterministic breaker tests."""
+    return time.monotonic()
+
+
+def _jitter(upper: float) -> float:
+    """Patchable jitter boundary: uniform(0, upper)."""
+    return random.uniform(0.0, upper)
+
+
+class CircuitOpenError(ClientError):
+    """Operator host считается недоступным — запрос отклонён без сети."""
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """Политика одного класса запросов."""
+
+    endpoint_class: str
+    max_attempts: int = 1
+    base_delay: float = 0.5
+    max_delay: float = 4.0
+    # Больший `Retry-After` не ждём внутри запроса — отдаём ошибку сразу
+    # (caller/следующий tick повторит позже, coordinator не висит минутами).
+    max_retry_after: float = 10.0
+
+    @property
+    def idempotent(self) -> bool:
+        """Повторяемый запрос (а значит и под защитой circuit breaker)."""
+        return self.max_attempts > 1
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter экспонента после неудачной попытки `attempt` (1-based)."""
+        return _jitter(min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+_POLICIES: dict[tuple[str, str], RetryPolicy] = {
+    ("GET", ENDPOINT_CLASS_REST): RetryPolicy(ENDPOINT_CLASS_REST, max_attempts=3),
+    # Snapshot — UI ждёт картинку; одна повторная попытка достаточно.
+    ("GET", ENDPOINT_CLASS_BINARY): RetryPolicy(ENDPOINT_CLASS_BINARY, max_attempts=2),
+}
+
+
+def endpoint_class(endpoint: str, binary: bool) -> str:
+    """Класс endpoint-а для выбора политики."""
+    if endpoint.startswith("/auth/"):
+        return ENDPOINT_CLASS_AUTH
+    if binary:
+        return ENDPOINT_CLASS_BINARY
+    return ENDPOINT_CLASS_REST
+
+
+def policy_for(method: str, endpoint: str, binary: bool = False) -> RetryPolicy:
+    """Политика для `(method, endpoint class)`; по умолчанию — без повторов."""
+    cls = endpoint_class(endpoint, binary)
+    return _POLICIES.get((method, cls)) or RetryPolicy(cls)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """`Retry-After` → секунды (delta-seconds или HTTP-date). None если нет/мусор."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class CircuitBreaker:
+    """Per-host circuit breaker (closed → open → half-open → closed)."""
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_TIMEOUT_SECONDS,
+    ) -> None:
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._consecutive_failures = 0
+        self._opened_at: float | None = None
+        # Время старта half-open пробы. Проба, не вернувшая результат (cancel),
+        # протухает через reset_timeout — иначе circuit залип бы открытым.
+        self._probe_started_at: float | None = None
+        self.rejected = 0
+        self.opened = 0
+
+    @property
+    def state(self) -> str:
+        """Текущее состояние (для diagnostics)."""
+        if self._opened_at is None:
+            return CIRCUIT_CLOSED
+        if _monotonic() - self._opened_at >= self._reset_timeout:
+            return CIRCUIT_HALF_OPEN
+        return CIRCUIT_OPEN
+
+    @property
+    def _probe_in_flight(self) -> bool:
+        return (
+            self._probe_started_at is not None
+            and _monotonic() - self._probe_started_at < self._reset_timeout
+        )
+
+    def allow(self) -> bool:
+        """Можно ли слать запрос. В half-open пропускаем ровно одну пробу."""
+        state = self.state
+        if state == CIRCUIT_CLOSED:
+            return True
+        if state == CIRCUIT_HALF_OPEN and not self._probe_in_flight:
+            self._probe_started_at = _monotonic()
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        """Хост ответил (любой статус < 500) — закрываем circuit."""
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self._probe_started_at = None
+
+    def record_failure(self) -> None:
+        """5xx / connection error / timeout."""
+        self._consecutive_failures += 1
+        # Проваленная half-open проба снова открывает circuit на reset_timeout.
+        if self._probe_started_at is not None or (
+            self._opened_at is None
+            and self._consecutive_failures >= self._failure_threshold
+        ):
+            self._opened_at = _monotonic()
+            self.opened += 1
+        self._probe_started_at = None
+
+    def stats(self) -> dict[str, Any]:
+        """Счётчики для diagnostics."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self._consecutive_failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
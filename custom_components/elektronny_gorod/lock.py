@@ -24,6 +24,7 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from .const import AREA_INTERCOM, DOMAIN, LOGGER
 from .coordinator import ElektronnyGorodUpdateCoordinator
 from .entity_migration import lock_unique_id
+from .snapshot_index import RECORD_LOCKS, data_index
 
 LOCK_UNLOCK_DELAY = 5  # секунды cosmetic-UX «открыто»
 LOCK_JAMMED_DELAY = 2
@@ -36,8 +37,26 @@ async def async_setup_entry(
 ) -> None:
     """Set up Elektronny Gorod Lock based on a config entry."""
     coordinator: ElektronnyGorodUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
-    locks = (coordinator.data or {}).get("locks") or []
-    async_add_entities(ElektronnyGorodLock(coordinator, lock_info) for lock_info in locks)
+    # Новые entrance-ы добавляются по diff-у coordinator-а, без reload entry.
+    known: set[tuple[Any, Any, Any]] = set()
+
+    @callback
+    def _async_add_new_locks() -> None:
+        new = {
+            key: lock_info
+            for key, lock_info in data_index(coordinator.data).locks.items()
+            if key not in known
+        }
+        if not new:
+            return
+        known.update(new)
+        async_add_entities(
+            ElektronnyGorodLock(coordinator, lock_info) for lock_info in new.values()
+        )
+
+    entry.async_on_unload(
+        coordinator.async_track_records((RECORD_LOCKS,), _async_add_new_locks)
+    )
 
 
 class ElektronnyGorodLock(
@@ -98,16 +117,10 @@ class ElektronnyGorodLock(
 
     @property
     def _coordinator_lock_info(self) -> dict[str, Any] | None:
-        """Найти текущий lock в coordinator.data."""
-        locks = (self.coordinator.data or {}).get("locks") or []
-        for lk in locks:
-            if (
-                lk.get("place_id") == self._place_id
-                and lk.get("access_control_id") == self._access_control_id
-                and lk.get("entrance_id") == self._entrance_id
-            ):
-                return lk
-        return None
+        """Текущий lock из индекса coordinator.data (O(1))."""
+        return data_index(self.coordinator.data).locks.get(
+            (self._place_id, self._access_control_id, self._entrance_id)
+        )
 
     @property
     def available(self) -> bool:
@@ -132,13 +145,17 @@ class ElektronnyGorodLock(
         info = self._coordinator_lock_info
         if info is None:
             return None
-        return {
+        attributes = {
             "Place ID": str(info.get("place_id")),
             "Access control ID": str(info.get("access_control_id")),
             "Entrance ID": str(info.get("entrance_id")),
             "Name": info.get("name"),
             "Openable": str(info.get("openable")),
         }
+        # Запись из last-known-good кэша после сбоя fetch-а (см. coordinator).
+        if stale_since := info.get("stale_since"):
+            attributes["Stale since"] = stale_since
+        return attributes
 
     @property
     def is_locking(self) -> bool:
@@ -210,5 +227,9 @@ class ElektronnyGorodLock(
     @callback
     def _handle_coordinator_update(self) -> None:
         """Coordinator обновился — properties (available/extra_state_attributes)
-        читают из coordinator.data в propertах; пишем state."""
-        self.async_write_ha_state()
+        читают из coordinator.data в propertах; пишем state, если запись
+        lock-а изменилась."""
+        if self.coordinator.record_changed(
+            RECORD_LOCKS, (self._place_id, self._access_control_id, self._entrance_id)
+        ):
+            self.async_write_ha_state()
@@ -0,0 +1,137 @@
+"""Per-endpoint метрики operator API (latency / ошибки / байты).
+
+Раньше ответ на «какой endpoint тормозит tick» требовал debug-логов. `HTTP`
+пишет каждую попытку сюда, по шаблону endpoint-а (ID и query вырезаны —
+в diagnostics не утекают place_id / camera_id / телефон):
+
+- count, ошибки по статусу (и по типу исключения для сетевых сбоев);
+- latency — фиксированная лог-шкала bucket-ов (память O(1) на шаблон),
+  p50/p95/p99 — верхняя граница bucket-а, где накопилась доля q;
+- bytes — по Content-Length (wire), иначе по прочитанному телу.
+
+Число шаблонов ограничено `_MAX_TEMPLATES` — неизвестные пути сверх лимита
+склеиваются в `OTHER_TEMPLATE`.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left
+import re
+from typing import Any
+
+# Верхние границы bucket-ов latency, мс (последний — всё, что дольше).
+LATENCY_BUCKETS_MS: tuple[float, ...] = (
+    25, 50, 100, 200, 400, 800, 1600, 3200, 6400, 12800, 25600, 60000,
+)
+_MAX_TEMPLATES = 64
+OTHER_TEMPLATE = "<other>"
+
+# Сегменты-идентификаторы: с цифрами (id, телефон, uuid), кроме версий API.
+_VERSION_SEGMENT = re.compile(r"^v\d+$")
+
+
+def endpoint_template(endpoint: str) -> str:
+    """`/rest/v1/places/123/cameras?x=1` → `/rest/v1/places/{id}/cameras`."""
+    path = endpoint.split("?", 1)[0]
+    return "/".join(
+        "{id}"
+        if any(ch.isdigit() for ch in segment)
+        and not _VERSION_SEGMENT.match(segment)
+        else segment
+        for segment in path.split("/")
+    )
+
+
+def percentile_from_buckets(buckets: list[int], q: float) -> float | None:
+    """Верхняя граница bucket-а с долей q (для overflow — последняя граница)."""
+    count = sum(buckets)
+    if not count:
+        return None
+    threshold = q * count
+    seen = 0
+    for index, hits in enumerate(buckets):
+        seen += hits
+        if seen >= threshold:
+            return float(LATENCY_BUCKETS_MS[min(index, len(LATENCY_BUCKETS_MS) - 1)])
+    return float(LATENCY_BUCKETS_MS[-1])
+
+
+class EndpointStats:
+    """Счётчики одного шаблона endpoint-а."""
+
+    __slots__ = ("count", "errors", "bytes", "buckets", "latency_max_ms")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors: dict[str, int] = {}
+        self.bytes = 0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.latency_max_ms = 0.0
+
+    def record(self, latency_ms: float, error: str | None) -> None:
+        self.count += 1
+        self.buckets[bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+        self.latency_max_ms = max(self.latency_max_ms, latency_ms)
+        if error is not None:
+            self.errors[error] = self.errors.get(error, 0) + 1
+
+    def percentile(self, q: float) -> float | None:
+        """Оценка перцентиля; не больше наблюдённого max (он точный)."""
+        if not self.count:
+            return None
+        if self.buckets[-1] and self.buckets[-1] >= (1 - q) * self.count:
+            return round(self.latency_max_ms, 1)
+        bound = percentile_from_buckets(self.buckets, q)
+        return None if bound is None else min(bound, round(self.latency_max_ms, 1))
+
+    @property
+    def error_count(self) -> int:
+        return sum(self.errors.values())
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": dict(self.errors),
+            "bytes": self.bytes,
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.latency_max_ms, 1),
+        }
+
+
+class EndpointMetrics:
+    """Реестр `EndpointStats` по шаблону + агрегат по всем endpoint-ам."""
+
+    def __init__(self, max_templates: int = _MAX_TEMPLATES) -> None:
+        self._stats: dict[str, EndpointStats] = {}
+        self._max_templates = max_templates
+        self.total = EndpointStats()
+
+    def _for(self, endpoint: str) -> EndpointStats:
+        template = endpoint_template(endpoint)
+        stats = self._stats.get(template)
+        if stats is None:
+            if len(self._stats) >= self._max_templates:
+                template = OTHER_TEMPLATE
+            stats = self._stats.setdefault(template, EndpointStats())
+        return stats
+
+    def record(self, endpoint: str, latency_ms: float, error: str | None = None) -> None:
+        """Одна попытка запроса; `error` — статус (`"503"`) или тип исключения."""
+        self._for(endpoint).record(latency_ms, error)
+        self.total.record(latency_ms, error)
+
+    def record_bytes(self, endpoint: str, size: int) -> None:
+        """Байты тела ответа."""
+        self._for(endpoint).bytes += size
+        self.total.bytes += size
+
+    def stats(self) -> dict[str, Any]:
+        """Снимок для diagnostics: агрегат + по шаблонам."""
+        return {
+            "total": self.total.as_dict(),
+            "endpoints": {
+                template: stats.as_dict()
+                for template, stats in sorted(self._stats.items())
+            },
+        }
@@ -0,0 +1,166 @@
+"""Account-wide token bucket с приоритетами для operator API.
+
+Coordinator, HistoryPoller (запрос на каждую камеру), refresh-и stream
+manager-а, recovery после рестарта go2rtc, snapshot-ы и FCM-регистрация ходят
+к оператору независимо. Burst на старте / reconcile рискует упереться в 429
+и throttling аккаунта. Все попытки `HTTP` (включая retry) проходят через
+один bucket аккаунта:
+
+- `PRIORITY_CRITICAL` — open_lock, mint SIP: не ждут никогда (берут токен в
+  долг — ожидание у двери хуже лишнего запроса); долг отрабатывают фоновые;
+- `PRIORITY_INTERACTIVE` — stream URL, snapshot, auth, запись DND;
+- `PRIORITY_BACKGROUND` — refresh coordinator-а, history, push-регистрация,
+  фоновые refresh-и stream manager-а (reconcile, продление по сроку: явный
+  `priority` от `CameraStreamManager`).
+
+Очередь строго по приоритету, внутри класса — FIFO.
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+PRIORITY_CRITICAL = 0
+PRIORITY_INTERACTIVE = 1
+PRIORITY_BACKGROUND = 2
+
+_PRIORITY_NAMES = {
+    PRIORITY_CRITICAL: "critical",
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_BACKGROUND: "background",
+}
+
+# Устойчивый темп и ёмкость burst-а. Tick coordinator-а на типичном аккаунте
+# (1-3 места × ~6 запросов) укладывается в burst; большие аккаунты и массовый
+# reconcile растягиваются до RATE_LIMIT_PER_SECOND.
+RATE_LIMIT_PER_SECOND = 5.0
+RATE_LIMIT_BURST = 10.0
+# Глубже долг не копим: критичные запросы продолжают идти, но фон не
+# блокируется дольше, чем на burst / rate секунд.
+_MAX_DEBT = RATE_LIMIT_BURST
+
+_RATE_LIMITERS_DATA = f"{DOMAIN}_rate_limiters"
+
+
+def priority_for(method: str, endpoint: str, binary: bool = False) -> int:
+    """Приоритет по умолчанию для `(method, endpoint)`."""
+    if method == "POST" and endpoint.endswith(("/actions", "/sipdevices")):
+        return PRIORITY_CRITICAL
+    if (
+        binary
+        or endpoint.startswith("/auth/")
+        or "/video?" in endpoint
+        or (method == "POST" and "/do_not_disturb" in endpoint)
+    ):
+        return PRIORITY_INTERACTIVE
+    return PRIORITY_BACKGROUND
+
+
+class TokenBucket:
+    """Token bucket + приоритетная очередь ожидающих."""
+
+    def __init__(
+        self,
+        rate: float = RATE_LIMIT_PER_SECOND,
+        burst: float = RATE_LIMIT_BURST,
+    ) -> None:
+        self._rate = rate
+        self._burst = burst
+        self._tokens = burst
+        self._updated: float | None = None
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._seq = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self.acquired = {name: 0 for name in _PRIORITY_NAMES.values()}
+        self.waited = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Сколько запросов сейчас ждут токен."""
+        return sum(1 for *_, fut in self._waiters if not fut.done())
+
+    def _refill(self, now: float) -> None:
+        if self._updated is not None:
+            self._tokens = min(
+                self._burst, self._tokens + (now - self._updated) * self._rate
+            )
+        self._updated = now
+
+    async def acquire(self, priority: int = PRIORITY_BACKGROUND) -> None:
+        """Дождаться токена (critical — без ожидания)."""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        self._refill(started)
+        self.acquired[_PRIORITY_NAMES[priority]] += 1
+        if priority == PRIORITY_CRITICAL:
+            self._tokens = max(-_MAX_DEBT, self._tokens - 1)
+            return
+        if not self.queue_depth and self._tokens >= 1:
+            self._tokens -= 1
+            return
+
+        future: asyncio.Future[None] = loop.create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        self._schedule(loop)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Токен уже выдан, но caller отменён — вернуть в bucket.
+                self._tokens += 1
+                self._schedule(loop)
+            raise
+        waited = loop.time() - started
+        self.waited += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+
+    def _schedule(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._timer is not None:
+            return
+        self._timer = loop.call_soon(self._drain)
+
+    def _drain(self) -> None:
+        self._timer = None
+        loop = asyncio.get_running_loop()
+        self._refill(loop.time())
+        while self._waiters:
+            *_, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self._tokens < 1:
+                self._timer = loop.call_later(
+                    (1 - self._tokens) / self._rate, self._drain
+                )
+                return
+            heapq.heappop(self._waiters)
+            self._tokens -= 1
+            future.set_result(None)
+
+    def stats(self) -> dict[str, Any]:
+        """Счётчики для diagnostics."""
+        return {
+            "queue_depth": self.queue_depth,
+            "tokens": round(max(self._tokens, -_MAX_DEBT), 2),
+            "acquired": dict(self.acquired),
+            "waited": self.waited,
+            "wait_avg": round(self.wait_total / self.waited, 3) if self.waited else 0.0,
+            "wait_max": round(self.wait_max, 3),
+        }
+
+
+def account_rate_limiter(hass: HomeAssistant, account_id: str) -> TokenBucket:
+    """Общий bucket аккаунта (entries одного аккаунта делят лимит оператора)."""
+    limiters: dict[str, TokenBucket] = hass.data.setdefault(_RATE_LIMITERS_DATA, {})
+    if account_id not in limiters:
+        limiters[account_id] = TokenBucket()
+    return limiters[account_id]
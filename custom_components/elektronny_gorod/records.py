@@ -0,0 +1,126 @@
+"""Компактные записи снимка coordinator-а (camera / lock / balance / place).
+
+Раньше каждая запись `coordinator.data` была свободным dict-ом, а список
+`places` хранил весь ответ `subscriber-places` (subscriber, адрес со всей
+региональной структурой и т.п.). На аккаунтах с сотнями public-камер это
+десятки байт dict-оверхеда на запись и полные сравнения dict-ов в
+`diff_indexes` на каждом тике.
+
+Теперь coordinator строит frozen slotted dataclass-ы (как `HistoryEvent` в
+`api.py`) только с полями, которые читают entity:
+
+- поля — `__slots__`, без per-instance `__dict__`;
+- сравнение двух записей одного типа — сравнение кортежей полей;
+- read-only `Mapping`-интерфейс (`record.get("name")`, `record["id"]`,
+  `dict(record)`): entity, миграции и persisted снимок работают с записью и
+  с dict-ом одинаково, запись равна dict-у с теми же полями;
+- `from_mapping` — обратно из dict-а (restore из `.storage`), лишние ключи
+  старых снимков отбрасываются.
+
+`slim_place` оставляет от subscriber-place только id, name и адресные поля,
+которые читают `place_display_name` и doorbell (`apartment`).
+"""
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, fields
+from typing import Any, Self
+
+
+class _Record(Mapping[str, Any]):
+    """Read-only mapping-вид над полями slotted dataclass-а."""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, Any]) -> Self:
+        """Запись из dict-а; неизвестные ключи игнорируются."""
+        return cls(**{f.name: data[f.name] for f in fields(cls) if f.name in data})  # type: ignore[arg-type]
+
+    def _values(self) -> tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.__slots__
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is self.__class__:
+            return self._values() == other._values()  # type: ignore[attr-defined]
+        if isinstance(other, Mapping):
+            return dict(self) == dict(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self._values())
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class CameraRecord(_Record):
+    """Камера места: intercom (по entrance), place или public."""
+
+    id: Any
+    name: str | None
+    source: str
+    hidden: bool = False
+    place_id: Any = None
+    access_control_id: Any = None
+    entrance_id: Any = None
+    stale_since: str | None = None
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class LockRecord(_Record):
+    """Замок: один per entrance (или per access control без entrances)."""
+
+    place_id: Any
+    access_control_id: Any
+    entrance_id: Any
+    name: str | None
+    openable: bool | None
+    hidden: bool = False
+    stale_since: str | None = None
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class BalanceRecord(_Record):
+    """Баланс места (`/finance`): то, что читают сенсоры и расписание."""
+
+    place_id: Any
+    balance: float | None = None
+    blocked: bool | None = None
+    payment_date: str | None = None
+    payment_sum: float | None = None
+    payment_link: str | None = None
+    days_to_block: int | None = None
+    stale_since: str | None = None
+
+
+# Поля адреса, которые читают entity (`place_display_name`, doorbell).
+_ADDRESS_FIELDS = ("visibleAddress", "apartment")
+
+
+def slim_place(subscriber_place: Mapping[str, Any]) -> dict[str, Any]:
+    """Subscriber-place без неиспользуемого payload-а (та же вложенность)."""
+    place = subscriber_place.get("place") or {}
+    slim: dict[str, Any] = {"id": place.get("id")}
+    if (name := place.get("name")) is not None:
+        slim["name"] = name
+    address = place.get("address")
+    if isinstance(address, Mapping):
+        slim["address"] = {
+            key: address[key] for key in _ADDRESS_FIELDS if key in address
+        }
+    elif address is not None:
+        slim["address"] = address
+    return {"place": slim}
@@ -0,0 +1,283 @@
+"""Независимые расписания refresh-а по видам данных coordinator-а.
+
+Раньше каждый тик (`UPDATE_INTERVAL`, 5 минут) перезапрашивал для каждого
+place всё: баланс, screens, access controls, три источника камер и DND —
+~6 запросов × N places, хотя почти всё это меняется раз в дни. Теперь тик
+coordinator-а — только гранулярность: каждый вид данных (`KIND_*`) в каждом
+place имеет свой срок (`REFRESH_INTERVALS`), запрос уходит, только когда срок
+вышел. `coordinator.data` по-прежнему один склеенный снимок.
+
+- Баланс редкий (6 ч), но вблизи блокировки / даты платежа (`blocked`,
+  `days_to_block` ≤ `BALANCE_NEAR_DAYS`, `targetDate` в пределах тех же дней)
+  сжимается до `BALANCE_NEAR_INTERVAL`; следующий срок никогда не позже
+  начала этого окна.
+- Сбой fetch-а — срок сразу истёк (повтор на следующем тике), как раньше.
+  Последний удачный результат вида при этом не выбрасывается, пока ему не
+  больше `MAX_STALENESS[kind]` (last-known-good, см. coordinator `_slice`).
+- Запись пользователя (DND из HA) инвалидирует свой вид — следующий тик
+  перечитывает только его.
+
+Адаптивность: срок каждого slice-а `(kind, scope)` учится на том, как часто
+данные реально меняются.
+
+- Ответ не изменился — следующий интервал slice-а удваивается, но не выше
+  `MAX_INTERVALS[kind]`; изменился — не выше базового.
+- Активность в place (DND из HA, открытие двери, FCM-пуш звонка) —
+  `snap_back`: виды `ACTIVITY_KINDS` этого place опрашиваются с
+  `FAST_INTERVAL`, дальше снова отходят по удвоению.
+- Баланс — без backoff-а: его срок задаёт сама запись
+  (`balance_refresh_interval`), и потолок — базовый интервал.
+
+Сроки считаются по монотонным часам (`clock` подменяется в тестах).
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime, time as dt_time, timedelta
+import time
+from typing import Any
+
+KIND_PLACES = "places"
+KIND_BALANCE = "balance"
+KIND_SCREENS = "screens"
+KIND_ACCESS_CONTROLS = "access_controls"
+KIND_CAMERAS = "cameras"
+KIND_PUBLIC_CAMERAS = "public_cameras"
+KIND_DND = "dnd"
+
+# Scope для видов уровня аккаунта (список places).
+ACCOUNT_SCOPE = ""
+
+# Виды данных одного place (всё, кроме списка places).
+PLACE_KINDS: tuple[str, ...] = (
+    KIND_BALANCE,
+    KIND_SCREENS,
+    KIND_ACCESS_CONTROLS,
+    KIND_CAMERAS,
+    KIND_PUBLIC_CAMERAS,
+    KIND_DND,
+)
+
+# Базовые интервалы, секунды. DND и screens пользователь меняет в приложении
+# оператора — их держим короче; состав домофонов/камер и баланс — редко.
+REFRESH_INTERVALS: dict[str, float] = {
+    KIND_PLACES: 60 * 60,
+    KIND_BALANCE: 6 * 60 * 60,
+    KIND_SCREENS: 30 * 60,
+    KIND_ACCESS_CONTROLS: 6 * 60 * 60,
+    KIND_CAMERAS: 6 * 60 * 60,
+    KIND_PUBLIC_CAMERAS: 6 * 60 * 60,
+    KIND_DND: 15 * 60,
+}
+
+# Потолок backoff-а при неизменных ответах. Не выше `MAX_STALENESS`: иначе
+# сбой на сроке выбросил бы last-known-good данные.
+MAX_INTERVALS: dict[str, float] = {
+    KIND_PLACES: 6 * 60 * 60,
+    KIND_BALANCE: REFRESH_INTERVALS[KIND_BALANCE],
+    KIND_SCREENS: 2 * 60 * 60,
+    KIND_ACCESS_CONTROLS: 12 * 60 * 60,
+    KIND_CAMERAS: 12 * 60 * 60,
+    KIND_PUBLIC_CAMERAS: 12 * 60 * 60,
+    KIND_DND: 60 * 60,
+}
+
+# Быстрый интервал после активности в place (= тик coordinator-а).
+FAST_INTERVAL: float = 5 * 60
+
+# Что может поменяться вокруг действия пользователя или звонка: DND, видимость
+# в приложении, домофоны. Баланс и списки камер живут своими сроками.
+ACTIVITY_KINDS: tuple[str, ...] = (KIND_DND, KIND_SCREENS, KIND_ACCESS_CONTROLS)
+
+# Сколько последний удачный результат вида переживает сбои fetch-а. Состав
+# домофонов/камер и баланс за сутки почти не меняются — лучше показать их с
+# `stale_since`, чем уронить entity в unavailable. DND — то, что пользователь
+# переключает сам: устаревшее состояние держим недолго.
+MAX_STALENESS: dict[str, float] = {
+    KIND_BALANCE: 24 * 60 * 60,
+    KIND_SCREENS: 24 * 60 * 60,
+    KIND_ACCESS_CONTROLS: 24 * 60 * 60,
+    KIND_CAMERAS: 24 * 60 * 60,
+    KIND_PUBLIC_CAMERAS: 24 * 60 * 60,
+    KIND_DND: 2 * 60 * 60,
+}
+
+# Окно «скоро блокировка / платёж»: там баланс опрашивается часто.
+BALANCE_NEAR_DAYS = 3
+BALANCE_NEAR_INTERVAL: float = 30 * 60
+
+
+def balance_refresh_interval(balance: dict[str, Any] | None, now: datetime) -> float:
+    """Интервал баланса place-а по его последней записи (см. module docstring)."""
+    interval = REFRESH_INTERVALS[KIND_BALANCE]
+    if not balance:
+        return interval
+    if balance.get("blocked"):
+        return BALANCE_NEAR_INTERVAL
+
+    days_to_block = balance.get("days_to_block")
+    if isinstance(days_to_block, (int, float)):
+        if days_to_block <= BALANCE_NEAR_DAYS:
+            return BALANCE_NEAR_INTERVAL
+        interval = min(interval, (days_to_block - BALANCE_NEAR_DAYS) * 86400)
+
+    target = None
+    if payment_date := balance.get("payment_date"):
+        try:
+            target = datetime.fromisoformat(str(payment_date)).date()
+        except ValueError:
+            target = None
+    # Дата платежа в прошлом (оператор её не сдвинул) — не повод долбить API.
+    if target is not None and target >= now.date():
+        window_start = datetime.combine(
+            target - timedelta(days=BALANCE_NEAR_DAYS), dt_time.min, now.tzinfo
+        )
+        until_window = (window_start - now).total_seconds()
+        if until_window <= 0:
+            return BALANCE_NEAR_INTERVAL
+        interval = min(interval, until_window)
+
+    return max(interval, BALANCE_NEAR_INTERVAL)
+
+
+class RefreshSchedule:
+    """Сроки следующего fetch-а по `(kind, scope)`; scope — place_id или аккаунт."""
+
+    def __init__(
+        self,
+        intervals: dict[str, float] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._intervals = {**REFRESH_INTERVALS, **(intervals or {})}
+        self._max_intervals = {
+            kind: max(interval, MAX_INTERVALS.get(kind, interval))
+            for kind, interval in self._intervals.items()
+        }
+        self._clock = clock
+        self._due: dict[tuple[str, str], float] = {}
+        self._fetched_at: dict[tuple[str, str], float] = {}
+        # Текущий адаптивный интервал slice-а (нет записи — базовый).
+        self._effective: dict[tuple[str, str], float] = {}
+        self._last_interval: dict[str, float] = {}
+        self.fetched = {kind: 0 for kind in self._intervals}
+        self.skipped = {kind: 0 for kind in self._intervals}
+        self.failed = {kind: 0 for kind in self._intervals}
+        self.retained = {kind: 0 for kind in self._intervals}
+        self.snap_backs = {kind: 0 for kind in self._intervals}
+
+    def is_due(self, kind: str, scope: str = ACCOUNT_SCOPE) -> bool:
+        """Пора ли запрашивать; не запрашивавшийся ещё `(kind, scope)` — пора."""
+        due = self._due.get((kind, scope))
+        if due is None or self._clock() >= due:
+            return True
+        self.skipped[kind] += 1
+        return False
+
+    def mark_fetched(
+        self,
+        kind: str,
+        scope: str = ACCOUNT_SCOPE,
+        interval: float | None = None,
+        *,
+        changed: bool = True,
+    ) -> None:
+        """Успешный fetch: следующий через адаптивный интервал slice-а.
+
+        `changed=False` (ответ тот же, что в кэше) удваивает интервал до
+        `MAX_INTERVALS[kind]`, изменение возвращает его не выше базового.
+        `interval` — потолок из самих данных (баланс у блокировки).
+        """
+        key = (kind, scope)
+        base = self._intervals[kind]
+        current = self._effective.get(key, base)
+        if changed:
+            effective = min(current, base)
+        else:
+            effective = min(current * 2, self._max_intervals[kind])
+        self._effective[key] = effective
+        if interval is not None:
+            interval = min(interval, effective)
+        else:
+            interval = effective
+        now = self._clock()
+        self._due[(kind, scope)] = now + interval
+        self._fetched_at[(kind, scope)] = now
+        self._last_interval[kind] = interval
+        self.fetched[kind] += 1
+
+    def mark_failed(
+        self, kind: str, scope: str = ACCOUNT_SCOPE, *, retained: bool = False
+    ) -> None:
+        """Сбой: повтор на следующем тике; `retained` — отдан прошлый результат."""
+        self._due.pop((kind, scope), None)
+        self.failed[kind] += 1
+        if retained:
+            self.retained[kind] += 1
+        else:
+            self._fetched_at.pop((kind, scope), None)
+
+    def age(self, kind: str, scope: str = ACCOUNT_SCOPE) -> float | None:
+        """Секунды с последнего удачного fetch-а (None — удачного не было)."""
+        fetched_at = self._fetched_at.get((kind, scope))
+        if fetched_at is None:
+            return None
+        return self._clock() - fetched_at
+
+    def snap_back(self, scope: str, kinds: tuple[str, ...] = ACTIVITY_KINDS) -> None:
+        """Активность в place: `kinds` — с `FAST_INTERVAL`, срок не позже него."""
+        due = self._clock() + FAST_INTERVAL
+        for kind in kinds:
+            key = (kind, scope)
+            self._effective[key] = min(
+                self._effective.get(key, self._intervals[kind]), FAST_INTERVAL
+            )
+            if key in self._due:
+                self._due[key] = min(self._due[key], due)
+            self.snap_backs[kind] += 1
+
+    def effective_interval(self, kind: str, scope: str = ACCOUNT_SCOPE) -> float:
+        """Текущий адаптивный интервал slice-а."""
+        return self._effective.get((kind, scope), self._intervals[kind])
+
+    def invalidate(self, kind: str, scope: str | None = None) -> None:
+        """Сбросить срок `kind` (для одного scope или всех)."""
+        if scope is not None:
+            self._due.pop((kind, scope), None)
+            return
+        for key in [key for key in self._due if key[0] == kind]:
+            del self._due[key]
+
+    def retain_scopes(self, scopes: set[str]) -> None:
+        """Забыть places, которых больше нет в аккаунте."""
+        for table in (self._due, self._fetched_at, self._effective):
+            for key in [
+                key for key in table
+                if key[1] != ACCOUNT_SCOPE and key[1] not in scopes
+            ]:
+                del table[key]
+
+    def stats(self) -> dict[str, Any]:
+        """Снимок для diagnostics — по видам, без place_id."""
+        now = self._clock()
+        result: dict[str, Any] = {}
+        for kind, interval in self._intervals.items():
+            dues = [due for (due_kind, _), due in self._due.items() if due_kind == kind]
+            # Адаптивные интервалы slice-ов вида (по возрастанию, без scope).
+            effective = sorted(
+                round(value, 1)
+                for (effective_kind, _), value in self._effective.items()
+                if effective_kind == kind
+            )
+            result[kind] = {
+                "interval_s": interval,
+                "max_interval_s": self._max_intervals[kind],
+                "effective_s": effective,
+                "last_interval_s": round(self._last_interval.get(kind, interval), 1),
+                "next_due_s": round(max(0.0, min(dues) - now), 1) if dues else 0.0,
+                "fetched": self.fetched[kind],
+                "skipped": self.skipped[kind],
+                "failed": self.failed[kind],
+                "retained": self.retained[kind],
+                "snap_backs": self.snap_backs[kind],
+            }
+        return result
@@ -20,8 +20,9 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import UnitOfTime
-from homeassistant.core import Event, HomeAssistant, callback
-from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
@@ -37,9 +38,14 @@ from .const import (
     DOMAIN,
     EVENT_CALL_STATE,
     LOGGER,
+    SIGNAL_STREAM_MANAGER,
     STREAM_MANAGER_DATA,
 )
 from .coordinator import ElektronnyGorodUpdateCoordinator
+from .history import place_display_name
+from .metrics import percentile_from_buckets
+from .session_ttl import SessionTtlModel
+from .snapshot_index import RECORD_ACCESS_CONTROLS, RECORD_BALANCES, data_index
 from .stream_manager import (
     BACKGROUND_REFRESH_INTERVAL,
     CameraStreamManager,
@@ -55,37 +61,78 @@ async def async_setup_entry(
     """Set up Elektronny Gorod Sensors (balance + days_to_block per place)."""
     coordinator: ElektronnyGorodUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    balances = (coordinator.data or {}).get("balances") or []
     entities: list[SensorEntity] = []
     stream_manager: CameraStreamManager | None = hass.data.get(
         STREAM_MANAGER_DATA,
         {},
     ).get(entry.entry_id)
+    rtsp_sensor: ElektronnyGorodRtspUrlsSensor | None = None
     if stream_manager is not None:
-        entities.append(
-            ElektronnyGorodRtspUrlsSensor(stream_manager, entry.entry_id)
+        rtsp_sensor = ElektronnyGorodRtspUrlsSensor(stream_manager, entry.entry_id)
+        entities.append(rtsp_sensor)
+
+    @callback
+    def _async_stream_manager_changed(
+        manager: CameraStreamManager | None,
+    ) -> None:
+        """Hot-apply go2rtc-опций: сенсор появляется / перепривязывается."""
+        nonlocal rtsp_sensor
+        if rtsp_sensor is not None:
+            rtsp_sensor.async_set_manager(manager)
+        elif manager is not None:
+            rtsp_sensor = ElektronnyGorodRtspUrlsSensor(manager, entry.entry_id)
+            async_add_entities([rtsp_sensor])
+
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_STREAM_MANAGER.format(entry.entry_id),
+            _async_stream_manager_changed,
         )
-    for balance_info in balances:
-        place_id = balance_info["place_id"]
-        entities.append(ElektronnyGorodBalanceSensor(coordinator, place_id))
-        entities.append(ElektronnyGorodDaysToBlockSensor(coordinator, place_id))
-
-    # call_state — одна сущность на домофон (дедуп по (place_id, access_control_id),
-    # как event.py: FCM-payload несёт AccessControlId, не entrance). Push-driven
-    # через EVENT_CALL_STATE (sip/call_controller.py) — единый источник фазы вызова.
-    locks = (coordinator.data or {}).get("locks") or []
-    by_ac: dict[tuple, dict] = {}
-    for lk in locks:
-        key = (lk.get("place_id"), lk.get("access_control_id"))
-        if None in key:
-            continue
-        cur = by_ac.get(key)
-        if cur is None or str(lk.get("entrance_id") or "") < str(cur.get("entrance_id") or ""):
-            by_ac[key] = lk
-    entities.extend(ElektronnyGorodCallStateSensor(lk) for lk in by_ac.values())
+    )
+    # Метрики operator API (metrics.py) — выключены по умолчанию; включаются
+    # пользователем для алертов на деградацию без debug-логов.
+    entities.append(ElektronnyGorodApiLatencySensor(coordinator, entry.entry_id))
+    entities.append(ElektronnyGorodApiErrorsSensor(coordinator, entry.entry_id))
 
     async_add_entities(entities)
 
+    # Балансовые сенсоры — per place; call_state — одна сущность на домофон
+    # (`SnapshotIndex.access_controls`, как event.py: FCM-payload несёт
+    # AccessControlId, не entrance). Push-driven через EVENT_CALL_STATE
+    # (sip/call_controller.py) — единый источник фазы вызова. Новые place-ы и
+    # домофоны добавляются по diff-у coordinator-а, без reload entry.
+    known_places: set[str] = set()
+    known_access_controls: set[tuple[str, str]] = set()
+
+    @callback
+    def _async_add_new_records() -> None:
+        index = data_index(coordinator.data)
+        new_entities: list[SensorEntity] = []
+        for place_id, balance_info in index.balances.items():
+            if place_id in known_places:
+                continue
+            known_places.add(place_id)
+            new_entities.append(
+                ElektronnyGorodBalanceSensor(coordinator, balance_info["place_id"])
+            )
+            new_entities.append(
+                ElektronnyGorodDaysToBlockSensor(coordinator, balance_info["place_id"])
+            )
+        for ac_key, lock_info in index.access_controls.items():
+            if ac_key in known_access_controls:
+                continue
+            known_access_controls.add(ac_key)
+            new_entities.append(ElektronnyGorodCallStateSensor(lock_info))
+        if new_entities:
+            async_add_entities(new_entities)
+
+    entry.async_on_unload(
+        coordinator.async_track_records(
+            (RECORD_BALANCES, RECORD_ACCESS_CONTROLS), _async_add_new_records
+        )
+    )
+
 
 class ElektronnyGorodRtspUrlsSensor(SensorEntity):
     """Actual freshness of integration-owned external RTSP registrations."""
@@ -100,22 +147,55 @@ class ElektronnyGorodRtspUrlsSensor(SensorEntity):
         manager: CameraStreamManager,
         entry_id: str,
     ) -> None:
-        self._manager = manager
+        self._manager: CameraStreamManager | None = manager
+        self._unsub_manager: CALLBACK_TYPE | None = None
         self._attr_unique_id = f"{DOMAIN}_{entry_id}_go2rtc_rtsp_urls"
 
     async def async_added_to_hass(self) -> None:
         """Subscribe to manager-owned sanitized state changes."""
         await super().async_added_to_hass()
-        self.async_on_remove(
-            self._manager.async_subscribe(self._handle_manager_update)
-        )
+        self._subscribe_manager()
+        self.async_on_remove(self._unsubscribe_manager)
+
+    def _subscribe_manager(self) -> None:
+        if self._manager is not None:
+            self._unsub_manager = self._manager.async_subscribe(
+                self._handle_manager_update
+            )
+
+    def _unsubscribe_manager(self) -> None:
+        if self._unsub_manager is not None:
+            self._unsub_manager()
+            self._unsub_manager = None
+
+    @callback
+    def async_set_manager(self, manager: CameraStreamManager | None) -> None:
+        """Rebind after an options hot-apply; None (go2rtc off) = unavailable."""
+        self._unsubscribe_manager()
+        self._manager = manager
+        if self.hass is None:
+            return
+        self._subscribe_manager()
+        self.async_write_ha_state()
+
+    @property
+    def available(self) -> bool:
+        """Unavailable while go2rtc is disabled in the entry options."""
+        return self._manager is not None
 
     @callback
     def _handle_manager_update(self) -> None:
         self.async_write_ha_state()
 
+    def _refresh_window(self) -> float:
+        """Learned refresh interval of the manager (28m30s until learned)."""
+        model = getattr(self._manager, "session_ttl", None)
+        if isinstance(model, SessionTtlModel):
+            return model.refresh_interval()
+        return BACKGROUND_REFRESH_INTERVAL.total_seconds()
+
     @staticmethod
-    def _is_fresh(state: ManagedCameraState, now: float) -> bool:
+    def _is_fresh(state: ManagedCameraState, now: float, window: float) -> bool:
         """A registration is truthful only inside the verified refresh TTL."""
         if (
             not state.eligible
@@ -127,24 +207,30 @@ class ElektronnyGorodRtspUrlsSensor(SensorEntity):
         ):
             return False
         age = now - state.last_success_monotonic
-        return 0 <= age <= BACKGROUND_REFRESH_INTERVAL.total_seconds()
+        return 0 <= age <= window
 
     @property
     def native_value(self) -> int:
-        """Count present, eligible registrations refreshed within 28m30s."""
+        """Count present, eligible registrations refreshed within the window."""
+        if self._manager is None:
+            return 0
         now = time.monotonic()
+        window = self._refresh_window()
         return sum(
-            self._is_fresh(state, now)
+            self._is_fresh(state, now, window)
             for state in self._manager.camera_states()
         )
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Expose only stable credential-free URLs and sanitized state."""
+        if self._manager is None:
+            return {}
         now = time.monotonic()
+        window = self._refresh_window()
         states = self._manager.camera_states()
         fresh_states = [
-            state for state in states if self._is_fresh(state, now)
+            state for state in states if self._is_fresh(state, now, window)
         ]
         urls = {
             state.display_name: self._manager.client.rtsp_url(
@@ -211,32 +297,12 @@ class ElektronnyGorodBalanceSensor(
         entity при регистрации в state machine. Поэтому достаём
         `visibleAddress` (готовая строка) или собираем fallback.
         """
-        places = (self.coordinator.data or {}).get("places") or []
-        for subscriber_place in places:
-            place = subscriber_place.get("place") or {}
-            if place.get("id") != self._place_id:
-                continue
-            addr = place.get("address")
-            if isinstance(addr, dict):
-                visible = addr.get("visibleAddress")
-                if isinstance(visible, str) and visible:
-                    return visible
-            if isinstance(addr, str) and addr:
-                return addr
-            name = place.get("name")
-            if isinstance(name, str) and name:
-                return name
-            break
-        return f"Place {self._place_id}"
+        return place_display_name(self.coordinator.data, str(self._place_id))
 
     @property
     def _balance_info(self) -> dict[str, Any] | None:
         """Найти balance для нашего place_id в текущем coordinator.data."""
-        balances = (self.coordinator.data or {}).get("balances") or []
-        for entry in balances:
-            if entry.get("place_id") == self._place_id:
-                return entry
-        return None
+        return data_index(self.coordinator.data).balances.get(str(self._place_id))
 
     @property
     def available(self) -> bool:
@@ -279,17 +345,22 @@ class ElektronnyGorodBalanceSensor(
             except (TypeError, ValueError):
                 target_date = payment_date
 
-        return {
+        attributes = {
             "Amount sum": amount_sum,
             "Target date": target_date,
             "Payment link": info.get("payment_link"),
             "Blocked": info.get("blocked"),
         }
+        # Баланс из last-known-good кэша после сбоя fetch-а (см. coordinator).
+        if stale_since := info.get("stale_since"):
+            attributes["Stale since"] = stale_since
+        return attributes
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Coordinator обновился — нашу state читаем из coordinator.data в propertах."""
-        self.async_write_ha_state()
+        if self.coordinator.record_changed(RECORD_BALANCES, str(self._place_id)):
+            self.async_write_ha_state()
 
 
 class ElektronnyGorodDaysToBlockSensor(
@@ -324,11 +395,7 @@ class ElektronnyGorodDaysToBlockSensor(
 
     @property
     def _balance_info(self) -> dict[str, Any] | None:
-        balances = (self.coordinator.data or {}).get("balances") or []
-        for entry in balances:
-            if entry.get("place_id") == self._place_id:
-                return entry
-        return None
+        return data_index(self.coordinator.data).balances.get(str(self._place_id))
 
     @property
     def available(self) -> bool:
@@ -348,9 +415,117 @@ class ElektronnyGorodDaysToBlockSensor(
 
     @callback
     def _handle_coordinator_update(self) -> None:
+        if self.coordinator.record_changed(RECORD_BALANCES, str(self._place_id)):
+            self.async_write_ha_state()
+
+
+def _account_device_info(entry_id: str) -> DeviceInfo:
+    """Service-device аккаунта (entry): сенсоры уровня интеграции, не place."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, f"{entry_id}_account")},
+        name="Электронный город",
+        manufacturer="Электронный город",
+        entry_type=DeviceEntryType.SERVICE,
+    )
+
+
+class ElektronnyGorodApiLatencySensor(
+    CoordinatorEntity[ElektronnyGorodUpdateCoordinator], SensorEntity
+):
+    """p95 latency operator API за окно между тиками coordinator-а.
+
+    Окно (а не накопленный p95) — чтобы деградация была видна сразу, а не
+    размывалась историей с момента старта.
+    """
+
+    _attr_has_entity_name = True
+    _attr_translation_key = "api_latency_p95"
+    _attr_icon = "mdi:timer-outline"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self,
+        coordinator: ElektronnyGorodUpdateCoordinator,
+        entry_id: str,
+    ) -> None:
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{DOMAIN}_{entry_id}_api_latency_p95"
+        self._attr_device_info = _account_device_info(entry_id)
+        self._last_buckets: list[int] | None = None
+        self._window_p95: float | None = None
+        self._window_requests = 0
+
+    def _roll_window(self) -> None:
+        buckets = list(self.coordinator.api.http.metrics.total.buckets)
+        previous = self._last_buckets or [0] * len(buckets)
+        window = [now - before for now, before in zip(buckets, previous)]
+        self._last_buckets = buckets
+        self._window_requests = sum(window)
+        self._window_p95 = percentile_from_buckets(window, 0.95)
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self._roll_window()
+
+    @property
+    def native_value(self) -> float | None:
+        return self._window_p95
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        endpoints = self.coordinator.api.http.metrics.stats()["endpoints"]
+        slowest = sorted(
+            endpoints.items(),
+            key=lambda item: item[1]["p95_ms"] or 0,
+            reverse=True,
+        )[:5]
+        return {
+            "window_requests": self._window_requests,
+            "slowest_endpoints": {
+                template: stats["p95_ms"] for template, stats in slowest
+            },
+        }
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._roll_window()
         self.async_write_ha_state()
 
 
+class ElektronnyGorodApiErrorsSensor(
+    CoordinatorEntity[ElektronnyGorodUpdateCoordinator], SensorEntity
+):
+    """Накопленное число неуспешных попыток к operator API (4xx/5xx/сеть)."""
+
+    _attr_has_entity_name = True
+    _attr_translation_key = "api_errors"
+    _attr_icon = "mdi:alert-circle-outline"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(
+        self,
+        coordinator: ElektronnyGorodUpdateCoordinator,
+        entry_id: str,
+    ) -> None:
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{DOMAIN}_{entry_id}_api_errors"
+        self._attr_device_info = _account_device_info(entry_id)
+
+    @property
+    def native_value(self) -> int:
+        return self.coordinator.api.http.metrics.total.error_count
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return {"by_status": dict(self.coordinator.api.http.metrics.total.errors)}
+
+
 class ElektronnyGorodCallStateSensor(SensorEntity):
     """Фаза вызова домофона (idle/ringing/connecting/active/ended/error).
 
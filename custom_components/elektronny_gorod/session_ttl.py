@@ -0,0 +1,187 @@
+"""Выученный срок жизни operator stream-сессии (forpost).
+
+Фоновый refresh stream manager-а (`BACKGROUND_REFRESH_INTERVAL`) и proactive
+keep-alive камер (`GO2RTC_PROACTIVE_REFRESH_INTERVAL`) были зашиты в 28:30 —
+95 % от одного наблюдения обрыва сессии на 30:00 (ADR-0009). Сократит
+оператор сессию — видео замерзает до recovery; продлит — лишние сессии.
+
+Модель учится на фактическом времени жизни producer-а: от PATCH-а свежего
+URL в go2rtc до момента, когда `bytes_recv` перестал расти при живых
+consumers (`StreamHealth.frozen`) / сработал recovery stream manager-а.
+
+- Скользящее окно последних `SAMPLE_WINDOW` наблюдений не старше
+  `SAMPLE_MAX_AGE` — общее на аккаунт: обрыв сессии у бэкенда одинаков для
+  всех камер. Последнее наблюдение каждой камеры — для diagnostics.
+- Наблюдаемый минимум — `TTL_PERCENTILE`-й перцентиль окна (nearest-rank).
+  Пока наблюдений меньше `MIN_SAMPLES` — `SESSION_TTL_DEFAULT`: один-два
+  обрыва по сети интервал не трогают.
+- Свидетельство TTL — только обрыв в полосе у текущей оценки: обрыв раньше
+  `EVIDENCE_BAND` от неё считается как нижняя граница полосы. Настоящее
+  сокращение сессии оценка догоняет шагами, случайный ранний обрыв сдвигает
+  её не больше чем на один шаг.
+- Восстановление: сессия, продлённая на текущем интервале живой
+  (`record_survival`), вытесняет из окна самое старое наблюдение обрыва —
+  пока продления проходят, оценка возвращается к `SESSION_TTL_DEFAULT`.
+- Refresh — на `SAFETY_FRACTION` от наблюдаемого минимума (0.95: 28:30 при
+  30:00), в пределах `MIN_REFRESH_INTERVAL` … `MAX_REFRESH_INTERVAL`.
+- Обрыв раньше `MIN_LIFETIME` — не истечение сессии (сеть, go2rtc), в окно
+  не идёт; второй обрыв той же камеры в пределах `MIN_LIFETIME` — то же
+  наблюдение, пришедшее другим путём (health snapshot + recovery).
+- Сжатие TTL заметнее чем на `SHRINK_ALERT_RATIO` — WARNING в лог и
+  счётчик `alerts` в diagnostics.
+
+Параметры модели — константы модуля, не опции entry: их подбирают по
+наблюдениям сессий, а не пользователь. Время — монотонные секунды (`clock`
+подменяется в тестах).
+"""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+import math
+import time
+from typing import Any
+
+from .const import LOGGER
+
+# Наблюдаемый TTL forpost-сессии (ADR-0009) — до первых наблюдений.
+SESSION_TTL_DEFAULT = 30 * 60
+# Refresh на такой доле наблюдаемого минимума (28:30 от 30:00).
+SAFETY_FRACTION = 0.95
+# Перцентиль окна, который считается наблюдаемым минимумом.
+TTL_PERCENTILE = 10
+SAMPLE_WINDOW = 50
+SAMPLE_MAX_AGE = 24 * 60 * 60
+# Столько наблюдений в окне нужно, чтобы уйти от SESSION_TTL_DEFAULT.
+MIN_SAMPLES = 5
+# Обрыв раньше этой доли текущей оценки TTL — свидетельство только её доли.
+EVIDENCE_BAND = 0.75
+# Продление, прошедшее на такой доле текущего интервала, — «сессия выжила».
+SURVIVAL_FRACTION = 0.9
+MIN_LIFETIME = 60
+MIN_REFRESH_INTERVAL = 5 * 60
+MAX_REFRESH_INTERVAL = 60 * 60
+SHRINK_ALERT_RATIO = 0.9
+
+
+@dataclass(slots=True)
+class _Sample:
+    camera_id: str
+    lifetime: float
+    # Lifetime, ограниченный снизу полосой свидетельства на момент записи.
+    evidence: float
+    observed: float
+
+
+class SessionTtlModel:
+    """Скользящее распределение времени жизни сессий → интервал refresh-а."""
+
+    def __init__(self, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._samples: deque[_Sample] = deque(maxlen=SAMPLE_WINDOW)
+        self._last: dict[str, _Sample] = {}
+        self._alert_level: float = SESSION_TTL_DEFAULT
+        self.recorded = 0
+        self.ignored = 0
+        self.clamped = 0
+        self.survived = 0
+        self.alerts = 0
+
+    def record(self, camera_id: str, lifetime: float) -> bool:
+        """Producer камеры прожил `lifetime` с. False — не наблюдение."""
+        now = self._clock()
+        previous = self._last.get(camera_id)
+        if lifetime < MIN_LIFETIME or (
+            previous is not None and now - previous.observed < MIN_LIFETIME
+        ):
+            self.ignored += 1
+            return False
+        floor = self.session_ttl() * EVIDENCE_BAND
+        if lifetime < floor:
+            self.clamped += 1
+        sample = _Sample(
+            camera_id=camera_id,
+            lifetime=lifetime,
+            evidence=max(lifetime, floor),
+            observed=now,
+        )
+        self._samples.append(sample)
+        self._last[camera_id] = sample
+        self.recorded += 1
+        self._check_shrink()
+        return True
+
+    def record_survival(self, camera_id: str, age: float) -> bool:
+        """Сессию камеры продлили живой через `age` с после PATCH-а.
+
+        Продление на текущем интервале вытесняет самое старое наблюдение
+        обрыва. False — продление раньше срока или окно уже пусто.
+        """
+        if age < self.refresh_interval() * SURVIVAL_FRACTION:
+            return False
+        if not self._window():
+            return False
+        self._samples.popleft()
+        self.survived += 1
+        self._check_shrink()
+        return True
+
+    def last_lifetime(self, camera_id: str) -> float | None:
+        sample = self._last.get(camera_id)
+        return sample.lifetime if sample is not None else None
+
+    def session_ttl(self) -> float:
+        """Наблюдаемый минимум времени жизни сессии, секунды."""
+        lifetimes = sorted(sample.evidence for sample in self._window())
+        if len(lifetimes) < MIN_SAMPLES:
+            return SESSION_TTL_DEFAULT
+        rank = math.ceil(TTL_PERCENTILE / 100 * len(lifetimes))
+        return lifetimes[max(rank - 1, 0)]
+
+    def refresh_interval(self) -> float:
+        """Через сколько секунд после PATCH-а продлевать сессию."""
+        return min(
+            max(self.session_ttl() * SAFETY_FRACTION, MIN_REFRESH_INTERVAL),
+            MAX_REFRESH_INTERVAL,
+        )
+
+    def _window(self) -> list[_Sample]:
+        cutoff = self._clock() - SAMPLE_MAX_AGE
+        while self._samples and self._samples[0].observed < cutoff:
+            self._samples.popleft()
+        return list(self._samples)
+
+    def _check_shrink(self) -> None:
+        ttl = self.session_ttl()
+        if ttl < self._alert_level * SHRINK_ALERT_RATIO:
+            self.alerts += 1
+            LOGGER.warning(
+                "Operator stream session TTL shrank to %.0fs (was %.0fs); "
+                "refreshing streams every %.0fs",
+                ttl,
+                self._alert_level,
+                self.refresh_interval(),
+            )
+            self._alert_level = ttl
+        elif ttl >= SESSION_TTL_DEFAULT:
+            self._alert_level = SESSION_TTL_DEFAULT
+
+    def stats(self) -> dict[str, Any]:
+        """Счётчики для diagnostics."""
+        window = self._window()
+        return {
+            "samples": len(window),
+            "session_ttl_s": round(self.session_ttl(), 1),
+            "refresh_interval_s": round(self.refresh_interval(), 1),
+            "min_lifetime_s": (
+                round(min(sample.lifetime for sample in window), 1)
+                if window
+                else None
+            ),
+            "recorded": self.recorded,
+            "ignored": self.ignored,
+            "clamped": self.clamped,
+            "survived": self.survived,
+            "alerts": self.alerts,
+        }
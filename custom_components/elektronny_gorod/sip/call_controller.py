@@ -138,6 +138,14 @@ class DoorbellCallController:
         self._last_call_id: str | None = None
         self._call_started_at: str | None = None
 
+    @callback
+    def set_go2rtc(self, go2rtc: Go2RtcConfig | None) -> None:
+        """Новый go2rtc-конфиг из опций (hot-apply, без reload entry).
+
+        Удерживаемый/идущий вызов не рвётся: мост уже поднят, новый конфиг
+        действует со следующего моста и его teardown-а."""
+        self._go2rtc = go2rtc
+
     # ---- трекинг активного вызова (из SIGNAL_DOORBELL) ----
     @callback
     def handle_signal(self, payload: dict[str, Any]) -> None:
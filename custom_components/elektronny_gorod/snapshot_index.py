@@ -0,0 +1,202 @@
+"""Индексированный снимок `coordinator.data` для O(1) lookup-ов entity.
+
+Раньше каждая entity на каждый state write искала свою запись линейным
+проходом по спискам `coordinator.data` (`available` камеры — по всем
+камерам, lock — по всем locks, квартира/имя места — по всем places). На
+аккаунтах с сотнями public-камер один тик стоил O(entities × cameras).
+
+Coordinator строит `SnapshotIndex` один раз за тик и кладёт его в
+`data[INDEX_KEY]`; entity читают через `data_index(data)`:
+
+- `cameras` — по `str(camera_id)`;
+- `locks` — по `(place_id, access_control_id, entrance_id)` (значения как в
+  записи lock-а, без нормализации — так сравнивал прежний поиск);
+- `places` / `balances` / `dnd` / `stale` — по `str(place_id)` (`stale` —
+  виды данных place-а, отданные из last-known-good кэша: `{kind: since}`);
+- `access_controls` — домофоны `(str(place_id), str(access_control_id))` →
+  lock с минимальным `entrance_id` (стабильный intercom-device; производный,
+  строится из `locks`).
+
+Значения — те же объекты записей, что в списках (не копии). Маппинги
+read-only (`MappingProxyType`). При первом совпадении id побеждает первая
+запись — как у прежнего линейного поиска.
+
+`data_index` проверяет, что индекс построен из тех же списков, что сейчас
+лежат в `data` (сравнение identity, O(1)); иначе — например, `data` собран
+вручную в тестах или список подменён — индекс строится заново.
+
+`diff_indexes` сравнивает два индекса по ключам записей: coordinator будит
+только entity, чья запись (`RECORD_*`, ключ) изменилась (см.
+`ElektronnyGorodUpdateCoordinator.record_changed`). Платформы по тому же diff
+добавляют entity для появившихся ключей (`async_track_records`).
+"""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any
+
+INDEX_KEY = "index"
+
+# Виды записей индекса (= имена полей `SnapshotIndex`).
+RECORD_CAMERAS = "cameras"
+RECORD_LOCKS = "locks"
+RECORD_PLACES = "places"
+RECORD_BALANCES = "balances"
+RECORD_DND = "dnd"
+RECORD_STALE = "stale"
+RECORD_ACCESS_CONTROLS = "access_controls"
+# Виды, лежащие в `data` (по ним проверяется свежесть индекса).
+_SOURCE_KINDS = (
+    RECORD_CAMERAS,
+    RECORD_LOCKS,
+    RECORD_PLACES,
+    RECORD_BALANCES,
+    RECORD_DND,
+    RECORD_STALE,
+)
+_RECORD_KINDS = (*_SOURCE_KINDS, RECORD_ACCESS_CONTROLS)
+
+LockKey = tuple[Any, Any, Any]
+AccessControlKey = tuple[str, str]
+# Запись снимка: `records.py` от coordinator-а или dict (тесты, старые снимки).
+Record = Mapping[str, Any]
+
+_EMPTY: Mapping[Any, Any] = MappingProxyType({})
+
+
+@dataclass(frozen=True, slots=True)
+class SnapshotIndex:
+    """Read-only индексы одного снимка coordinator-а."""
+
+    cameras: Mapping[str, Record] = _EMPTY
+    locks: Mapping[LockKey, Record] = _EMPTY
+    places: Mapping[str, dict[str, Any]] = _EMPTY
+    balances: Mapping[str, Record] = _EMPTY
+    dnd: Mapping[str, list[dict[str, Any]]] = _EMPTY
+    stale: Mapping[str, dict[str, str]] = _EMPTY
+    access_controls: Mapping[AccessControlKey, Record] = _EMPTY
+    # Списки, из которых построен индекс (для проверки свежести).
+    _sources: tuple[Any, ...] = field(default=(), compare=False, repr=False)
+
+    @classmethod
+    def build(cls, data: Mapping[str, Any]) -> SnapshotIndex:
+        """Один проход по спискам снимка."""
+        cameras: dict[str, Record] = {}
+        for camera in data.get("cameras") or []:
+            cameras.setdefault(str(camera.get("id") or ""), camera)
+
+        locks: dict[LockKey, Record] = {}
+        for lock in data.get("locks") or []:
+            locks.setdefault(
+                (
+                    lock.get("place_id"),
+                    lock.get("access_control_id"),
+                    lock.get("entrance_id"),
+                ),
+                lock,
+            )
+
+        # Один домофон — один lock-представитель (min entrance_id), как
+        # дедуп event/call_state entity по FCM `AccessControlId`.
+        access_controls: dict[AccessControlKey, Record] = {}
+        for lock in locks.values():
+            place_id, ac_id = lock.get("place_id"), lock.get("access_control_id")
+            if place_id is None or ac_id is None:
+                continue
+            ac_key = (str(place_id), str(ac_id))
+            current = access_controls.get(ac_key)
+            if current is None or str(lock.get("entrance_id") or "") < str(
+                current.get("entrance_id") or ""
+            ):
+                access_controls[ac_key] = lock
+
+        places: dict[str, dict[str, Any]] = {}
+        for subscriber_place in data.get("places") or []:
+            place_id = (subscriber_place.get("place") or {}).get("id")
+            if place_id is not None:
+                places.setdefault(str(place_id), subscriber_place)
+
+        balances: dict[str, Record] = {}
+        for balance in data.get("balances") or []:
+            balances.setdefault(str(balance.get("place_id")), balance)
+
+        dnd = {str(place_id): items for place_id, items in (data.get("dnd") or {}).items()}
+        stale = {
+            str(place_id): kinds
+            for place_id, kinds in (data.get("stale") or {}).items()
+        }
+
+        return cls(
+            cameras=MappingProxyType(cameras),
+            locks=MappingProxyType(locks),
+            places=MappingProxyType(places),
+            balances=MappingProxyType(balances),
+            dnd=MappingProxyType(dnd),
+            stale=MappingProxyType(stale),
+            access_controls=MappingProxyType(access_controls),
+            _sources=_sources(data),
+        )
+
+    def place(self, place_id: Any) -> dict[str, Any]:
+        """`place` из subscriber-place записи (пустой dict, если места нет)."""
+        subscriber_place = self.places.get(str(place_id))
+        if subscriber_place is None:
+            return {}
+        return subscriber_place.get("place") or {}
+
+
+EMPTY_INDEX = SnapshotIndex()
+
+
+def _sources(data: Mapping[str, Any]) -> tuple[Any, ...]:
+    return tuple(data.get(kind) for kind in _SOURCE_KINDS)
+
+
+def data_index(data: Mapping[str, Any] | None) -> SnapshotIndex:
+    """Индекс снимка: сохранённый coordinator-ом или построенный на месте."""
+    if not data:
+        return EMPTY_INDEX
+    index = data.get(INDEX_KEY)
+    if isinstance(index, SnapshotIndex):
+        current = _sources(data)
+        if len(current) == len(index._sources) and all(
+            now is source for now, source in zip(current, index._sources)
+        ):
+            return index
+    return SnapshotIndex.build(data)
+
+
+@dataclass(frozen=True, slots=True)
+class SnapshotDiff:
+    """Изменённые записи между двумя уведомлениями; `full` — будить всех."""
+
+    full: bool = False
+    changed: frozenset[tuple[str, Any]] = frozenset()
+
+    def affects(self, kind: str, key: Any) -> bool:
+        return self.full or (kind, key) in self.changed
+
+    def touches(self, kinds: tuple[str, ...]) -> bool:
+        """Мог ли измениться состав записей видов `kinds`."""
+        return self.full or any(kind in kinds for kind, _ in self.changed)
+
+
+FULL_DIFF = SnapshotDiff(full=True)
+
+
+def diff_indexes(old: SnapshotIndex, new: SnapshotIndex) -> SnapshotDiff:
+    """Структурный diff по ключам: добавленные, удалённые и изменённые записи."""
+    changed: set[tuple[str, Any]] = set()
+    for kind in _RECORD_KINDS:
+        before: Mapping[Any, Any] = getattr(old, kind)
+        after: Mapping[Any, Any] = getattr(new, kind)
+        if before is after:
+            continue
+        changed.update(
+            (kind, key)
+            for key in before.keys() | after.keys()
+            if before.get(key) != after.get(key)
+        )
+    return SnapshotDiff(changed=frozenset(changed))
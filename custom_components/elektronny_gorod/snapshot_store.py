@@ -0,0 +1,120 @@
+"""Persisted снимок coordinator-а для быстрого старта без сети.
+
+Раньше `async_setup_entry` ждал `async_config_entry_first_refresh()` — полный
+обход places у оператора — до setup-а платформ: рестарт HA ждал оператора,
+а любой сбой оператора валил setup целиком (`ConfigEntryNotReady`).
+
+Теперь последний удачный снимок `coordinator.data` хранится в `.storage`
+(`Store`, ключ `elektronny_gorod.snapshot.<entry_id>`). Setup строит entity
+из него сразу, а живой refresh идёт в фоне:
+
+- в хранилище только списки снимка (`SNAPSHOT_KEYS`) — без `index`
+  (строится заново) и без токенов / UA (их в снимке и не было); записи
+  `records.py` пишутся dict-ами и при загрузке собираются обратно;
+- запись — отложенная (`SAVE_DELAY`) и только после живого refresh-а с
+  изменениями (см. `ElektronnyGorodUpdateCoordinator.async_update_listeners`);
+- снимок старше `SNAPSHOT_MAX_AGE` всё равно даёт entity, но они
+  unavailable до первого живого refresh-а;
+- битый / чужой payload игнорируется — обычный блокирующий first refresh.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from datetime import datetime
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .records import BalanceRecord, CameraRecord, LockRecord, slim_place
+from .refresh_schedule import REFRESH_INTERVALS
+
+_STORAGE_VERSION = 1
+
+# Списки снимка, которые переживают рестарт (и их ожидаемые типы).
+SNAPSHOT_KEYS: dict[str, type] = {
+    "places": list,
+    "balances": list,
+    "cameras": list,
+    "locks": list,
+    "dnd": dict,
+}
+
+# Списки записей, которые при загрузке собираются обратно в `records.py`.
+_RECORD_TYPES: dict[str, type[BalanceRecord | CameraRecord | LockRecord]] = {
+    "balances": BalanceRecord,
+    "cameras": CameraRecord,
+    "locks": LockRecord,
+}
+
+# Снимок не старше самого долгого срока вида данных — не хуже обычного кэша.
+SNAPSHOT_MAX_AGE: float = max(REFRESH_INTERVALS.values())
+
+# Серия тиков с изменениями пишет файл один раз.
+SAVE_DELAY = 30
+
+
+def snapshot_storage_key(entry_id: str) -> str:
+    """Ключ `.storage` снимка одного config entry."""
+    return f"{DOMAIN}.snapshot.{entry_id}"
+
+
+def sanitize_snapshot(data: Mapping[str, Any]) -> dict[str, Any]:
+    """Только сериализуемые списки снимка (без `index`, записи — dict-ами)."""
+    snapshot = {key: data.get(key) or kind() for key, kind in SNAPSHOT_KEYS.items()}
+    for key in _RECORD_TYPES:
+        snapshot[key] = [dict(record) for record in snapshot[key]]
+    return snapshot
+
+
+def _parse_snapshot(data: Mapping[str, Any]) -> dict[str, Any]:
+    """Снимок из `.storage` в формате coordinator-а (записи `records.py`)."""
+    snapshot = sanitize_snapshot(data)
+    for key, record_type in _RECORD_TYPES.items():
+        snapshot[key] = [record_type.from_mapping(item) for item in snapshot[key]]
+    snapshot["places"] = [slim_place(place) for place in snapshot["places"]]
+    return snapshot
+
+
+class SnapshotStore:
+    """Загрузка / отложенная запись снимка одного config entry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store: Store[dict[str, Any]] = Store(
+            hass, _STORAGE_VERSION, snapshot_storage_key(entry_id)
+        )
+
+    async def async_load(self) -> tuple[dict[str, Any], datetime] | None:
+        """`(снимок, saved_at)` или None, если снимка нет / он не валиден."""
+        stored = await self._store.async_load()
+        if not isinstance(stored, Mapping):
+            return None
+        saved_at = dt_util.parse_datetime(str(stored.get("saved_at") or ""))
+        data = stored.get("data")
+        if saved_at is None or not isinstance(data, Mapping):
+            return None
+        if not all(
+            isinstance(data.get(key), kind) for key, kind in SNAPSHOT_KEYS.items()
+        ):
+            return None
+        try:
+            return _parse_snapshot(data), saved_at
+        except (AttributeError, TypeError):
+            # Не dict в списке записей / нет обязательного поля.
+            return None
+
+    def async_delay_save(self, data_func: Callable[[], Mapping[str, Any]]) -> None:
+        """Запланировать запись; `data_func` читается в момент записи."""
+        self._store.async_delay_save(
+            lambda: {
+                "saved_at": dt_util.utcnow().isoformat(),
+                "data": sanitize_snapshot(data_func()),
+            },
+            SAVE_DELAY,
+        )
+
+    async def async_remove(self) -> None:
+        """Удалить файл снимка (удаление entry)."""
+        await self._store.async_remove()
@@ -4,13 +4,15 @@ from __future__ import annotations
 
 import asyncio
 import hashlib
+import heapq
+import itertools
 import time
 from dataclasses import dataclass, replace
 from datetime import datetime, timedelta, timezone
-from typing import Any, Callable
+from typing import Any, Awaitable, Callable
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.event import async_call_later, async_track_time_interval
 
@@ -27,9 +29,24 @@ from .const import (
     DOMAIN,
     LOGGER,
 )
+from .deadline_scheduler import DeadlineScheduler
 from .go2rtc import Go2RtcClient, Go2RtcRequestError, Go2RtcStreamInfo
+from .go2rtc_monitor import (
+    Go2RtcHealthMonitor,
+    async_acquire_health_monitor,
+    async_release_health_monitor,
+)
+from .rate_limit import (
+    PRIORITY_BACKGROUND as REQUEST_PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE as REQUEST_PRIORITY_INTERACTIVE,
+)
+from .session_ttl import SessionTtlModel
+from .snapshot_index import data_index
+from .stream_url_cache import MIN_REMAINING_OPEN, StreamUrlCache
 
 
+# Default renewal period until the session-TTL model has observed producer
+# deaths (`session_ttl.py`); the live value is `session_ttl.refresh_interval()`.
 BACKGROUND_REFRESH_INTERVAL = timedelta(minutes=28, seconds=30)
 RECONCILE_INTERVAL = timedelta(minutes=1)
 STARTUP_JITTER_MAX_SECONDS = 60.0
@@ -42,6 +59,39 @@ ON_DEMAND_REFRESH_REASONS = frozenset({
     "recovery",
     "active_consumer",
 })
+# Admission of operator-mint + go2rtc-PATCH chains: a go2rtc restart makes
+# reconcile refresh every camera at once. At most `REFRESH_MAX_IN_FLIGHT`
+# chains run concurrently, queued strictly by priority (FIFO inside one);
+# an HA open is admitted immediately and never waits behind background work.
+REFRESH_MAX_IN_FLIGHT = 3
+PRIORITY_HA_OPEN = 0
+REFRESH_PRIORITIES: dict[str, int] = {
+    "ha_open": PRIORITY_HA_OPEN,
+    "active_consumer": 1,
+    "recovery": 2,
+}
+PRIORITY_BACKGROUND = 3
+_PRIORITY_NAMES = {
+    PRIORITY_HA_OPEN: "ha_open",
+    1: "active_consumer",
+    2: "recovery",
+    PRIORITY_BACKGROUND: "background",
+}
+# Remaining operator-session life a cached source URL needs per reason: an
+# open only has to outlive a viewing, a renewal needs an almost full session.
+# Recovery and reconcile always mint — the producer's session is gone. Other
+# reasons need the learned refresh interval.
+SOURCE_MIN_REMAINING: dict[str, float] = {
+    "ha_open": MIN_REMAINING_OPEN,
+}
+SOURCE_MINT_REASONS = frozenset({"recovery", "reconcile"})
+# Scheduled renewals: a live producer renewed by one is evidence that the
+# session outlived the learned refresh interval (`session_ttl.py`).
+RENEWAL_REASONS = frozenset({"background_due", "active_consumer"})
+# Deadline kinds sharing the manager's scheduler: background refresh of a
+# manager-eligible camera and the entity keep-alive for external viewers.
+DUE_REFRESH = "refresh"
+DUE_KEEPALIVE = "keepalive"
 
 
 def _monotonic() -> float:
@@ -49,6 +99,108 @@ def _monotonic() -> float:
     return time.monotonic()
 
 
+def refresh_priority(reason: str) -> int:
+    """Admission priority of a refresh reason (lower runs first)."""
+    return REFRESH_PRIORITIES.get(reason, PRIORITY_BACKGROUND)
+
+
+def request_priority(reason: str) -> int:
+    """Account token-bucket class (`rate_limit.py`) of the operator mint.
+
+    Only a refresh somebody is waiting on competes with interactive
+    requests; reconcile storms and renewals queue behind them.
+    """
+    if reason in ON_DEMAND_REFRESH_REASONS:
+        return REQUEST_PRIORITY_INTERACTIVE
+    return REQUEST_PRIORITY_BACKGROUND
+
+
+class RefreshAdmission:
+    """Bounded-concurrency priority gate for per-camera refresh chains."""
+
+    def __init__(self) -> None:
+        self.max_in_flight = REFRESH_MAX_IN_FLIGHT
+        self.in_flight = 0
+        # (priority, seq, key, future); a promoted waiter leaves a stale
+        # entry behind that shares its future and is skipped once done.
+        self._waiters: list[tuple[int, int, str, asyncio.Future[None]]] = []
+        self._pending: dict[str, tuple[int, asyncio.Future[None]]] = {}
+        self._seq = itertools.count()
+        self.admitted = {name: 0 for name in _PRIORITY_NAMES.values()}
+        self.queued = 0
+        self.promoted = 0
+        self.wait_max = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._pending)
+
+    async def acquire(self, key: str, priority: int) -> None:
+        """Wait for a slot; `release()` must follow every successful return."""
+        if priority == PRIORITY_HA_OPEN or (
+            not self._pending and self.in_flight < self.max_in_flight
+        ):
+            self._admit(priority)
+            return
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        future: asyncio.Future[None] = loop.create_future()
+        self._pending[key] = (priority, future)
+        heapq.heappush(self._waiters, (priority, next(self._seq), key, future))
+        self.queued += 1
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Slot granted, but the owner is gone: hand it on.
+                self.release()
+            raise
+        finally:
+            if self._pending.get(key, (None, None))[1] is future:
+                del self._pending[key]
+        self.wait_max = max(self.wait_max, loop.time() - started)
+
+    def promote(self, key: str, priority: int) -> None:
+        """Raise the priority of a queued waiter (a joined HA caller)."""
+        pending = self._pending.get(key)
+        if pending is None or priority >= pending[0]:
+            return
+        future = pending[1]
+        self.promoted += 1
+        if priority == PRIORITY_HA_OPEN:
+            if not future.done():
+                self._admit(priority)
+                future.set_result(None)
+            return
+        self._pending[key] = (priority, future)
+        heapq.heappush(self._waiters, (priority, next(self._seq), key, future))
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        while self._waiters and self.in_flight < self.max_in_flight:
+            priority, _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self._admit(priority)
+            future.set_result(None)
+
+    def _admit(self, priority: int) -> None:
+        self.in_flight += 1
+        self.admitted[_PRIORITY_NAMES[priority]] += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Counters for diagnostics."""
+        return {
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "admitted": dict(self.admitted),
+            "queued": self.queued,
+            "promoted": self.promoted,
+            "wait_max": round(self.wait_max, 3),
+        }
+
+
 @dataclass(frozen=True)
 class StreamRefreshResult:
     """Transient refresh result returned to an HA or background caller."""
@@ -71,6 +223,9 @@ class ManagedCameraState:
     producer_active: bool = False
     last_success: datetime | None = None
     last_success_monotonic: float | None = None
+    # When the operator session behind the published source began; cleared
+    # once its stall has been fed to the session-TTL model.
+    session_started_monotonic: float | None = None
     next_due_monotonic: float | None = None
     failure_count: int = 0
     status: str = "idle"
@@ -108,13 +263,39 @@ class CameraStreamManager:
         self._inflight: dict[
             str, asyncio.Task[StreamRefreshResult]
         ] = {}
-        self._due_unsubs: dict[str, CALLBACK_TYPE] = {}
+        # Best admission priority asked of each in-flight owner; read when
+        # the owner reaches the gate, so a join before that is not lost.
+        self._inflight_priority: dict[str, int] = {}
+        # Every refresh/keep-alive deadline of this manager behind one timer.
+        self._admission = RefreshAdmission()
+        self._due: DeadlineScheduler[tuple[str, str]] = DeadlineScheduler(
+            hass,
+            self._async_dispatch_due,
+            clock=lambda: _monotonic(),
+        )
+        self._keepalives: dict[
+            str, tuple[Callable[[], Awaitable[None]], float | None]
+        ] = {}
+        # Learned operator-session lifetime: shared with the coordinator's
+        # URL cache so direct-path deaths and go2rtc stalls feed one model.
+        ttl_model = getattr(coordinator, "session_ttl", None)
+        self.session_ttl: SessionTtlModel = (
+            ttl_model
+            if isinstance(ttl_model, SessionTtlModel)
+            else SessionTtlModel(clock=lambda: _monotonic())
+        )
         self._reconcile_unsub: CALLBACK_TYPE | None = None
         self._registry_unsub: CALLBACK_TYPE | None = None
         self._prompt_reconcile_unsub: CALLBACK_TYPE | None = None
         self._reconcile_lock = asyncio.Lock()
         self._listeners: set[Callable[[], None]] = set()
         self._owned_preloads: set[str] = set()
+        # Shared `/api/streams` poller of this go2rtc instance: camera health
+        # and manager state between reconciles come from one snapshot.
+        self.health_monitor: Go2RtcHealthMonitor | None = (
+            async_acquire_health_monitor(hass, client)
+        )
+        self._snapshot_unsub: CALLBACK_TYPE | None = None
         self._started = False
         self._stopping = False
 
@@ -124,6 +305,7 @@ class CameraStreamManager:
             return
         self._stopping = False
         self._started = True
+        self._attach_health_monitor()
         if not self.keep_warm:
             # Preserve the publication contract on setup/transport reload:
             # remove every idle integration-owned stream when publishing is
@@ -162,8 +344,15 @@ class CameraStreamManager:
         async with self._reconcile_lock:
             pass
         self._inflight.clear()
+        self._inflight_priority.clear()
         await self._async_remove_owned_preloads()
         self._listeners.clear()
+        self._keepalives.clear()
+        self._due.clear()
+        self._detach_health_monitor()
+        if self.health_monitor is not None:
+            async_release_health_monitor(self.hass, self.health_monitor)
+            self.health_monitor = None
 
     async def async_apply_entry_options(self) -> bool:
         """Apply publication-only options without reloading the config entry."""
@@ -229,11 +418,154 @@ class CameraStreamManager:
 
         self._ensure_background_tracking()
         await self.async_reconcile(refresh_missing=False)
+        self._schedule_staggered_activation()
+
+    async def async_swap_client(self, client: Go2RtcClient) -> None:
+        """Move owned streams to a new go2rtc transport without entry reload.
+
+        Idle manager streams are removed from the old server (best effort: it
+        may already be gone), per-camera transport state is reset, and
+        eligible cameras are republished on the new server with the same
+        staggered activation as a policy enable. Viewers of the old server
+        keep their producer until they disconnect.
+        """
+        if not self._started:
+            self.client = client
+            self._replace_health_monitor(client)
+            return
+        self._stop_background_tracking()
+        # In-flight refresh owners are shielded for HA callers: let them
+        # finish against the old client instead of cancelling a viewer.
+        tasks = list(self._inflight.values())
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        async with self._reconcile_lock:
+            # Refreshes a reconcile started just before releasing the lock.
+            tasks = list(self._inflight.values())
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            await asyncio.gather(
+                *(
+                    self._async_cleanup_stream(state)
+                    for state in self._states.values()
+                    if state.present or state.preloaded
+                )
+            )
+            await self._async_remove_owned_preloads()
+            self.client = client
+            self._replace_health_monitor(client)
+            self._attach_health_monitor()
+            for state in self._states.values():
+                state.present = False
+                state.consumer_count = 0
+                state.preloaded = False
+                state.producer_active = False
+                state.cleanup_pending = False
+                state.failure_count = 0
+                state.status = "idle"
+
+        if not self.keep_warm:
+            await self.async_reconcile()
+            return
+        self._ensure_background_tracking()
+        await self.async_reconcile(refresh_missing=False)
+        self._schedule_staggered_activation()
+
+    def _replace_health_monitor(self, client: Go2RtcClient) -> None:
+        """Move to the health monitor of the new go2rtc instance."""
+        self._detach_health_monitor()
+        if self.health_monitor is not None:
+            async_release_health_monitor(self.hass, self.health_monitor)
+        self.health_monitor = async_acquire_health_monitor(self.hass, client)
+
+    def _attach_health_monitor(self) -> None:
+        if self.health_monitor is None:
+            self.health_monitor = async_acquire_health_monitor(
+                self.hass, self.client
+            )
+        if self._snapshot_unsub is None:
+            self._snapshot_unsub = self.health_monitor.async_subscribe_snapshot(
+                self._handle_health_snapshot
+            )
+
+    def _detach_health_monitor(self) -> None:
+        if self._snapshot_unsub is not None:
+            self._snapshot_unsub()
+            self._snapshot_unsub = None
+
+    def _handle_health_snapshot(
+        self, streams: dict[str, Go2RtcStreamInfo]
+    ) -> None:
+        """Refresh observed per-camera state from the shared snapshot."""
+        changed = False
+        for state in self._states.values():
+            self._observe_session_end(state)
+            info = streams.get(state.stream_name)
+            observed = (
+                info is not None,
+                info.consumer_count if info is not None else 0,
+                info.producer_active if info is not None else False,
+            )
+            if observed != (
+                state.present,
+                state.consumer_count,
+                state.producer_active,
+            ):
+                (
+                    state.present,
+                    state.consumer_count,
+                    state.producer_active,
+                ) = observed
+                changed = True
+        if changed:
+            self._notify_listeners()
+
+    def _observe_session_end(self, state: ManagedCameraState) -> None:
+        """Feed the PATCH-to-stall lifetime of a frozen producer to the model."""
+        if state.session_started_monotonic is None or self.health_monitor is None:
+            return
+        health = self.health_monitor.latest(state.stream_name)
+        if health is None or not health.frozen:
+            return
+        lifetime = _monotonic() - state.session_started_monotonic
+        # One observation per published session, however long it stays frozen.
+        state.session_started_monotonic = None
+        self.session_ttl.record(state.camera_id, lifetime)
+
+    def _observe_session_survival(self, state: ManagedCameraState) -> None:
+        """Feed the age of a still-live producer being renewed to the model."""
+        if state.session_started_monotonic is None or not (
+            state.present and state.producer_active
+        ):
+            return
+        if self.health_monitor is not None:
+            health = self.health_monitor.latest(state.stream_name)
+            if health is not None and health.frozen:
+                return
+        self.session_ttl.record_survival(
+            state.camera_id, _monotonic() - state.session_started_monotonic
+        )
+
+    def cached_stream_info(
+        self,
+        camera_id: str,
+        max_age: float,
+    ) -> Go2RtcStreamInfo | None:
+        """Stream info from a monitor snapshot at most `max_age` s old."""
+        if self.health_monitor is None:
+            return None
+        streams = self.health_monitor.snapshot(max_age)
+        if streams is None:
+            return None
+        return streams.get(f"eg_{camera_id}")
+
+    def _schedule_staggered_activation(self) -> None:
+        """Schedule every unscheduled eligible camera with a small stagger."""
         activation_index = 0
         for camera_id in self._camera_ids():
             state = self._state_for(camera_id)
             state.eligible = self.is_camera_eligible(camera_id)
-            if state.eligible and camera_id not in self._due_unsubs:
+            if state.eligible and (DUE_REFRESH, camera_id) not in self._due:
                 self._schedule_due(
                     camera_id,
                     activation_index * POLICY_ENABLE_STAGGER_SECONDS,
@@ -267,9 +599,9 @@ class CameraStreamManager:
                 unsub()
                 setattr(self, attr, None)
 
-        for unsub in self._due_unsubs.values():
-            unsub()
-        self._due_unsubs.clear()
+        for key in self._due:
+            if key[0] == DUE_REFRESH:
+                self._due.cancel(key)
         for state in self._states.values():
             state.next_due_monotonic = None
 
@@ -279,16 +611,31 @@ class CameraStreamManager:
         reason: str,
     ) -> StreamRefreshResult:
         """Join or start one complete operator-mint and go2rtc-PATCH chain."""
-        camera_id = str(camera_id)
+        return await asyncio.shield(self._start_refresh(str(camera_id), reason))
+
+    def _start_refresh(
+        self,
+        camera_id: str,
+        reason: str,
+    ) -> asyncio.Task[StreamRefreshResult]:
+        """Return the in-flight owner of `camera_id`, starting one if needed."""
+        priority = refresh_priority(reason)
         task = self._inflight.get(camera_id)
-        if task is None:
-            task = self.hass.async_create_task(
-                self._async_refresh_owner(camera_id, reason),
-                name=f"elektronny_gorod_stream_refresh_{camera_id}",
-                eager_start=False,
-            )
-            self._inflight[camera_id] = task
-        return await asyncio.shield(task)
+        if task is not None:
+            if priority < self._inflight_priority.get(camera_id, priority + 1):
+                # A queued background chain must not hold an HA open back;
+                # an owner not yet at the gate picks the priority up there.
+                self._inflight_priority[camera_id] = priority
+                self._admission.promote(camera_id, priority)
+            return task
+        task = self.hass.async_create_task(
+            self._async_refresh_owner(camera_id, reason),
+            name=f"elektronny_gorod_stream_refresh_{camera_id}",
+            eager_start=False,
+        )
+        self._inflight[camera_id] = task
+        self._inflight_priority[camera_id] = priority
+        return task
 
     def camera_state(self, camera_id: str) -> ManagedCameraState | None:
         """Return a detached, credential-free snapshot for diagnostics."""
@@ -375,11 +722,22 @@ class CameraStreamManager:
             return None
         return registry_entry
 
-    async def async_reconcile(self, *, refresh_missing: bool = True) -> None:
-        """Compare one complete go2rtc snapshot with registry desired state."""
+    async def async_reconcile(
+        self,
+        *,
+        refresh_missing: bool = True,
+        streams: dict[str, Go2RtcStreamInfo] | None = None,
+    ) -> None:
+        """Compare one complete go2rtc snapshot with registry desired state.
+
+        `streams` — a fresh health-monitor snapshot; without it the stream
+        list is fetched here.
+        """
+        refreshes: list[asyncio.Task[StreamRefreshResult]] = []
         async with self._reconcile_lock:
             try:
-                streams = await self.client.async_list_streams()
+                if streams is None:
+                    streams = await self.client.async_list_streams()
                 preloads = await self.client.async_list_preloads()
             except asyncio.CancelledError:
                 raise
@@ -388,7 +746,6 @@ class CameraStreamManager:
             except Exception:  # noqa: BLE001 - keep scheduler alive, details private
                 return
 
-            refreshes: list[asyncio.Future[StreamRefreshResult] | Any] = []
             cleanups: list[Any] = []
             managed_names = {
                 f"eg_{camera_id}" for camera_id in self._camera_ids()
@@ -417,7 +774,7 @@ class CameraStreamManager:
                             # Re-arm the existing preload after a fresh PATCH.
                             state.preloaded = False
                         refreshes.append(
-                            self.async_refresh(camera_id, "reconcile")
+                            self._start_refresh(camera_id, "reconcile")
                         )
                     elif info is None:
                         state.status = "missing"
@@ -437,9 +794,17 @@ class CameraStreamManager:
 
             if cleanups:
                 await asyncio.gather(*cleanups)
-            if refreshes:
-                await asyncio.gather(*refreshes)
-            self._notify_listeners()
+            if not refreshes:
+                self._notify_listeners()
+                return
+        # The admitted refreshes drain outside the lock: after a go2rtc
+        # restart that takes minutes, and client swaps, policy applies and
+        # the periodic reconcile must not wait behind it.
+        await asyncio.gather(
+            *(asyncio.shield(task) for task in refreshes),
+            return_exceptions=True,
+        )
+        self._notify_listeners()
 
     async def _async_refresh_owner(
         self,
@@ -455,113 +820,175 @@ class CameraStreamManager:
                 state.status = "excluded"
                 self._notify_listeners()
                 return self._proxied_result(state)
+            await self._admission.acquire(
+                camera_id,
+                self._inflight_priority.get(camera_id, refresh_priority(reason)),
+            )
             try:
-                source_url = await self.coordinator.get_camera_stream(camera_id)
-            except asyncio.CancelledError:
-                raise
-            except Exception:  # noqa: BLE001 - sanitize operator boundary
-                self._record_failure(state, "operator_error")
-                return StreamRefreshResult(url=None, proxied=False)
+                return await self._async_mint_and_publish(
+                    state, camera_id, reason
+                )
+            finally:
+                self._admission.release()
+        finally:
+            current = asyncio.current_task()
+            if self._inflight.get(camera_id) is current:
+                self._inflight.pop(camera_id, None)
+                self._inflight_priority.pop(camera_id, None)
+
+    async def _async_mint_and_publish(
+        self,
+        state: ManagedCameraState,
+        camera_id: str,
+        reason: str,
+    ) -> StreamRefreshResult:
+        """Operator mint + go2rtc PATCH/preload under an admission slot."""
+        if reason in RENEWAL_REASONS:
+            self._observe_session_survival(state)
+        try:
+            source_url = await self._async_source_url(state, reason)
+        except asyncio.CancelledError:
+            raise
+        except Exception:  # noqa: BLE001 - sanitize operator boundary
+            self._record_failure(state, "operator_error")
+            return StreamRefreshResult(url=None, proxied=False)
 
-            if not source_url:
-                self._record_failure(state, "empty_source")
-                return StreamRefreshResult(url=None, proxied=False)
+        if not source_url:
+            self._record_failure(state, "empty_source")
+            return StreamRefreshResult(url=None, proxied=False)
 
-            publishable = self._is_refresh_allowed(camera_id, reason)
-            state.eligible = self.is_camera_eligible(camera_id)
-            if (
-                not publishable
-                or (
-                    reason in BACKGROUND_REFRESH_REASONS
-                    and not state.eligible
-                )
-            ):
-                state.status = "excluded"
-                self._notify_listeners()
-                return self._proxied_result(state)
+        publishable = self._is_refresh_allowed(camera_id, reason)
+        state.eligible = self.is_camera_eligible(camera_id)
+        if (
+            not publishable
+            or (
+                reason in BACKGROUND_REFRESH_REASONS
+                and not state.eligible
+            )
+        ):
+            state.status = "excluded"
+            self._notify_listeners()
+            return self._proxied_result(state)
 
-            stream_source = (
-                f"ffmpeg:{source_url}"
-                "#video=copy#audio=aac#audio=opus"
+        stream_source = (
+            f"ffmpeg:{source_url}"
+            "#video=copy#audio=aac#audio=opus"
+        )
+        try:
+            await self.client.async_patch_stream(
+                state.stream_name,
+                stream_source,
             )
+        except Go2RtcRequestError as err:
+            self._record_failure(state, f"patch_{err.category}")
+            return StreamRefreshResult(url=source_url, proxied=False)
+        except asyncio.CancelledError:
+            raise
+        except Exception:  # noqa: BLE001 - keep unexpected details private
+            self._record_failure(state, "patch_unexpected")
+            return StreamRefreshResult(url=source_url, proxied=False)
+
+        state.present = True
+        state.eligible = self.is_camera_eligible(camera_id)
+        if (
+            reason in BACKGROUND_REFRESH_REASONS
+            and not state.eligible
+        ):
+            await self._async_cleanup_stream(state)
+            self._notify_listeners()
+            return self._proxied_result(state)
+
+        needs_preload = state.eligible and not (
+            state.preloaded and state.producer_active
+        )
+        if needs_preload:
+            # Claim the stable name before network I/O so unload can issue
+            # an idempotent DELETE even if cancellation races a completed
+            # server-side preload PUT whose response never reaches us.
+            self._owned_preloads.add(state.stream_name)
             try:
-                await self.client.async_patch_stream(
-                    state.stream_name,
-                    stream_source,
-                )
+                await self.client.async_enable_preload(state.stream_name)
             except Go2RtcRequestError as err:
-                self._record_failure(state, f"patch_{err.category}")
-                return StreamRefreshResult(url=source_url, proxied=False)
+                self._owned_preloads.discard(state.stream_name)
+                state.preloaded = False
+                state.producer_active = False
+                self._record_failure(state, f"preload_{err.category}")
+                return StreamRefreshResult(
+                    url=source_url,
+                    proxied=False,
+                )
             except asyncio.CancelledError:
                 raise
-            except Exception:  # noqa: BLE001 - keep unexpected details private
-                self._record_failure(state, "patch_unexpected")
-                return StreamRefreshResult(url=source_url, proxied=False)
-
-            state.present = True
-            state.eligible = self.is_camera_eligible(camera_id)
-            if (
-                reason in BACKGROUND_REFRESH_REASONS
-                and not state.eligible
-            ):
-                await self._async_cleanup_stream(state)
-                self._notify_listeners()
-                return self._proxied_result(state)
+            except Exception:  # noqa: BLE001 - sanitize transport detail
+                self._owned_preloads.discard(state.stream_name)
+                state.preloaded = False
+                state.producer_active = False
+                self._record_failure(state, "preload_unexpected")
+                return StreamRefreshResult(
+                    url=source_url,
+                    proxied=False,
+                )
+            state.preloaded = True
+            state.producer_active = True
+
+        state.last_success = datetime.now(timezone.utc)
+        completed = _monotonic()
+        state.last_success_monotonic = completed
+        state.session_started_monotonic = completed - self._source_age(camera_id)
+        state.failure_count = 0
+        state.status = "ready"
+        if (
+            self._started
+            and self.keep_warm
+            and self.is_camera_eligible(camera_id)
+        ):
+            self._schedule_due(
+                camera_id,
+                self.session_ttl.refresh_interval(),
+                base_monotonic=completed,
+            )
+        self._notify_listeners()
+        return self._proxied_result(state)
 
-            needs_preload = state.eligible and not (
-                state.preloaded and state.producer_active
+    async def _async_source_url(
+        self,
+        state: ManagedCameraState,
+        reason: str,
+    ) -> str | None:
+        """Operator source URL, reusing the shared cache when it is safe.
+
+        A cached URL is only reused while the manager still sees a live
+        producer on it; otherwise the session is dead or unknown and a fresh
+        URL is minted.
+        """
+        camera_id = state.camera_id
+        cache = getattr(self.coordinator, "stream_urls", None)
+        if not isinstance(cache, StreamUrlCache):
+            return await self.coordinator.get_camera_stream(camera_id)
+        priority = request_priority(reason)
+        if reason in SOURCE_MINT_REASONS or not (
+            state.present and state.producer_active
+        ):
+            self.coordinator.invalidate_camera_stream(
+                camera_id, producer_died=reason == "recovery"
             )
-            if needs_preload:
-                # Claim the stable name before network I/O so unload can issue
-                # an idempotent DELETE even if cancellation races a completed
-                # server-side preload PUT whose response never reaches us.
-                self._owned_preloads.add(state.stream_name)
-                try:
-                    await self.client.async_enable_preload(state.stream_name)
-                except Go2RtcRequestError as err:
-                    self._owned_preloads.discard(state.stream_name)
-                    state.preloaded = False
-                    state.producer_active = False
-                    self._record_failure(state, f"preload_{err.category}")
-                    return StreamRefreshResult(
-                        url=source_url,
-                        proxied=False,
-                    )
-                except asyncio.CancelledError:
-                    raise
-                except Exception:  # noqa: BLE001 - sanitize transport detail
-                    self._owned_preloads.discard(state.stream_name)
-                    state.preloaded = False
-                    state.producer_active = False
-                    self._record_failure(state, "preload_unexpected")
-                    return StreamRefreshResult(
-                        url=source_url,
-                        proxied=False,
-                    )
-                state.preloaded = True
-                state.producer_active = True
-
-            state.last_success = datetime.now(timezone.utc)
-            completed = _monotonic()
-            state.last_success_monotonic = completed
-            state.failure_count = 0
-            state.status = "ready"
-            if (
-                self._started
-                and self.keep_warm
-                and self.is_camera_eligible(camera_id)
-            ):
-                self._schedule_due(
-                    camera_id,
-                    BACKGROUND_REFRESH_INTERVAL.total_seconds(),
-                    base_monotonic=completed,
-                )
-            self._notify_listeners()
-            return self._proxied_result(state)
-        finally:
-            current = asyncio.current_task()
-            if self._inflight.get(camera_id) is current:
-                self._inflight.pop(camera_id, None)
+            return await self.coordinator.get_shared_camera_stream(
+                camera_id, priority=priority
+            )
+        return await self.coordinator.get_shared_camera_stream(
+            camera_id,
+            min_remaining=SOURCE_MIN_REMAINING.get(
+                reason, self.session_ttl.refresh_interval()
+            ),
+            priority=priority,
+        )
+
+    def _source_age(self, camera_id: str) -> float:
+        """Seconds since the published source URL was minted (0 if unknown)."""
+        cache = getattr(self.coordinator, "stream_urls", None)
+        if not isinstance(cache, StreamUrlCache):
+            return 0.0
+        return cache.age(camera_id) or 0.0
 
     def _proxied_result(self, state: ManagedCameraState) -> StreamRefreshResult:
         """Return the stable credential-aware URL without persisting it."""
@@ -577,11 +1004,8 @@ class CameraStreamManager:
         state = self._states.get(camera_id)
         if state is not None:
             return state
-        display_name = camera_id
-        for camera in (self.coordinator.data or {}).get("cameras") or []:
-            if str(camera.get("id") or "") == camera_id:
-                display_name = str(camera.get("name") or camera_id)
-                break
+        camera = data_index(self.coordinator.data).cameras.get(camera_id) or {}
+        display_name = str(camera.get("name") or camera_id)
         state = ManagedCameraState(
             camera_id=camera_id,
             stream_name=f"eg_{camera_id}",
@@ -741,10 +1165,8 @@ class CameraStreamManager:
 
     def _camera_is_api_hidden(self, camera_id: str) -> bool:
         """Read the pre-visibility-sync API hint for startup race prevention."""
-        for camera in (self.coordinator.data or {}).get("cameras") or []:
-            if str(camera.get("id") or "") == camera_id:
-                return bool(camera.get("hidden"))
-        return False
+        camera = data_index(self.coordinator.data).cameras.get(camera_id)
+        return bool(camera and camera.get("hidden"))
 
     def _startup_offset(self, camera_id: str) -> float:
         seed = f"{self.entry.entry_id}:{camera_id}".encode()
@@ -760,34 +1182,111 @@ class CameraStreamManager:
     ) -> None:
         if not self._started or not self.keep_warm:
             return
-        self._cancel_due(camera_id)
         state = self._state_for(camera_id)
         base = _monotonic() if base_monotonic is None else base_monotonic
         state.next_due_monotonic = base + delay
+        self._due.schedule((DUE_REFRESH, camera_id), state.next_due_monotonic)
 
-        async def _due(_now: datetime) -> None:
-            self._due_unsubs.pop(camera_id, None)
+    def _cancel_due(self, camera_id: str) -> None:
+        self._due.cancel((DUE_REFRESH, camera_id))
+        state = self._states.get(camera_id)
+        if state is not None:
             state.next_due_monotonic = None
+
+    async def _async_dispatch_due(self, keys: list[tuple[str, str]]) -> None:
+        """Run one batch of due refreshes and keep-alives concurrently."""
+        jobs: list[Awaitable[Any]] = []
+        for kind, camera_id in keys:
+            if kind == DUE_KEEPALIVE:
+                keepalive = self._keepalives.get(camera_id)
+                if keepalive is None:
+                    continue
+                action, interval = keepalive
+                self._due.schedule(
+                    (DUE_KEEPALIVE, camera_id),
+                    _monotonic() + self._keepalive_interval(interval),
+                )
+                jobs.append(action())
+                continue
+            state = self._states.get(camera_id)
+            if state is not None:
+                state.next_due_monotonic = None
             if self._started and self.is_camera_eligible(camera_id):
-                await self.async_refresh(camera_id, "background_due")
+                jobs.append(self.async_refresh(camera_id, "background_due"))
+        if not jobs:
+            return
+        for result in await asyncio.gather(*jobs, return_exceptions=True):
+            if isinstance(result, Exception):
+                LOGGER.error(
+                    "go2rtc stream manager due job failed (%s)",
+                    type(result).__name__,
+                )
 
-        self._due_unsubs[camera_id] = async_call_later(
-            self.hass,
-            delay,
-            _due,
+    @callback
+    def async_track_keepalive(
+        self,
+        camera_id: str,
+        action: Callable[[], Awaitable[None]],
+        interval: timedelta | None = None,
+    ) -> CALLBACK_TYPE:
+        """Run `action` every `interval` on the manager's shared scheduler.
+
+        Keep-alives of entities added together land in one dispatch window
+        and run as one batch instead of separate timer wakeups. Without an
+        `interval` the period follows the learned session refresh interval.
+        """
+        camera_id = str(camera_id)
+        key = (DUE_KEEPALIVE, camera_id)
+        seconds = interval.total_seconds() if interval is not None else None
+        registration = (action, seconds)
+        self._keepalives[camera_id] = registration
+        self._due.schedule(key, _monotonic() + self._keepalive_interval(seconds))
+
+        @callback
+        def _untrack() -> None:
+            if self._keepalives.get(camera_id) is registration:
+                del self._keepalives[camera_id]
+                self._due.cancel(key)
+
+        return _untrack
+
+    def _keepalive_interval(self, interval: float | None) -> float:
+        return (
+            interval if interval is not None else self.session_ttl.refresh_interval()
         )
 
-    def _cancel_due(self, camera_id: str) -> None:
-        unsub = self._due_unsubs.pop(camera_id, None)
-        if unsub is not None:
-            unsub()
-        state = self._states.get(camera_id)
-        if state is not None:
-            state.next_due_monotonic = None
+    def admission_stats(self) -> dict[str, Any]:
+        """Refresh admission counters (in-flight, queue, per priority)."""
+        return self._admission.stats()
+
+    def scheduler_stats(self) -> dict[str, Any]:
+        """Shared scheduler counters and per-camera next-due seconds."""
+        now = _monotonic()
+        due_in: dict[str, dict[str, float]] = {
+            DUE_REFRESH: {},
+            DUE_KEEPALIVE: {},
+        }
+        for (kind, camera_id), deadline in sorted(self._due.due_times().items()):
+            due_in[kind][camera_id] = round(max(deadline - now, 0.0), 1)
+        return {
+            **self._due.stats(),
+            "refresh_due_in_s": due_in[DUE_REFRESH],
+            "keepalive_due_in_s": due_in[DUE_KEEPALIVE],
+        }
 
     async def _async_reconcile_interval(self, _now: datetime) -> None:
-        if not self._stopping:
-            await self.async_reconcile()
+        if self._stopping:
+            return
+        # Periodic reconcile reuses the monitor's recent `/api/streams`
+        # snapshot; explicit reconciles (policy, registry) fetch fresh.
+        streams = (
+            self.health_monitor.snapshot(
+                self.health_monitor.interval.total_seconds()
+            )
+            if self.health_monitor is not None
+            else None
+        )
+        await self.async_reconcile(streams=streams)
 
     def _handle_registry_update(self, event: Event) -> None:
         entity_id = str((event.data or {}).get("entity_id") or "")
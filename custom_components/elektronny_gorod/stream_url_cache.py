@@ -0,0 +1,123 @@
+"""Кэш operator stream URL-ов камер с учётом срока жизни сессии.
+
+`query_camera_stream` отдаёт forpost-URL — server-side сессию, живущую
+~30 минут (ADR-0009). Раньше stream manager минтил свежий URL на каждый
+refresh go2rtc-источника: открытие камеры сразу после фонового refresh-а —
+лишний round-trip к оператору и новая сессия поверх ещё живой.
+
+Кэш — только для go2rtc-источников stream manager-а
+(`coordinator.get_shared_camera_stream`): URL потребляет один go2rtc
+producer. Direct-путь камеры отдаёт URL HA stream worker-у как одноразовый
+(ADR-0014) и всегда минтит свежий (`coordinator.get_camera_stream`).
+
+Кэш хранит последний URL каждой камеры с моментом получения и отдаёт его,
+только если сессии осталось не меньше, чем нужно вызывающему (`get`,
+`min_remaining` секунд):
+
+- открытие камеры — несколько минут (`MIN_REMAINING_OPEN`);
+- продление сессии (фоновый срок, proactive keep-alive) — почти весь TTL:
+  годится лишь URL, полученный только что;
+- recovery / пропавший producer — всегда свежий URL (`invalidate`).
+
+Срок жизни сессии — выученный `SessionTtlModel` (`session_ttl.py`, до первых
+наблюдений — `SESSION_TTL_DEFAULT`): смерть producer-а (health check,
+recovery) отдаёт модели время от получения URL до смерти. Свежий URL
+заменяет прежний — одна operator-сессия на камеру.
+
+Сроки считаются по монотонным часам (`clock` подменяется в тестах). URL-ы
+наружу (diagnostics, логи) не попадают — только счётчики.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+import time
+from typing import Any
+
+from .session_ttl import SESSION_TTL_DEFAULT, SessionTtlModel
+
+# Открытию камеры хватает URL, которому осталось хотя бы столько.
+MIN_REMAINING_OPEN = 5 * 60
+
+
+@dataclass(slots=True)
+class _CachedUrl:
+    url: str
+    fetched: float
+
+
+class StreamUrlCache:
+    """Последний operator URL каждой камеры со сроком жизни его сессии."""
+
+    def __init__(
+        self,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        ttl_model: SessionTtlModel | None = None,
+    ) -> None:
+        self._clock = clock
+        self.ttl_model = ttl_model or SessionTtlModel(clock=clock)
+        self._urls: dict[str, _CachedUrl] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.deaths = 0
+
+    def ttl(self) -> float:
+        """Ожидаемый срок жизни operator-сессии (общий на аккаунт), секунды."""
+        return self.ttl_model.session_ttl()
+
+    def observed_ttl(self, camera_id: str) -> float | None:
+        return self.ttl_model.last_lifetime(camera_id)
+
+    def remaining(self, camera_id: str) -> float | None:
+        """Сколько ещё проживёт сессия закэшированного URL (None — нет URL)."""
+        cached = self._urls.get(camera_id)
+        if cached is None:
+            return None
+        return cached.fetched + self.ttl() - self._clock()
+
+    def age(self, camera_id: str) -> float | None:
+        """Сколько секунд назад получен закэшированный URL (None — нет URL)."""
+        cached = self._urls.get(camera_id)
+        if cached is None:
+            return None
+        return self._clock() - cached.fetched
+
+    def get(self, camera_id: str, min_remaining: float) -> str | None:
+        """Закэшированный URL, если сессии осталось ≥ `min_remaining` с."""
+        remaining = self.remaining(camera_id)
+        if remaining is None or remaining < min_remaining:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self._urls[camera_id].url
+
+    def put(self, camera_id: str, url: str) -> None:
+        """Свежий URL от оператора (заменяет прежнюю сессию камеры)."""
+        self._urls[camera_id] = _CachedUrl(url=url, fetched=self._clock())
+
+    def invalidate(self, camera_id: str, *, producer_died: bool = False) -> None:
+        """Забыть URL камеры.
+
+        `producer_died` — health check увидел смерть producer-а на этом URL:
+        его возраст — наблюдение для модели TTL сессии.
+        """
+        cached = self._urls.pop(camera_id, None)
+        if cached is None:
+            return
+        self.invalidations += 1
+        if not producer_died:
+            return
+        if self.ttl_model.record(camera_id, self._clock() - cached.fetched):
+            self.deaths += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Счётчики для diagnostics (без URL-ов)."""
+        return {
+            "cached": len(self._urls),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "deaths": self.deaths,
+        }
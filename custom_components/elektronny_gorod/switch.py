@@ -22,6 +22,8 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, LOGGER
 from .coordinator import ElektronnyGorodUpdateCoordinator
+from .refresh_schedule import KIND_DND
+from .snapshot_index import RECORD_DND, RECORD_STALE, data_index
 
 DND_ROOT = "DO_NOT_DISTURB_ROOT"
 DND_INTERCOM = "INTERCOM_CALLS"
@@ -48,22 +50,27 @@ async def async_setup_entry(
 ) -> None:
     """Set up DND switches based on a config entry."""
     coordinator: ElektronnyGorodUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    # Новый place / DND-item добавляется по diff-у coordinator-а, без reload.
+    known: set[tuple[str, str]] = set()
 
-    dnd_per_place: dict[str, list[dict[str, Any]]] = (
-        (coordinator.data or {}).get("dnd") or {}
+    @callback
+    def _async_add_new_switches() -> None:
+        entities: list[ElektronnyGorodDNDSwitch] = []
+        for place_id, items in data_index(coordinator.data).dnd.items():
+            present_types = {item.get("type") for item in items}
+            for dnd_type in (DND_ROOT, DND_INTERCOM, DND_MGMT):
+                if dnd_type in present_types and (place_id, dnd_type) not in known:
+                    known.add((place_id, dnd_type))
+                    entities.append(
+                        ElektronnyGorodDNDSwitch(coordinator, place_id, dnd_type)
+                    )
+        if entities:
+            async_add_entities(entities)
+
+    entry.async_on_unload(
+        coordinator.async_track_records((RECORD_DND,), _async_add_new_switches)
     )
 
-    entities: list[ElektronnyGorodDNDSwitch] = []
-    for place_id, items in dnd_per_place.items():
-        present_types = {item.get("type") for item in items}
-        for dnd_type in (DND_ROOT, DND_INTERCOM, DND_MGMT):
-            if dnd_type in present_types:
-                entities.append(
-                    ElektronnyGorodDNDSwitch(coordinator, place_id, dnd_type)
-                )
-
-    async_add_entities(entities)
-
 
 class ElektronnyGorodDNDSwitch(
     CoordinatorEntity[ElektronnyGorodUpdateCoordinator], SwitchEntity
@@ -102,9 +109,8 @@ class ElektronnyGorodDNDSwitch(
 
     @property
     def _dnd_items(self) -> list[dict[str, Any]] | None:
-        """Все DND items для нашего place из coordinator.data."""
-        dnd = (self.coordinator.data or {}).get("dnd") or {}
-        return dnd.get(self._place_id)
+        """Все DND items для нашего place из индекса coordinator.data."""
+        return data_index(self.coordinator.data).dnd.get(self._place_id)
 
     def _item(self, dnd_type: str) -> dict[str, Any] | None:
         items = self._dnd_items
@@ -148,6 +154,14 @@ class ElektronnyGorodDNDSwitch(
             return None
         return bool(item.get("status"))
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """`stale_since`, пока DND place-а — из last-known-good кэша."""
+        stale = data_index(self.coordinator.data).stale.get(self._place_id) or {}
+        if not (stale_since := stale.get(KIND_DND)):
+            return None
+        return {"stale_since": stale_since}
+
     # ------------------------------------------------------------------ #
     # Service calls                                                      #
     # ------------------------------------------------------------------ #
@@ -185,10 +199,18 @@ class ElektronnyGorodDNDSwitch(
             )
             return
 
-        # Refresh coordinator чтобы entity увидела новый state.
-        await self.coordinator.async_request_refresh()
+        # Перечитать только DND этого place — entity увидит новый state без
+        # полного обхода places.
+        await self.coordinator.async_refresh_place(self._place_id, (KIND_DND,))
 
     @callback
     def _handle_coordinator_update(self) -> None:
-        """Coordinator обновился — read state из coordinator.data в properties."""
-        self.async_write_ha_state()
+        """Coordinator обновился — read state из coordinator.data в properties.
+
+        Ключ — весь DND place-а: availability dependent-switch-ей зависит от
+        root-item-а того же place; `stale_since` — из сводки `stale` place-а.
+        """
+        if self.coordinator.record_changed(
+            RECORD_DND, self._place_id
+        ) or self.coordinator.record_changed(RECORD_STALE, self._place_id):
+            self.async_write_ha_state()
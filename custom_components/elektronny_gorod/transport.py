@@ -0,0 +1,163 @@
+"""Выделенный connection pool для operator API host.
+
+Shared HA-сессия (`async_get_clientsession`) — общий connector на весь
+инстанс: `limit_per_host=100`, DNS без кэша, keep-alive aiohttp по умолчанию
+(15 с). Для operator-а это значит лишние DNS-запросы и TLS-handshake на
+критическом пути ring → mint SIP → open_lock, если соединение успело
+закрыться между запросами.
+
+Здесь — долгоживущая сессия только для `BASE_API_URL` (см. поправку к
+ADR-0008): свой `TCPConnector` с фиксированным `limit_per_host`, DNS-кэшем и
+keep-alive, а также счётчики переиспользования соединений (aiohttp
+`TraceConfig`). Transport общий для всех entries (host один), живёт по
+ref-count: открывается первым `async_setup_entry`, закрывается unload-ом
+последнего entry или остановкой HA. Вне entry (config flow, временный API в
+`async_remove_entry`) `HTTP` использует shared HA-сессию, как раньше.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+from aiohttp import ClientSession, TCPConnector, ThreadedResolver, TraceConfig
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.util import ssl as ssl_util
+from homeassistant.helpers.json import json_dumps
+
+from .const import DOMAIN, LOGGER
+
+TRANSPORT_DATA = f"{DOMAIN}_transport"
+
+# Coordinator держит ≤ 6 in-flight (`_REFRESH_CONCURRENCY`) + on-demand
+# действия (snapshot, open_lock, mint SIP). Больше соединений к одному host
+# приложение не открывает — кап защищает оператора от burst-а.
+OPERATOR_LIMIT_PER_HOST = 10
+# DNS operator host меняется редко; резолвим раз в 10 минут, а не на каждый
+# новый connect.
+OPERATOR_DNS_CACHE_TTL_SECONDS = 600
+# Keep-alive idle-соединения. Типичный idle-timeout балансировщиков — 60 с;
+# держим чуть меньше, чтобы не переиспользовать сокет, который LB уже закрыл.
+OPERATOR_KEEPALIVE_TIMEOUT_SECONDS = 55.0
+
+
+class OperatorTransport:
+    """Сессия + connector operator API и счётчики переиспользования."""
+
+    def __init__(self) -> None:
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.dns_cache_hits = 0
+        self.dns_cache_misses = 0
+        self.requests = 0
+        # Сколько config entries держат transport открытым.
+        self.users = 0
+        self._session: ClientSession | None = None
+        self._closed = False
+
+    @property
+    def session(self) -> ClientSession:
+        """Сессия operator-а; connector создаётся лениво при первом запросе."""
+        if self._session is None:
+            trace = TraceConfig()
+            trace.on_request_start.append(self._on_request_start)
+            trace.on_connection_create_end.append(self._on_connection_create_end)
+            trace.on_connection_reuseconn.append(self._on_connection_reuseconn)
+            trace.on_dns_cache_hit.append(self._on_dns_cache_hit)
+            trace.on_dns_cache_miss.append(self._on_dns_cache_miss)
+            self._session = ClientSession(
+                connector=TCPConnector(
+                    limit_per_host=OPERATOR_LIMIT_PER_HOST,
+                    ttl_dns_cache=OPERATOR_DNS_CACHE_TTL_SECONDS,
+                    keepalive_timeout=OPERATOR_KEEPALIVE_TIMEOUT_SECONDS,
+                    ssl=ssl_util.client_context(),
+                    # Host один и закэширован на 10 минут — getaddrinfo в
+                    # executor-е хватает; aiodns-канал здесь не окупается.
+                    resolver=ThreadedResolver(),
+                ),
+                json_serialize=json_dumps,
+                trace_configs=[trace],
+            )
+        return self._session
+
+    @property
+    def closed(self) -> bool:
+        """Transport закрыт (после unload последнего entry / stop HA)."""
+        return self._closed
+
+    async def async_close(self) -> None:
+        """Закрыть сессию и connector (идемпотентно)."""
+        self._closed = True
+        if self._session is not None:
+            await self._session.close()
+
+    async def _on_request_start(self, *_: Any) -> None:
+        self.requests += 1
+
+    async def _on_connection_create_end(self, *_: Any) -> None:
+        self.connections_created += 1
+
+    async def _on_connection_reuseconn(self, *_: Any) -> None:
+        self.connections_reused += 1
+
+    async def _on_dns_cache_hit(self, *_: Any) -> None:
+        self.dns_cache_hits += 1
+
+    async def _on_dns_cache_miss(self, *_: Any) -> None:
+        self.dns_cache_misses += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Счётчики для diagnostics (без host/URL)."""
+        total = self.connections_created + self.connections_reused
+        return {
+            "requests": self.requests,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "reuse_ratio": round(self.connections_reused / total, 3) if total else None,
+            "dns_cache_hits": self.dns_cache_hits,
+            "dns_cache_misses": self.dns_cache_misses,
+            "limit_per_host": OPERATOR_LIMIT_PER_HOST,
+        }
+
+
+def get_operator_transport(hass: HomeAssistant) -> OperatorTransport | None:
+    """Открытый transport или None (вне entry → shared HA-сессия)."""
+    transport: OperatorTransport | None = hass.data.get(TRANSPORT_DATA)
+    if transport is None or transport.closed:
+        return None
+    return transport
+
+
+@callback
+def async_acquire_operator_transport(
+    hass: HomeAssistant,
+) -> Callable[[], Coroutine[Any, Any, None]]:
+    """Взять ссылку на shared transport; вернуть release для `entry.async_on_unload`."""
+    transport = get_operator_transport(hass)
+    if transport is None:
+        transport = OperatorTransport()
+        if TRANSPORT_DATA not in hass.data:
+            # Один listener на инстанс: закрывает transport, актуальный на stop.
+            async def _async_close_on_stop(_event: Event) -> None:
+                if (current := hass.data.get(TRANSPORT_DATA)) is not None:
+                    await current.async_close()
+
+            hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_on_stop)
+        hass.data[TRANSPORT_DATA] = transport
+        LOGGER.debug("Operator transport opened")
+    transport.users += 1
+    released = False
+
+    async def _async_release() -> None:
+        nonlocal released
+        if released:
+            return
+        released = True
+        transport.users -= 1
+        if transport.users > 0:
+            return
+        await transport.async_close()
+        LOGGER.debug("Operator transport closed")
+
+    return _async_release
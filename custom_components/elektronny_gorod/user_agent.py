@@ -41,6 +41,15 @@ class UserAgent:
         self.place_id: str = value["place_id"]
 
     def __str__(self):
+        return self.for_place(self.place_id)
+
+    def for_place(self, place_id: str | None) -> str:
+        """UA-строка с явным place_id (per-request контекст, без мутации self).
+
+        Формат идентичен `__str__` — fingerprint не меняется; place_id берётся
+        из аргумента, а не из shared state, поэтому параллельные запросы по
+        разным places не гоняются за `self.place_id`.
+        """
         _phone_manufacturer = self.phone_manufacturer
         _phone_model = self.phone_model
         _android_ver = self.android_ver
@@ -48,5 +57,5 @@ class UserAgent:
         _account_id = self.account_id
         _operator_id = self.operator_id
         _uuid = self.uuid
-        _place_id = self.place_id
+        _place_id = self.place_id if place_id is None else place_id
         return f"{_phone_manufacturer} {_phone_model} | Android {_android_ver} | ntk | {_app_version["name"]} ({_app_version["code"]}) | {_account_id} | {_operator_id} | {_uuid} | {_place_id}"
@@ -0,0 +1,287 @@
+"""Локальный stand-in operator API для replay-тестов и бенчмарков.
+
+`research/scripts/chlz-to-har.py` превращает capture в HAR, но воспроизвести
+его было нечем. Здесь — aiohttp-сервер на 127.0.0.1, который отдаёт:
+
+- записанные ответы из HAR (`load_har`): только status + тело, заголовки
+  ответа не сохраняются, auth-flow (`/auth/...`) пропускается целиком —
+  токены не должны попасть даже в локальный replay;
+- синтетические ответы (`synthetic_routes`) на N places × M intercom-камер —
+  shape как у фикстур `mobile_app_9_9_0`, все ID синтетические.
+
+Маршрут — `(METHOD, endpoint_template(path))`: ID в пути и query не важны,
+поэтому запись одного place обслуживает все. Инъекции: `latency` (+ `jitter`)
+на каждый ответ, `fail(template, status, times)`, случайные ошибки
+`error_rate` с фиксированным seed и `chunked` (тело без Content-Length).
+`requests` считает запросы по шаблону.
+
+`HTTP` направляется на stand-in через `standin.patch_http(monkeypatch)` —
+базовый URL у клиента зашит (`https://BASE_API_URL`).
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+from collections import Counter
+from collections.abc import Callable
+import json
+from pathlib import Path
+import random
+from typing import Any
+from urllib.parse import urlsplit
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from custom_components.elektronny_gorod._logging import is_auth_path
+from custom_components.elektronny_gorod.http import HTTP
+from custom_components.elektronny_gorod.metrics import endpoint_template
+
+# (status, тело) по path запроса; тело — bytes (как записано) или JSON-объект.
+Responder = Callable[[str], tuple[int, Any]]
+RouteKey = tuple[str, str]
+
+
+def load_har(path: str | Path, *, host_filter: str | None = None) -> dict[RouteKey, Responder]:
+    """Маршруты из HAR 1.2; при повторах шаблона побеждает последняя запись."""
+    har = json.loads(Path(path).read_text(encoding="utf-8"))
+    routes: dict[RouteKey, Responder] = {}
+    for entry in har.get("log", {}).get("entries", []):
+        request = entry.get("request") or {}
+        response = entry.get("response") or {}
+        url = urlsplit(request.get("url", ""))
+        if host_filter is not None and host_filter not in url.netloc:
+            continue
+        if is_auth_path(url.path):
+            continue
+        content = response.get("content") or {}
+        text = content.get("text") or ""
+        body = (
+            base64.b64decode(text)
+            if content.get("encoding") == "base64"
+            else text.encode("utf-8")
+        )
+        status = int(response.get("status") or 200)
+        routes[(request.get("method", "GET"), endpoint_template(url.path))] = (
+            lambda _path, status=status, body=body: (status, body)
+        )
+    return routes
+
+
+def _place_id(path: str) -> int:
+    """ID place-а из `/places/{id}/...` (0, если в пути его нет)."""
+    parts = path.split("/")
+    if "places" in parts:
+        return int(parts[parts.index("places") + 1])
+    return 0
+
+
+def synthetic_routes(places: int, cameras_per_place: int) -> dict[RouteKey, Responder]:
+    """Аккаунт на `places` мест, у каждого — домофон с `cameras_per_place` подъездами."""
+    place_ids = [1001 + index for index in range(places)]
+
+    def subscriber_places(_path: str) -> tuple[int, Any]:
+        return 200, {
+            "data": [
+                {
+                    "id": place_id,
+                    "subscriber": {"id": 9001, "accountId": "A1", "name": "Fixture"},
+                    "place": {"id": place_id, "address": {"visibleAddress": f"addr {place_id}"}},
+                }
+                for place_id in place_ids
+            ]
+        }
+
+    def finance(_path: str) -> tuple[int, Any]:
+        return 200, {
+            "data": {
+                "balance": 100.0,
+                "blockType": None,
+                "blocked": False,
+                "targetDate": "2026-01-01",
+                "amountSum": 0,
+                "paymentLink": "https://example.invalid/pay",
+                "daysToBlock": 30,
+                "daysToWarning": 25,
+                "company": "Fixture",
+            }
+        }
+
+    def access_controls(path: str) -> tuple[int, Any]:
+        place_id = _place_id(path)
+        return 200, {
+            "data": [
+                {
+                    "id": place_id * 10,
+                    "name": f"Door {place_id}",
+                    "allowOpen": True,
+                    "externalCameraId": None,
+                    "entrances": [
+                        {
+                            "id": place_id * 100 + index,
+                            "name": f"Entrance {index}",
+                            "externalCameraId": place_id * 1000 + index,
+                            "allowOpen": True,
+                        }
+                        for index in range(cameras_per_place)
+                    ],
+                }
+            ]
+        }
+
+    def empty_list(_path: str) -> tuple[int, Any]:
+        return 200, {"data": []}
+
+    def screens(_path: str) -> tuple[int, Any]:
+        return 200, {
+            "screens": [
+                {"type": "ACCESS_CONTROLS", "entities": [], "hidden": []},
+                {"type": "PUBLIC_CAMERAS", "entities": [], "hidden": []},
+            ]
+        }
+
+    def dnd(_path: str) -> tuple[int, Any]:
+        return 200, {
+            "do_not_disturb": [
+                {"type": "DO_NOT_DISTURB_ROOT", "name": "DND", "status": False, "editable": True},
+            ]
+        }
+
+    def events_search(_path: str) -> tuple[int, Any]:
+        return 200, {
+            "content": [
+                {
+                    "id": f"event-{place_id}",
+                    "placeId": place_id,
+                    "eventTypeName": "accessControlCallMissed",
+                    "timestamp": "1700000000",
+                    "source": {"type": "accessControl", "id": place_id * 10},
+                }
+                for place_id in place_ids
+            ],
+            "number": 0,
+            "last": True,
+        }
+
+    def camera_events(path: str) -> tuple[int, Any]:
+        camera_id = int(path.split("/")[-2])
+        return 200, {
+            "data": [
+                {
+                    "isAvailable": True,
+                    "ID": camera_id * 10,
+                    "Time": 1700000000,
+                    "Duration": 30,
+                    "EventSubjectID": 126,
+                    "IsGotoEnabled": 1,
+                    "CameraID": camera_id,
+                }
+            ]
+        }
+
+    return {
+        ("GET", "/rest/v3/subscriber-places"): subscriber_places,
+        ("GET", "/api/mh-payment/mobile/v1/finance"): finance,
+        ("GET", "/rest/v1/places/{id}/accesscontrols"): access_controls,
+        ("GET", "/rest/v1/places/{id}/cameras"): empty_list,
+        ("GET", "/rest/v2/places/{id}/public/cameras"): empty_list,
+        ("GET", "/api/mh-customer/mobile/v1/customers/places/{id}/settings/screens"): screens,
+        ("GET", "/api/mh-customer/mobile/v1/customers/places/{id}/settings/do_not_disturb"): dnd,
+        ("POST", "/rest/v1/events/search"): events_search,
+        ("GET", "/rest/v2/forpost/cameras/{id}/events"): camera_events,
+    }
+
+
+class OperatorStandIn:
+    """aiohttp-сервер, отвечающий по `routes`; `async with` поднимает/гасит его."""
+
+    def __init__(
+        self,
+        routes: dict[RouteKey, Responder],
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: int = 0,
+        chunked: bool = False,
+    ) -> None:
+        self.routes = dict(routes)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.chunked = chunked
+        self.requests: Counter[str] = Counter()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._faults: dict[RouteKey, list[int]] = {}
+        self._random = random.Random(seed)
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", self._handle)
+        self._server = TestServer(app, host="127.0.0.1")
+
+    @property
+    def base_url(self) -> str:
+        return str(self._server.make_url("")).rstrip("/")
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.requests.values())
+
+    def fail(self, method: str, template: str, status: int, times: int = 1) -> None:
+        """Следующие `times` запросов шаблона получат `status`."""
+        self._faults.setdefault((method, template), []).extend([status] * times)
+
+    def patch_http(self, monkeypatch: Any) -> None:
+        """Все `HTTP`, созданные дальше, ходят на stand-in."""
+        original_init = HTTP.__init__
+        base_url = self.base_url
+
+        def init(http: HTTP, *args: Any, **kwargs: Any) -> None:
+            original_init(http, *args, **kwargs)
+            http._base_url = base_url
+
+        monkeypatch.setattr(HTTP, "__init__", init)
+
+    async def __aenter__(self) -> OperatorStandIn:
+        await self._server.start_server(access_log=None)
+        return self
+
+    async def __aexit__(self, *_exc: object) -> None:
+        await self._server.close()
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        key = (request.method, endpoint_template(request.path))
+        self.requests[f"{key[0]} {key[1]}"] += 1
+        await request.read()
+        delay = self.latency + self._random.uniform(0, self.jitter)
+        if delay:
+            # Пик одновременно обрабатываемых запросов: проверка параллельности
+            # без замера wall-clock.
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                self.in_flight -= 1
+
+        faults = self._faults.get(key)
+        if faults:
+            return web.Response(status=faults.pop(0))
+        if self.error_rate and self._random.random() < self.error_rate:
+            return web.Response(status=self.error_status)
+        responder = self.routes.get(key)
+        if responder is None:
+            return web.Response(status=404)
+        status, body = responder(request.path)
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode()
+        if self.chunked:
+            response = web.StreamResponse(status=status)
+            response.enable_chunked_encoding()
+            await response.prepare(request)
+            await response.write(body)
+            await response.write_eof()
+            return response
+        return web.Response(status=status, body=body, content_type="application/json")
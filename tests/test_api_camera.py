@@ -7,6 +7,7 @@ from unittest.mock import AsyncMock, MagicMock
 from aiohttp import ClientResponse
 
 from custom_components.elektronny_gorod.api import ElektronnyGorodAPI
+from custom_components.elektronny_gorod.rate_limit import PRIORITY_BACKGROUND
 from custom_components.elektronny_gorod.user_agent import UserAgent
 
 
@@ -19,5 +20,18 @@ async def test_live_stream_requests_explicit_h264_format(hass) -> None:
 
     assert await api.query_camera_stream("CAMERA") == "https://stream.invalid/live"
     api.http.get.assert_awaited_once_with(
-        "/rest/v1/forpost/cameras/CAMERA/video?LightStream=0&Format=H264"
+        "/rest/v1/forpost/cameras/CAMERA/video?LightStream=0&Format=H264",
+        priority=None,
     )
+
+
+async def test_stream_url_request_takes_caller_priority(hass) -> None:
+    """Фоновый refresh stream manager-а идёт в bucket как background."""
+    api = ElektronnyGorodAPI(hass, UserAgent())
+    response = MagicMock(spec=ClientResponse)
+    response.json = AsyncMock(return_value={"data": {"URL": "https://stream.invalid/live"}})
+    api.http.get = AsyncMock(return_value=response)
+
+    await api.query_camera_stream("CAMERA", priority=PRIORITY_BACKGROUND)
+
+    assert api.http.get.await_args.kwargs["priority"] == PRIORITY_BACKGROUND
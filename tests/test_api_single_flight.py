@@ -0,0 +1,154 @@
+"""Single-flight склейка идентичных in-flight чтений в `ElektronnyGorodAPI`.
+
+- Конкурентные одинаковые GET (snapshot, JSON-чтения) — один HTTP round-trip.
+- Ключ учитывает endpoint и тело: разные камеры / страницы не склеиваются.
+- Действия (open_lock), одноразовый stream URL и POST без явного opt-in не
+  склеиваются никогда.
+"""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiohttp import ClientResponse
+
+from custom_components.elektronny_gorod.api import ElektronnyGorodAPI
+from custom_components.elektronny_gorod.user_agent import UserAgent
+
+
+def _json_response(payload) -> MagicMock:
+    response = MagicMock(spec=ClientResponse)
+    response.json = AsyncMock(return_value=payload)
+    return response
+
+
+def _slow(value):
+    gate = asyncio.Event()
+
+    async def side_effect(*_args, **_kwargs):
+        await gate.wait()
+        return value() if callable(value) else value
+
+    return gate, side_effect
+
+
+async def test_different_endpoints_are_not_coalesced(hass) -> None:
+    api = ElektronnyGorodAPI(hass, UserAgent())
+    gate, side_effect = _slow(b"jpeg")
+    api.http.get = AsyncMock(side_effect=side_effect)
+
+    tasks = [
+        asyncio.ensure_future(api.query_camera_snapshot("C1", 640, 360)),
+        asyncio.ensure_future(api.query_camera_snapshot("C2", 640, 360)),
+    ]
+    await asyncio.sleep(0)
+    gate.set()
+
+    assert await asyncio.gather(*tasks) == [b"jpeg", b"jpeg"]
+    assert api.http.get.await_count == 2
+    assert api.coalesced == 0
+
+
+async def test_history_search_is_keyed_by_body(hass) -> None:
+    api = ElektronnyGorodAPI(hass, UserAgent())
+    gate, side_effect = _slow(lambda: _json_response({"content": [], "last": True}))
+    api.http.post = AsyncMock(side_effect=side_effect)
+
+    tasks = [
+        asyncio.ensure_future(api.query_events([1])),
+        asyncio.ensure_future(api.query_events([1])),
+        asyncio.ensure_future(api.query_events([2])),
+    ]
+    await asyncio.sleep(0)
+    gate.set()
+    await asyncio.gather(*tasks)
+
+    assert api.http.post.await_count == 2
+    assert api.coalesced == 1
+
+
+async def test_actions_are_never_coalesced(hass) -> None:
+    api = ElektronnyGorodAPI(hass, UserAgent())
+    gate, side_effect = _slow(None)
+    api.http.post = AsyncMock(side_effect=side_effect)
+
+    tasks = [
+        asyncio.ensure_future(api.open_lock("P1", "AC1", None)) for _ in range(2)
+    ]
+    await asyncio.sleep(0)
+    gate.set()
+    await asyncio.gather(*tasks)
+
+    assert api.http.post.await_count == 2
+
+
+async def test_single_use_stream_urls_are_never_coalesced(hass) -> None:
+    api = ElektronnyGorodAPI(hass, UserAgent())
+    gate, side_effect = _slow(lambda: _json_response({"data": {"URL": "rtsp://x"}}))
+    api.http.get = AsyncMock(side_effect=side_effect)
+
+    tasks = [asyncio.ensure_future(api.query_camera_stream("C1")) for _ in range(2)]
+    await asyncio.sleep(0)
+    gate.set()
+
+    assert await asyncio.gather(*tasks) == ["rtsp://x"] * 2
+    assert api.http.get.await_count == 2
+    assert api.coalesced == 0
+    assert api._inflight == {}
+
+
+async def test_error_is_shared_and_not_cached(hass) -> None:
+    api = ElektronnyGorodAPI(hass, UserAgent())
+    gate, _ = _slow(None)
+
+    async def boom(*_args, **_kwargs):
+        await gate.wait()
+        raise RuntimeError("operator down")
+
+    api.http.get = AsyncMock(side_effect=boom)
+    tasks = [
+        asyncio.ensure_future(api.query_camera_snapshot("C1", 1, 1)) for _ in range(2)
+    ]
+    await asyncio.sleep(0)
+    gate.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert api.http.get.await_count == 1
+
+    api.http.get = AsyncMock(return_value=b"ok")
+    assert await api.query_camera_snapshot("C1", 1, 1) == b"ok"
+
+
+async def test_cancelled_waiter_does_not_cancel_shared_request(hass) -> None:
+    api = ElektronnyGorodAPI(hass, UserAgent())
+    gate, side_effect = _slow(b"jpeg")
+    api.http.get = AsyncMock(side_effect=side_effect)
+
+    first = asyncio.ensure_future(api.query_camera_snapshot("C1", 1, 1))
+    second = asyncio.ensure_future(api.query_camera_snapshot("C1", 1, 1))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    gate.set()
+
+    assert await second == b"jpeg"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+async def test_opt_out_disables_coalescing(hass) -> None:
+    api = ElektronnyGorodAPI(hass, UserAgent())
+    api.coalesce_requests = False
+    gate, side_effect = _slow(b"jpeg")
+    api.http.get = AsyncMock(side_effect=side_effect)
+
+    tasks = [
+        asyncio.ensure_future(api.query_camera_snapshot("C1", 1, 1)) for _ in range(2)
+    ]
+    await asyncio.sleep(0)
+    gate.set()
+    await asyncio.gather(*tasks)
+
+    assert api.http.get.await_count == 2
@@ -36,7 +36,10 @@ from custom_components.elektronny_gorod.const import (
     CONF_USER_AGENT,
     DOMAIN,
 )
-from custom_components.elektronny_gorod.go2rtc import Go2RtcStreamInfo
+from custom_components.elektronny_gorod.go2rtc import (
+    Go2RtcRequestError,
+    Go2RtcStreamInfo,
+)
 from custom_components.elektronny_gorod.user_agent import UserAgent
 
 CAM_A = "100"
@@ -82,7 +85,7 @@ def mock_api():
 
         counter = {"n": 0}
 
-        async def _stream(camera_id: str):
+        async def _stream(camera_id: str, *, priority: int | None = None):
             counter["n"] += 1
             return f"https://op.example/stream/{camera_id}/token{counter['n']}.flv"
 
@@ -268,30 +271,51 @@ async def test_recovery_go2rtc_path_calls_manager(hass: HomeAssistant, mock_api)
     stream.update_source.assert_not_called()
 
 
-# ─── A-71 v2: go2rtc producer-health poll (go2rtc/WebRTC-only, лифты) ──────
+# ─── A-71 v2: go2rtc producer-health (go2rtc/WebRTC-only, лифты) ──────────
 #
 # Контекст: камеры без legacy HA Stream worker (обслуживаются только через
 # go2rtc/WebRTC — напр. лифты) не дают сигнала `stream.available → False`.
-# Для них поллим go2rtc `/api/streams` producer `bytes_recv`: заморожен при
-# наличии consumers → producer мёртв (operator EOF) → тот же recovery.
+# Для них общий health-monitor снимает go2rtc `/api/streams` и считает
+# producer `bytes_recv`: заморожен при наличии consumers → producer мёртв
+# (operator EOF) → тот же recovery.
+
+
+def _snapshot(bytes_recv: int, consumers: int) -> dict[str, Go2RtcStreamInfo]:
+    """Снимок `/api/streams` общего health-monitor-а с одним `eg_<CAM_A>`."""
+    return {
+        f"eg_{CAM_A}": Go2RtcStreamInfo(
+            producers=({"bytes_recv": bytes_recv},),
+            consumer_count=consumers,
+            producer_active=True,
+        )
+    }
+
+
+async def _poll(cam, *snapshots) -> None:
+    """Прогнать снимки через monitor go2rtc-инстанса камеры."""
+    monitor = cam._stream_manager.health_monitor
+    with patch.object(
+        monitor.client,
+        "async_list_streams",
+        new=AsyncMock(side_effect=list(snapshots)),
+    ):
+        for _ in snapshots:
+            await monitor.async_poll()
 
 
 async def test_go2rtc_poll_frozen_triggers_recovery(hass: HomeAssistant, mock_api):
-    """bytes_recv не растёт между опросами при consumers>0 → recovery."""
+    """bytes_recv не растёт между снимками при consumers>0 → recovery."""
     cam = await _setup_camera(hass, use_go2rtc=True)
     instance = mock_api.return_value
     instance.query_camera_stream.reset_mock()
-    cam._fetch_go2rtc_stream_info = AsyncMock(
-        return_value=([{"bytes_recv": 1000}], [{}])
-    )
 
     with patch.object(
         cam._stream_manager.client,
         "async_patch_stream",
         new=AsyncMock(),
     ) as mock_patch:
-        await cam._async_poll_go2rtc_health()  # baseline (prev=None) — без recovery
-        await cam._async_poll_go2rtc_health()  # тот же bytes_recv → frozen → recovery
+        # baseline (prev=None) — без recovery; тот же bytes_recv → frozen.
+        await _poll(cam, _snapshot(1000, 1), _snapshot(1000, 1))
         await hass.async_block_till_done()
 
     assert instance.query_camera_stream.await_count == 1
@@ -299,19 +323,18 @@ async def test_go2rtc_poll_frozen_triggers_recovery(hass: HomeAssistant, mock_ap
 
 
 async def test_go2rtc_poll_first_call_only_baselines(hass: HomeAssistant, mock_api):
-    """Первый опрос лишь ставит baseline — recovery не запускается."""
+    """Первый снимок лишь ставит baseline — recovery не запускается."""
     cam = await _setup_camera(hass, use_go2rtc=True)
     instance = mock_api.return_value
     instance.query_camera_stream.reset_mock()
-    cam._fetch_go2rtc_stream_info = AsyncMock(
-        return_value=([{"bytes_recv": 1000}], [{}])
-    )
 
-    await cam._async_poll_go2rtc_health()
+    await _poll(cam, _snapshot(1000, 1))
     await hass.async_block_till_done()
 
     assert instance.query_camera_stream.await_count == 0
-    assert cam._go2rtc_last_bytes_recv == 1000
+    health = cam._stream_manager.health_monitor.latest(f"eg_{CAM_A}")
+    assert health.bytes_recv == 1000
+    assert health.bytes_delta is None
 
 
 async def test_go2rtc_poll_growing_no_recovery(hass: HomeAssistant, mock_api):
@@ -319,14 +342,8 @@ async def test_go2rtc_poll_growing_no_recovery(hass: HomeAssistant, mock_api):
     cam = await _setup_camera(hass, use_go2rtc=True)
     instance = mock_api.return_value
     instance.query_camera_stream.reset_mock()
-    cam._fetch_go2rtc_stream_info = AsyncMock(side_effect=[
-        ([{"bytes_recv": 1000}], [{}]),
-        ([{"bytes_recv": 2000}], [{}]),
-        ([{"bytes_recv": 3000}], [{}]),
-    ])
-
-    for _ in range(3):
-        await cam._async_poll_go2rtc_health()
+
+    await _poll(cam, _snapshot(1000, 1), _snapshot(2000, 1), _snapshot(3000, 1))
     await hass.async_block_till_done()
 
     assert instance.query_camera_stream.await_count == 0
@@ -338,43 +355,44 @@ async def test_go2rtc_poll_no_consumers_resets_baseline(hass: HomeAssistant, moc
     cam = await _setup_camera(hass, use_go2rtc=True)
     instance = mock_api.return_value
     instance.query_camera_stream.reset_mock()
-    cam._fetch_go2rtc_stream_info = AsyncMock(
-        return_value=([{"bytes_recv": 1000}], [])
-    )
 
-    await cam._async_poll_go2rtc_health()
-    await cam._async_poll_go2rtc_health()
+    await _poll(cam, _snapshot(1000, 0), _snapshot(1000, 0))
     await hass.async_block_till_done()
 
     assert instance.query_camera_stream.await_count == 0
-    assert cam._go2rtc_last_bytes_recv is None
+    health = cam._stream_manager.health_monitor.latest(f"eg_{CAM_A}")
+    assert health.bytes_delta is None
 
 
 async def test_go2rtc_poll_fetch_failure_graceful(hass: HomeAssistant, mock_api):
-    """go2rtc недоступен / не-JSON (_fetch вернул None) → no-op, без падения."""
+    """go2rtc недоступен → снимка нет, no-op, без падения."""
     cam = await _setup_camera(hass, use_go2rtc=True)
     instance = mock_api.return_value
     instance.query_camera_stream.reset_mock()
-    cam._fetch_go2rtc_stream_info = AsyncMock(return_value=None)
 
-    await cam._async_poll_go2rtc_health()
-    await cam._async_poll_go2rtc_health()
+    await _poll(
+        cam,
+        Go2RtcRequestError("list", "timeout"),
+        Go2RtcRequestError("list", "timeout"),
+    )
     await hass.async_block_till_done()
 
     assert instance.query_camera_stream.await_count == 0
+    assert cam._stream_manager.health_monitor.failures == 2
 
 
 async def test_health_poll_registered_only_for_go2rtc(hass: HomeAssistant, mock_api):
-    """Таймер health-poll регистрируется для use_go2rtc, и НЕ для прямого FLV."""
+    """Подписка на health-monitor — для use_go2rtc, и НЕ для прямого FLV."""
     cam_go2rtc = await _setup_camera(hass, use_go2rtc=True)
-    assert cam_go2rtc._unsub_health_poll is not None
+    assert cam_go2rtc._unsub_health is not None
+    assert cam_go2rtc._health_monitor is cam_go2rtc._stream_manager.health_monitor
 
 
 async def test_health_poll_not_registered_without_go2rtc(
     hass: HomeAssistant, mock_api
 ):
     cam_direct = await _setup_camera(hass, use_go2rtc=False)
-    assert cam_direct._unsub_health_poll is None
+    assert cam_direct._unsub_health is None
 
 
 async def test_fetch_go2rtc_stream_info_parses_response(
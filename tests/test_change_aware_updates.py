@@ -0,0 +1,194 @@
+"""Change-aware уведомления coordinator-а: будим только затронутые entity.
+
+- `diff_indexes` находит добавленные / удалённые / изменённые записи по ключу.
+- Тик без изменений не пишет state ни одной entity.
+- Изменение одного lock-а / DND place-а пишет только их entity.
+- Смена `last_update_success` и `async_update_all_listeners` — полный путь.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.const import EVENT_STATE_CHANGED, EVENT_STATE_REPORTED
+from homeassistant.core import Event, HomeAssistant, callback
+
+from custom_components.elektronny_gorod.const import (
+    CONF_ACCESS_TOKEN,
+    CONF_OPERATOR_ID,
+    CONF_REFRESH_TOKEN,
+    CONF_USER_AGENT,
+    DOMAIN,
+)
+from custom_components.elektronny_gorod.snapshot_index import (
+    RECORD_ACCESS_CONTROLS,
+    RECORD_CAMERAS,
+    RECORD_DND,
+    RECORD_LOCKS,
+    SnapshotIndex,
+    diff_indexes,
+)
+from custom_components.elektronny_gorod.user_agent import UserAgent
+
+PLACE_ID = "P1"
+
+
+def _dnd(root: bool) -> list[dict[str, Any]]:
+    return [
+        {"type": "DO_NOT_DISTURB_ROOT", "status": root, "editable": True},
+        {"type": "INTERCOM_CALLS", "status": False, "editable": True},
+    ]
+
+
+@pytest.fixture
+def mock_api():
+    with patch(
+        "custom_components.elektronny_gorod.coordinator.ElektronnyGorodAPI"
+    ) as mock_cls:
+        instance = mock_cls.return_value
+        instance.http = AsyncMock()
+        instance.http.user_agent = AsyncMock()
+        instance.query_places = AsyncMock(return_value=[{
+            "subscriber": {"id": "S1", "accountId": "A1", "name": "Test"},
+            "place": {"id": PLACE_ID, "address": {"visibleAddress": "Home"}},
+        }])
+        instance.query_balance = AsyncMock(return_value={"balance": 10})
+        instance.query_access_controls = AsyncMock(return_value=[{
+            "id": "AC1",
+            "name": "Door",
+            "entrances": [
+                {"id": "E1", "name": "Подъезд 1", "externalCameraId": 101, "allowOpen": True},
+                {"id": "E2", "name": "Подъезд 2", "externalCameraId": 102, "allowOpen": True},
+            ],
+        }])
+        instance.query_cameras = AsyncMock(return_value=[])
+        instance.query_public_cameras = AsyncMock(return_value=[])
+        instance.query_screens_settings = AsyncMock(return_value={})
+        instance.query_dnd_settings = AsyncMock(return_value=_dnd(False))
+        yield mock_cls
+
+
+async def _setup(hass: HomeAssistant):
+    ua = UserAgent()
+    ua.operator_id = "1"
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=3,
+        unique_id="test_unique_subscriber_S1",
+        data={
+            CONF_ACCESS_TOKEN: "T1",
+            CONF_REFRESH_TOKEN: "R1",
+            CONF_OPERATOR_ID: "1",
+            CONF_USER_AGENT: json.dumps(ua.json()),
+            "account_id": "A1",
+            "subscriber_id": "S1",
+            "use_go2rtc": False,
+            "go2rtc_base_url": "http://127.0.0.1:1984",
+            "go2rtc_rtsp_host": "127.0.0.1",
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry, hass.data[DOMAIN][entry.entry_id]
+
+
+def _track_writes(hass: HomeAssistant) -> list[str]:
+    """entity_id каждой записи state (changed или reported без изменений)."""
+    writes: list[str] = []
+
+    @callback
+    def _record(event: Event) -> None:
+        writes.append(event.data["entity_id"])
+
+    @callback
+    def _any(_data: Any) -> bool:
+        return True
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _record)
+    hass.bus.async_listen(EVENT_STATE_REPORTED, _record, event_filter=_any)
+    return writes
+
+
+def test_diff_indexes_reports_changed_added_removed() -> None:
+    old = SnapshotIndex.build({
+        "cameras": [{"id": 1, "name": "A"}, {"id": 2, "name": "B"}],
+        "locks": [{"place_id": "P", "access_control_id": "A", "entrance_id": "E"}],
+    })
+    new = SnapshotIndex.build({
+        "cameras": [{"id": 1, "name": "A"}, {"id": 2, "name": "B2"}, {"id": 3}],
+        "locks": [],
+    })
+
+    diff = diff_indexes(old, new)
+
+    assert not diff.full
+    assert diff.changed == {
+        (RECORD_CAMERAS, "2"),
+        (RECORD_CAMERAS, "3"),
+        (RECORD_LOCKS, ("P", "A", "E")),
+        (RECORD_ACCESS_CONTROLS, ("P", "A")),
+    }
+    assert not diff.affects(RECORD_CAMERAS, "1")
+
+
+async def test_unchanged_tick_writes_nothing(hass: HomeAssistant, mock_api) -> None:
+    _entry, coordinator = await _setup(hass)
+    writes = _track_writes(hass)
+
+    coordinator.async_set_updated_data(await coordinator._async_update_data())
+    await hass.async_block_till_done()
+
+    assert writes == []
+    assert coordinator.last_diff.changed == frozenset()
+
+
+async def test_only_changed_records_write_state(hass: HomeAssistant, mock_api) -> None:
+    _entry, coordinator = await _setup(hass)
+    writes = _track_writes(hass)
+    data = coordinator.data
+    locks = [dict(lock) for lock in data["locks"]]
+    locks[1]["openable"] = False
+    changed = {
+        **{key: value for key, value in data.items() if key != "index"},
+        "locks": locks,
+        "dnd": {PLACE_ID: _dnd(True)},
+    }
+
+    coordinator.async_set_updated_data(changed)
+    await hass.async_block_till_done()
+
+    assert coordinator.last_diff.changed == {
+        (RECORD_LOCKS, (PLACE_ID, "AC1", "E2")),
+        (RECORD_DND, PLACE_ID),
+    }
+    # Камеры, сенсоры баланса, event-ы и второй lock не тронуты.
+    assert all(eid.startswith(("switch.", "lock.")) for eid in writes)
+    lock_writes = {eid for eid in writes if eid.startswith("lock.")}
+    assert len(lock_writes) == 1
+    assert hass.states.get(next(iter(lock_writes))).state == "unavailable"
+    # Оба DND-switch-а place-а (root + зависимый от него intercom).
+    assert len({eid for eid in writes if eid.startswith("switch.")}) == 2
+
+
+async def test_availability_flip_and_forced_full_refresh(
+    hass: HomeAssistant, mock_api
+) -> None:
+    _entry, coordinator = await _setup(hass)
+    writes = _track_writes(hass)
+
+    coordinator.async_set_update_error(RuntimeError("operator down"))
+    await hass.async_block_till_done()
+    assert coordinator.last_diff.full
+    entity_count = len(set(writes))
+    assert entity_count > 0
+
+    writes.clear()
+    coordinator.async_update_all_listeners()
+    await hass.async_block_till_done()
+    assert len(set(writes)) == entity_count
+    assert coordinator.notify_stats["full"] >= 3
@@ -0,0 +1,120 @@
+"""Parallel per-place refresh: places и их запросы идут конкурентно.
+
+`place_id` передаётся per-request (UA-строка строится на каждый запрос), поэтому
+coordinator больше не обязан обходить places сериально. Проверяем:
+- запросы разных places реально перекрываются по времени;
+- in-flight не превышает `_REFRESH_CONCURRENCY`;
+- порядок/состав данных тот же, что при serial refresh.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.elektronny_gorod import coordinator as coordinator_module
+from custom_components.elektronny_gorod.coordinator import (
+    ElektronnyGorodUpdateCoordinator,
+)
+
+_PLACES = [f"P{i}" for i in range(5)]
+
+
+class _Tracker:
+    """Считает одновременные in-flight вызовы API-моков."""
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.peak = 0
+
+    def wrap(self, result_for: Any) -> AsyncMock:
+        async def _call(place_id: str | None = None, *_args: Any, **_kwargs: Any) -> Any:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            try:
+                await asyncio.sleep(0)
+                await asyncio.sleep(0)
+                return result_for(place_id)
+            finally:
+                self.in_flight -= 1
+
+        return AsyncMock(side_effect=_call)
+
+
+def _make_coordinator(hass: HomeAssistant, tracker: _Tracker):
+    with patch.object(coordinator_module, "ElektronnyGorodAPI") as mock_cls, patch.object(
+        coordinator_module, "UserAgent"
+    ):
+        api = mock_cls.return_value
+        api.http = MagicMock()
+        api.query_places = AsyncMock(return_value=[
+            {"place": {"id": place_id}} for place_id in _PLACES
+        ])
+        api.query_balance = tracker.wrap(lambda p: {"balance": 1, "targetDate": p})
+        api.query_screens_settings = tracker.wrap(lambda p: {})
+        api.query_access_controls = tracker.wrap(lambda p: [{
+            "id": f"AC-{p}",
+            "name": "Door",
+            "entrances": [{"id": f"E-{p}", "externalCameraId": f"cam-{p}"}],
+        }])
+        api.query_cameras = tracker.wrap(lambda p: [])
+        api.query_public_cameras = tracker.wrap(lambda p: [{"id": "city", "name": "City"}])
+        api.query_dnd_settings = tracker.wrap(lambda p: [{"type": "ROOT", "status": False}])
+        entry = MagicMock()
+        entry.data = {
+            "user_agent": "{}",
+            "access_token": "T",
+            "refresh_token": "R",
+            "operator_id": "1",
+        }
+        coordinator = ElektronnyGorodUpdateCoordinator(hass, entry=entry)
+    return coordinator, api
+
+
+async def test_refresh_overlaps_requests_within_limit(hass: HomeAssistant) -> None:
+    tracker = _Tracker()
+    coordinator, _api = _make_coordinator(hass, tracker)
+
+    await coordinator._async_update_data()
+
+    assert tracker.peak > 1
+    assert tracker.peak <= coordinator_module._REFRESH_CONCURRENCY
+    coordinator.async_unsubscribe()
+
+
+async def test_parallel_refresh_keeps_place_order_and_dedupe(hass: HomeAssistant) -> None:
+    tracker = _Tracker()
+    coordinator, api = _make_coordinator(hass, tracker)
+
+    data = await coordinator._async_update_data()
+
+    assert [b["place_id"] for b in data["balances"]] == _PLACES
+    assert [lk["place_id"] for lk in data["locks"]] == _PLACES
+    # Порядок places сохранён; общая public-камера — один раз, из первого place.
+    assert [c["id"] for c in data["cameras"]] == (
+        ["cam-P0", "city"] + [f"cam-{p}" for p in _PLACES[1:]]
+    )
+    assert sorted(data["dnd"]) == _PLACES
+    # Контекст-free запросы берут основное место аккаунта.
+    assert api.http.user_agent.place_id == "P0"
+    coordinator.async_unsubscribe()
+
+
+async def test_one_place_failure_does_not_drop_others(hass: HomeAssistant) -> None:
+    tracker = _Tracker()
+    coordinator, api = _make_coordinator(hass, tracker)
+
+    async def _flaky(place_id: str) -> list[dict[str, Any]]:
+        if place_id == "P2":
+            raise RuntimeError("boom")
+        return [{"id": f"AC-{place_id}", "name": "Door", "entrances": []}]
+
+    api.query_access_controls = AsyncMock(side_effect=_flaky)
+
+    data = await coordinator._async_update_data()
+
+    assert [lk["place_id"] for lk in data["locks"]] == ["P0", "P1", "P3", "P4"]
+    assert len(data["balances"]) == len(_PLACES)
+    coordinator.async_unsubscribe()
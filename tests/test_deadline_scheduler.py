@@ -0,0 +1,129 @@
+"""Heap-планировщик сроков (`deadline_scheduler.py`).
+
+- Один взведённый таймер на ближайший срок; более поздний срок не перевзводит.
+- Cancel — ленивый, stale-записи пропускаются и уплотняются.
+- Всё, что истекает в пределах окна, уходит одним batch-ем.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+from unittest.mock import MagicMock
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.elektronny_gorod import deadline_scheduler
+from custom_components.elektronny_gorod.deadline_scheduler import DeadlineScheduler
+
+
+class _Timers:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.armed: list[tuple[float, Callable, MagicMock]] = []
+
+    def call_later(self, hass, delay, action):
+        cancel = MagicMock(name=f"cancel_{len(self.armed)}")
+        self.armed.append((delay, action, cancel))
+        return cancel
+
+    def live(self) -> list[float]:
+        return [delay for delay, _, cancel in self.armed if not cancel.called]
+
+    async def fire(self) -> None:
+        delay, action, _ = self.armed.pop()
+        self.now += delay
+        await action(None)
+
+
+@pytest.fixture
+def timers(monkeypatch: pytest.MonkeyPatch) -> _Timers:
+    timers = _Timers()
+    monkeypatch.setattr(deadline_scheduler, "async_call_later", timers.call_later)
+    return timers
+
+
+def _scheduler(hass: HomeAssistant, timers: _Timers, batches: list) -> DeadlineScheduler:
+    async def _dispatch(keys: list[str]) -> None:
+        batches.append(sorted(keys))
+
+    return DeadlineScheduler(hass, _dispatch, clock=lambda: timers.now)
+
+
+async def test_one_timer_for_the_earliest_deadline(
+    hass: HomeAssistant, timers: _Timers
+) -> None:
+    scheduler = _scheduler(hass, timers, [])
+
+    scheduler.schedule("a", 50.0)
+    scheduler.schedule("b", 80.0)
+    assert timers.live() == [50.0]
+
+    scheduler.schedule("c", 10.0)
+    assert timers.live() == [10.0]
+    assert scheduler.next_due("b") == 80.0
+    assert scheduler.due_times() == {"a": 50.0, "b": 80.0, "c": 10.0}
+
+    scheduler.clear()
+    assert timers.live() == []
+    assert len(scheduler) == 0
+
+
+async def test_batch_dispatch_within_window_and_rearm(
+    hass: HomeAssistant, timers: _Timers
+) -> None:
+    batches: list = []
+    scheduler = _scheduler(hass, timers, batches)
+    for key, deadline in (("a", 10.0), ("b", 10.1), ("c", 10.2), ("d", 40.0)):
+        scheduler.schedule(key, deadline)
+
+    await timers.fire()
+
+    assert batches == [["a", "b", "c"]]
+    assert timers.live() == [30.0]
+    assert scheduler.stats()["dispatched"] == 3
+    await timers.fire()
+    assert batches == [["a", "b", "c"], ["d"]]
+    assert timers.live() == []
+
+
+async def test_cancel_and_reschedule_are_lazy(
+    hass: HomeAssistant, timers: _Timers
+) -> None:
+    batches: list = []
+    scheduler = _scheduler(hass, timers, batches)
+    for index in range(100):
+        scheduler.schedule(f"cam{index}", 100.0 + index)
+    for index in range(99):
+        assert scheduler.cancel(f"cam{index}")
+    assert not scheduler.cancel("cam0")
+    # Stale-записи уплотнены, живая осталась одна.
+    assert len(scheduler._heap) <= 2 * len(scheduler)
+
+    # Отменённый ранний срок: таймер срабатывает впустую и перевзводится.
+    await timers.fire()
+    assert batches == []
+    assert timers.live() == [pytest.approx(99.0)]
+
+    scheduler.schedule("cam99", 500.0)
+    assert scheduler.next_due("cam99") == 500.0
+    await timers.fire()
+    assert batches == []
+    await timers.fire()
+    assert batches == [["cam99"]]
+
+
+async def test_dispatch_failure_keeps_scheduler_running(
+    hass: HomeAssistant, timers: _Timers
+) -> None:
+    async def _broken(keys: list[str]) -> None:
+        raise RuntimeError("boom")
+
+    scheduler = DeadlineScheduler(hass, _broken, clock=lambda: timers.now)
+    scheduler.schedule("a", 5.0)
+    scheduler.schedule("b", 15.0)
+
+    await timers.fire()
+
+    assert timers.live() == [10.0]
+    assert "b" in scheduler and "a" not in scheduler
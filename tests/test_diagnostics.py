@@ -121,6 +121,54 @@ async def test_diagnostics_coordinator_snapshot_is_counts_only(
     }
 
 
+async def test_diagnostics_exposes_http_cache_counters(hass: HomeAssistant) -> None:
+    """Счётчики conditional-кэша попадают в diagnostics (только числа)."""
+    from custom_components.elektronny_gorod.http import ResponseCache
+
+    entry = _make_entry()
+    entry.add_to_hass(hass)
+
+    cache = ResponseCache()
+    cache.hits = 4
+    cache.misses = 2
+
+    class _FakeHttp:
+        def diagnostics(self):
+            return {"response_cache": cache.stats()}
+
+    class _FakeApi:
+        http = _FakeHttp()
+
+    class _FakeCoordinator:
+        data = None
+        api = _FakeApi()
+
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = _FakeCoordinator()
+
+    diag = await async_get_config_entry_diagnostics(hass, entry)
+    assert diag["http"]["response_cache"]["hits"] == 4
+    assert diag["http"]["response_cache"]["misses"] == 2
+
+
+async def test_diagnostics_exposes_stream_manager_due_times(
+    hass: HomeAssistant,
+) -> None:
+    """Сроки общего планировщика stream manager-а — только числа."""
+    from custom_components.elektronny_gorod.const import STREAM_MANAGER_DATA
+
+    entry = _make_entry()
+    entry.add_to_hass(hass)
+
+    class _FakeManager:
+        def scheduler_stats(self):
+            return {"scheduled": 1, "refresh_due_in_s": {"100": 12.5}}
+
+    hass.data.setdefault(STREAM_MANAGER_DATA, {})[entry.entry_id] = _FakeManager()
+
+    diag = await async_get_config_entry_diagnostics(hass, entry)
+    assert diag["stream_manager"]["refresh_due_in_s"] == {"100": 12.5}
+
+
 async def test_diagnostics_without_coordinator(hass: HomeAssistant) -> None:
     """Без coordinator в hass.data — diagnostics не падает, секция отсутствует."""
     entry = _make_entry()
@@ -0,0 +1,159 @@
+"""Entity для новых ключей снимка — без reload entry (`async_track_records`).
+
+- Новый entrance / домофон / DND-item после setup-а → новые lock, camera,
+  event, call_state, switch entity на том же coordinator-е.
+- Исчезнувший ключ → entity unavailable (не удаляется); вернулся — снова
+  available, без дублей.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.elektronny_gorod.const import (
+    CONF_ACCESS_TOKEN,
+    CONF_OPERATOR_ID,
+    CONF_REFRESH_TOKEN,
+    CONF_USER_AGENT,
+    DOMAIN,
+)
+from custom_components.elektronny_gorod.refresh_schedule import (
+    KIND_ACCESS_CONTROLS,
+    KIND_DND,
+)
+from custom_components.elektronny_gorod.user_agent import UserAgent
+
+PLACE_ID = "P1"
+_DOOR = {
+    "id": "AC1",
+    "name": "Door",
+    "entrances": [
+        {"id": "E1", "name": "Подъезд 1", "externalCameraId": 101, "allowOpen": True},
+    ],
+}
+_GATE = {
+    "id": "AC2",
+    "name": "Gate",
+    "entrances": [
+        {"id": "E2", "name": "Калитка", "externalCameraId": 102, "allowOpen": True},
+    ],
+}
+
+
+@pytest.fixture
+def mock_api():
+    with patch(
+        "custom_components.elektronny_gorod.coordinator.ElektronnyGorodAPI"
+    ) as mock_cls:
+        instance = mock_cls.return_value
+        instance.http = AsyncMock()
+        instance.http.user_agent = AsyncMock()
+        instance.query_places = AsyncMock(return_value=[{
+            "subscriber": {"id": "S1", "accountId": "A1", "name": "Test"},
+            "place": {"id": PLACE_ID, "address": {"visibleAddress": "Home"}},
+        }])
+        instance.query_balance = AsyncMock(return_value={"balance": 10})
+        instance.query_access_controls = AsyncMock(return_value=[_DOOR])
+        instance.query_cameras = AsyncMock(return_value=[])
+        instance.query_public_cameras = AsyncMock(return_value=[])
+        instance.query_screens_settings = AsyncMock(return_value={})
+        instance.query_dnd_settings = AsyncMock(return_value=[
+            {"type": "DO_NOT_DISTURB_ROOT", "status": True, "editable": True},
+        ])
+        yield instance
+
+
+async def _setup(hass: HomeAssistant):
+    ua = UserAgent()
+    ua.operator_id = "1"
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=3,
+        unique_id="test_unique_subscriber_S1",
+        data={
+            CONF_ACCESS_TOKEN: "T1",
+            CONF_REFRESH_TOKEN: "R1",
+            CONF_OPERATOR_ID: "1",
+            CONF_USER_AGENT: json.dumps(ua.json()),
+            "account_id": "A1",
+            "subscriber_id": "S1",
+            "use_go2rtc": False,
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry, hass.data[DOMAIN][entry.entry_id]
+
+
+async def _refresh(hass: HomeAssistant, coordinator: Any, *kinds: str) -> None:
+    for kind in kinds:
+        coordinator.refresh_schedule.invalidate(kind)
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+
+def _entity_id(hass: HomeAssistant, domain: str, unique_id: str) -> str | None:
+    return er.async_get(hass).async_get_entity_id(domain, DOMAIN, unique_id)
+
+
+async def test_new_access_control_adds_entities_without_reload(
+    hass: HomeAssistant, mock_api
+) -> None:
+    entry, coordinator = await _setup(hass)
+    before = len(er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id))
+    assert _entity_id(hass, "lock", f"{DOMAIN}_lock_{PLACE_ID}_AC2_E2") is None
+
+    mock_api.query_access_controls.return_value = [_DOOR, _GATE]
+    mock_api.query_dnd_settings.return_value = [
+        {"type": "DO_NOT_DISTURB_ROOT", "status": True, "editable": True},
+        {"type": "INTERCOM_CALLS", "status": False, "editable": True},
+    ]
+    await _refresh(hass, coordinator, KIND_ACCESS_CONTROLS, KIND_DND)
+
+    assert hass.data[DOMAIN][entry.entry_id] is coordinator
+    for domain, unique_id in (
+        ("lock", f"{DOMAIN}_lock_{PLACE_ID}_AC2_E2"),
+        ("camera", f"{DOMAIN}_camera_102"),
+        ("event", f"{DOMAIN}_event_doorbell_{PLACE_ID}_AC2"),
+        ("event", f"{DOMAIN}_event_history_access_{PLACE_ID}_AC2"),
+        ("switch", f"{DOMAIN}_dnd_{PLACE_ID}_dnd_intercom_calls"),
+    ):
+        entity_id = _entity_id(hass, domain, unique_id)
+        assert entity_id is not None, unique_id
+        assert hass.states.get(entity_id).state != "unavailable", unique_id
+    after = len(er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id))
+    # lock + camera + 2 event + camera-history event + call_state + DND switch.
+    assert after - before == 7
+
+
+async def test_removed_key_goes_unavailable_and_returns(
+    hass: HomeAssistant, mock_api
+) -> None:
+    entry, coordinator = await _setup(hass)
+    mock_api.query_access_controls.return_value = [_DOOR, _GATE]
+    await _refresh(hass, coordinator, KIND_ACCESS_CONTROLS)
+    lock_id = _entity_id(hass, "lock", f"{DOMAIN}_lock_{PLACE_ID}_AC2_E2")
+    doorbell_id = _entity_id(hass, "event", f"{DOMAIN}_event_doorbell_{PLACE_ID}_AC2")
+    count = len(er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id))
+
+    mock_api.query_access_controls.return_value = [_DOOR]
+    await _refresh(hass, coordinator, KIND_ACCESS_CONTROLS)
+    assert hass.states.get(lock_id).state == "unavailable"
+    assert hass.states.get(doorbell_id).state == "unavailable"
+
+    mock_api.query_access_controls.return_value = [_DOOR, _GATE]
+    await _refresh(hass, coordinator, KIND_ACCESS_CONTROLS)
+    assert hass.states.get(lock_id).state == "locked"
+    assert hass.states.get(doorbell_id).state != "unavailable"
+    assert (
+        len(er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id))
+        == count
+    )
@@ -0,0 +1,129 @@
+"""Общий go2rtc health-monitor (`go2rtc_monitor.py`).
+
+- Один `/api/streams` на интервал для всех подписчиков: дельты `bytes_recv`,
+  consumers и liveness считаются за один проход.
+- Monitor один на go2rtc-инстанс (ref-count), таймер — только пока есть
+  подписчики.
+"""
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.elektronny_gorod.go2rtc import Go2RtcStreamInfo
+from custom_components.elektronny_gorod.go2rtc_monitor import (
+    GO2RTC_MONITOR_DATA,
+    async_acquire_health_monitor,
+    async_release_health_monitor,
+)
+
+
+def _client(base_url: str = "http://go2rtc:1984", username: str | None = None):
+    client = MagicMock()
+    client.base_url = base_url
+    client._username = username
+    client._password = None
+    client.async_list_streams = AsyncMock(return_value={})
+    return client
+
+
+def _info(bytes_recv: int, consumers: int) -> Go2RtcStreamInfo:
+    return Go2RtcStreamInfo(
+        producers=({"bytes_recv": bytes_recv},),
+        consumer_count=consumers,
+        producer_active=True,
+    )
+
+
+async def test_one_snapshot_fans_out_to_every_stream(hass: HomeAssistant) -> None:
+    client = _client()
+    monitor = async_acquire_health_monitor(hass, client)
+    received: dict[str, list] = {}
+    snapshots: list[dict] = []
+    names = [f"eg_{camera_id}" for camera_id in range(150)]
+    unsubs = [
+        monitor.async_subscribe(
+            name, lambda health, name=name: received.setdefault(name, []).append(health)
+        )
+        for name in names
+    ]
+    unsubs.append(monitor.async_subscribe_snapshot(snapshots.append))
+
+    client.async_list_streams.return_value = {
+        name: _info(1000, 1) for name in names[:-1]
+    }
+    assert await monitor.async_poll()
+    client.async_list_streams.return_value = {
+        "eg_0": _info(1000, 1),
+        "eg_1": _info(5000, 1),
+    }
+    assert await monitor.async_poll()
+
+    assert client.async_list_streams.await_count == 2
+    assert len(snapshots) == 2
+    first, second = received["eg_0"]
+    assert first.bytes_delta is None and not first.frozen
+    assert second.bytes_delta == 0 and second.frozen
+    assert received["eg_1"][1].bytes_delta == 4000
+    # Стрима нет в снимке → None (камера сбрасывает своё состояние).
+    assert received["eg_149"] == [None, None]
+    assert received["eg_2"][1] is None
+    for unsub in unsubs:
+        unsub()
+    async_release_health_monitor(hass, monitor)
+
+
+async def test_monitor_is_shared_per_instance_and_ref_counted(
+    hass: HomeAssistant,
+) -> None:
+    first = async_acquire_health_monitor(hass, _client())
+    second = async_acquire_health_monitor(hass, _client())
+    other = async_acquire_health_monitor(hass, _client(username="admin"))
+
+    assert first is second
+    assert other is not first
+    assert first.users == 2
+
+    async_release_health_monitor(hass, first)
+    assert len(hass.data[GO2RTC_MONITOR_DATA]) == 2
+    async_release_health_monitor(hass, second)
+    async_release_health_monitor(hass, other)
+    assert hass.data[GO2RTC_MONITOR_DATA] == {}
+
+
+async def test_timer_runs_only_while_subscribed(hass: HomeAssistant) -> None:
+    monitor = async_acquire_health_monitor(hass, _client())
+    assert monitor._unsub_timer is None
+
+    unsub_stream = monitor.async_subscribe("eg_1", lambda _health: None)
+    unsub_snapshot = monitor.async_subscribe_snapshot(lambda _streams: None)
+    assert monitor._unsub_timer is not None
+
+    unsub_stream()
+    assert monitor._unsub_timer is not None
+    unsub_snapshot()
+    assert monitor._unsub_timer is None
+    async_release_health_monitor(hass, monitor)
+
+
+async def test_listener_failure_does_not_break_fan_out(hass: HomeAssistant) -> None:
+    client = _client()
+    client.async_list_streams.return_value = {"eg_1": _info(10, 1)}
+    monitor = async_acquire_health_monitor(hass, client)
+    received = []
+
+    def _broken(_health):
+        raise RuntimeError("boom")
+
+    unsubs = [
+        monitor.async_subscribe("eg_1", _broken),
+        monitor.async_subscribe("eg_1", received.append),
+    ]
+    assert await monitor.async_poll()
+
+    assert [health.bytes_recv for health in received] == [10]
+    assert monitor.stats()["polls"] == 1
+    for unsub in unsubs:
+        unsub()
+    async_release_health_monitor(hass, monitor)
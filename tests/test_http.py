@@ -23,6 +23,17 @@ class _FakeResponse:
         self.method = "GET"
         self.url = "https://example/"
 
+    def release(self) -> None:
+        """aiohttp: вернуть соединение в пул перед retry."""
+
+
+@pytest.fixture(autouse=True)
+def no_retry_sleep(monkeypatch) -> AsyncMock:
+    """Backoff между retry — мгновенный (детерминированные быстрые тесты)."""
+    sleep = AsyncMock()
+    monkeypatch.setattr("custom_components.elektronny_gorod.http._async_sleep", sleep)
+    return sleep
+
 
 @pytest.fixture
 def fake_session() -> MagicMock:
@@ -167,6 +178,7 @@ async def test_binary_get_uses_binary_timeout(http_client, fake_session):
     from custom_components.elektronny_gorod.http import _BINARY_TIMEOUT
 
     resp = MagicMock()
+    resp.status = 200
     resp.read = AsyncMock(return_value=b"jpeg-bytes")
     fake_session.get = AsyncMock(return_value=resp)
 
@@ -176,3 +188,29 @@ async def test_binary_get_uses_binary_timeout(http_client, fake_session):
     timeout = fake_session.get.await_args.kwargs["timeout"]
     assert timeout is _BINARY_TIMEOUT
     assert timeout.total == 60
+
+
+# --- Per-request place context in User-Agent -------------------------------- #
+
+
+async def test_place_id_is_per_request_in_user_agent(hass, fake_session, monkeypatch):
+    """Явный place_id попадает в UA только этого запроса; shared state не мутируется."""
+    from custom_components.elektronny_gorod.user_agent import UserAgent
+
+    monkeypatch.setattr(
+        "custom_components.elektronny_gorod.http.async_get_clientsession",
+        lambda _hass: fake_session,
+    )
+    ua = UserAgent()
+    ua.place_id = "DEFAULT"
+    client = HTTP(hass=hass, user_agent=ua, access_token="T", refresh_token=None, operator="1")
+
+    await client.get("/rest/v1/places/P1/accesscontrols", place_id="P1")
+    first = fake_session.get.await_args.kwargs["headers"]["user-agent"]
+    await client.get("/rest/v1/forpost/cameras/1/video")
+    second = fake_session.get.await_args.kwargs["headers"]["user-agent"]
+
+    assert first.endswith("| P1")
+    assert second.endswith("| DEFAULT")
+    assert first.rsplit("|", 1)[0] == second.rsplit("|", 1)[0]
+    assert ua.place_id == "DEFAULT"
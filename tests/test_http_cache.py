@@ -0,0 +1,143 @@
+"""Conditional-request кэш (`HTTP.get_json` + `ResponseCache`).
+
+- Валидаторы (ETag / Last-Modified) сохраняются и уходят в следующий запрос.
+- 304 → кэшированное тело, без парсинга.
+- Без валидаторов: тот же sha256 тела → тот же объект (identity-stable).
+- Счётчики hit/miss для diagnostics.
+"""
+from __future__ import annotations
+
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiohttp import ClientError, ClientResponse
+
+from custom_components.elektronny_gorod.http import HTTP, ResponseCache, _CacheEntry
+
+
+def _response(status: int, body: bytes = b"", headers: dict | None = None) -> MagicMock:
+    resp = MagicMock(spec=ClientResponse)
+    resp.status = status
+    resp.ok = status < 400
+    resp.reason = "OK"
+    resp.headers = headers or {}
+    resp.method = "GET"
+    resp.url = "https://example/"
+    resp.read = AsyncMock(return_value=body)
+    return resp
+
+
+@pytest.fixture(autouse=True)
+def no_retry_sleep(monkeypatch) -> None:
+    monkeypatch.setattr(
+        "custom_components.elektronny_gorod.http._async_sleep", AsyncMock()
+    )
+
+
+@pytest.fixture
+def fake_session() -> MagicMock:
+    return MagicMock()
+
+
+@pytest.fixture
+def http_client(hass, fake_session, monkeypatch) -> HTTP:
+    monkeypatch.setattr(
+        "custom_components.elektronny_gorod.http.async_get_clientsession",
+        lambda _hass: fake_session,
+    )
+    ua = MagicMock()
+    ua.account_id = "A1"
+    ua.__str__ = lambda self: "test-ua"
+    return HTTP(hass=hass, user_agent=ua, access_token="T", refresh_token=None, operator="1")
+
+
+_BODY = json.dumps({"data": [{"id": 1}]}).encode()
+
+
+async def test_etag_sent_and_304_reuses_cached_body(http_client, fake_session):
+    fake_session.get = AsyncMock(side_effect=[
+        _response(200, _BODY, {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2026 00:00:00 GMT"}),
+        _response(304),
+    ])
+
+    first = await http_client.get_json("/rest/v1/places/P1/cameras", place_id="P1")
+    second = await http_client.get_json("/rest/v1/places/P1/cameras", place_id="P1")
+
+    assert first == {"data": [{"id": 1}]}
+    assert second is first
+    sent = fake_session.get.await_args_list[1].kwargs["headers"]
+    assert sent["if-none-match"] == '"v1"'
+    assert sent["if-modified-since"] == "Mon, 01 Jan 2026 00:00:00 GMT"
+    stats = http_client.response_cache.stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+    assert stats["not_modified"] == 1
+
+
+async def test_first_request_has_no_conditional_headers(http_client, fake_session):
+    fake_session.get = AsyncMock(return_value=_response(200, _BODY))
+
+    await http_client.get_json("/rest/v1/places/P1/cameras")
+
+    sent = fake_session.get.await_args.kwargs["headers"]
+    assert "if-none-match" not in sent
+    assert "if-modified-since" not in sent
+
+
+async def test_content_hash_fallback_returns_same_object(http_client, fake_session):
+    """Оператор без валидаторов: идентичное тело не парсится повторно."""
+    fake_session.get = AsyncMock(side_effect=[
+        _response(200, _BODY),
+        _response(200, _BODY),
+        _response(200, json.dumps({"data": []}).encode()),
+    ])
+
+    first = await http_client.get_json("/rest/v2/places/P1/public/cameras")
+    second = await http_client.get_json("/rest/v2/places/P1/public/cameras")
+    third = await http_client.get_json("/rest/v2/places/P1/public/cameras")
+
+    assert second is first
+    assert third == {"data": []}
+    assert third is not first
+    stats = http_client.response_cache.stats()
+    assert (stats["hits"], stats["misses"], stats["unchanged"]) == (1, 2, 1)
+
+
+async def test_error_does_not_poison_cache(http_client, fake_session):
+    fake_session.get = AsyncMock(side_effect=[
+        _response(200, _BODY, {"ETag": '"v1"'}),
+        *(_response(500) for _ in range(3)),
+        _response(304),
+    ])
+
+    first = await http_client.get_json("/rest/v1/places/P1/accesscontrols")
+    with pytest.raises(ClientError):
+        await http_client.get_json("/rest/v1/places/P1/accesscontrols")
+    assert await http_client.get_json("/rest/v1/places/P1/accesscontrols") is first
+
+
+async def test_cache_is_keyed_by_account(http_client, fake_session):
+    fake_session.get = AsyncMock(side_effect=[
+        _response(200, _BODY, {"ETag": '"v1"'}),
+        _response(200, _BODY),
+    ])
+
+    await http_client.get_json("/rest/v3/subscriber-places")
+    http_client.user_agent.account_id = "A2"
+    await http_client.get_json("/rest/v3/subscriber-places")
+
+    sent = fake_session.get.await_args_list[1].kwargs["headers"]
+    assert "if-none-match" not in sent
+
+
+def test_response_cache_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+    for name in ("a", "b"):
+        cache.put(("A1", name), _CacheEntry(None, None, name, name))
+    cache.get(("A1", "a"))
+    cache.put(("A1", "c"), _CacheEntry(None, None, "c", "c"))
+
+    assert cache.get(("A1", "b")) is None
+    assert cache.get(("A1", "a")) is not None
+    assert cache.stats()["entries"] == 2
@@ -0,0 +1,222 @@
+"""Retry / backoff / circuit breaker для operator API (`http_policy.py`).
+
+- Ретраятся только идемпотентные GET; POST / `/auth/*` — одна попытка (A-21).
+- 429/503 уважают `Retry-After` в пределах бюджета политики.
+- Per-host circuit breaker: fail-fast для GET, пока оператор лежит.
+"""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiohttp import ClientConnectionError, ClientError, ClientResponse
+
+from custom_components.elektronny_gorod import http_policy
+from custom_components.elektronny_gorod.http import HTTP
+from custom_components.elektronny_gorod.http_policy import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    CIRCUIT_RESET_TIMEOUT_SECONDS,
+    CircuitBreaker,
+    CircuitOpenError,
+    parse_retry_after,
+    policy_for,
+)
+
+_REST = "/rest/v1/places/P1/accesscontrols"
+
+
+def _response(status: int, headers: dict | None = None) -> MagicMock:
+    resp = MagicMock(spec=ClientResponse)
+    resp.status = status
+    resp.ok = status < 400
+    resp.reason = "OK"
+    resp.headers = headers or {}
+    resp.method = "GET"
+    resp.url = "https://example/"
+    return resp
+
+
+@pytest.fixture
+def sleep(monkeypatch) -> AsyncMock:
+    sleep = AsyncMock()
+    monkeypatch.setattr("custom_components.elektronny_gorod.http._async_sleep", sleep)
+    monkeypatch.setattr(http_policy, "_jitter", lambda upper: upper)
+    return sleep
+
+
+@pytest.fixture
+def fake_session() -> MagicMock:
+    return MagicMock()
+
+
+@pytest.fixture
+def http_client(hass, fake_session, monkeypatch, sleep) -> HTTP:
+    monkeypatch.setattr(
+        "custom_components.elektronny_gorod.http.async_get_clientsession",
+        lambda _hass: fake_session,
+    )
+    ua = MagicMock()
+    ua.__str__ = lambda self: "test-ua"
+    return HTTP(hass=hass, user_agent=ua, access_token="T", refresh_token=None, operator="1")
+
+
+def test_policies_by_method_and_endpoint_class() -> None:
+    assert policy_for("GET", _REST).max_attempts == 3
+    assert policy_for("GET", "/rest/v1/forpost/cameras/1/snapshots", binary=True).max_attempts == 2
+    assert policy_for("GET", "/auth/v2/login/123").max_attempts == 1
+    assert policy_for("POST", "/rest/v1/places/P1/accesscontrols/1/actions").max_attempts == 1
+    assert policy_for("DELETE", "/rest/v1/subscriberNotifications").max_attempts == 1
+
+
+async def test_get_retries_transient_5xx_with_backoff(http_client, fake_session, sleep):
+    fake_session.get = AsyncMock(side_effect=[_response(502), _response(503), _response(200)])
+
+    response = await http_client.get(_REST)
+
+    assert response.status == 200
+    assert fake_session.get.await_count == 3
+    # Экспонента: base 0.5 → 0.5, 1.0 (jitter патчен в верхнюю границу).
+    assert [c.args[0] for c in sleep.await_args_list] == [0.5, 1.0]
+    assert http_client.retries == 2
+
+
+async def test_get_gives_up_after_max_attempts(http_client, fake_session):
+    fake_session.get = AsyncMock(return_value=_response(500))
+
+    with pytest.raises(ClientError):
+        await http_client.get(_REST)
+
+    assert fake_session.get.await_count == 3
+
+
+async def test_post_is_never_retried(http_client, fake_session, sleep):
+    fake_session.post = AsyncMock(return_value=_response(503))
+
+    with pytest.raises(ClientError):
+        await http_client.post("/rest/v1/places/P1/accesscontrols/1/actions", "{}")
+
+    assert fake_session.post.await_count == 1
+    sleep.assert_not_awaited()
+
+
+async def test_auth_get_is_never_retried(http_client, fake_session):
+    fake_session.get = AsyncMock(return_value=_response(500))
+
+    with pytest.raises(ClientError):
+        await http_client.get("/auth/v2/login/1131686")
+
+    assert fake_session.get.await_count == 1
+
+
+async def test_4xx_is_not_retried(http_client, fake_session):
+    fake_session.get = AsyncMock(return_value=_response(404))
+
+    with pytest.raises(ClientError):
+        await http_client.get(_REST)
+
+    assert fake_session.get.await_count == 1
+
+
+async def test_retry_after_is_honored(http_client, fake_session, sleep):
+    fake_session.get = AsyncMock(side_effect=[
+        _response(429, {"Retry-After": "3"}),
+        _response(200),
+    ])
+
+    await http_client.get(_REST)
+
+    sleep.assert_awaited_once_with(3.0)
+
+
+async def test_retry_after_beyond_budget_fails_immediately(http_client, fake_session, sleep):
+    fake_session.get = AsyncMock(return_value=_response(503, {"Retry-After": "120"}))
+
+    with pytest.raises(ClientError):
+        await http_client.get(_REST)
+
+    assert fake_session.get.await_count == 1
+    sleep.assert_not_awaited()
+
+
+async def test_connection_error_is_retried(http_client, fake_session):
+    fake_session.get = AsyncMock(side_effect=[ClientConnectionError(), _response(200)])
+
+    response = await http_client.get(_REST)
+
+    assert response.status == 200
+
+
+async def test_total_timeout_is_not_retried(http_client, fake_session):
+    fake_session.get = AsyncMock(side_effect=asyncio.TimeoutError())
+
+    with pytest.raises(asyncio.TimeoutError):
+        await http_client.get(_REST)
+
+    assert fake_session.get.await_count == 1
+
+
+async def test_open_circuit_fails_fast_for_get_but_not_post(
+    hass, http_client, fake_session, monkeypatch
+):
+    now = [1000.0]
+    monkeypatch.setattr(http_policy, "_monotonic", lambda: now[0])
+    fake_session.get = AsyncMock(return_value=_response(503))
+    fake_session.post = AsyncMock(return_value=_response(200))
+
+    with pytest.raises(ClientError):
+        await http_client.get(_REST)
+    with pytest.raises(ClientError):
+        await http_client.get(_REST)
+    assert http_client.circuit_breaker.state == CIRCUIT_OPEN
+    calls = fake_session.get.await_count
+
+    with pytest.raises(CircuitOpenError):
+        await http_client.get(_REST)
+    assert fake_session.get.await_count == calls
+
+    # Действие пользователя (POST) всё равно получает реальную попытку;
+    # успешный ответ хоста закрывает circuit.
+    await http_client.post("/rest/v1/places/P1/accesscontrols/1/actions", "{}")
+    assert fake_session.post.await_count == 1
+    assert http_client.circuit_breaker.state == CIRCUIT_CLOSED
+
+
+async def test_breaker_is_shared_per_host(hass, http_client) -> None:
+    other = HTTP(hass=hass, user_agent=MagicMock(), access_token=None, refresh_token=None, operator="2")
+    assert other.circuit_breaker is http_client.circuit_breaker
+
+
+def test_breaker_half_open_allows_single_probe(monkeypatch) -> None:
+    now = [0.0]
+    monkeypatch.setattr(http_policy, "_monotonic", lambda: now[0])
+    breaker = CircuitBreaker()
+    for _ in range(CIRCUIT_FAILURE_THRESHOLD):
+        breaker.record_failure()
+    assert not breaker.allow()
+
+    now[0] += CIRCUIT_RESET_TIMEOUT_SECONDS
+    assert breaker.state == CIRCUIT_HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == CIRCUIT_OPEN
+    now[0] += CIRCUIT_RESET_TIMEOUT_SECONDS
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CIRCUIT_CLOSED
+    assert breaker.stats()["opened"] == 2
+
+
+def test_parse_retry_after_formats() -> None:
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("garbage") is None
+    future = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert 25 <= parse_retry_after(format_datetime(future, usegmt=True)) <= 30
@@ -0,0 +1,142 @@
+"""Last-known-good данные place-а при сбоях fetch-а (`coordinator._slice`).
+
+- Сбой fetch-а после удачного — прошлый результат остаётся в снимке, записи
+  получают `stale_since`, entity не уходят в unavailable.
+- Старше `MAX_STALENESS[kind]` — данные вида выбрасываются, как раньше.
+- Удачный повтор снимает пометку.
+"""
+from __future__ import annotations
+
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.elektronny_gorod.const import (
+    CONF_ACCESS_TOKEN,
+    CONF_OPERATOR_ID,
+    CONF_REFRESH_TOKEN,
+    CONF_USER_AGENT,
+    DOMAIN,
+)
+from custom_components.elektronny_gorod.coordinator import (
+    ElektronnyGorodUpdateCoordinator,
+)
+from custom_components.elektronny_gorod.rate_limit import TokenBucket
+from custom_components.elektronny_gorod.refresh_schedule import (
+    KIND_ACCESS_CONTROLS,
+    KIND_BALANCE,
+    KIND_DND,
+    MAX_STALENESS,
+    REFRESH_INTERVALS,
+    RefreshSchedule,
+)
+from custom_components.elektronny_gorod.snapshot_index import data_index
+from custom_components.elektronny_gorod.transport import (
+    async_acquire_operator_transport,
+)
+from custom_components.elektronny_gorod.user_agent import UserAgent
+
+from tests.operator_standin import OperatorStandIn, synthetic_routes
+
+_ACCESS_CONTROLS = "/rest/v1/places/{id}/accesscontrols"
+_FINANCE = "/api/mh-payment/mobile/v1/finance"
+_DND = "/api/mh-customer/mobile/v1/customers/places/{id}/settings/do_not_disturb"
+
+
+@pytest.fixture
+async def coordinator(hass: HomeAssistant, socket_enabled, monkeypatch):
+    """Coordinator против stand-in-а (1 place, 2 entrance) с ручными часами."""
+    bucket = TokenBucket(rate=1e6, burst=1e6)
+    monkeypatch.setattr(
+        "custom_components.elektronny_gorod.http.account_rate_limiter",
+        lambda _hass, _account_id: bucket,
+    )
+    monkeypatch.setattr(
+        "custom_components.elektronny_gorod.http._async_sleep", AsyncMock()
+    )
+    standin = OperatorStandIn(synthetic_routes(1, 2))
+    await standin.__aenter__()
+    standin.patch_http(monkeypatch)
+    release = async_acquire_operator_transport(hass)
+
+    ua = UserAgent()
+    ua.operator_id = "1"
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_ACCESS_TOKEN: "T1",
+            CONF_REFRESH_TOKEN: "R1",
+            CONF_OPERATOR_ID: "1",
+            CONF_USER_AGENT: json.dumps(ua.json()),
+            "account_id": "A1",
+        },
+    )
+    entry.add_to_hass(hass)
+    coordinator = ElektronnyGorodUpdateCoordinator(hass, entry=entry)
+    clock = [0.0]
+    coordinator.refresh_schedule = RefreshSchedule(clock=lambda: clock[0])
+    await coordinator.async_refresh()
+    coordinator.standin = standin
+    coordinator.clock = clock
+    yield coordinator
+
+    coordinator.async_unsubscribe()
+    await release()
+    await standin.__aexit__(None, None, None)
+
+
+async def _tick_at(coordinator, seconds: float) -> None:
+    coordinator.clock[0] = seconds
+    await coordinator.async_refresh()
+
+
+async def test_failed_fetch_keeps_last_known_good_locks(coordinator) -> None:
+    locks = coordinator.data["locks"]
+    assert len(locks) == 2
+    coordinator.standin.fail("GET", _ACCESS_CONTROLS, 500, times=10)
+
+    await _tick_at(coordinator, REFRESH_INTERVALS[KIND_ACCESS_CONTROLS])
+
+    assert coordinator.last_update_success
+    data = coordinator.data
+    assert [lock["entrance_id"] for lock in data["locks"]] == [
+        lock["entrance_id"] for lock in locks
+    ]
+    assert all(lock["stale_since"] for lock in data["locks"])
+    intercoms = [cam for cam in data["cameras"] if cam["source"] == "intercom"]
+    assert intercoms and all(cam["stale_since"] for cam in intercoms)
+    assert set(data["stale"]["1001"]) == {KIND_ACCESS_CONTROLS}
+    assert data_index(data).stale["1001"] == data["stale"]["1001"]
+    assert coordinator.refresh_schedule.stats()[KIND_ACCESS_CONTROLS]["retained"] == 1
+
+
+async def test_data_older_than_max_staleness_is_dropped(coordinator) -> None:
+    coordinator.standin.fail("GET", _ACCESS_CONTROLS, 500, times=10)
+
+    await _tick_at(coordinator, MAX_STALENESS[KIND_ACCESS_CONTROLS] + 1)
+
+    assert coordinator.data["locks"] == []
+    assert coordinator.data["stale"] == {}
+
+
+async def test_successful_retry_clears_stale_marker(coordinator) -> None:
+    coordinator.standin.fail("GET", _FINANCE, 404)
+    coordinator.standin.fail("GET", _DND, 404)
+    coordinator.refresh_schedule.invalidate(KIND_BALANCE)
+    coordinator.refresh_schedule.invalidate(KIND_DND)
+
+    await _tick_at(coordinator, 60)
+    (balance,) = coordinator.data["balances"]
+    assert balance.stale_since
+    assert set(coordinator.data["stale"]["1001"]) == {KIND_BALANCE, KIND_DND}
+    # DND-items — payload API, без пометок в самих записях.
+    assert all("stale_since" not in item for item in coordinator.data["dnd"]["1001"])
+
+    await _tick_at(coordinator, 120)
+    (balance,) = coordinator.data["balances"]
+    assert balance.stale_since is None
+    assert coordinator.data["stale"] == {}
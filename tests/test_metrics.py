@@ -0,0 +1,150 @@
+"""Per-endpoint метрики operator API (`metrics.py`).
+
+- Шаблон endpoint-а без ID / query (в diagnostics не утекают place_id и т.п.).
+- Ограниченная по памяти гистограмма latency и p50/p95/p99.
+- `HTTP` пишет каждую попытку: статус ошибки, тип сетевого сбоя, байты.
+- Diagnostic-сенсор отдаёт p95 за окно между тиками.
+"""
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiohttp import ClientConnectionError, ClientError, ClientResponse
+
+from custom_components.elektronny_gorod.http import HTTP
+from custom_components.elektronny_gorod.metrics import (
+    OTHER_TEMPLATE,
+    EndpointMetrics,
+    endpoint_template,
+)
+from custom_components.elektronny_gorod.sensor import (
+    ElektronnyGorodApiErrorsSensor,
+    ElektronnyGorodApiLatencySensor,
+)
+
+
+def test_endpoint_template_strips_ids_and_query() -> None:
+    assert endpoint_template("/rest/v1/places/123/accesscontrols") == (
+        "/rest/v1/places/{id}/accesscontrols"
+    )
+    assert endpoint_template(
+        "/rest/v1/forpost/cameras/C77/video?LightStream=0&Format=H264"
+    ) == "/rest/v1/forpost/cameras/{id}/video"
+    assert endpoint_template("/auth/v2/login/79990000000") == "/auth/v2/login/{id}"
+    assert endpoint_template("/api/mh-payment/mobile/v1/finance?placeId=1") == (
+        "/api/mh-payment/mobile/v1/finance"
+    )
+
+
+def test_percentiles_from_histogram() -> None:
+    metrics = EndpointMetrics()
+    for latency in [10] * 90 + [300] * 9 + [5000]:
+        metrics.record("/rest/v1/places/1/cameras", latency)
+
+    stats = metrics.stats()["endpoints"]["/rest/v1/places/{id}/cameras"]
+    assert stats["count"] == 100
+    assert stats["p50_ms"] == 25.0  # верхняя граница bucket-а
+    assert stats["p95_ms"] == 400.0
+    assert stats["p99_ms"] == 400.0
+    assert stats["max_ms"] == 5000.0
+
+
+def test_template_count_is_bounded() -> None:
+    metrics = EndpointMetrics(max_templates=2)
+    metrics.record("/a", 1)
+    metrics.record("/b", 1)
+    metrics.record("/c", 1)
+    metrics.record("/d", 1)
+
+    assert set(metrics.stats()["endpoints"]) == {"/a", "/b", OTHER_TEMPLATE}
+    assert metrics.stats()["endpoints"][OTHER_TEMPLATE]["count"] == 2
+    assert metrics.total.count == 4
+
+
+def _response(status: int, headers: dict | None = None) -> MagicMock:
+    resp = MagicMock(spec=ClientResponse)
+    resp.status = status
+    resp.ok = status < 400
+    resp.reason = "OK"
+    resp.headers = headers or {}
+    resp.method = "GET"
+    resp.url = "https://example/"
+    return resp
+
+
+@pytest.fixture
+def http_client(hass, monkeypatch) -> tuple[HTTP, MagicMock]:
+    session = MagicMock()
+    monkeypatch.setattr(
+        "custom_components.elektronny_gorod.http.async_get_clientsession",
+        lambda _hass: session,
+    )
+    monkeypatch.setattr(
+        "custom_components.elektronny_gorod.http._async_sleep", AsyncMock()
+    )
+    ua = MagicMock()
+    ua.__str__ = lambda self: "test-ua"
+    client = HTTP(hass=hass, user_agent=ua, access_token="T", refresh_token=None, operator="1")
+    return client, session
+
+
+async def test_http_records_attempts_errors_and_bytes(http_client) -> None:
+    client, session = http_client
+    session.get = AsyncMock(
+        side_effect=[
+            ClientConnectionError(),
+            _response(503),
+            _response(200, {"Content-Length": "42"}),
+        ]
+    )
+
+    await client.get("/rest/v1/places/P1/cameras")
+
+    stats = client.diagnostics()["endpoints"]["endpoints"]["/rest/v1/places/{id}/cameras"]
+    assert stats["count"] == 3
+    assert stats["errors"] == {"ClientConnectionError": 1, "503": 1}
+    assert stats["bytes"] == 42
+
+    session.get = AsyncMock(return_value=_response(404))
+    with pytest.raises(ClientError):
+        await client.get("/rest/v1/places/P1/cameras")
+    assert client.metrics.total.errors["404"] == 1
+
+
+async def test_binary_bytes_are_counted(http_client) -> None:
+    client, session = http_client
+    resp = _response(200)
+    resp.read = AsyncMock(return_value=b"x" * 1000)
+    session.get = AsyncMock(return_value=resp)
+
+    await client.get("/rest/v1/forpost/cameras/1/snapshots", binary=True)
+
+    assert client.metrics.total.bytes == 1000
+
+
+def test_diagnostic_sensors_report_window_and_errors() -> None:
+    metrics = EndpointMetrics()
+    coordinator = MagicMock()
+    coordinator.api.http.metrics = metrics
+    latency = ElektronnyGorodApiLatencySensor(coordinator, "E1")
+    errors = ElektronnyGorodApiErrorsSensor(coordinator, "E1")
+    assert latency.entity_registry_enabled_default is False
+    # Оба сенсора — на service-device аккаунта (entry).
+    assert latency.device_info["identifiers"] == {("elektronny_gorod", "E1_account")}
+    assert errors.device_info == latency.device_info
+
+    for _ in range(20):
+        metrics.record("/slow", 3000)
+    latency._roll_window()
+    assert latency.native_value == 3200.0
+
+    for _ in range(20):
+        metrics.record("/fast", 20, "500")
+    latency._roll_window()
+    # Окно содержит только быстрые запросы после предыдущего тика.
+    assert latency.native_value == 25.0
+    assert latency.extra_state_attributes["window_requests"] == 20
+    assert list(latency.extra_state_attributes["slowest_endpoints"]) == ["/slow", "/fast"]
+    assert errors.native_value == 20
+    assert errors.extra_state_attributes == {"by_status": {"500": 20}}
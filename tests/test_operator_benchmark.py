@@ -0,0 +1,326 @@
+"""Replay против локального stand-in оператора + бенчмарки (`operator_standin.py`).
+
+По умолчанию — быстрые smoke-проверки стенда: HAR-replay, N×M payload,
+инъекция latency / ошибок, число запросов coordinator-а, HistoryPoller и
+`async_setup_entry` через настоящий HTTP-стек (transport, retry, metrics).
+
+Бенчмарки (wall time / число запросов / peak memory по tracemalloc)
+включаются переменной окружения:
+
+    EG_BENCHMARK=1 pytest tests/test_operator_benchmark.py -s -k benchmark
+
+`EG_BENCHMARK_LATENCY_MS` — latency ответа stand-in-а (по умолчанию 20 мс).
+Account-wide token bucket в бенчмарках отключён — иначе wall time меряет
+`RATE_LIMIT_PER_SECOND`, а не код.
+"""
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+import json
+import os
+import time
+import tracemalloc
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+
+from custom_components.elektronny_gorod.const import (
+    CONF_ACCESS_TOKEN,
+    CONF_OPERATOR_ID,
+    CONF_REFRESH_TOKEN,
+    CONF_USER_AGENT,
+    DOMAIN,
+)
+from custom_components.elektronny_gorod.coordinator import (
+    ElektronnyGorodUpdateCoordinator,
+)
+from custom_components.elektronny_gorod.history import HistoryPoller, HistoryWatermark
+from custom_components.elektronny_gorod.rate_limit import TokenBucket
+from custom_components.elektronny_gorod.transport import (
+    async_acquire_operator_transport,
+)
+from custom_components.elektronny_gorod.user_agent import UserAgent
+
+from tests.operator_standin import OperatorStandIn, load_har, synthetic_routes
+
+_BENCHMARK = bool(os.environ.get("EG_BENCHMARK"))
+_BENCHMARK_LATENCY = float(os.environ.get("EG_BENCHMARK_LATENCY_MS", "20")) / 1000
+_BENCHMARK_SIZES = [(1, 4), (10, 8), (50, 16)]
+
+benchmark = pytest.mark.skipif(not _BENCHMARK, reason="set EG_BENCHMARK=1")
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    wall_s: float
+    requests: int
+    peak_kib: float
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name}: {self.wall_s * 1000:.1f} ms, "
+            f"{self.requests} requests, peak {self.peak_kib:.0f} KiB"
+        )
+
+
+async def _measure(
+    name: str, standin: OperatorStandIn, run: Callable[[], Awaitable[Any]]
+) -> BenchmarkResult:
+    requests_before = standin.total_requests
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        await run()
+    finally:
+        wall = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return BenchmarkResult(
+        name, wall, standin.total_requests - requests_before, peak / 1024
+    )
+
+
+def _entry() -> MockConfigEntry:
+    ua = UserAgent()
+    ua.operator_id = "1"
+    return MockConfigEntry(
+        domain=DOMAIN,
+        version=3,
+        unique_id="standin_subscriber_9001",
+        title="Stand-in",
+        data={
+            CONF_ACCESS_TOKEN: "T1",
+            CONF_REFRESH_TOKEN: "R1",
+            CONF_OPERATOR_ID: "1",
+            CONF_USER_AGENT: json.dumps(ua.json()),
+            "account_id": "A1",
+            "subscriber_id": "9001",
+            "use_go2rtc": False,
+            "go2rtc_base_url": "http://127.0.0.1:1984",
+            "go2rtc_rtsp_host": "127.0.0.1",
+        },
+    )
+
+
+@pytest.fixture(autouse=True)
+def unthrottled(socket_enabled, monkeypatch) -> None:
+    """Loopback-сокеты для stand-in; без account-wide лимита и backoff-пауз retry."""
+    bucket = TokenBucket(rate=1e6, burst=1e6)
+    monkeypatch.setattr(
+        "custom_components.elektronny_gorod.http.account_rate_limiter",
+        lambda _hass, _account_id: bucket,
+    )
+    monkeypatch.setattr(
+        "custom_components.elektronny_gorod.http._async_sleep", AsyncMock()
+    )
+
+
+async def _refresh(hass: HomeAssistant) -> tuple[ElektronnyGorodUpdateCoordinator, dict]:
+    """Один `_async_update_data` через выделенный transport."""
+    entry = _entry()
+    entry.add_to_hass(hass)
+    release = async_acquire_operator_transport(hass)
+    coordinator = ElektronnyGorodUpdateCoordinator(hass, entry=entry)
+    try:
+        data = await coordinator._async_update_data()
+    finally:
+        coordinator.async_unsubscribe()
+        await release()
+    return coordinator, data
+
+
+async def test_coordinator_refresh_against_synthetic_account(hass, monkeypatch) -> None:
+    async with OperatorStandIn(synthetic_routes(places=2, cameras_per_place=3)) as standin:
+        standin.patch_http(monkeypatch)
+        _, data = await _refresh(hass)
+
+    assert len(data["places"]) == 2
+    assert len(data["cameras"]) == 6
+    assert len(data["locks"]) == 6
+    assert set(data["dnd"]) == {"1001", "1002"}
+    # 1 places + 6 per-place запросов × 2 места.
+    assert standin.total_requests == 13
+    assert standin.requests["GET /rest/v1/places/{id}/accesscontrols"] == 2
+
+
+async def test_injected_errors_are_retried(hass, monkeypatch) -> None:
+    async with OperatorStandIn(synthetic_routes(places=1, cameras_per_place=2)) as standin:
+        standin.patch_http(monkeypatch)
+        standin.fail("GET", "/rest/v1/places/{id}/accesscontrols", 503)
+        coordinator, data = await _refresh(hass)
+
+    assert len(data["cameras"]) == 2
+    assert standin.requests["GET /rest/v1/places/{id}/accesscontrols"] == 2
+    assert coordinator.api.http.metrics.total.errors == {"503": 1}
+
+
+async def test_injected_latency_overlaps_places(hass, monkeypatch) -> None:
+    routes = synthetic_routes(places=4, cameras_per_place=1)
+    async with OperatorStandIn(routes, latency=0.05) as standin:
+        standin.patch_http(monkeypatch)
+        await _refresh(hass)
+
+    assert standin.total_requests == 25
+    # Места опрашиваются параллельно: stand-in видел больше одного запроса
+    # одновременно (счётчик, а не wall-clock — не флапает на медленном CI).
+    assert standin.max_in_flight > 1
+
+
+async def test_history_poll_against_standin(hass, monkeypatch) -> None:
+    async with OperatorStandIn(synthetic_routes(places=2, cameras_per_place=2)) as standin:
+        standin.patch_http(monkeypatch)
+        coordinator, data = await _refresh(hass)
+        coordinator.data = data
+        emitted: list[dict] = []
+        poller = HistoryPoller(
+            coordinator, HistoryWatermark(), emitted.append, camera_enabled=lambda _id: True
+        )
+        release = async_acquire_operator_transport(hass)
+        try:
+            assert await poller.async_poll() is True
+        finally:
+            await release()
+
+    assert standin.requests["POST /rest/v1/events/search"] == 1
+    assert standin.requests["GET /rest/v2/forpost/cameras/{id}/events"] == 4
+    assert emitted == []  # первый poll — тихий baseline
+
+
+async def test_setup_entry_against_standin(hass, monkeypatch) -> None:
+    async with OperatorStandIn(synthetic_routes(places=1, cameras_per_place=2)) as standin:
+        standin.patch_http(monkeypatch)
+        entry = _entry()
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert entry.state is ConfigEntryState.LOADED
+        assert len(hass.data[DOMAIN][entry.entry_id].data["cameras"]) == 2
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert standin.requests["GET /rest/v3/subscriber-places"] >= 1
+
+
+async def test_har_replay_skips_auth_flow(hass, monkeypatch, tmp_path) -> None:
+    def entry(method: str, url: str, payload: Any, status: int = 200) -> dict:
+        return {
+            "request": {"method": method, "url": url},
+            "response": {"status": status, "content": {"text": json.dumps(payload)}},
+        }
+
+    har = tmp_path / "session.har"
+    har.write_text(
+        json.dumps(
+            {
+                "log": {
+                    "entries": [
+                        entry(
+                            "GET",
+                            "https://myhome.proptech.ru/rest/v3/subscriber-places",
+                            {"data": [{"place": {"id": 7}, "subscriber": {"id": 1}}]},
+                        ),
+                        entry(
+                            "GET",
+                            "https://myhome.proptech.ru/rest/v1/places/7/accesscontrols",
+                            {"data": [{"id": 70, "name": "Gate", "externalCameraId": 700}]},
+                        ),
+                        entry(
+                            "POST",
+                            "https://myhome.proptech.ru/auth/v3/auth/1/confirmation",
+                            {"accessToken": "secret"},
+                        ),
+                        entry("GET", "https://fcm.example.invalid/noise", {}),
+                    ]
+                }
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    routes = load_har(har, host_filter="proptech.ru")
+    assert set(routes) == {
+        ("GET", "/rest/v3/subscriber-places"),
+        ("GET", "/rest/v1/places/{id}/accesscontrols"),
+    }
+    async with OperatorStandIn(routes) as standin:
+        standin.patch_http(monkeypatch)
+        _, data = await _refresh(hass)
+
+    assert [camera["id"] for camera in data["cameras"]] == [700]
+    # Незаписанные endpoint-ы → 404; coordinator отдаёт partial data.
+    assert standin.requests["GET /api/mh-payment/mobile/v1/finance"] >= 1
+
+
+# --------------------------------------------------------------------- #
+# Бенчмарки (EG_BENCHMARK=1)                                            #
+# --------------------------------------------------------------------- #
+
+
+@benchmark
+@pytest.mark.parametrize(("places", "cameras"), _BENCHMARK_SIZES)
+async def test_benchmark_coordinator_refresh(
+    hass, monkeypatch, record_property, places: int, cameras: int
+) -> None:
+    routes = synthetic_routes(places, cameras)
+    async with OperatorStandIn(routes, latency=_BENCHMARK_LATENCY) as standin:
+        standin.patch_http(monkeypatch)
+        result = await _measure(
+            f"_async_update_data {places}x{cameras}", standin, lambda: _refresh(hass)
+        )
+    record_property("benchmark", str(result))
+    print(result)
+
+
+@benchmark
+@pytest.mark.parametrize(("places", "cameras"), _BENCHMARK_SIZES)
+async def test_benchmark_history_poll(
+    hass, monkeypatch, record_property, places: int, cameras: int
+) -> None:
+    routes = synthetic_routes(places, cameras)
+    async with OperatorStandIn(routes, latency=_BENCHMARK_LATENCY) as standin:
+        standin.patch_http(monkeypatch)
+        coordinator, data = await _refresh(hass)
+        coordinator.data = data
+        poller = HistoryPoller(
+            coordinator, HistoryWatermark(), lambda _event: None,
+            camera_enabled=lambda _id: True,
+        )
+        release = async_acquire_operator_transport(hass)
+        try:
+            result = await _measure(
+                f"HistoryPoller.async_poll {places}x{cameras}", standin, poller.async_poll
+            )
+        finally:
+            await release()
+    record_property("benchmark", str(result))
+    print(result)
+
+
+@benchmark
+@pytest.mark.parametrize(("places", "cameras"), _BENCHMARK_SIZES)
+async def test_benchmark_setup_entry(
+    hass, monkeypatch, record_property, places: int, cameras: int
+) -> None:
+    routes = synthetic_routes(places, cameras)
+    async with OperatorStandIn(routes, latency=_BENCHMARK_LATENCY) as standin:
+        standin.patch_http(monkeypatch)
+        entry = _entry()
+        entry.add_to_hass(hass)
+
+        async def setup() -> None:
+            assert await hass.config_entries.async_setup(entry.entry_id)
+            await hass.async_block_till_done()
+
+        result = await _measure(f"async_setup_entry {places}x{cameras}", standin, setup)
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+    record_property("benchmark", str(result))
+    print(result)
@@ -0,0 +1,118 @@
+"""Account-wide token bucket с приоритетами (`rate_limit.py`).
+
+- Burst проходит сразу, дальше — темп `rate`.
+- Ожидающие обслуживаются по приоритету; critical не ждёт никогда.
+- Queue depth / wait-статистика — для diagnostics.
+- Bucket общий на аккаунт и на все HTTP-попытки.
+"""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiohttp import ClientResponse
+
+from custom_components.elektronny_gorod.http import HTTP
+from custom_components.elektronny_gorod.rate_limit import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_CRITICAL,
+    PRIORITY_INTERACTIVE,
+    TokenBucket,
+    account_rate_limiter,
+    priority_for,
+)
+
+
+def test_default_priorities() -> None:
+    assert priority_for("POST", "/rest/v1/places/1/accesscontrols/2/actions") == PRIORITY_CRITICAL
+    assert priority_for("POST", "/rest/v1/places/1/accesscontrols/2/sipdevices") == PRIORITY_CRITICAL
+    assert priority_for("GET", "/rest/v1/forpost/cameras/C/video?LightStream=0") == PRIORITY_INTERACTIVE
+    assert priority_for("GET", "/rest/v1/forpost/cameras/C/snapshots", binary=True) == PRIORITY_INTERACTIVE
+    assert priority_for("POST", "/auth/v2/auth/1/password") == PRIORITY_INTERACTIVE
+    assert priority_for("GET", "/rest/v1/places/1/cameras") == PRIORITY_BACKGROUND
+    assert priority_for("POST", "/rest/v1/events/search?page=0") == PRIORITY_BACKGROUND
+
+
+async def test_burst_then_rate() -> None:
+    bucket = TokenBucket(rate=50.0, burst=2)
+    await bucket.acquire()
+    await bucket.acquire()
+    assert bucket.waited == 0
+
+    await asyncio.wait_for(bucket.acquire(), timeout=1)
+    assert bucket.waited == 1
+    assert bucket.stats()["wait_max"] > 0
+
+
+async def test_waiters_are_served_by_priority() -> None:
+    bucket = TokenBucket(rate=100.0, burst=1)
+    await bucket.acquire()
+    order: list[str] = []
+
+    async def take(name: str, priority: int) -> None:
+        await bucket.acquire(priority)
+        order.append(name)
+
+    tasks = [
+        asyncio.ensure_future(take("bg-1", PRIORITY_BACKGROUND)),
+        asyncio.ensure_future(take("bg-2", PRIORITY_BACKGROUND)),
+        asyncio.ensure_future(take("stream", PRIORITY_INTERACTIVE)),
+    ]
+    await asyncio.sleep(0)
+    assert bucket.queue_depth == 3
+
+    await bucket.acquire(PRIORITY_CRITICAL)  # не ждёт, хотя токенов нет
+    order.append("door")
+    await asyncio.wait_for(asyncio.gather(*tasks), timeout=1)
+
+    assert order == ["door", "stream", "bg-1", "bg-2"]
+    assert bucket.queue_depth == 0
+    assert bucket.stats()["acquired"] == {"critical": 1, "interactive": 1, "background": 3}
+
+
+async def test_cancelled_waiter_leaves_queue() -> None:
+    bucket = TokenBucket(rate=100.0, burst=1)
+    await bucket.acquire()
+    waiter = asyncio.ensure_future(bucket.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert bucket.queue_depth == 0
+    await asyncio.wait_for(bucket.acquire(), timeout=1)
+
+
+async def test_every_http_attempt_takes_a_token(hass, monkeypatch) -> None:
+    session = MagicMock()
+    monkeypatch.setattr(
+        "custom_components.elektronny_gorod.http.async_get_clientsession",
+        lambda _hass: session,
+    )
+    monkeypatch.setattr(
+        "custom_components.elektronny_gorod.http._async_sleep", AsyncMock()
+    )
+
+    def response(status: int) -> MagicMock:
+        resp = MagicMock(spec=ClientResponse)
+        resp.status = status
+        resp.ok = status < 400
+        resp.reason = "OK"
+        resp.headers = {}
+        resp.method = "GET"
+        resp.url = "https://example/"
+        return resp
+
+    session.get = AsyncMock(side_effect=[response(503), response(200)])
+    ua = MagicMock()
+    ua.__str__ = lambda self: "test-ua"
+    ua.account_id = "A1"
+    client = HTTP(hass=hass, user_agent=ua, access_token="T", refresh_token=None, operator="1")
+
+    await client.get("/rest/v1/places/P1/cameras")
+
+    limiter = account_rate_limiter(hass, "A1")
+    assert client.rate_limiter is limiter
+    assert limiter.acquired["background"] == 2
+    assert client.diagnostics()["rate_limiter"]["queue_depth"] == 0
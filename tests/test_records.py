@@ -0,0 +1,135 @@
+"""Компактные записи снимка (`records.py`).
+
+- Slotted frozen dataclass-ы с read-only Mapping-интерфейсом: entity читают
+  запись и dict одинаково, запись равна dict-у с теми же полями.
+- `slim_place` оставляет только поля, которые читают entity.
+- Persisted снимок: записи пишутся dict-ами и собираются обратно.
+"""
+from __future__ import annotations
+
+from dataclasses import FrozenInstanceError, replace
+
+import pytest
+
+from custom_components.elektronny_gorod.history import place_display_name
+from custom_components.elektronny_gorod.records import (
+    BalanceRecord,
+    CameraRecord,
+    LockRecord,
+    slim_place,
+)
+from custom_components.elektronny_gorod.snapshot_index import (
+    SnapshotIndex,
+    diff_indexes,
+)
+from custom_components.elektronny_gorod.snapshot_store import (
+    _parse_snapshot,
+    sanitize_snapshot,
+)
+
+
+def _lock(**overrides) -> LockRecord:
+    return replace(
+        LockRecord(
+            place_id="P1",
+            access_control_id="AC1",
+            entrance_id="E1",
+            name="Подъезд 1",
+            openable=True,
+        ),
+        **overrides,
+    )
+
+
+def test_record_is_slotted_frozen_mapping() -> None:
+    lock = _lock()
+
+    assert not hasattr(lock, "__dict__")
+    with pytest.raises(FrozenInstanceError):
+        lock.name = "Other"  # type: ignore[misc]
+    assert lock["entrance_id"] == "E1"
+    assert lock.get("ac_name") is None
+    assert "openable" in lock
+    with pytest.raises(KeyError):
+        lock["ac_name"]  # noqa: B018
+    assert dict(lock) == {
+        "place_id": "P1",
+        "access_control_id": "AC1",
+        "entrance_id": "E1",
+        "name": "Подъезд 1",
+        "openable": True,
+        "hidden": False,
+        "stale_since": None,
+    }
+
+
+def test_record_equality_and_hash() -> None:
+    assert _lock() == _lock()
+    assert hash(_lock()) == hash(_lock())
+    assert _lock() != _lock(openable=False)
+    assert _lock() == dict(_lock())
+    assert dict(_lock()) == _lock()
+    assert _lock() != CameraRecord(id=1, name="Подъезд 1", source="intercom")
+
+    old = SnapshotIndex.build({"locks": [_lock()]})
+    new = SnapshotIndex.build({"locks": [_lock(), _lock(entrance_id="E2")]})
+    assert diff_indexes(old, new).changed == {
+        ("locks", ("P1", "AC1", "E2")),
+    }
+
+
+def test_slim_place_keeps_only_read_fields() -> None:
+    subscriber_place = {
+        "id": 7,
+        "subscriber": {"id": "S1", "name": "Иван", "accountId": "A1"},
+        "provider": {"id": 1, "name": "Оператор"},
+        "place": {
+            "id": "P1",
+            "address": {
+                "visibleAddress": "ул. Ленина, 1",
+                "apartment": "12",
+                "city": "Город",
+                "structureId": 42,
+            },
+        },
+    }
+
+    slim = slim_place(subscriber_place)
+
+    assert slim == {
+        "place": {
+            "id": "P1",
+            "address": {"visibleAddress": "ул. Ленина, 1", "apartment": "12"},
+        }
+    }
+    assert place_display_name({"places": [slim]}, "P1") == "ул. Ленина, 1"
+    assert slim_place({"place": {"id": "P2", "address": "addr"}}) == {
+        "place": {"id": "P2", "address": "addr"}
+    }
+
+
+def test_snapshot_round_trip_restores_records() -> None:
+    data = {
+        "places": [{"place": {"id": "P1", "address": {"visibleAddress": "Home"}}}],
+        "balances": [BalanceRecord(place_id="P1", balance=10.5)],
+        "cameras": [CameraRecord(id=101, name="Подъезд 1", source="intercom")],
+        "locks": [_lock()],
+        "dnd": {},
+        "index": object(),
+    }
+
+    stored = sanitize_snapshot(data)
+    assert all(
+        type(item) is dict
+        for key in ("balances", "cameras", "locks")
+        for item in stored[key]
+    )
+    # Поля старых снимков, которых в записях больше нет, отбрасываются.
+    stored["locks"][0]["ac_name"] = "Door"
+
+    restored = _parse_snapshot(stored)
+
+    assert restored["locks"] == [_lock()]
+    assert isinstance(restored["locks"][0], LockRecord)
+    assert isinstance(restored["cameras"][0], CameraRecord)
+    assert restored["balances"][0].balance == 10.5
@@ -0,0 +1,307 @@
+"""Независимые расписания refresh-а по видам данных (`refresh_schedule.py`).
+
+- Баланс редкий, но сжимается у блокировки / даты платежа.
+- Тик coordinator-а запрашивает только виды с истёкшим сроком; `data` — тот
+  же склеенный снимок из кэша.
+- Сбой вида — повтор на следующем тике; запись DND инвалидирует только DND.
+- Объём запросов к stand-in-у оператора за 6 часов падает на порядок.
+- Адаптивные сроки: неизменные ответы — backoff до `MAX_INTERVALS`,
+  активность в place (FCM-пуш, открытие двери) — снова `FAST_INTERVAL`.
+"""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.elektronny_gorod.const import (
+    CONF_ACCESS_TOKEN,
+    CONF_OPERATOR_ID,
+    CONF_REFRESH_TOKEN,
+    CONF_USER_AGENT,
+    DOMAIN,
+)
+from custom_components.elektronny_gorod.coordinator import (
+    UPDATE_INTERVAL,
+    ElektronnyGorodUpdateCoordinator,
+)
+from custom_components.elektronny_gorod.rate_limit import TokenBucket
+from custom_components.elektronny_gorod.refresh_schedule import (
+    BALANCE_NEAR_INTERVAL,
+    FAST_INTERVAL,
+    KIND_ACCESS_CONTROLS,
+    KIND_BALANCE,
+    KIND_CAMERAS,
+    KIND_DND,
+    MAX_INTERVALS,
+    REFRESH_INTERVALS,
+    RefreshSchedule,
+    balance_refresh_interval,
+)
+from custom_components.elektronny_gorod.transport import (
+    async_acquire_operator_transport,
+)
+from custom_components.elektronny_gorod.user_agent import UserAgent
+
+from tests.operator_standin import OperatorStandIn, synthetic_routes
+
+_NOW = datetime(2026, 10, 17, 22, 0, tzinfo=timezone.utc)
+_TICK = UPDATE_INTERVAL.total_seconds()
+# Запросов на тик до расписаний: places + 6 per-place.
+_REQUESTS_PER_PLACE = 6
+
+
+def test_balance_interval_is_sparse_far_from_payment() -> None:
+    balance = {"blocked": False, "days_to_block": 30, "payment_date": "2026-11-15"}
+
+    assert balance_refresh_interval(balance, _NOW) == REFRESH_INTERVALS[KIND_BALANCE]
+    assert balance_refresh_interval(None, _NOW) == REFRESH_INTERVALS[KIND_BALANCE]
+    # Дата платежа в прошлом — оператор её не сдвинул, это не «скоро блокировка».
+    stale = {"blocked": False, "days_to_block": 30, "payment_date": "2026-01-01"}
+    assert balance_refresh_interval(stale, _NOW) == REFRESH_INTERVALS[KIND_BALANCE]
+
+
+def test_balance_interval_tightens_near_block() -> None:
+    assert balance_refresh_interval({"blocked": True}, _NOW) == BALANCE_NEAR_INTERVAL
+    assert balance_refresh_interval({"days_to_block": 2}, _NOW) == BALANCE_NEAR_INTERVAL
+    assert (
+        balance_refresh_interval({"payment_date": "2026-10-19T00:00:00"}, _NOW)
+        == BALANCE_NEAR_INTERVAL
+    )
+    # Окно (за 3 дня до 21.10) откроется в полночь — следующий fetch не позже.
+    assert balance_refresh_interval({"payment_date": "2026-10-21"}, _NOW) == 2 * 3600
+
+
+def test_schedule_due_fetched_failed_invalidate() -> None:
+    now = [0.0]
+    schedule = RefreshSchedule(clock=lambda: now[0])
+
+    assert schedule.is_due(KIND_DND, "P1")
+    schedule.mark_fetched(KIND_DND, "P1")
+    schedule.mark_fetched(KIND_DND, "P2")
+    assert not schedule.is_due(KIND_DND, "P1")
+
+    now[0] = REFRESH_INTERVALS[KIND_DND]
+    assert schedule.is_due(KIND_DND, "P1")
+
+    schedule.mark_fetched(KIND_CAMERAS, "P1")
+    schedule.mark_failed(KIND_CAMERAS, "P1")
+    assert schedule.is_due(KIND_CAMERAS, "P1")
+
+    now[0] = 0.0
+    schedule.invalidate(KIND_DND, "P1")
+    assert schedule.is_due(KIND_DND, "P1")
+    assert not schedule.is_due(KIND_DND, "P2")
+
+    schedule.retain_scopes({"P1"})
+    assert schedule.is_due(KIND_DND, "P2")
+    stats = schedule.stats()
+    assert stats[KIND_DND]["fetched"] == 2
+    assert stats[KIND_DND]["skipped"] == 2
+    assert stats[KIND_CAMERAS]["failed"] == 1
+
+
+@pytest.fixture
+async def standin_coordinator(hass: HomeAssistant, socket_enabled, monkeypatch):
+    """Coordinator против stand-in-а с подменёнными монотонными часами."""
+    bucket = TokenBucket(rate=1e6, burst=1e6)
+    monkeypatch.setattr(
+        "custom_components.elektronny_gorod.http.account_rate_limiter",
+        lambda _hass, _account_id: bucket,
+    )
+    monkeypatch.setattr(
+        "custom_components.elektronny_gorod.http._async_sleep", AsyncMock()
+    )
+    monkeypatch.setattr(
+        "custom_components.elektronny_gorod.coordinator.dt_util.now", lambda: _NOW
+    )
+    cleanup: list = []
+
+    async def make(places: int, cameras: int):
+        standin = OperatorStandIn(synthetic_routes(places, cameras))
+        await standin.__aenter__()
+        standin.patch_http(monkeypatch)
+        ua = UserAgent()
+        ua.operator_id = "1"
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={
+                CONF_ACCESS_TOKEN: "T1",
+                CONF_REFRESH_TOKEN: "R1",
+                CONF_OPERATOR_ID: "1",
+                CONF_USER_AGENT: json.dumps(ua.json()),
+                "account_id": "A1",
+            },
+        )
+        entry.add_to_hass(hass)
+        coordinator = ElektronnyGorodUpdateCoordinator(hass, entry=entry)
+        clock = [0.0]
+        coordinator.refresh_schedule = RefreshSchedule(clock=lambda: clock[0])
+        cleanup.append((standin, coordinator))
+        return coordinator, standin, clock
+
+    release = async_acquire_operator_transport(hass)
+    yield make
+    await release()
+    for standin, coordinator in cleanup:
+        coordinator.async_unsubscribe()
+        await standin.__aexit__(None, None, None)
+
+
+async def test_ticks_fetch_only_due_kinds(standin_coordinator) -> None:
+    coordinator, standin, clock = await standin_coordinator(places=2, cameras=3)
+
+    first = await coordinator._async_update_data()
+    assert standin.total_requests == 1 + 2 * _REQUESTS_PER_PLACE
+
+    clock[0] += _TICK
+    second = await coordinator._async_update_data()
+    # Ничей срок ещё не вышел — ни одного запроса, снимок тот же.
+    assert standin.total_requests == 1 + 2 * _REQUESTS_PER_PLACE
+    assert second == first
+
+    clock[0] = REFRESH_INTERVALS[KIND_DND]
+    await coordinator._async_update_data()
+    assert standin.requests[
+        "GET /api/mh-customer/mobile/v1/customers/places/{id}/settings/do_not_disturb"
+    ] == 4
+    assert standin.requests["GET /rest/v1/places/{id}/accesscontrols"] == 2
+
+
+async def test_request_volume_drops_by_order_of_magnitude(standin_coordinator) -> None:
+    coordinator, standin, clock = await standin_coordinator(places=2, cameras=3)
+    ticks = int(6 * 3600 // _TICK)
+
+    for tick in range(ticks):
+        clock[0] = tick * _TICK
+        data = await coordinator._async_update_data()
+
+    assert len(data["cameras"]) == 6
+    before = ticks * (1 + 2 * _REQUESTS_PER_PLACE)
+    assert standin.total_requests * 10 <= before
+    stats = coordinator.refresh_schedule.stats()
+    assert stats[KIND_BALANCE]["fetched"] == 2
+
+
+async def test_failed_kind_is_retried_next_tick(standin_coordinator) -> None:
+    coordinator, standin, clock = await standin_coordinator(places=1, cameras=2)
+    standin.fail("GET", "/rest/v1/places/{id}/cameras", 404)
+    standin.fail("GET", "/rest/v1/places/{id}/accesscontrols", 404)
+
+    data = await coordinator._async_update_data()
+    assert data["locks"] == []
+
+    clock[0] += _TICK
+    data = await coordinator._async_update_data()
+    assert len(data["locks"]) == 2
+    assert standin.requests["GET /rest/v1/places/{id}/cameras"] == 2
+    assert standin.requests["GET /rest/v1/places/{id}/accesscontrols"] == 2
+    assert coordinator.refresh_schedule.stats()[KIND_CAMERAS]["failed"] == 1
+
+
+async def test_collectors_take_one_request_slot(standin_coordinator) -> None:
+    coordinator, standin, _ = await standin_coordinator(places=2, cameras=1)
+    # Слот берёт `_slice`; вложенный захват в collector-е повесил бы refresh,
+    # как только все слоты заняты внешними вызовами.
+    coordinator._request_slots = asyncio.Semaphore(1)
+
+    data = await asyncio.wait_for(coordinator._async_update_data(), timeout=5)
+
+    assert len(data["cameras"]) == 2
+    assert standin.requests["GET /api/mh-payment/mobile/v1/finance"] == 2
+
+
+async def test_dnd_write_invalidates_only_dnd(standin_coordinator, monkeypatch) -> None:
+    coordinator, standin, clock = await standin_coordinator(places=1, cameras=1)
+    await coordinator._async_update_data()
+    monkeypatch.setattr(
+        coordinator.api, "post_dnd_settings", AsyncMock(return_value=True)
+    )
+
+    assert await coordinator.async_set_dnd("1001", [])
+    clock[0] += _TICK
+    await coordinator._async_update_data()
+
+    assert standin.requests[
+        "GET /api/mh-customer/mobile/v1/customers/places/{id}/settings/do_not_disturb"
+    ] == 2
+    assert standin.total_requests == 1 + _REQUESTS_PER_PLACE + 1
+
+
+def test_unchanged_responses_back_off_and_change_resets() -> None:
+    now = [0.0]
+    schedule = RefreshSchedule(clock=lambda: now[0])
+    base = REFRESH_INTERVALS[KIND_DND]
+
+    schedule.mark_fetched(KIND_DND, "P1")
+    assert schedule.effective_interval(KIND_DND, "P1") == base
+    for _ in range(10):
+        schedule.mark_fetched(KIND_DND, "P1", changed=False)
+    assert schedule.effective_interval(KIND_DND, "P1") == MAX_INTERVALS[KIND_DND]
+    assert not schedule.is_due(KIND_DND, "P1")
+    now[0] = MAX_INTERVALS[KIND_DND]
+    assert schedule.is_due(KIND_DND, "P1")
+
+    schedule.mark_fetched(KIND_DND, "P1", changed=True)
+    assert schedule.effective_interval(KIND_DND, "P1") == base
+    # Потолок из данных (баланс у блокировки) сильнее backoff-а.
+    schedule.mark_fetched(KIND_BALANCE, "P1", BALANCE_NEAR_INTERVAL, changed=False)
+    assert schedule.effective_interval(KIND_BALANCE, "P1") == REFRESH_INTERVALS[KIND_BALANCE]
+    now[0] += BALANCE_NEAR_INTERVAL
+    assert schedule.is_due(KIND_BALANCE, "P1")
+
+
+def test_snap_back_pulls_activity_kinds_to_fast_interval() -> None:
+    now = [0.0]
+    schedule = RefreshSchedule(clock=lambda: now[0])
+    for kind in (KIND_DND, KIND_ACCESS_CONTROLS, KIND_CAMERAS):
+        schedule.mark_fetched(kind, "P1")
+        schedule.mark_fetched(kind, "P1", changed=False)
+
+    schedule.snap_back("P1")
+
+    now[0] = FAST_INTERVAL
+    assert schedule.is_due(KIND_DND, "P1")
+    assert schedule.is_due(KIND_ACCESS_CONTROLS, "P1")
+    assert not schedule.is_due(KIND_CAMERAS, "P1")
+    # После изменения интервал остаётся быстрым, тишина удваивает его обратно.
+    schedule.mark_fetched(KIND_DND, "P1", changed=True)
+    assert schedule.effective_interval(KIND_DND, "P1") == FAST_INTERVAL
+    schedule.mark_fetched(KIND_DND, "P1", changed=False)
+    assert schedule.effective_interval(KIND_DND, "P1") == 2 * FAST_INTERVAL
+    stats = schedule.stats()
+    assert stats[KIND_DND]["effective_s"] == [2 * FAST_INTERVAL]
+    assert stats[KIND_DND]["snap_backs"] == 1
+
+
+async def test_steady_state_backs_off_and_push_snaps_back(standin_coordinator) -> None:
+    coordinator, standin, clock = await standin_coordinator(places=1, cameras=1)
+    dnd = "GET /api/mh-customer/mobile/v1/customers/places/{id}/settings/do_not_disturb"
+    ticks = int(6 * 3600 // _TICK)
+
+    for tick in range(ticks):
+        clock[0] = tick * _TICK
+        await coordinator._async_update_data()
+
+    # Без backoff-а — раз в 15 минут (24 за 6 часов).
+    assert standin.requests[dnd] < 6 * 3600 // REFRESH_INTERVALS[KIND_DND] // 2
+    assert coordinator.refresh_schedule.effective_interval(KIND_DND, "1001") == (
+        MAX_INTERVALS[KIND_DND]
+    )
+    before = standin.requests[dnd]
+
+    coordinator.handle_doorbell_signal({"event_type": "ring", "place_id": "1001"})
+    coordinator.handle_doorbell_signal({"event_type": "ring", "place_id": "404"})
+    clock[0] = ticks * _TICK
+    await coordinator._async_update_data()
+
+    assert standin.requests[dnd] == before + 1
+    assert coordinator.refresh_schedule.effective_interval(KIND_DND, "1001") == (
+        2 * FAST_INTERVAL
+    )
@@ -87,7 +87,7 @@ async def _platform_sensor(
     hass: HomeAssistant,
     manager: _ManagerStub | None,
 ):
-    entry = SimpleNamespace(entry_id="entry-1")
+    entry = SimpleNamespace(entry_id="entry-1", async_on_unload=lambda _unsub: None)
     coordinator = MagicMock()
     coordinator.data = {"balances": [], "locks": []}
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
@@ -240,7 +240,9 @@ async def test_sensor_attributes_never_contain_operator_url_or_token(
 async def test_sensor_is_absent_when_go2rtc_is_disabled(
     hass: HomeAssistant,
 ) -> None:
-    entry = SimpleNamespace(entry_id="entry-disabled")
+    entry = SimpleNamespace(
+        entry_id="entry-disabled", async_on_unload=lambda _unsub: None
+    )
     coordinator = MagicMock()
     coordinator.data = {"balances": [], "locks": []}
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
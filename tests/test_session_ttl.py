@@ -0,0 +1,158 @@
+"""Выученный TTL operator-сессии (`session_ttl.py`).
+
+- Без наблюдений (и пока их меньше `MIN_SAMPLES`) — 28:30 от 30:00; с
+  наблюдениями — safety-доля нижнего перцентиля скользящего окна.
+- Обрыв далеко ниже текущей оценки — свидетельство только границы полосы:
+  оценка догоняет настоящее сокращение шагами.
+- Ранние обрывы и дубли одного обрыва в окно не идут.
+- Продления живых сессий возвращают оценку к умолчанию.
+- Сжатие TTL — WARNING и счётчик alerts; старые наблюдения истекают.
+"""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.elektronny_gorod.session_ttl import (
+    EVIDENCE_BAND,
+    MIN_REFRESH_INTERVAL,
+    MIN_SAMPLES,
+    SAMPLE_MAX_AGE,
+    SESSION_TTL_DEFAULT,
+    SessionTtlModel,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_defaults_to_observed_thirty_minute_cutoff() -> None:
+    model = SessionTtlModel(clock=_Clock())
+
+    assert model.session_ttl() == SESSION_TTL_DEFAULT
+    assert model.refresh_interval() == 28 * 60 + 30
+    assert model.stats()["samples"] == 0
+
+
+def test_default_holds_until_enough_samples() -> None:
+    clock = _Clock()
+    model = SessionTtlModel(clock=clock)
+    for index in range(MIN_SAMPLES - 1):
+        clock.now += 120
+        assert model.record(str(index), 25 * 60)
+    assert model.session_ttl() == SESSION_TTL_DEFAULT
+
+    clock.now += 120
+    assert model.record("last", 25 * 60)
+    assert model.session_ttl() == 25 * 60
+
+
+def test_single_early_stall_moves_estimate_one_band_step_at_most() -> None:
+    clock = _Clock()
+    model = SessionTtlModel(clock=clock)
+    for index in range(MIN_SAMPLES - 1):
+        clock.now += 120
+        model.record(str(index), 30 * 60)
+    # Обрыв на 2-й минуте (сеть) — не «TTL 2 минуты».
+    clock.now += 120
+    assert model.record("lift", 2 * 60)
+
+    assert model.session_ttl() == SESSION_TTL_DEFAULT * EVIDENCE_BAND
+    assert model.last_lifetime("lift") == 2 * 60
+    assert model.stats()["clamped"] == 1
+    assert model.stats()["min_lifetime_s"] == 120.0
+
+
+def test_percentile_of_rolling_window_sets_refresh_interval() -> None:
+    clock = _Clock()
+    model = SessionTtlModel(clock=clock)
+    for index in range(19):
+        clock.now += 600
+        assert model.record(str(index), 30 * 60)
+    # Один обрыв по сети не обрушивает интервал при 20 наблюдениях.
+    clock.now += 600
+    assert model.record("lift", 10 * 60)
+    assert model.session_ttl() == 30 * 60
+
+    # Оператор действительно сократил сессию до 10 минут: оценка догоняет
+    # шагами полосы свидетельства.
+    steps = []
+    for index in range(30):
+        clock.now += 600
+        model.record(f"late{index}", 10 * 60)
+        steps.append(model.session_ttl())
+    assert steps == sorted(steps, reverse=True)
+    assert steps[1] == 30 * 60 * EVIDENCE_BAND
+    assert model.session_ttl() == 10 * 60
+    assert model.refresh_interval() == pytest.approx(10 * 60 * 0.95)
+    assert model.last_lifetime("lift") == 10 * 60
+
+
+def test_surviving_renewals_recover_the_default() -> None:
+    clock = _Clock()
+    model = SessionTtlModel(clock=clock)
+    for index in range(MIN_SAMPLES):
+        clock.now += 120
+        model.record(str(index), 20 * 60)
+    shrunk = model.refresh_interval()
+    assert shrunk == pytest.approx(30 * 60 * EVIDENCE_BAND * 0.95)
+    assert model.alerts == 1
+
+    # Продление раньше срока ничего не доказывает.
+    assert not model.record_survival("100", shrunk / 2)
+    assert model.record_survival("100", shrunk)
+    # Окно стало меньше MIN_SAMPLES — назад к умолчанию.
+    assert model.session_ttl() == SESSION_TTL_DEFAULT
+    assert model.stats()["survived"] == 1
+
+    # Уровень тревоги сброшен: новое сжатие снова предупреждает.
+    clock.now += 120
+    model.record("again", 20 * 60)
+    assert model.session_ttl() == 30 * 60 * EVIDENCE_BAND
+    assert model.alerts == 2
+
+
+def test_early_and_duplicate_deaths_are_not_samples() -> None:
+    clock = _Clock()
+    model = SessionTtlModel(clock=clock)
+
+    assert not model.record("100", 10)
+    assert model.record("100", 25 * 60)
+    clock.now += 5
+    # Тот же обрыв, пришедший через recovery после health snapshot.
+    assert not model.record("100", 25 * 60 + 5)
+    assert model.stats()["recorded"] == 1
+    assert model.stats()["ignored"] == 2
+
+
+def test_shrink_alerts_once_per_level_and_samples_expire(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    clock = _Clock()
+    model = SessionTtlModel(clock=clock)
+
+    for index in range(MIN_SAMPLES - 1):
+        clock.now += 120
+        model.record(str(index), 29 * 60)
+    assert model.alerts == 0
+    clock.now += 120
+    model.record("100", 20 * 60)
+    assert model.session_ttl() == 30 * 60 * EVIDENCE_BAND
+    clock.now += 120
+    model.record("200", 21 * 60)
+    assert model.session_ttl() == 21 * 60
+    assert model.alerts == 1
+    assert caplog.text.count("session TTL shrank") == 1
+
+    for index in range(20):
+        clock.now += 120
+        model.record(f"short{index}", 2 * 60)
+    assert model.refresh_interval() == MIN_REFRESH_INTERVAL
+    assert model.alerts > 2
+
+    clock.now += SAMPLE_MAX_AGE + 1
+    assert model.session_ttl() == SESSION_TTL_DEFAULT
@@ -0,0 +1,103 @@
+"""Индексированный снимок coordinator.data (`snapshot_index.py`).
+
+- Индексы по camera id, `(place, ac, entrance)` и place id; первая запись
+  побеждает, как у прежнего линейного поиска.
+- Coordinator кладёт индекс в `data` раз за тик; `data_index` отдаёт его же,
+  пока списки снимка не подменены.
+- Entity-accessor-ы читают через индекс.
+"""
+from __future__ import annotations
+
+from types import MappingProxyType
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.elektronny_gorod.camera import ElektronnyGorodCamera
+from custom_components.elektronny_gorod.history import place_display_name
+from custom_components.elektronny_gorod.lock import ElektronnyGorodLock
+from custom_components.elektronny_gorod.snapshot_index import (
+    EMPTY_INDEX,
+    INDEX_KEY,
+    SnapshotIndex,
+    data_index,
+)
+
+
+def _data() -> dict:
+    return {
+        "places": [
+            {"place": {"id": 1001, "address": {"visibleAddress": "Home", "apartment": "9"}}},
+            {"place": {"id": 1002, "address": "Dacha"}},
+        ],
+        "cameras": [
+            {"id": 7, "name": "Intercom", "source": "intercom"},
+            {"id": "7", "name": "Duplicate", "source": "public"},
+            {"id": "C2", "name": "City", "source": "public"},
+        ],
+        "locks": [
+            {"place_id": 1001, "access_control_id": 10, "entrance_id": 100, "openable": True},
+            {"place_id": 1001, "access_control_id": 11, "entrance_id": None, "openable": False},
+        ],
+        "balances": [{"place_id": 1001, "balance": 12.5}],
+        "dnd": {"1001": [{"type": "DO_NOT_DISTURB_ROOT", "status": True}]},
+    }
+
+
+def test_build_indexes_by_key_first_wins() -> None:
+    data = _data()
+    index = SnapshotIndex.build(data)
+
+    assert index.cameras["7"]["name"] == "Intercom"
+    assert index.cameras["C2"] is data["cameras"][2]
+    assert index.locks[(1001, 11, None)]["openable"] is False
+    assert index.balances["1001"]["balance"] == 12.5
+    assert index.dnd["1001"][0]["status"] is True
+    assert index.place(1001)["address"]["apartment"] == "9"
+    assert index.place("missing") == {}
+    assert isinstance(index.cameras, MappingProxyType)
+    with pytest.raises(TypeError):
+        index.cameras["new"] = {}  # type: ignore[index]
+
+
+def test_data_index_reuses_stored_index_until_lists_change() -> None:
+    data = _data()
+    data[INDEX_KEY] = SnapshotIndex.build(data)
+
+    assert data_index(data) is data[INDEX_KEY]
+    assert data_index(None) is EMPTY_INDEX
+
+    # Список подменили (тест / внешний код) — индекс строится заново.
+    data["cameras"] = [{"id": "C9"}]
+    assert set(data_index(data).cameras) == {"C9"}
+    # Без сохранённого индекса (MagicMock-coordinator в тестах) — тоже работает.
+    assert data_index({"cameras": [{"id": 1}]}).cameras["1"] == {"id": 1}
+
+
+def test_place_display_name_from_index() -> None:
+    data = _data()
+
+    assert place_display_name(data, "1001") == "Home"
+    assert place_display_name(data, "1002") == "Dacha"
+    assert place_display_name(data, "404") == "Place 404"
+
+
+def test_entity_accessors_read_through_index() -> None:
+    data = _data()
+    data[INDEX_KEY] = SnapshotIndex.build(data)
+    coordinator = MagicMock()
+    coordinator.data = data
+    coordinator.last_update_success = True
+
+    camera = ElektronnyGorodCamera(
+        coordinator, {"id": "C2", "source": "public"}, stream_manager=None
+    )
+    lock = ElektronnyGorodLock(coordinator, dict(data["locks"][0], name="Door", ac_name="AC"))
+
+    assert camera._coordinator_camera_info is data["cameras"][2]
+    assert camera.available
+    assert lock._coordinator_lock_info is data["locks"][0]
+    assert lock.available
+
+    data["cameras"] = []
+    assert camera.available is False
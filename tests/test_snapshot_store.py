@@ -0,0 +1,211 @@
+"""Persisted снимок coordinator-а: setup без сети (`snapshot_store.py`).
+
+- Живой refresh пишет sanitized снимок (без `index`) в `.storage`.
+- Со снимком setup не ждёт оператора: entity сразу, refresh — в фоне.
+- Сбой фонового refresh-а / устаревший снимок — entity unavailable.
+- Битый payload — обычный блокирующий first refresh.
+"""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+import json
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.elektronny_gorod.const import (
+    CONF_ACCESS_TOKEN,
+    CONF_OPERATOR_ID,
+    CONF_REFRESH_TOKEN,
+    CONF_USER_AGENT,
+    DOMAIN,
+)
+from custom_components.elektronny_gorod.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from custom_components.elektronny_gorod.snapshot_store import (
+    SAVE_DELAY,
+    SNAPSHOT_MAX_AGE,
+    snapshot_storage_key,
+)
+from custom_components.elektronny_gorod.user_agent import UserAgent
+
+ENTRY_ID = "snapshot_entry"
+PLACE_ID = "P1"
+
+
+def _snapshot() -> dict[str, Any]:
+    return {
+        "places": [{"place": {"id": PLACE_ID, "address": {"visibleAddress": "Home"}}}],
+        "balances": [{"place_id": PLACE_ID, "balance": 10}],
+        "cameras": [{
+            "id": 101, "name": "Подъезд 1", "place_id": PLACE_ID,
+            "access_control_id": "AC1", "entrance_id": "E1",
+            "source": "intercom", "hidden": False,
+        }],
+        "locks": [{
+            "place_id": PLACE_ID, "access_control_id": "AC1", "entrance_id": "E1",
+            "name": "Подъезд 1", "ac_name": "Door", "openable": True, "hidden": False,
+        }],
+        "dnd": {},
+    }
+
+
+def _store(hass_storage: dict[str, Any], data: Any, age: float = 60) -> None:
+    key = snapshot_storage_key(ENTRY_ID)
+    hass_storage[key] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": key,
+        "data": {
+            "saved_at": (dt_util.utcnow() - timedelta(seconds=age)).isoformat(),
+            "data": data,
+        },
+    }
+
+
+@pytest.fixture
+def mock_api():
+    with patch(
+        "custom_components.elektronny_gorod.coordinator.ElektronnyGorodAPI"
+    ) as mock_cls:
+        instance = mock_cls.return_value
+        instance.http = AsyncMock()
+        instance.http.user_agent = AsyncMock()
+        instance.http.diagnostics = MagicMock(return_value={})
+        instance.query_places = AsyncMock(return_value=_snapshot()["places"])
+        instance.query_balance = AsyncMock(return_value={"balance": 10})
+        instance.query_access_controls = AsyncMock(return_value=[{
+            "id": "AC1",
+            "name": "Door",
+            "entrances": [
+                {"id": "E1", "name": "Подъезд 1", "externalCameraId": 101, "allowOpen": True},
+            ],
+        }])
+        instance.query_cameras = AsyncMock(return_value=[])
+        instance.query_public_cameras = AsyncMock(return_value=[])
+        instance.query_screens_settings = AsyncMock(return_value={})
+        instance.query_dnd_settings = AsyncMock(return_value=[])
+        yield instance
+
+
+def _entry(hass: HomeAssistant) -> MockConfigEntry:
+    ua = UserAgent()
+    ua.operator_id = "1"
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=3,
+        entry_id=ENTRY_ID,
+        unique_id="test_unique_subscriber_S1",
+        data={
+            CONF_ACCESS_TOKEN: "T1",
+            CONF_REFRESH_TOKEN: "R1",
+            CONF_OPERATOR_ID: "1",
+            CONF_USER_AGENT: json.dumps(ua.json()),
+            "account_id": "A1",
+            "subscriber_id": "S1",
+            "use_go2rtc": False,
+        },
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+def _lock_state(hass: HomeAssistant) -> str:
+    (entity_id,) = hass.states.async_entity_ids("lock")
+    return hass.states.get(entity_id).state
+
+
+async def test_live_refresh_persists_sanitized_snapshot(
+    hass: HomeAssistant, hass_storage: dict[str, Any], mock_api
+) -> None:
+    entry = _entry(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=SAVE_DELAY + 1))
+    await hass.async_block_till_done()
+
+    stored = hass_storage[snapshot_storage_key(ENTRY_ID)]["data"]
+    assert set(stored["data"]) == {"places", "balances", "cameras", "locks", "dnd"}
+    assert stored["data"]["locks"][0]["entrance_id"] == "E1"
+    assert "T1" not in json.dumps(stored)
+    diag = await async_get_config_entry_diagnostics(hass, entry)
+    assert diag["startup"]["source"] == "live"
+    assert diag["startup"]["time_saved"] == 0.0
+
+
+async def test_restored_setup_does_not_wait_for_operator(
+    hass: HomeAssistant, hass_storage: dict[str, Any], mock_api
+) -> None:
+    _store(hass_storage, _snapshot())
+    release = asyncio.Event()
+
+    async def _hanging_places() -> list[dict[str, Any]]:
+        await release.wait()
+        raise RuntimeError("operator down")
+
+    mock_api.query_places.side_effect = _hanging_places
+    entry = _entry(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    assert entry.state is ConfigEntryState.LOADED
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    assert coordinator.startup_stats["source"] == "restored"
+    assert _lock_state(hass) == "locked"
+
+    # Фоновый refresh упал — entity из снимка уходят в unavailable.
+    release.set()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert not coordinator.last_update_success
+    assert _lock_state(hass) == "unavailable"
+
+
+async def test_stale_snapshot_is_unavailable_until_live_refresh(
+    hass: HomeAssistant, hass_storage: dict[str, Any], mock_api
+) -> None:
+    _store(hass_storage, _snapshot(), age=SNAPSHOT_MAX_AGE + 60)
+    release = asyncio.Event()
+    places = _snapshot()["places"]
+
+    async def _slow_places() -> list[dict[str, Any]]:
+        await release.wait()
+        return places
+
+    mock_api.query_places.side_effect = _slow_places
+    entry = _entry(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    assert coordinator.startup_stats["stale"] is True
+    assert _lock_state(hass) == "unavailable"
+
+    release.set()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert _lock_state(hass) == "locked"
+    stats = (await async_get_config_entry_diagnostics(hass, entry))["startup"]
+    assert stats["source"] == "restored"
+    assert stats["first_refresh"] is not None
+    assert stats["time_saved"] == stats["first_refresh"]
+
+
+async def test_invalid_snapshot_falls_back_to_blocking_refresh(
+    hass: HomeAssistant, hass_storage: dict[str, Any], mock_api
+) -> None:
+    _store(hass_storage, {"places": "garbage"})
+    mock_api.query_places.side_effect = RuntimeError("operator down")
+    entry = _entry(hass)
+
+    assert not await hass.config_entries.async_setup(entry.entry_id)
+    assert entry.state is ConfigEntryState.SETUP_RETRY
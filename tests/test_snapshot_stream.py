@@ -0,0 +1,162 @@
+"""Snapshot без двойной буферизации и с guard-ом размера.
+
+- `HTTP.get(binary=True, max_bytes=...)` читает тело чанками: Content-Length
+  или фактический размер больше лимита → `ResponseTooLargeError`.
+- MJPEG камеры: кадр — общий single-flight `get_camera_snapshot`, не чаще
+  раза в `frame_interval`; первый кадр дважды, отключение клиента — конец
+  потока.
+"""
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiohttp import ClientError
+
+from custom_components.elektronny_gorod import camera as camera_module
+from custom_components.elektronny_gorod.camera import ElektronnyGorodCamera
+from custom_components.elektronny_gorod.http import HTTP, ResponseTooLargeError
+from custom_components.elektronny_gorod.transport import (
+    async_acquire_operator_transport,
+)
+from custom_components.elektronny_gorod.user_agent import UserAgent
+
+from tests.operator_standin import OperatorStandIn
+
+_SNAPSHOT = "/rest/v1/forpost/cameras/{id}/snapshots"
+
+
+@pytest.fixture(autouse=True)
+def _loopback(socket_enabled) -> None:
+    """Stand-in оператора слушает 127.0.0.1."""
+
+
+def _routes(body: bytes) -> dict:
+    return {("GET", _SNAPSHOT): lambda _path: (200, body)}
+
+
+@pytest.fixture
+async def http_client(hass, monkeypatch):
+    async def make(routes: dict, **kwargs) -> tuple[HTTP, OperatorStandIn]:
+        standin = OperatorStandIn(routes, **kwargs)
+        await standin.__aenter__()
+        cleanup.append(standin)
+        standin.patch_http(monkeypatch)
+        return HTTP(hass, UserAgent(), "T", None, "1"), standin
+
+    release = async_acquire_operator_transport(hass)
+    cleanup: list[OperatorStandIn] = []
+    yield make
+    await release()
+    for standin in cleanup:
+        await standin.__aexit__(None, None, None)
+
+
+async def test_binary_get_within_limit(http_client) -> None:
+    client, _ = await http_client(_routes(b"\xff\xd8jpeg"))
+
+    body = await client.get("/rest/v1/forpost/cameras/1/snapshots", binary=True, max_bytes=100)
+
+    assert body == b"\xff\xd8jpeg"
+    assert client.metrics.total.bytes == 6
+
+
+async def test_content_length_over_limit_is_rejected(http_client) -> None:
+    client, _ = await http_client(_routes(b"x" * 200))
+
+    with pytest.raises(ResponseTooLargeError):
+        await client.get("/rest/v1/forpost/cameras/1/snapshots", binary=True, max_bytes=100)
+
+
+async def test_chunked_body_over_limit_is_rejected(http_client) -> None:
+    client, _ = await http_client(_routes(b"x" * 200), chunked=True)
+
+    with pytest.raises(ResponseTooLargeError):
+        await client.get("/rest/v1/forpost/cameras/1/snapshots", binary=True, max_bytes=100)
+
+
+class _FakeStreamResponse:
+    def __init__(self) -> None:
+        self.content_type = None
+        self.written: list[bytes] = []
+
+    async def prepare(self, _request) -> None:
+        return None
+
+    async def write(self, data: bytes) -> None:
+        self.written.append(bytes(data))
+
+
+def _mjpeg_entity(monkeypatch, frames: list[bytes]):
+    monkeypatch.setattr(
+        camera_module, "web", SimpleNamespace(StreamResponse=_FakeStreamResponse)
+    )
+    coordinator = MagicMock()
+    coordinator.data = {"cameras": [{"id": "C1"}]}
+    coordinator.last_update_success = True
+    remaining = iter(frames)
+    calls: list[str] = []
+
+    async def get_snapshot(camera_id, _width, _height):
+        calls.append(camera_id)
+        try:
+            return next(remaining)
+        except StopIteration:
+            raise ClientError("operator down") from None
+
+    coordinator.get_camera_snapshot = get_snapshot
+    entity = ElektronnyGorodCamera(coordinator, {"id": "C1"}, stream_manager=None)
+    entity._attr_frame_interval = 0
+    return entity, calls
+
+
+async def test_mjpeg_writes_frames_until_operator_fails(monkeypatch) -> None:
+    entity, calls = _mjpeg_entity(monkeypatch, [b"first", b"abcd"])
+
+    response = await entity.handle_async_mjpeg_stream(MagicMock())
+
+    written = b"".join(response.written)
+    assert written.count(b"first") == 2
+    assert b"Content-Length: 5" in written
+    assert response.written[-3:] == [
+        b"--frameboundary\r\nContent-Type: image/jpeg\r\nContent-Length: 4\r\n\r\n",
+        b"abcd",
+        b"\r\n",
+    ]
+    assert len(calls) == 3
+
+
+async def test_mjpeg_viewers_share_one_snapshot_per_interval(monkeypatch) -> None:
+    entity, calls = _mjpeg_entity(monkeypatch, [b"one", b"two"])
+    entity._attr_frame_interval = 60
+
+    assert await entity._async_shared_frame() == b"one"
+    # Кадр ещё свежий — новые зрители получают тот же объект без GET-а.
+    frames = await asyncio.gather(*(entity._async_shared_frame() for _ in range(5)))
+    assert all(frame is frames[0] for frame in frames)
+    assert len(calls) == 1
+
+    entity._attr_frame_interval = 0
+    assert await entity._async_shared_frame() == b"two"
+    assert len(calls) == 2
+
+
+async def test_mjpeg_client_disconnect_ends_stream_quietly(monkeypatch) -> None:
+    entity, calls = _mjpeg_entity(monkeypatch, [b"one", b"two", b"three"])
+    writes = 0
+
+    async def write(self, data: bytes) -> None:
+        nonlocal writes
+        writes += 1
+        if writes > 6:
+            raise ConnectionResetError("client went away")
+        self.written.append(bytes(data))
+
+    monkeypatch.setattr(_FakeStreamResponse, "write", write)
+
+    response = await entity.handle_async_mjpeg_stream(MagicMock())
+
+    assert b"".join(response.written).count(b"one") == 2
+    assert len(calls) == 2
@@ -9,7 +9,15 @@ from unittest.mock import AsyncMock, MagicMock
 import pytest
 
 from custom_components.elektronny_gorod.go2rtc import Go2RtcRequestError
+from custom_components.elektronny_gorod.rate_limit import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+)
 from custom_components.elektronny_gorod.stream_manager import CameraStreamManager
+from custom_components.elektronny_gorod.stream_url_cache import (
+    MIN_REMAINING_OPEN,
+    StreamUrlCache,
+)
 
 
 def _manager(
@@ -382,3 +390,208 @@ async def test_operator_error_is_recorded_without_exception_details() -> None:
     assert state is not None
     assert state.status == "operator_error"
     assert "OPERATOR_SECRET" not in repr(state)
+
+
+def _gated_manager(max_in_flight: int, camera_count: int):
+    """Manager whose operator mints block until released one by one."""
+    gates: dict[str, asyncio.Event] = {}
+    started: list[str] = []
+    running = {"now": 0, "peak": 0}
+
+    async def gated_stream(camera_id: str) -> str:
+        started.append(camera_id)
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        try:
+            await gates.setdefault(camera_id, asyncio.Event()).wait()
+        finally:
+            running["now"] -= 1
+        return f"https://operator/{camera_id}?token={camera_id}"
+
+    manager, coordinator, client = _manager(stream_side_effect=gated_stream)
+    manager._admission.max_in_flight = max_in_flight
+    coordinator.data = {
+        "cameras": [{"id": str(100 + i)} for i in range(camera_count)]
+    }
+    return manager, gates, started, running
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_mass_refresh_is_bounded_by_admission() -> None:
+    manager, gates, started, running = _gated_manager(2, 8)
+    camera_ids = [str(100 + i) for i in range(8)]
+    tasks = [
+        asyncio.create_task(manager.async_refresh(camera_id, "reconcile"))
+        for camera_id in camera_ids
+    ]
+    await _settle()
+
+    assert started == ["100", "101"]
+    assert manager.admission_stats()["queue_depth"] == 6
+    for camera_id in camera_ids:
+        gates.setdefault(camera_id, asyncio.Event()).set()
+    await asyncio.wait_for(asyncio.gather(*tasks), timeout=1)
+
+    assert running["peak"] == 2
+    assert sorted(started) == camera_ids
+    assert manager.admission_stats()["in_flight"] == 0
+
+
+async def test_ha_open_never_waits_behind_background_storm() -> None:
+    manager, gates, started, _ = _gated_manager(1, 4)
+    background = [
+        asyncio.create_task(manager.async_refresh(camera_id, "reconcile"))
+        for camera_id in ("100", "101")
+    ]
+    await _settle()
+    opened = asyncio.create_task(manager.async_refresh("102", "ha_open"))
+    await _settle()
+
+    # Слот занят фоном, но открытие камеры допущено сразу.
+    assert started == ["100", "102"]
+    gates.setdefault("102", asyncio.Event()).set()
+    assert (await asyncio.wait_for(opened, timeout=1)).proxied is True
+    assert not background[1].done()
+
+    for camera_id in ("100", "101"):
+        gates.setdefault(camera_id, asyncio.Event()).set()
+    await asyncio.wait_for(asyncio.gather(*background), timeout=1)
+    assert manager.admission_stats()["admitted"]["ha_open"] == 1
+
+
+async def test_queue_order_follows_reason_priority() -> None:
+    manager, gates, started, _ = _gated_manager(1, 4)
+    tasks = [asyncio.create_task(manager.async_refresh("100", "reconcile"))]
+    await _settle()
+    for camera_id, reason in (
+        ("101", "background_due"),
+        ("102", "recovery"),
+        ("103", "active_consumer"),
+    ):
+        tasks.append(asyncio.create_task(manager.async_refresh(camera_id, reason)))
+    await _settle()
+
+    for camera_id in ("100", "103", "102"):
+        gates.setdefault(camera_id, asyncio.Event()).set()
+        await _settle()
+    gates.setdefault("101", asyncio.Event()).set()
+    await asyncio.wait_for(asyncio.gather(*tasks), timeout=1)
+
+    assert started == ["100", "103", "102", "101"]
+
+
+async def test_joined_ha_open_promotes_queued_background_refresh() -> None:
+    manager, gates, started, _ = _gated_manager(1, 2)
+    first = asyncio.create_task(manager.async_refresh("100", "reconcile"))
+    await _settle()
+    queued = asyncio.create_task(manager.async_refresh("101", "reconcile"))
+    await _settle()
+    assert started == ["100"]
+
+    opened = asyncio.create_task(manager.async_refresh("101", "ha_open"))
+    await _settle()
+
+    assert started == ["100", "101"]
+    assert manager.admission_stats()["promoted"] == 1
+    for camera_id in ("100", "101"):
+        gates.setdefault(camera_id, asyncio.Event()).set()
+    await asyncio.wait_for(asyncio.gather(first, queued, opened), timeout=1)
+    assert manager.admission_stats()["in_flight"] == 0
+
+
+async def test_ha_open_joining_before_owner_reaches_gate_is_promoted() -> None:
+    manager, gates, started, _ = _gated_manager(1, 2)
+    first = asyncio.create_task(manager.async_refresh("100", "reconcile"))
+    await _settle()
+
+    # Owner ещё не дошёл до acquire(): promote() ему нечего поднимать.
+    owner = manager._start_refresh("101", "reconcile")
+    assert manager._start_refresh("101", "ha_open") is owner
+    await _settle()
+
+    assert started == ["100", "101"]
+    assert manager.admission_stats()["admitted"]["ha_open"] == 1
+    for camera_id in ("100", "101"):
+        gates.setdefault(camera_id, asyncio.Event()).set()
+    await asyncio.wait_for(asyncio.gather(first, owner), timeout=1)
+    assert manager._inflight_priority == {}
+
+
+async def test_cancelled_waiter_releases_its_place() -> None:
+    manager, gates, started, _ = _gated_manager(1, 3)
+    first = asyncio.create_task(manager.async_refresh("100", "reconcile"))
+    await _settle()
+    doomed = asyncio.create_task(manager.async_refresh("101", "reconcile"))
+    last = asyncio.create_task(manager.async_refresh("102", "reconcile"))
+    await _settle()
+
+    manager._inflight["101"].cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await doomed
+    gates.setdefault("100", asyncio.Event()).set()
+    gates.setdefault("102", asyncio.Event()).set()
+    await asyncio.wait_for(asyncio.gather(first, last), timeout=1)
+
+    assert started == ["100", "102"]
+    stats = manager.admission_stats()
+    assert stats["in_flight"] == 0
+    assert stats["queue_depth"] == 0
+
+
+async def test_stream_manager_reuses_url_only_for_live_producer() -> None:
+    manager, coordinator, _ = _manager()
+    coordinator.stream_urls = StreamUrlCache()
+    coordinator.get_shared_camera_stream = AsyncMock(
+        return_value="https://operator/100?token=TOKEN_1"
+    )
+    state = manager._state_for("100")
+
+    # Producer не виден — сессия неизвестна: свежий mint.
+    await manager.async_refresh("100", "ha_open")
+    coordinator.invalidate_camera_stream.assert_called_once_with(
+        "100", producer_died=False
+    )
+    coordinator.get_shared_camera_stream.assert_awaited_with(
+        "100", priority=PRIORITY_INTERACTIVE
+    )
+
+    state.present = True
+    state.producer_active = True
+    coordinator.invalidate_camera_stream.reset_mock()
+    await manager.async_refresh("100", "ha_open")
+    coordinator.get_shared_camera_stream.assert_awaited_with(
+        "100", min_remaining=MIN_REMAINING_OPEN, priority=PRIORITY_INTERACTIVE
+    )
+    coordinator.invalidate_camera_stream.assert_not_called()
+
+    await manager.async_refresh("100", "recovery")
+    coordinator.invalidate_camera_stream.assert_called_once_with(
+        "100", producer_died=True
+    )
+    coordinator.get_shared_camera_stream.assert_awaited_with(
+        "100", priority=PRIORITY_INTERACTIVE
+    )
+    coordinator.get_camera_stream.assert_not_awaited()
+
+
+async def test_background_refreshes_mint_at_background_request_priority() -> None:
+    manager, coordinator, _ = _manager()
+    coordinator.stream_urls = StreamUrlCache()
+    coordinator.get_shared_camera_stream = AsyncMock(
+        return_value="https://operator/100?token=TOKEN_1"
+    )
+
+    # Шторм reconcile после рестарта go2rtc не конкурирует с открытием камеры
+    # в token bucket аккаунта.
+    await manager.async_refresh("100", "reconcile")
+    coordinator.get_shared_camera_stream.assert_awaited_with(
+        "100", priority=PRIORITY_BACKGROUND
+    )
+    await manager.async_refresh("200", "ha_open")
+    coordinator.get_shared_camera_stream.assert_awaited_with(
+        "200", priority=PRIORITY_INTERACTIVE
+    )
@@ -174,7 +174,7 @@ async def test_unload_stops_and_removes_manager(
     assert manager._started is False
     assert entry.entry_id not in hass.data.get(STREAM_MANAGER_DATA, {})
     assert manager._inflight == {}
-    assert manager._due_unsubs == {}
+    assert len(manager._due) == 0
 
 
 async def test_unload_removes_adopted_manager_preload(
@@ -238,12 +238,35 @@ async def test_policy_only_options_update_skips_config_entry_reload(
     reload_entry.assert_not_awaited()
 
 
-async def test_transport_options_update_keeps_config_entry_reload(
+async def test_transport_options_update_swaps_client_without_reload(
+    hass: HomeAssistant,
+) -> None:
+    entry = _entry(keep_warm=True)
+    manager = MagicMock()
+    manager.async_apply_entry_options = AsyncMock(side_effect=[False, True])
+    manager.async_swap_client = AsyncMock()
+    hass.data.setdefault(STREAM_MANAGER_DATA, {})[entry.entry_id] = manager
+
+    with patch.object(
+        hass.config_entries,
+        "async_reload",
+        new=AsyncMock(),
+    ) as reload_entry:
+        await async_update_options(hass, entry)
+
+    (client,), _ = manager.async_swap_client.await_args
+    assert client.base_url == "http://127.0.0.1:1984"
+    assert manager.async_apply_entry_options.await_count == 2
+    reload_entry.assert_not_awaited()
+
+
+async def test_failed_hot_apply_falls_back_to_reload(
     hass: HomeAssistant,
 ) -> None:
     entry = _entry(keep_warm=True)
     manager = MagicMock()
     manager.async_apply_entry_options = AsyncMock(return_value=False)
+    manager.async_swap_client = AsyncMock(side_effect=RuntimeError)
     hass.data.setdefault(STREAM_MANAGER_DATA, {})[entry.entry_id] = manager
 
     with patch.object(
@@ -253,10 +276,79 @@ async def test_transport_options_update_keeps_config_entry_reload(
     ) as reload_entry:
         await async_update_options(hass, entry)
 
-    manager.async_apply_entry_options.assert_awaited_once_with()
     reload_entry.assert_awaited_once_with(entry.entry_id)
 
 
+async def test_go2rtc_toggle_and_transport_change_apply_without_reload(
+    hass: HomeAssistant,
+    mock_api,
+) -> None:
+    entry = _entry(keep_warm=False)
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    manager = hass.data[STREAM_MANAGER_DATA][entry.entry_id]
+    rtsp_sensor = er.async_get(hass).async_get_entity_id(
+        "sensor", DOMAIN, f"{DOMAIN}_{entry.entry_id}_go2rtc_rtsp_urls"
+    )
+    call_camera = er.async_get(hass).async_get_entity_id(
+        "camera", DOMAIN, f"{DOMAIN}_{entry.entry_id}_intercom_call"
+    )
+    assert rtsp_sensor is not None and call_camera is not None
+
+    with patch.object(
+        hass.config_entries,
+        "async_reload",
+        new=AsyncMock(),
+    ) as reload_entry:
+        hass.config_entries.async_update_entry(
+            entry, options={"use_go2rtc": False}
+        )
+        await hass.async_block_till_done()
+
+        assert manager._started is False
+        assert entry.entry_id not in hass.data[STREAM_MANAGER_DATA]
+        assert _camera(hass)._stream_manager is None
+        assert hass.states.get(rtsp_sensor).state == "unavailable"
+        assert hass.states.get(call_camera).state == "unavailable"
+
+        hass.config_entries.async_update_entry(
+            entry,
+            options={
+                "use_go2rtc": True,
+                "go2rtc_base_url": "http://go2rtc:1984",
+                "go2rtc_rtsp_host": "go2rtc.local",
+            },
+        )
+        await hass.async_block_till_done()
+
+        restarted = hass.data[STREAM_MANAGER_DATA][entry.entry_id]
+        assert restarted is not manager
+        assert restarted._started is True
+        assert _camera(hass)._stream_manager is restarted
+        assert hass.states.get(rtsp_sensor).state != "unavailable"
+
+        hass.config_entries.async_update_entry(
+            entry,
+            options={
+                "use_go2rtc": True,
+                "go2rtc_base_url": "http://other-go2rtc:1984",
+                "go2rtc_rtsp_host": "other-go2rtc.local",
+            },
+        )
+        await hass.async_block_till_done()
+
+        assert hass.data[STREAM_MANAGER_DATA][entry.entry_id] is restarted
+        assert restarted.client.rtsp_host == "other-go2rtc.local"
+        # Камера переподписана на health-monitor нового go2rtc.
+        assert _camera(hass)._health_monitor is restarted.health_monitor
+        assert restarted.health_monitor.client is restarted.client
+        sip_controller = hass.data[f"{DOMAIN}_sip"][entry.entry_id]
+        assert sip_controller._go2rtc.base_url == "http://other-go2rtc:1984"
+
+    reload_entry.assert_not_awaited()
+
+
 async def test_camera_open_uses_manager_patch_not_legacy_writer(
     hass: HomeAssistant,
     mock_api,
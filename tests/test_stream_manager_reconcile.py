@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
@@ -427,7 +428,33 @@ async def test_missing_eligible_stream_runs_full_refresh_chain(
     for call in client.async_patch_stream.await_args_list:
         assert call.args[1].startswith("ffmpeg:https://operator/")
         assert call.args[1].endswith("#video=copy#audio=aac#audio=opus")
-    assert manager._due_unsubs == {}
+    assert len(manager._due) == 0
+
+
+async def test_reconcile_releases_lock_while_refreshes_drain(
+    hass: HomeAssistant,
+) -> None:
+    manager, coordinator, client, _, _ = _setup(hass, streams={})
+    gate = asyncio.Event()
+
+    async def slow_mint(camera_id: str) -> str:
+        await gate.wait()
+        return f"https://operator/{camera_id}?token=SLOW"
+
+    coordinator.get_camera_stream.side_effect = slow_mint
+    reconcile = asyncio.create_task(manager.async_reconcile())
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+    # Минты висят, но lock свободен: policy/swap не ждут всю очередь.
+    assert not reconcile.done()
+    assert not manager._reconcile_lock.locked()
+    assert set(manager._inflight) == {"100", "200"}
+
+    gate.set()
+    await asyncio.wait_for(reconcile, timeout=1)
+    assert client.async_patch_stream.await_count == 2
+    assert manager._inflight == {}
 
 
 async def test_go2rtc_restart_is_recovered_on_next_reconcile(
@@ -12,6 +12,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_registry as er
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
+from custom_components.elektronny_gorod import deadline_scheduler
 from custom_components.elektronny_gorod import stream_manager as module
 from custom_components.elektronny_gorod.const import (
     CONF_GO2RTC_BASE_URL,
@@ -27,6 +28,7 @@ from custom_components.elektronny_gorod.go2rtc import (
     Go2RtcRequestError,
     Go2RtcStreamInfo,
 )
+from custom_components.elektronny_gorod.session_ttl import MIN_SAMPLES
 from custom_components.elektronny_gorod.stream_manager import CameraStreamManager
 
 
@@ -34,19 +36,49 @@ class _Schedules:
     def __init__(self) -> None:
         self.later: list[tuple[float, Callable, MagicMock]] = []
         self.intervals: list[tuple[object, Callable, MagicMock]] = []
+        # Единственный таймер deadline-планировщика менеджера.
+        self.due: list[tuple[float, Callable, MagicMock]] = []
+        self.fired: set[int] = set()
+        self.now = 1000.0
 
     def call_later(self, hass, delay, action):
+        return self._record(self.later, delay, action)
+
+    def due_later(self, hass, delay, action):
+        return self._record(self.due, delay, action)
+
+    @staticmethod
+    def _record(target, delay, action):
         seconds = delay.total_seconds() if hasattr(delay, "total_seconds") else float(delay)
-        cancel = MagicMock(name=f"cancel_later_{len(self.later)}")
-        self.later.append((seconds, action, cancel))
+        cancel = MagicMock(name=f"cancel_later_{len(target)}")
+        target.append((seconds, action, cancel))
         return cancel
 
+    def armed(self) -> list[float]:
+        """Задержки ещё не отменённых таймеров планировщика."""
+        return [
+            delay
+            for index, (delay, _, cancel) in enumerate(self.due)
+            if not cancel.called and index not in self.fired
+        ]
+
+    async def fire(self) -> None:
+        """Сдвинуть часы к последнему взведённому таймеру и выполнить его."""
+        delay, action, _ = self.due[-1]
+        self.fired.add(len(self.due) - 1)
+        self.now += delay
+        await action(None)
+
     def track_interval(self, hass, action, interval, **kwargs):
         cancel = MagicMock(name="cancel_interval")
         self.intervals.append((interval, action, cancel))
         return cancel
 
 
+def _due_in(manager: CameraStreamManager) -> dict[str, float]:
+    return manager.scheduler_stats()["refresh_due_in_s"]
+
+
 def _setup(
     hass: HomeAssistant,
     monkeypatch: pytest.MonkeyPatch,
@@ -56,6 +88,8 @@ def _setup(
 ):
     schedules = _Schedules()
     monkeypatch.setattr(module, "async_call_later", schedules.call_later, raising=False)
+    monkeypatch.setattr(deadline_scheduler, "async_call_later", schedules.due_later)
+    monkeypatch.setattr(module, "_monotonic", lambda: schedules.now)
     monkeypatch.setattr(
         module,
         "async_track_time_interval",
@@ -133,21 +167,23 @@ async def test_startup_offsets_are_deterministic_bounded_and_distinct(
 
     await manager.async_start()
 
-    offsets = [delay for delay, _, _ in schedules.later]
-    assert len(offsets) == 2
-    assert all(0 <= delay < 60 for delay in offsets)
-    assert offsets[0] != offsets[1]
+    offsets = _due_in(manager)
+    assert sorted(offsets) == ["100", "200"]
+    assert all(0 <= delay < 60 for delay in offsets.values())
+    assert offsets["100"] != offsets["200"]
+    # Один взведённый таймер — на ближайший срок.
+    assert schedules.armed() == [pytest.approx(min(offsets.values()), abs=0.05)]
+    assert schedules.later == []
     client.async_patch_stream.assert_not_awaited()
     assert len(schedules.intervals) == 1
     assert schedules.intervals[0][0].total_seconds() == 60
 
-    first_offsets = offsets.copy()
     await manager.async_stop()
+    assert schedules.armed() == []
 
-    schedules.later.clear()
     schedules.intervals.clear()
     await manager.async_start()
-    assert [delay for delay, _, _ in schedules.later] == first_offsets
+    assert _due_in(manager) == offsets
     await manager.async_stop()
 
 
@@ -157,17 +193,16 @@ async def test_each_success_rebases_only_that_cameras_28m30s_due_time(
 ) -> None:
     manager, _, _, schedules, _ = _setup(hass, monkeypatch)
     await manager.async_start()
-    schedules.later.clear()
-    completed = iter((100.0, 200.0))
-    monkeypatch.setattr(module, "_monotonic", lambda: next(completed), raising=False)
+    schedules.now = 100.0
 
     await manager.async_refresh("100", "ha_open")
     state_100 = manager.camera_state("100")
     state_200_before = manager.camera_state("200")
+    schedules.now = 200.0
     await manager.async_refresh("200", "background")
     state_200 = manager.camera_state("200")
 
-    assert [delay for delay, _, _ in schedules.later] == [1710.0, 1710.0]
+    assert _due_in(manager) == {"100": 1610.0, "200": 1710.0}
     assert state_100.next_due_monotonic == 1810.0
     assert state_200_before.next_due_monotonic is not None
     assert state_200.next_due_monotonic == 1910.0
@@ -206,26 +241,19 @@ async def test_retry_delays_are_15_30_60_then_capped_at_300_seconds(
     hass: HomeAssistant,
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    manager, _, client, schedules, _ = _setup(hass, monkeypatch)
+    manager, _, client, _, _ = _setup(hass, monkeypatch)
     client.async_patch_stream.side_effect = Go2RtcRequestError(
         "patch", "http_500"
     )
     await manager.async_start()
-    schedules.later.clear()
 
+    delays = []
     for _ in range(7):
         result = await manager.async_refresh("100", "background")
         assert result.proxied is False
+        delays.append(_due_in(manager)["100"])
 
-    assert [delay for delay, _, _ in schedules.later] == [
-        15.0,
-        30.0,
-        60.0,
-        120.0,
-        240.0,
-        300.0,
-        300.0,
-    ]
+    assert delays == [15.0, 30.0, 60.0, 120.0, 240.0, 300.0, 300.0]
     await manager.async_stop()
 
 
@@ -233,22 +261,135 @@ async def test_success_resets_retry_and_returns_to_28m30s(
     hass: HomeAssistant,
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    manager, _, client, schedules, _ = _setup(hass, monkeypatch)
+    manager, _, client, _, _ = _setup(hass, monkeypatch)
     client.async_patch_stream.side_effect = [
         Go2RtcRequestError("patch", "http_500"),
         None,
     ]
     await manager.async_start()
-    schedules.later.clear()
 
     await manager.async_refresh("100", "background")
-    assert schedules.later[-1][0] == 15.0
+    assert _due_in(manager)["100"] == 15.0
     await manager.async_refresh("100", "background")
 
     state = manager.camera_state("100")
     assert state.failure_count == 0
     assert state.status == "ready"
-    assert schedules.later[-1][0] == 1710.0
+    assert _due_in(manager)["100"] == 1710.0
+    await manager.async_stop()
+
+
+async def test_single_timer_dispatches_cameras_due_together_as_one_batch(
+    hass: HomeAssistant,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    manager, coordinator, client, schedules, _ = _setup(hass, monkeypatch)
+    await manager.async_start()
+    coordinator.get_camera_stream.reset_mock()
+    manager._due.clear()
+    manager._schedule_due("100", 30.0)
+    manager._schedule_due("200", 30.1)
+
+    # Более ранний срок перевзводит таймер; более поздний — нет.
+    assert schedules.armed() == [30.0]
+    await schedules.fire()
+    await hass.async_block_till_done()
+
+    assert sorted(
+        call.args[0] for call in coordinator.get_camera_stream.await_args_list
+    ) == ["100", "200"]
+    assert manager.scheduler_stats()["dispatches"] == 1
+    assert manager.scheduler_stats()["dispatched"] == 2
+    # Успех перевзвёл оба срока на 28:30, таймер снова один.
+    assert _due_in(manager) == {"100": 1710.0, "200": 1710.0}
+    assert schedules.armed() == [1710.0]
+    await manager.async_stop()
+
+
+async def test_keepalive_shares_manager_timer_and_repeats(
+    hass: HomeAssistant,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    manager, _, _, schedules, _ = _setup(hass, monkeypatch, keep_warm=False)
+    await manager.async_start()
+    calls: list[str] = []
+
+    async def _keepalive() -> None:
+        calls.append("100")
+
+    untrack = manager.async_track_keepalive(
+        "100", _keepalive, module.BACKGROUND_REFRESH_INTERVAL
+    )
+    assert manager.scheduler_stats()["keepalive_due_in_s"] == {"100": 1710.0}
+    assert schedules.armed() == [1710.0]
+
+    await schedules.fire()
+    assert calls == ["100"]
+    assert manager.scheduler_stats()["keepalive_due_in_s"] == {"100": 1710.0}
+
+    untrack()
+    assert schedules.armed() == []
+    await manager.async_stop()
+
+
+async def test_frozen_producer_teaches_session_ttl_to_refresh_and_keepalive(
+    hass: HomeAssistant,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    manager, _, client, schedules, _ = _setup(hass, monkeypatch)
+    await manager.async_start()
+    await manager.async_refresh("100", "ha_open")
+    assert _due_in(manager)["100"] == 1710.0
+    # Ранее оборванные сессии других камер: одной смерти мало для модели.
+    for index in range(MIN_SAMPLES - 1):
+        manager.session_ttl.record(f"seen{index}", 20 * 60)
+    assert manager.session_ttl.session_ttl() == 1800
+
+    # Оператор оборвал сессию на 20:00: bytes_recv стоит при живом consumer.
+    stalled = Go2RtcStreamInfo(
+        producers=({"bytes_recv": 500},),
+        consumer_count=1,
+        producer_active=True,
+    )
+    client.async_list_streams.return_value = {"eg_100": stalled}
+    schedules.now += 20 * 60
+    assert await manager.health_monitor.async_poll()
+    assert await manager.health_monitor.async_poll()
+    # Повторные снимки той же заморозки — не новые наблюдения.
+    assert await manager.health_monitor.async_poll()
+
+    stats = manager.session_ttl.stats()
+    assert stats["samples"] == MIN_SAMPLES
+    # Обрыв ниже полосы свидетельства — один шаг вниз, не сразу 20:00.
+    assert stats["session_ttl_s"] == 1350.0
+    assert stats["alerts"] == 1
+    assert "session TTL shrank to 1350s" in caplog.text
+
+    await manager.async_refresh("100", "recovery")
+    assert _due_in(manager)["100"] == 1282.5
+
+    async def _keepalive() -> None:
+        return None
+
+    untrack = manager.async_track_keepalive("200", _keepalive)
+    assert manager.scheduler_stats()["keepalive_due_in_s"] == {"200": 1282.5}
+    untrack()
+
+    # Сессия дожила до продления на выученном интервале: модель выходит из
+    # сжатия (окно снова меньше MIN_SAMPLES).
+    client.async_list_streams.return_value = {
+        "eg_100": Go2RtcStreamInfo(
+            producers=({"bytes_recv": 9000},),
+            consumer_count=1,
+            producer_active=True,
+        )
+    }
+    schedules.now += 1282.5
+    assert await manager.health_monitor.async_poll()
+    await manager.async_refresh("100", "background_due")
+    assert manager.session_ttl.stats()["survived"] == 1
+    assert manager.session_ttl.session_ttl() == 1800
     await manager.async_stop()
 
 
@@ -509,7 +650,7 @@ async def test_policy_only_options_update_preserves_active_preloads(
     client.async_enable_preload.reset_mock()
     client.async_patch_stream.reset_mock()
     coordinator.get_camera_stream.reset_mock()
-    scheduled_before = list(manager._due_unsubs)
+    scheduled_before = manager._due.due_times()
 
     hass.config_entries.async_update_entry(
         manager.entry,
@@ -539,7 +680,7 @@ async def test_policy_only_options_update_preserves_active_preloads(
     coordinator.get_camera_stream.assert_not_awaited()
     assert manager.keep_warm is True
     assert manager.keep_warm_hidden is True
-    assert list(manager._due_unsubs) == scheduled_before
+    assert manager._due.due_times() == scheduled_before
     assert len(schedules.intervals) == 1
     await manager.async_stop()
 
@@ -568,6 +709,72 @@ async def test_transport_change_requires_normal_config_entry_reload(
     await manager.async_stop()
 
 
+async def test_swap_client_moves_owned_streams_to_new_transport(
+    hass: HomeAssistant,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    manager, coordinator, client, schedules, _ = _setup(hass, monkeypatch)
+    active = Go2RtcStreamInfo(
+        producers=({"bytes_recv": 100},),
+        consumer_count=0,
+        producer_active=True,
+    )
+    client.async_list_streams.return_value = {
+        "eg_100": active,
+        "eg_200": active,
+    }
+    client.async_list_preloads.return_value = {"eg_100", "eg_200"}
+    client.async_get_stream.return_value = active
+    await manager.async_start()
+    coordinator.get_camera_stream.reset_mock()
+    new_client = MagicMock()
+    new_client.async_list_streams = AsyncMock(return_value={})
+    new_client.async_list_preloads = AsyncMock(return_value=set())
+
+    await manager.async_swap_client(new_client)
+
+    # Старый go2rtc: preload-ы сняты, idle-стримы удалены.
+    assert client.async_disable_preload.await_count == 2
+    assert client.async_delete_stream.await_count == 2
+    assert manager.client is new_client
+    assert manager._owned_preloads == set()
+    new_client.async_list_streams.assert_awaited_once()
+    for camera_id in ("100", "200"):
+        state = manager.camera_state(camera_id)
+        assert state.present is False and state.preloaded is False
+    # Публикация на новом go2rtc — staggered, как при включении policy.
+    assert _due_in(manager) == {"100": 0.0, "200": 0.5}
+    coordinator.get_camera_stream.assert_not_awaited()
+    await manager.async_stop()
+
+
+async def test_periodic_reconcile_reuses_health_monitor_snapshot(
+    hass: HomeAssistant,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    manager, _, client, schedules, _ = _setup(hass, monkeypatch)
+    await manager.async_start()
+    client.async_list_streams.reset_mock()
+    active = Go2RtcStreamInfo(
+        producers=({"bytes_recv": 100},),
+        consumer_count=2,
+        producer_active=True,
+    )
+    client.async_list_streams.return_value = {"eg_100": active}
+
+    assert await manager.health_monitor.async_poll()
+    # Снимок monitor-а сразу виден в состоянии менеджера.
+    assert manager.camera_state("100").consumer_count == 2
+    ((_, reconcile_interval, _),) = schedules.intervals
+    await reconcile_interval(None)
+
+    # Один `/api/streams` на оба потребителя: monitor и periodic reconcile.
+    client.async_list_streams.assert_awaited_once()
+    assert manager.camera_state("100").present is True
+    await manager.async_stop()
+    assert manager.health_monitor is None
+
+
 async def test_policy_update_off_cleans_preloads_without_operator_refresh(
     hass: HomeAssistant,
     monkeypatch: pytest.MonkeyPatch,
@@ -604,7 +811,7 @@ async def test_policy_update_off_cleans_preloads_without_operator_refresh(
     assert manager.keep_warm is False
     assert manager._registry_unsub is None
     assert manager._reconcile_unsub is None
-    assert manager._due_unsubs == {}
+    assert len(manager._due) == 0
     assert client.async_disable_preload.await_count == 2
     assert client.async_delete_stream.await_count == 2
     coordinator.get_camera_stream.assert_not_awaited()
@@ -637,8 +844,8 @@ async def test_policy_update_on_schedules_missing_with_short_async_ramp(
     assert manager._started is True
     assert manager.keep_warm is True
     assert len(schedules.intervals) == 1
-    assert len(schedules.later) == 2
-    assert [delay for delay, _, _ in schedules.later] == [0.0, 0.5]
+    assert _due_in(manager) == {"100": 0.0, "200": 0.5}
+    assert schedules.armed() == [0.0]
     coordinator.get_camera_stream.assert_not_awaited()
     client.async_patch_stream.assert_not_awaited()
     await manager.async_stop()
@@ -0,0 +1,142 @@
+"""Кэш operator stream URL-ов (`stream_url_cache.py`).
+
+- URL отдаётся, пока сессии осталось не меньше, чем нужно вызывающему.
+- Смерть producer-а — наблюдение для модели TTL сессии (общей на аккаунт);
+  свежий URL заменяет кэш.
+- Coordinator — общая точка go2rtc-источников: повторный вызов получает тот
+  же URL; одноразовый URL direct-пути в кэш не попадает.
+"""
+from __future__ import annotations
+
+import json
+from unittest.mock import AsyncMock
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.elektronny_gorod.const import (
+    CONF_ACCESS_TOKEN,
+    CONF_REFRESH_TOKEN,
+    DOMAIN,
+)
+from custom_components.elektronny_gorod.session_ttl import (
+    EVIDENCE_BAND,
+    MIN_SAMPLES,
+)
+from custom_components.elektronny_gorod.stream_url_cache import (
+    MIN_REMAINING_OPEN,
+    SESSION_TTL_DEFAULT,
+    StreamUrlCache,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_url_is_reused_only_with_enough_remaining_life() -> None:
+    clock = _Clock()
+    cache = StreamUrlCache(clock=clock)
+    cache.put("100", "https://operator/100?token=A")
+
+    clock.now += 120
+    assert cache.get("100", MIN_REMAINING_OPEN) == "https://operator/100?token=A"
+    # Продлению сессии нужен почти весь TTL — минутный URL уже не годится.
+    assert cache.get("100", SESSION_TTL_DEFAULT - 90) is None
+    clock.now += SESSION_TTL_DEFAULT - MIN_REMAINING_OPEN
+    assert cache.get("100", MIN_REMAINING_OPEN) is None
+    assert cache.get("200", 0) is None
+    assert cache.stats() == {
+        "cached": 1,
+        "hits": 1,
+        "misses": 3,
+        "invalidations": 0,
+        "deaths": 0,
+    }
+
+
+def test_producer_death_records_observed_ttl() -> None:
+    clock = _Clock()
+    cache = StreamUrlCache(clock=clock)
+    # Обрывы, уже виденные моделью на других камерах.
+    for index in range(MIN_SAMPLES - 1):
+        cache.ttl_model.record(f"seen{index}", 20 * 60)
+    cache.put("100", "https://operator/100?token=A")
+    clock.now += 20 * 60
+
+    cache.invalidate("100", producer_died=True)
+
+    assert cache.get("100", 0) is None
+    assert cache.observed_ttl("100") == 20 * 60
+    # Срок сессии задаёт бэкенд — наблюдение действует на все камеры
+    # (первый шаг полосы свидетельства от 30:00).
+    assert cache.ttl() == SESSION_TTL_DEFAULT * EVIDENCE_BAND
+    cache.put("100", "https://operator/100?token=B")
+    clock.now += 18 * 60
+    # Осталось 4.5 минуты по наблюдаемому TTL — для открытия мало.
+    assert cache.get("100", MIN_REMAINING_OPEN) is None
+
+    # Ранняя смерть (сеть/go2rtc) — не истечение сессии.
+    cache.put("200", "https://operator/200?token=C")
+    clock.now += 10
+    cache.invalidate("200", producer_died=True)
+    assert cache.observed_ttl("200") is None
+    assert cache.stats()["deaths"] == 1
+
+
+async def test_coordinator_shares_cached_url_between_callers(
+    hass: HomeAssistant, monkeypatch
+) -> None:
+    from custom_components.elektronny_gorod.coordinator import (
+        ElektronnyGorodUpdateCoordinator,
+    )
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_ACCESS_TOKEN: "T",
+            CONF_REFRESH_TOKEN: "R",
+            "user_agent": json.dumps({}),
+            "operator_id": 1,
+        },
+    )
+    entry.add_to_hass(hass)
+    monkeypatch.setattr(
+        "custom_components.elektronny_gorod.coordinator.UserAgent.from_json",
+        lambda self, _data: None,
+    )
+    coordinator = ElektronnyGorodUpdateCoordinator(hass, entry=entry)
+    query = AsyncMock(
+        side_effect=[
+            "https://operator/A",
+            "https://operator/B",
+            "https://operator/direct",
+        ]
+    )
+    monkeypatch.setattr(coordinator._api, "query_camera_stream", query)
+
+    first = await coordinator.get_shared_camera_stream("100")
+    reused = await coordinator.get_shared_camera_stream(
+        "100", min_remaining=MIN_REMAINING_OPEN
+    )
+    coordinator.invalidate_camera_stream("100", producer_died=True)
+    fresh = await coordinator.get_shared_camera_stream(
+        "100", min_remaining=MIN_REMAINING_OPEN
+    )
+    # Direct-путь: одноразовый URL — всегда свой, кэш не трогает.
+    direct = await coordinator.get_camera_stream("100")
+
+    assert (first, reused, fresh, direct) == (
+        "https://operator/A",
+        "https://operator/A",
+        "https://operator/B",
+        "https://operator/direct",
+    )
+    assert query.await_count == 3
+    assert coordinator.stream_urls.get(
+        "100", MIN_REMAINING_OPEN
+    ) == "https://operator/B"
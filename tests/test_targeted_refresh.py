@@ -0,0 +1,160 @@
+"""Targeted refresh одного place (`coordinator.async_refresh_place`).
+
+- Перезапрашиваются только выбранные виды одного place; остальные places и
+  виды — из кэша, результат вливается в `coordinator.data`.
+- Одновременные запросы того же slice-а — один запрос к оператору.
+- Сервис `refresh_place`: валидация kinds, неизвестный place — ошибка.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.elektronny_gorod import _async_register_refresh_service
+from custom_components.elektronny_gorod.const import (
+    CONF_ACCESS_TOKEN,
+    CONF_OPERATOR_ID,
+    CONF_REFRESH_TOKEN,
+    CONF_USER_AGENT,
+    DOMAIN,
+)
+from custom_components.elektronny_gorod.coordinator import (
+    ElektronnyGorodUpdateCoordinator,
+)
+from custom_components.elektronny_gorod.rate_limit import TokenBucket
+from custom_components.elektronny_gorod.refresh_schedule import (
+    KIND_BALANCE,
+    KIND_DND,
+    RefreshSchedule,
+)
+from custom_components.elektronny_gorod.transport import (
+    async_acquire_operator_transport,
+)
+from custom_components.elektronny_gorod.user_agent import UserAgent
+
+from tests.operator_standin import OperatorStandIn, synthetic_routes
+
+_DND = "GET /api/mh-customer/mobile/v1/customers/places/{id}/settings/do_not_disturb"
+
+
+@pytest.fixture
+async def coordinator(hass: HomeAssistant, socket_enabled, monkeypatch):
+    """Coordinator против stand-in-а (2 places) после первого живого тика."""
+    bucket = TokenBucket(rate=1e6, burst=1e6)
+    monkeypatch.setattr(
+        "custom_components.elektronny_gorod.http.account_rate_limiter",
+        lambda _hass, _account_id: bucket,
+    )
+    monkeypatch.setattr(
+        "custom_components.elektronny_gorod.http._async_sleep", AsyncMock()
+    )
+    standin = OperatorStandIn(synthetic_routes(2, 2))
+    await standin.__aenter__()
+    standin.patch_http(monkeypatch)
+    release = async_acquire_operator_transport(hass)
+
+    ua = UserAgent()
+    ua.operator_id = "1"
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_ACCESS_TOKEN: "T1",
+            CONF_REFRESH_TOKEN: "R1",
+            CONF_OPERATOR_ID: "1",
+            CONF_USER_AGENT: json.dumps(ua.json()),
+            "account_id": "A1",
+        },
+    )
+    entry.add_to_hass(hass)
+    coordinator = ElektronnyGorodUpdateCoordinator(hass, entry=entry)
+    coordinator.refresh_schedule = RefreshSchedule(clock=lambda: 0.0)
+    await coordinator.async_refresh()
+    coordinator.standin = standin
+    yield coordinator
+
+    coordinator.async_unsubscribe()
+    await release()
+    await standin.__aexit__(None, None, None)
+
+
+async def test_refresh_place_fetches_only_requested_slice(coordinator) -> None:
+    standin = coordinator.standin
+    before = standin.total_requests
+    data = coordinator.data
+
+    assert await coordinator.async_refresh_place("1001", [KIND_DND])
+
+    assert standin.total_requests == before + 1
+    assert standin.requests[_DND] == 3
+    # Снимок склеен заново из кэша: тот же состав, другой объект.
+    assert coordinator.data is not data
+    assert coordinator.data["locks"] == data["locks"]
+    assert set(coordinator.data["dnd"]) == {"1001", "1002"}
+
+
+async def test_concurrent_refreshes_of_same_slice_are_deduplicated(
+    coordinator,
+) -> None:
+    standin = coordinator.standin
+    before = standin.total_requests
+
+    results = await asyncio.gather(
+        coordinator.async_refresh_place("1001", [KIND_DND]),
+        coordinator.async_refresh_place("1001", [KIND_DND]),
+        coordinator.async_refresh_place("1001", [KIND_DND, KIND_BALANCE]),
+    )
+
+    assert results == [True, True, True]
+    assert standin.total_requests == before + 2
+    assert coordinator.targeted_stats == {"refreshes": 2, "deduplicated": 2}
+    assert not coordinator._targeted
+
+
+async def test_refresh_place_rejects_unknown_place_and_kind(coordinator) -> None:
+    assert not await coordinator.async_refresh_place("404", [KIND_DND])
+    with pytest.raises(ValueError):
+        await coordinator.async_refresh_place("1001", ["bogus"])
+
+
+async def test_refresh_place_service(hass: HomeAssistant, coordinator) -> None:
+    hass.data.setdefault(DOMAIN, {})["entry"] = coordinator
+    _async_register_refresh_service(hass)
+    before = coordinator.standin.total_requests
+
+    await hass.services.async_call(
+        DOMAIN, "refresh_place", {"place_id": "1002", "kinds": "dnd"}, blocking=True
+    )
+    assert coordinator.standin.total_requests == before + 1
+
+    with pytest.raises(HomeAssistantError):
+        await hass.services.async_call(
+            DOMAIN, "refresh_place", {"place_id": "404"}, blocking=True
+        )
+
+
+async def test_refresh_place_service_before_first_live_refresh(
+    hass: HomeAssistant, coordinator
+) -> None:
+    # Старт из сохранённого снимка: place виден в `data`, `_places` ещё нет.
+    coordinator._places = None
+    coordinator._live_data = False
+    hass.data.setdefault(DOMAIN, {})["entry"] = coordinator
+    _async_register_refresh_service(hass)
+    before = coordinator.standin.total_requests
+
+    await hass.services.async_call(
+        DOMAIN, "refresh_place", {"place_id": "1001", "kinds": "dnd"}, blocking=True
+    )
+
+    # Влить не во что — полный refresh: places + запрошенный DND.
+    assert coordinator.standin.total_requests == before + 2
+    assert coordinator.standin.requests[_DND] == 3
+    assert coordinator.has_place("1001")
+    assert coordinator._live_data
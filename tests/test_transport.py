@@ -0,0 +1,111 @@
+"""Выделенный connection pool operator API (`transport.py`).
+
+- Transport общий для entries, закрывается release-ом последнего.
+- Connector создаётся лениво, с `limit_per_host` / DNS-кэшем / keep-alive.
+- `HTTP` ходит через transport, пока он открыт; иначе — shared HA-сессия.
+"""
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+from aiohttp import ClientResponse
+
+from custom_components.elektronny_gorod.http import HTTP
+from custom_components.elektronny_gorod.transport import (
+    OPERATOR_DNS_CACHE_TTL_SECONDS,
+    OPERATOR_LIMIT_PER_HOST,
+    async_acquire_operator_transport,
+    get_operator_transport,
+)
+
+
+def _http(hass) -> HTTP:
+    ua = MagicMock()
+    ua.__str__ = lambda self: "test-ua"
+    return HTTP(hass=hass, user_agent=ua, access_token="T", refresh_token=None, operator="1")
+
+
+def _response() -> MagicMock:
+    resp = MagicMock(spec=ClientResponse)
+    resp.status = 200
+    resp.ok = True
+    resp.reason = "OK"
+    resp.headers = {}
+    resp.method = "GET"
+    resp.url = "https://example/"
+    return resp
+
+
+async def test_transport_is_shared_and_refcounted(hass) -> None:
+    release_a = async_acquire_operator_transport(hass)
+    transport = get_operator_transport(hass)
+    release_b = async_acquire_operator_transport(hass)
+
+    assert transport is not None
+    assert get_operator_transport(hass) is transport
+    assert transport.users == 2
+
+    await release_a()
+    await release_a()  # повторный release — no-op
+    assert get_operator_transport(hass) is transport
+
+    await release_b()
+    assert transport.closed
+    assert get_operator_transport(hass) is None
+
+    release_c = async_acquire_operator_transport(hass)
+    assert get_operator_transport(hass) not in (None, transport)
+    await release_c()
+
+
+async def test_connector_is_lazy_and_tuned(hass) -> None:
+    release = async_acquire_operator_transport(hass)
+    transport = get_operator_transport(hass)
+    assert transport._session is None
+
+    connector = transport.session.connector
+    assert connector.limit_per_host == OPERATOR_LIMIT_PER_HOST
+    assert connector._cached_hosts._ttl == OPERATOR_DNS_CACHE_TTL_SECONDS
+
+    await release()
+    assert transport.session.closed
+
+
+async def test_http_uses_operator_transport_when_open(hass, monkeypatch) -> None:
+    shared = MagicMock()
+    monkeypatch.setattr(
+        "custom_components.elektronny_gorod.http.async_get_clientsession",
+        lambda _hass: shared,
+    )
+    client = _http(hass)
+    release = async_acquire_operator_transport(hass)
+    transport = get_operator_transport(hass)
+    dedicated = MagicMock()
+    dedicated.get = AsyncMock(return_value=_response())
+    transport._session = dedicated
+
+    await client.get("/rest/v1/places/P1/accesscontrols")
+    dedicated.get.assert_awaited_once()
+    assert client.diagnostics()["transport"]["limit_per_host"] == OPERATOR_LIMIT_PER_HOST
+
+    transport._session = None
+    await release()
+    shared.get = AsyncMock(return_value=_response())
+    await client.get("/rest/v1/places/P1/accesscontrols")
+    shared.get.assert_awaited_once()
+    assert client.diagnostics()["transport"] is None
+
+
+async def test_reuse_counters(hass) -> None:
+    release = async_acquire_operator_transport(hass)
+    transport = get_operator_transport(hass)
+
+    await transport._on_connection_create_end()
+    for _ in range(3):
+        await transport._on_connection_reuseconn()
+
+    stats = transport.stats()
+    assert stats["connections_created"] == 1
+    assert stats["connections_reused"] == 3
+    assert stats["reuse_ratio"] == 0.75
+    await release()